@@ -1,18 +1,37 @@
 import numpy as np
 import rasterio
+from rasterio.enums import Resampling
+from rasterio.windows import Window
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-import plotly.offline as pyo
 from scipy.ndimage import gaussian_filter
-from scipy.interpolate import griddata
 from skimage import filters
+import json
 import os
 
+from arazi_aktarim import camera_path_script, write_html
+from arazi_istatistik import DEFAULT_PERCENTILES, terrain_statistics, write_csv, write_json
+from arazi_onbellek import KEY_VERSION, TerrainCache
+from arazi_piramit import build_pyramid, pick_level
+from arazi_turevleri import DERIVATIVE_BACKENDS, map_strips, terrain_derivatives
+from dem_bosluk_doldurma import fill_voids
+from yangin_tehlikesi import fire_hazard_map, print_result as print_hazard, terrain_layers
+
 class AgriDagi3D:
-    def __init__(self, dem_path, roughness_path=None):
+    # Karo modunda komşu karolardan okunacak taşma (halo) genişliği (piksel).
+    # gaussian_filter(sigma=1, truncate=4) yarıçapı 4 + sobel/gradient yarıçapı 1
+    TILE_HALO = 5
+    
+    # Gölgeleme ışık kaynağı (derece)
+    HILLSHADE_AZIMUTH = 315
+    HILLSHADE_ALTITUDE = 45
+
+    def __init__(self, dem_path, roughness_path=None, tiled=False, tile_size=1024, output_dir=None,
+                 derivatives_backend='legacy', n_workers=1, cache_dir=None, cache_max_bytes=10 * 1024 ** 3,
+                 reuse_derived=True):
         self.dem_path = dem_path
         self.roughness_path = roughness_path
         self.dem_data = None
@@ -23,7 +42,33 @@ class AgriDagi3D:
         self.transform = None
         self.crs = None
         
-        self._load_data()
+        # Karo (tiled) modu: RAM'e sığmayan DEM'ler pencere pencere işlenir
+        self.tiled = tiled
+        self.tile_size = tile_size
+        self.output_dir = output_dir
+        self.derived_paths = {}
+        # Karo modunda aynı DEM ve ayarlarla üretilmiş türev GeoTIFF'leri yeniden kullan
+        self.reuse_derived = reuse_derived
+        
+        # Türev hesaplama arka ucu: 'legacy' (float64), 'fused' veya 'numba' (tek geçiş, float32)
+        if derivatives_backend not in DERIVATIVE_BACKENDS:
+            raise ValueError(f"Geçersiz derivatives_backend: {derivatives_backend!r} "
+                             f"(seçenekler: {', '.join(DERIVATIVE_BACKENDS)})")
+        self.derivatives_backend = derivatives_backend
+        
+        # Boşluk doldurma ve türev hesaplarında kullanılacak iş parçacığı sayısı
+        self.n_workers = max(1, int(n_workers or os.cpu_count()))
+        
+        # Türetilmiş katmanlar için kalıcı disk önbelleği (DEM içerik özetiyle anahtarlanır)
+        self.cache = TerrainCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+        
+        # Render için LOD piramitleri (DEM indirgeme yöntemine göre, ilk kullanımda oluşturulur)
+        self._pyramids = {}
+        
+        if self.tiled:
+            self._process_tiled()
+        else:
+            self._load_data()
         
     def _load_data(self):
         """Veri setlerini yükle ve ön işleme yap"""
@@ -31,15 +76,30 @@ class AgriDagi3D:
         
         # DEM verisi
         with rasterio.open(self.dem_path) as dataset:
-            self.dem_data = dataset.read(1).astype(float)
             self.transform = dataset.transform
             self.crs = dataset.crs
             
-            # NoData değerlerini interpolasyon ile doldur
-            if dataset.nodata is not None:
-                mask = self.dem_data == dataset.nodata
-                self.dem_data[mask] = np.nan
-                self._interpolate_missing_values()
+            # Önbellekte varsa doldurulmuş DEM ve türevleri bellek eşlemeli aç
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.key(self.dem_path, self.transform, self._pixel_size(),
+                                           self.HILLSHADE_AZIMUTH, self.HILLSHADE_ALTITUDE,
+                                           self.derivatives_backend)
+                cached = self.cache.load(cache_key)
+                if cached is not None:
+                    self.dem_data = cached['dem']
+                    self.slope_data = cached['slope']
+                    self.aspect_data = cached['aspect']
+                    self.hillshade_data = cached['hillshade']
+            
+            if self.dem_data is None:
+                self.dem_data = dataset.read(1).astype(float)
+                
+                # NoData değerlerini interpolasyon ile doldur
+                if dataset.nodata is not None:
+                    mask = self.dem_data == dataset.nodata
+                    self.dem_data[mask] = np.nan
+                    self._interpolate_missing_values()
         
         # Roughness verisi (varsa)
         if self.roughness_path and os.path.exists(self.roughness_path):
@@ -50,67 +110,184 @@ class AgriDagi3D:
                     self.roughness_data[mask] = np.nan
         
         # Türetilmiş haritaları hesapla
-        self._calculate_derived_maps()
+        if self.slope_data is None:
+            self._calculate_derived_maps()
+            if cache_key is not None:
+                self.cache.store(cache_key, {'dem': self.dem_data, 'slope': self.slope_data,
+                                             'aspect': self.aspect_data, 'hillshade': self.hillshade_data},
+                                 meta={'dem_path': os.path.abspath(self.dem_path)})
+        else:
+            print("⚡ Türetilmiş haritalar önbellekten yüklendi")
         
         print(f"✅ Veri yükleme tamamlandı: {self.dem_data.shape}")
         
-    def _interpolate_missing_values(self):
-        """Eksik değerleri interpolasyon ile doldur"""
-        mask = ~np.isnan(self.dem_data)
-        if np.sum(mask) < 0.5 * self.dem_data.size:
-            return
+    def _process_tiled(self):
+        """DEM'i halo'lu pencerelerle karo karo işle ve sonuçları diske yaz.
+
+        Bellek kullanımı raster boyutuna değil karo boyutuna bağlıdır. NoData
+        içermeyen bir DEM için çıktılar bellek içi yol ile bit düzeyinde aynıdır.
+        """
+        print("🧱 Karo modunda işleniyor...")
+        
+        output_dir = self.output_dir or os.path.dirname(os.path.abspath(self.dem_path))
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(self.dem_path))[0]
+        self.derived_paths = {
+            name: os.path.join(output_dir, f'{base_name}_{name}.tif')
+            for name in ('slope', 'aspect', 'hillshade')
+        }
+        
+        stamp_path = os.path.join(output_dir, f'{base_name}_turevler.json')
+        
+        halo = self.TILE_HALO
+        with rasterio.open(self.dem_path) as dataset:
+            self.transform = dataset.transform
+            self.crs = dataset.crs
+            height, width = dataset.height, dataset.width
+            pixel_size = self._pixel_size()
+            
+            # DEM ve ayarlar değişmediyse diskteki türevler geçerli: yeniden hesaplama
+            stamp = self._tiled_stamp(pixel_size)
+            if self.reuse_derived and self._read_stamp(stamp_path) == stamp and \
+                    all(os.path.exists(path) for path in self.derived_paths.values()):
+                print(f"⚡ Türetilmiş katmanlar yeniden kullanıldı: {output_dir}")
+                return
+            # Yarım kalan yazım eski damgayla geçerli görünmesin
+            if os.path.exists(stamp_path):
+                os.remove(stamp_path)
             
-        y, x = np.mgrid[0:self.dem_data.shape[0], 0:self.dem_data.shape[1]]
-        valid_points = np.column_stack((y[mask], x[mask]))
-        valid_values = self.dem_data[mask]
+            profile = dict(driver='GTiff', width=width, height=height, count=1,
+                           crs=dataset.crs, transform=dataset.transform,
+                           tiled=True, blockxsize=256, blockysize=256,
+                           compress='lzw', BIGTIFF='IF_SAFER')
+            float_dtype = 'float64' if self.derivatives_backend == 'legacy' else 'float32'
+            dtypes = {'slope': float_dtype, 'aspect': float_dtype, 'hillshade': 'uint8'}
+            outputs = {name: rasterio.open(path, 'w', dtype=dtypes[name], **profile)
+                       for name, path in self.derived_paths.items()}
+            try:
+                for row_off in range(0, height, self.tile_size):
+                    for col_off in range(0, width, self.tile_size):
+                        core = Window(col_off, row_off,
+                                      min(self.tile_size, width - col_off),
+                                      min(self.tile_size, height - row_off))
+                        
+                        # Çekirdek pencereyi raster sınırları içinde halo kadar genişlet
+                        r0, c0 = max(0, row_off - halo), max(0, col_off - halo)
+                        r1 = min(height, row_off + core.height + halo)
+                        c1 = min(width, col_off + core.width + halo)
+                        dem = dataset.read(1, window=Window(c0, r0, c1 - c0, r1 - r0)).astype(float)
+                        if dataset.nodata is not None:
+                            dem[dem == dataset.nodata] = np.nan
+                            self._interpolate_missing_values(dem)
+                        
+                        crop = (slice(row_off - r0, row_off - r0 + core.height),
+                                slice(col_off - c0, col_off - c0 + core.width))
+                        layers = self._compute_derivatives(pixel_size, dem)
+                        for name, layer in zip(('slope', 'aspect', 'hillshade'), layers):
+                            outputs[name].write(layer[crop], 1, window=core)
+            finally:
+                for output in outputs.values():
+                    output.close()
+        
+        with open(stamp_path, 'w', encoding='utf-8') as handle:
+            json.dump(stamp, handle)
+        print(f"✅ Karo işleme tamamlandı: {(height, width)} -> {output_dir}")
+    
+    def _tiled_stamp(self, pixel_size):
+        """Karo türevlerini üreten DEM ve ayarların damgası.
+
+        Önbellek dizini verildiyse DEM içerik özeti (arazi_onbellek), yoksa
+        yol + boyut + değiştirilme zamanı kullanılır.
+        """
+        if self.cache is not None:
+            dem = self.cache.content_hash(self.dem_path)
+        else:
+            stat = os.stat(self.dem_path)
+            dem = f'{os.path.abspath(self.dem_path)}|{stat.st_size}|{stat.st_mtime_ns}'
+        return {'key_version': KEY_VERSION, 'dem': dem, 'transform': list(self.transform)[:6],
+                'pixel_size': float(pixel_size), 'backend': self.derivatives_backend, 'tile_size': self.tile_size,
+                'azimuth': self.HILLSHADE_AZIMUTH, 'altitude': self.HILLSHADE_ALTITUDE}
+    
+    @staticmethod
+    def _read_stamp(path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
         
-        missing_points = np.column_stack((y[~mask], x[~mask]))
+    def _interpolate_missing_values(self, dem=None):
+        """Eksik değerleri her boşluğun çevre halkasından yerel interpolasyon ile doldur"""
+        dem = self.dem_data if dem is None else dem
+        mask = ~np.isnan(dem)
+        if np.sum(mask) < 0.5 * dem.size:
+            return
         
-        if len(missing_points) > 0:
-            interpolated = griddata(valid_points, valid_values, missing_points, 
-                                  method='cubic', fill_value=np.nanmean(valid_values))
-            self.dem_data[~mask] = interpolated
+        fill_voids(dem, ring_width=3, method='cubic', n_workers=self.n_workers)
+    
+    def _pixel_size(self):
+        """Piksel boyutu (metre cinsinden)"""
+        pixel_size = abs(self.transform[0])
+        if self.crs and 'EPSG:4326' in self.crs.to_string():
+            pixel_size *= 111000  # Derece -> metre (yaklaşık)
+        return pixel_size
     
     def _calculate_derived_maps(self):
         """Türetilmiş haritaları hesapla"""
         print("🗺️ Türetilmiş haritalar hesaplanıyor...")
         
         # Piksel boyutu (metre cinsinden)
-        pixel_size = abs(self.transform[0])
-        if self.crs and 'EPSG:4326' in self.crs.to_string():
-            pixel_size *= 111000  # Derece -> metre (yaklaşık)
+        pixel_size = self._pixel_size()
         
-        # Eğim hesaplama (gelişmiş algoritma)
-        self.slope_data = self._calculate_slope_advanced(pixel_size)
+        # Eğim, bakı ve gölgeleme
+        self.slope_data, self.aspect_data, self.hillshade_data = self._compute_derivatives(pixel_size)
         
-        # Aspect (bakı) hesaplama
-        self.aspect_data = self._calculate_aspect(pixel_size)
+    def _compute_derivatives(self, pixel_size, dem=None):
+        """Seçili arka uç ile (eğim, bakı, gölgeleme) üçlüsünü hesapla"""
+        dem = self.dem_data if dem is None else dem
+        if self.derivatives_backend != 'legacy':
+            return terrain_derivatives(dem, pixel_size, self.HILLSHADE_AZIMUTH, self.HILLSHADE_ALTITUDE,
+                                       backend=self.derivatives_backend, n_workers=self.n_workers)
+        if self.n_workers == 1:
+            return (self._calculate_slope_advanced(pixel_size, dem),
+                    self._calculate_aspect(pixel_size, dem),
+                    self._calculate_hillshade(self.HILLSHADE_AZIMUTH, self.HILLSHADE_ALTITUDE, dem=dem))
         
-        # Hillshade (gölgeleme) hesaplama
-        self.hillshade_data = self._calculate_hillshade()
+        # Halo satırlı şeritler karo modundaki gibi tam ekranla bit düzeyinde aynı sonucu verir
+        def legacy_strip(strip, top, n_rows, outs):
+            core = slice(top, top + n_rows)
+            outs[0][:] = self._calculate_slope_advanced(pixel_size, strip)[core]
+            outs[1][:] = self._calculate_aspect(pixel_size, strip)[core]
+            outs[2][:] = self._calculate_hillshade(self.HILLSHADE_AZIMUTH, self.HILLSHADE_ALTITUDE, dem=strip)[core]
         
-    def _calculate_slope_advanced(self, pixel_size):
+        return map_strips(legacy_strip, dem, (np.float64, np.float64, np.uint8), n_workers=self.n_workers)
+        
+    def _calculate_slope_advanced(self, pixel_size, dem=None):
         """Gelişmiş eğim hesaplama algoritması"""
-        smoothed_dem = gaussian_filter(self.dem_data, sigma=1.0)
-        grad_x = filters.sobel_h(smoothed_dem) / (8 * pixel_size)
-        grad_y = filters.sobel_v(smoothed_dem) / (8 * pixel_size)
+        dem = self.dem_data if dem is None else dem
+        smoothed_dem = gaussian_filter(dem, sigma=1.0)
+        # skimage'ın Sobel çekirdekleri 4'e bölünmüştür: birim eğimde 2 verir (Horn ölçeği /8 değil /2)
+        grad_x = filters.sobel_h(smoothed_dem) / (2 * pixel_size)
+        grad_y = filters.sobel_v(smoothed_dem) / (2 * pixel_size)
         slope_rad = np.arctan(np.sqrt(grad_x**2 + grad_y**2))
         slope_deg = np.degrees(slope_rad)
         return np.clip(slope_deg, 0, 90)
     
-    def _calculate_aspect(self, pixel_size):
+    def _calculate_aspect(self, pixel_size, dem=None):
         """Aspect (bakı) hesaplama"""
-        grad_x = np.gradient(self.dem_data, pixel_size, axis=1)
-        grad_y = np.gradient(self.dem_data, pixel_size, axis=0)
+        dem = self.dem_data if dem is None else dem
+        grad_x = np.gradient(dem, pixel_size, axis=1)
+        grad_y = np.gradient(dem, pixel_size, axis=0)
         aspect_rad = np.arctan2(-grad_y, grad_x)
         aspect_deg = (np.degrees(aspect_rad) + 360) % 360
         return aspect_deg
     
-    def _calculate_hillshade(self, azimuth=315, altitude=45):
+    def _calculate_hillshade(self, azimuth=315, altitude=45, dem=None):
         """Hillshade (gölgeleme) hesaplama"""
+        dem = self.dem_data if dem is None else dem
         azimuth_rad = np.radians(azimuth)
         altitude_rad = np.radians(altitude)
-        grad_x, grad_y = np.gradient(self.dem_data)
+        grad_x, grad_y = np.gradient(dem)
         slope_rad = np.arctan(np.sqrt(grad_x**2 + grad_y**2))
         aspect_rad = np.arctan2(-grad_y, grad_x)
         hillshade = (np.sin(altitude_rad) * np.cos(slope_rad) + 
@@ -119,15 +296,71 @@ class AgriDagi3D:
         hillshade = np.clip(hillshade * 255, 0, 255)
         return hillshade.astype(np.uint8)
     
-    def create_ultra_realistic_3d(self, sample_rate=3, quality='high'):
+    def _get_pyramid(self, lod_method='mean'):
+        """DEM ve türevleri için LOD piramidini bir kez oluştur ve sakla"""
+        if lod_method not in self._pyramids:
+            print(f"🔺 LOD piramidi oluşturuluyor ({lod_method})...")
+            self._pyramids[lod_method] = {
+                'dem': build_pyramid(self.dem_data, lod_method),
+                'slope': build_pyramid(self.slope_data, 'mean'),
+                'aspect': build_pyramid(self.aspect_data, 'circular'),
+                'hillshade': build_pyramid(self.hillshade_data, 'mean'),
+            }
+        return self._pyramids[lod_method]
+    
+    def _read_decimated(self, step, lod_method='mean'):
+        """Karo modunda katmanları GeoTIFF'lerden ``step`` kat seyreltilmiş oku.
+
+        Tam çözünürlüklü raster belleğe alınmaz; GDAL okurken indirger (DEM
+        için lod_method'a karşılık gelen average/max, bakı için en yakın komşu).
+        """
+        resampling = {'dem': Resampling.max if lod_method == 'max' else Resampling.average,
+                      'slope': Resampling.average, 'aspect': Resampling.nearest,
+                      'hillshade': Resampling.average}
+        paths = {'dem': self.dem_path, **self.derived_paths}
+        layers = {}
+        for name in ('dem', 'slope', 'aspect', 'hillshade'):
+            with rasterio.open(paths[name]) as dataset:
+                shape = (-(-dataset.height // step), -(-dataset.width // step))
+                data = dataset.read(1, out_shape=shape, resampling=resampling[name], masked=True)
+                layers[name] = data.astype(np.float32).filled(np.nan) if name != 'hillshade' else data.filled(0)
+        return layers
+    
+    def _sample_layers(self, sample_rate=None, max_vertices=250_000, lod_method='mean'):
+        """Render için katmanları seç: sample_rate verilirse adımlı seyreltme, yoksa
+        köşe bütçesine göre LOD piramidi seviyesi. x/y orijinal piksel birimindedir."""
+        if self.tiled:
+            # Karo modunda dem_data yoktur: piramit seviyesine denk adımla diskten indirgenmiş oku
+            step = sample_rate
+            if step is None:
+                with rasterio.open(self.dem_path) as dataset:
+                    height, width = dataset.shape
+                step = 1
+                while (-(-height // step)) * (-(-width // step)) > max_vertices and min(height, width) // (2 * step) >= 16:
+                    step *= 2
+            layers = self._read_decimated(step, lod_method)
+            print(f"🔍 Karo modu, {step} kat indirgenmiş: {layers['dem'].shape} ({layers['dem'].size} köşe)")
+        elif sample_rate is not None:
+            step = sample_rate
+            layers = {name: getattr(self, f'{name}_data')[::step, ::step]
+                      for name in ('dem', 'slope', 'aspect', 'hillshade')}
+        else:
+            pyramid = self._get_pyramid(lod_method)
+            level = pick_level(pyramid['dem'], max_vertices)
+            step = 2 ** level
+            layers = {name: levels[level] for name, levels in pyramid.items()}
+            print(f"🔍 LOD seviyesi {level}: {layers['dem'].shape} ({layers['dem'].size} köşe)")
+        height, width = layers['dem'].shape
+        return layers, np.arange(width) * step, np.arange(height) * step
+    
+    def create_ultra_realistic_3d(self, sample_rate=None, quality='high', max_vertices=250_000, lod_method='mean',
+                                  export_mode='float32', gzip_output=False, auto_open=True, save_html=True):
         """Ultra gerçekçi 3D model oluştur"""
         print("🎨 Ultra gerçekçi 3D model oluşturuluyor...")
-        dem_sampled = self.dem_data[::sample_rate, ::sample_rate]
-        slope_sampled = self.slope_data[::sample_rate, ::sample_rate]
-        hillshade_sampled = self.hillshade_data[::sample_rate, ::sample_rate]
-        height, width = dem_sampled.shape
-        x = np.linspace(0, width-1, width)
-        y = np.linspace(0, height-1, height)
+        layers, x, y = self._sample_layers(sample_rate, max_vertices, lod_method)
+        dem_sampled = layers['dem']
+        slope_sampled = layers['slope']
+        hillshade_sampled = layers['hillshade']
         colors = self._generate_realistic_colors(dem_sampled, slope_sampled, hillshade_sampled)
         
         surface = go.Surface(
@@ -158,9 +391,10 @@ class AgriDagi3D:
             width=1400, height=900, margin=dict(l=0, r=0, t=50, b=0),
             paper_bgcolor='rgba(0,0,0,0.9)', plot_bgcolor='rgba(0,0,0,0.9)'
         )
-        filename = f'bolge_ultra_realistic_{quality}.html'
-        pyo.plot(fig, filename=filename, auto_open=True)
-        print(f"✅ Ultra gerçekçi model kaydedildi: {filename}")
+        if save_html:
+            filename = f'bolge_ultra_realistic_{quality}.html'
+            filename = write_html(fig, filename, export_mode, gzip_output, auto_open)
+            print(f"✅ Ultra gerçekçi model kaydedildi: {filename}")
         return fig
     
     def _generate_realistic_colors(self, dem, slope, hillshade):
@@ -180,20 +414,21 @@ class AgriDagi3D:
         [1.0,  '#ffffff']   # Zirve, kar (Tam Beyaz)
     ]
     
-    def create_professional_analysis(self, sample_rate=4):
+    def create_professional_analysis(self, sample_rate=None, max_vertices=250_000, lod_method='mean',
+                                     export_mode='float32', gzip_output=False, auto_open=True, save_html=True):
         print("📊 Profesyonel analiz dashboard'u oluşturuluyor...")
-        dem_sampled = self.dem_data[::sample_rate, ::sample_rate]
-        slope_sampled = self.slope_data[::sample_rate, ::sample_rate]
-        aspect_sampled = self.aspect_data[::sample_rate, ::sample_rate]
-        hillshade_sampled = self.hillshade_data[::sample_rate, ::sample_rate]
-        height, width = dem_sampled.shape
-        x, y = np.linspace(0, width-1, width), np.linspace(0, height-1, height)
+        # Dört alt grafik aynı yüzeyi çizdiği için bütçe panel başına bölünür
+        layers, x, y = self._sample_layers(sample_rate, max_vertices // 4, lod_method)
+        dem_sampled = layers['dem']
+        slope_sampled = layers['slope']
+        aspect_sampled = layers['aspect']
+        hillshade_sampled = layers['hillshade']
         
         fig = make_subplots(rows=2, cols=2, subplot_titles=['3D Topografik Model', 'Eğim Analizi (3D)', 'Bakı Analizi (3D)', 'Gölgeleme Analizi (3D)'],
                             specs=[[{'type': 'scene'}, {'type': 'scene'}], [{'type': 'scene'}, {'type': 'scene'}]],
                             vertical_spacing=0.08, horizontal_spacing=0.05)
         
-        fig.add_trace(go.Surface(z=dem_sampled, x=x, y=y, colorscale='terrain', showscale=False, name='Topografya'), row=1, col=1)
+        fig.add_trace(go.Surface(z=dem_sampled, x=x, y=y, colorscale='earth', showscale=False, name='Topografya'), row=1, col=1)
         fig.add_trace(go.Surface(z=dem_sampled, x=x, y=y, surfacecolor=slope_sampled, colorscale='Reds', showscale=True, colorbar=dict(x=0.48, len=0.4, title='Eğim (°)')), row=1, col=2)
         fig.add_trace(go.Surface(z=dem_sampled, x=x, y=y, surfacecolor=aspect_sampled, colorscale='HSV', showscale=True, colorbar=dict(x=0.02, len=0.4, title='Bakı (°)')), row=2, col=1)
         fig.add_trace(go.Surface(z=dem_sampled, x=x, y=y, surfacecolor=hillshade_sampled, colorscale='gray', showscale=True, colorbar=dict(x=1.02, len=0.4, title='Gölgeleme')), row=2, col=2)
@@ -206,25 +441,51 @@ class AgriDagi3D:
             scene_name = f'scene{i if i > 1 else ""}'
             fig.update_layout(**{scene_name: dict(camera=camera_settings, aspectratio=dict(x=1, y=1, z=0.3), aspectmode='manual')})
         
-        filename = 'bolge_profesyonel_analiz.html'
-        pyo.plot(fig, filename=filename, auto_open=True)
-        print(f"✅ Profesyonel analiz kaydedildi: {filename}")
+        if save_html:
+            filename = 'bolge_profesyonel_analiz.html'
+            filename = write_html(fig, filename, export_mode, gzip_output, auto_open)
+            print(f"✅ Profesyonel analiz kaydedildi: {filename}")
         return fig
     
-    def create_cinematic_flythrough(self, sample_rate=5, duration=20):
-        print("🎬 Sinematik uçuş animasyonu oluşturuluyor...")
-        dem_sampled = self.dem_data[::sample_rate, ::sample_rate]
-        colors = self._generate_realistic_colors(
-            dem_sampled, self.slope_data[::sample_rate, ::sample_rate], self.hillshade_data[::sample_rate, ::sample_rate])
-        height, width = dem_sampled.shape
-        x, y = np.linspace(0, width-1, width), np.linspace(0, height-1, height)
-        n_frames = duration * 2
-        frames = []
+    def _flythrough_eyes(self, n_frames):
+        """Sinematik uçuş için spiral kamera göz konumları (Plotly sahne birimleri)"""
+        eyes = []
         for i in range(n_frames):
             t = i / n_frames
             angle, radius, height_factor = t * 4 * np.pi, 3 - 1.5 * t, 2 - 1.5 * t
-            eye_x, eye_y, eye_z = radius * np.cos(angle), radius * np.sin(angle), height_factor
-            frames.append(go.Frame(layout=dict(scene=dict(camera=dict(eye=dict(x=eye_x, y=eye_y, z=eye_z), center=dict(x=0, y=0, z=0.3)))), name=f'frame_{i}'))
+            eyes.append((radius * np.cos(angle), radius * np.sin(angle), height_factor))
+        return eyes
+    
+    def create_cinematic_flythrough(self, sample_rate=None, duration=20, max_vertices=250_000, lod_method='mean',
+                                    export_mode='float32', gzip_output=False, auto_open=True, camera_mode='smooth',
+                                    save_html=True):
+        """Sinematik uçuş animasyonu.
+
+        camera_mode='smooth': yüzey bir kez çizilir, kamera anahtar konumlar arasında
+        tarayıcıda requestAnimationFrame ile yumuşak enterpole edilir (yeniden üçgenleme yok).
+        camera_mode='frames': eski yöntem, her kare için redraw ile Plotly animasyonu.
+        """
+        print("🎬 Sinematik uçuş animasyonu oluşturuluyor...")
+        if camera_mode not in ('smooth', 'frames'):
+            raise ValueError(f"Geçersiz camera_mode: {camera_mode!r} (seçenekler: smooth, frames)")
+        layers, x, y = self._sample_layers(sample_rate, max_vertices, lod_method)
+        dem_sampled = layers['dem']
+        colors = self._generate_realistic_colors(dem_sampled, layers['slope'], layers['hillshade'])
+        center = dict(x=0, y=0, z=0.3)
+        eyes = self._flythrough_eyes(duration * 2)
+        
+        play_label, pause_label = '🎬 Filmi Başlat', '⏸️ Duraklat'
+        frames, post_script = [], None
+        if camera_mode == 'frames':
+            for i, (eye_x, eye_y, eye_z) in enumerate(eyes):
+                frames.append(go.Frame(layout=dict(scene=dict(camera=dict(eye=dict(x=eye_x, y=eye_y, z=eye_z), center=center))), name=f'frame_{i}'))
+            buttons = [{'label': play_label, 'method': 'animate', 'args': [None, {'frame': {'duration': 500, 'redraw': True}, 'fromcurrent': True, 'transition': {'duration': 100}}]},
+                       {'label': pause_label, 'method': 'animate', 'args': [[None], {'frame': {'duration': 0}}]}]
+        else:
+            # Düğmeler yalnızca olay üretir; kamera yolunu gömülü JS yürütür
+            buttons = [{'label': play_label, 'method': 'skip', 'args': [None]},
+                       {'label': pause_label, 'method': 'skip', 'args': [None]}]
+            post_script = camera_path_script(eyes, center, duration * 1000, play_label)
         
         fig = go.Figure(
             data=[go.Surface(z=dem_sampled, x=x, y=y, surfacecolor=colors, colorscale=self._create_topographic_colorscale(), showscale=True,
@@ -233,46 +494,98 @@ class AgriDagi3D:
             frames=frames)
         
         fig.update_layout(
-            title='🎬 Sinematik Uçuş', scene=dict(aspectratio=dict(x=1, y=1, z=0.3), aspectmode='manual', bgcolor='rgba(0,0,0,0.9)'),
-            updatemenus=[{'type': 'buttons', 'showactive': False, 'y': 0.9, 'x': 0.1,
-                          'buttons': [{'label': '🎬 Filmi Başlat', 'method': 'animate', 'args': [None, {'frame': {'duration': 500, 'redraw': True}, 'fromcurrent': True, 'transition': {'duration': 100}}]},
-                                      {'label': '⏸️ Duraklat', 'method': 'animate', 'args': [[None], {'frame': {'duration': 0}}]}]}],
+            title='🎬 Sinematik Uçuş', scene=dict(aspectratio=dict(x=1, y=1, z=0.3), aspectmode='manual', bgcolor='rgba(0,0,0,0.9)',
+                                                 camera=dict(eye=dict(zip('xyz', eyes[0])), center=center)),
+            updatemenus=[{'type': 'buttons', 'showactive': False, 'y': 0.9, 'x': 0.1, 'buttons': buttons}],
             width=1400, height=900, paper_bgcolor='black')
         
-        filename = 'bolge_cinematic.html'
-        pyo.plot(fig, filename=filename, auto_open=True)
-        print(f"✅ Sinematik animasyon kaydedildi: {filename}")
+        if save_html:
+            filename = 'bolge_cinematic.html'
+            filename = write_html(fig, filename, export_mode, gzip_output, auto_open, post_script=post_script)
+            print(f"✅ Sinematik animasyon kaydedildi: {filename}")
         return fig
     
-    def generate_report(self):
-        """Analiz raporu oluştur"""
+    def generate_report(self, zones_path=None, classes=None, percentiles=DEFAULT_PERCENTILES,
+                        json_path=None, csv_path=None, block_rows=1024):
+        """Analiz raporu oluştur.
+
+        İstatistikler blok bazlı tek geçişte hesaplanır; karo modunda DEM ve
+        türetilmiş GeoTIFF'ler pencere pencere okunur. ``zones_path`` verilirse
+        (DEM ile aynı boyutta bölge rasterı) bölge başına tablolar da üretilir.
+        Rapor sözlüğü döndürülür, istenirse JSON/CSV olarak da yazılır.
+        """
+        if self.tiled:
+            layers = {'dem': self.dem_path, **self.derived_paths}
+        else:
+            layers = {'dem': self.dem_data, 'slope': self.slope_data,
+                      'aspect': self.aspect_data, 'hillshade': self.hillshade_data}
+        report = terrain_statistics(layers, zones=zones_path, classes=classes,
+                                    percentiles=percentiles, block_rows=block_rows)
+        dem_stats = report['layers']['dem']
+        slope_stats = report['layers']['slope']
+        
         print("\n" + "="*60)
         print("📊 3D ARAZİ ANALİZ RAPORU")
         print("="*60)
         
-        print(f"🗻 Veri Boyutu: {self.dem_data.shape}")
-        print(f"📏 Min Yükseklik: {np.nanmin(self.dem_data):.2f} m")
-        print(f"📏 Max Yükseklik: {np.nanmax(self.dem_data):.2f} m")
-        print(f"📏 Ortalama Yükseklik: {np.nanmean(self.dem_data):.2f} m")
-        print(f"📐 Ortalama Eğim: {np.nanmean(self.slope_data):.2f}°")
-        print(f"📐 Max Eğim: {np.nanmax(self.slope_data):.2f}°")
-        
-        slope_classes = {
-            'Düz (0-5°)': np.sum((self.slope_data >= 0) & (self.slope_data < 5)),
-            'Hafif (5-15°)': np.sum((self.slope_data >= 5) & (self.slope_data < 15)),
-            'Orta (15-30°)': np.sum((self.slope_data >= 15) & (self.slope_data < 30)),
-            'Dik (30-45°)': np.sum((self.slope_data >= 30) & (self.slope_data < 45)),
-            'Çok Dik (>45°)': np.sum(self.slope_data >= 45)
-        }
-        total_pixels = np.sum(~np.isnan(self.slope_data))
+        print(f"🗻 Veri Boyutu: {tuple(report['shape'])}")
+        print(f"📏 Min Yükseklik: {dem_stats['min']:.2f} m")
+        print(f"📏 Max Yükseklik: {dem_stats['max']:.2f} m")
+        print(f"📏 Ortalama Yükseklik: {dem_stats['mean']:.2f} m (σ {dem_stats['std']:.2f} m)")
+        if 'percentiles' in dem_stats:
+            print("📏 Yükseklik Yüzdelikleri: " +
+                  ", ".join(f"{name} {value:.0f} m" for name, value in dem_stats['percentiles'].items()))
+        print(f"📐 Ortalama Eğim: {slope_stats['mean']:.2f}° (σ {slope_stats['std']:.2f}°)")
+        print(f"📐 Max Eğim: {slope_stats['max']:.2f}°")
+        
+        titles = {'dem': '🏔️ YÜKSEKLİK SINIFLANDIRMASI', 'slope': '🎯 EĞİM SINIFLANDIRMASI',
+                  'aspect': '🧭 BAKI DAĞILIMI', 'hillshade': '🌗 GÖLGELEME SINIFLANDIRMASI'}
+        for name, stats in report['layers'].items():
+            if 'classes' not in stats:
+                continue
+            print(f"\n{titles.get(name, name.upper())}:")
+            for class_name, entry in stats['classes'].items():
+                print(f"  - {class_name:<20}: {entry['percent']:>7.2f} %")
         
-        print("\n🎯 EĞİM SINIFLANDIRMASI:")
-        for class_name, count in slope_classes.items():
-            percentage = (count / total_pixels) * 100
-            # --- EKSİK KISIM TAMAMLANDI ---
-            print(f"  - {class_name:<20}: {percentage:>7.2f} %")
+        if 'zones' in report:
+            print("\n🗂️ BÖLGE İSTATİSTİKLERİ:")
+            print(f"  {'Bölge':<10}{'Piksel':>10}{'Ort. Yük. (m)':>15}{'Ort. Eğim (°)':>15}{'Max Eğim (°)':>14}")
+            for zone, zone_dem in report['zones']['dem'].items():
+                zone_slope = report['zones']['slope'].get(zone, {})
+                print(f"  {zone:<10}{zone_dem['count']:>10}{zone_dem['mean']:>15.1f}"
+                      f"{zone_slope.get('mean', np.nan):>15.2f}{zone_slope.get('max', np.nan):>14.2f}")
+        
+        if json_path:
+            write_json(report, json_path)
+            print(f"\n💾 JSON rapor: {json_path}")
+        if csv_path:
+            write_csv(report, csv_path)
+            print(f"💾 CSV rapor: {csv_path}")
             
         print("="*60)
+        return report
+    
+    def create_fire_hazard_map(self, fuel_path=None, vegetation_path=None, output_dir='yangin_tehlikesi',
+                               weights=None, reference='slope', aspect_convention='agridagi', block_rows=512):
+        """Eğim, bakı, pürüzlülük ve yakıt/bitki rasterlarından yangın tehlike haritası.
+
+        Hesap yangin_tehlikesi.fire_hazard_map ile blok bazlı yapılır; karo
+        modunda türetilmiş GeoTIFF'ler, aksi halde bellekteki diziler okunur.
+        Farklı ızgaradaki katmanlar (ör. 10 m yakıt rasterı) ``reference``
+        katmanının ızgarasına yeniden örneklenir. Sonuç sözlüğü döndürülür.
+        """
+        layers = terrain_layers(self)
+        layers.update(fuel=fuel_path, vegetation=vegetation_path)
+        result = fire_hazard_map(layers, output_dir, weights=weights, reference=reference,
+                                 aspect_convention=aspect_convention, block_rows=block_rows)
+        
+        print("\n" + "="*60)
+        print("🔥 YANGIN TEHLİKE HARİTASI")
+        print("="*60)
+        print_hazard(result)
+        print(f"💾 {result['hazard_path']}, {result['class_path']} ({result['seconds']:.1f} s)")
+        print("="*60)
+        return result
 
 
 # --- KODU ÇALIŞTIRMAK İÇİN ANA BLOK ---
@@ -286,20 +599,36 @@ if __name__ == '__main__':
         print(f"HATA: '{dem_dosyasi}' dosyası bulunamadı. Lütfen dosya adını kontrol edin.")
     else:
         # Analiz sınıfından bir nesne oluştur
+        # RAM'e sığmayan büyük DEM'ler için karo modu (sonuçlar GeoTIFF olarak diske yazılır):
+        # AgriDagi3D(dem_path=dem_dosyasi, tiled=True, tile_size=1024, output_dir='turetilmis')
+        # Aynı DEM tekrar tekrar işleniyorsa türetilmiş katmanları önbellekte tutun:
+        # AgriDagi3D(dem_path=dem_dosyasi, cache_dir='.arazi_onbellek')
         arazi_analizi = AgriDagi3D(dem_path=dem_dosyasi)
 
         # İstatistiksel raporu konsola yazdır
+        # Makine tarafından okunabilir çıktı ve bölge tabloları için:
+        # arazi_analizi.generate_report(zones_path='bolgeler.tif', json_path='rapor.json', csv_path='rapor.csv')
         arazi_analizi.generate_report()
 
         # Çalıştırmak istediğiniz analiz fonksiyonunu seçin.
         # Aynı anda birden fazlasını çalıştırmak sisteminizi yorabilir.
         # İstediğinizin başındaki '#' işaretini kaldırarak çalıştırabilirsiniz.
         
+        # Çözünürlük, köşe bütçesine (max_vertices) göre LOD piramidinden otomatik seçilir.
+        # Eski adımlı seyreltme için sample_rate=... verilebilir.
+        # Varsayılan export_mode='float32': yüzey ızgaraları ikili gömülür ve panolarda
+        # ortak z ızgarası bir kez yazılır; plotly.js çıktının yanına plotly.min.js olarak
+        # bir kez yazılır. Daha küçük dosya için export_mode='uint16' ve gzip_output=True,
+        # tek parça (plotly.js gömülü, ızgara kopyalı) eski çıktı için export_mode='inline'.
+        
         # 1. Ultra Gerçekçi 3D Model
-        arazi_analizi.create_ultra_realistic_3d(sample_rate=2)
+        arazi_analizi.create_ultra_realistic_3d(max_vertices=250_000)
         
         # 2. Profesyonel Analiz Paneli
-        # arazi_analizi.create_professional_analysis(sample_rate=4)
+        # arazi_analizi.create_professional_analysis(max_vertices=250_000)
 
         # 3. Sinematik Uçuş Animasyonu
-        # arazi_analizi.create_cinematic_flythrough(sample_rate=4, duration=15)
+        # arazi_analizi.create_cinematic_flythrough(max_vertices=150_000, duration=15)
+
+        # 4. Yangın Tehlike Haritası (pürüzlülük için AgriDagi3D(..., roughness_path=...) verin)
+        # arazi_analizi.create_fire_hazard_map(fuel_path='yakit_yuku/yakit_yuku.tif', vegetation_path='ndvi.tif')
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+3D HTML çıktıları için kompakt ikili dışa aktarım.
+
+pyo.plot() plotly.js'i ve tüm z/surfacecolor değerlerini HTML içine gömer.
+Bu modül yüzey ızgaralarını base64 tipli diziler olarak saklar:
+  'float32' - 4 bayt/değer
+  'uint16'  - ölçek/ofset ile nicemlenmiş 2 bayt/değer (65535 = NaN)
+Aynı içerikli diziler (ör. panolardaki ortak z ızgarası) bir kez yazılır ve
+tarayıcıda tek bir dizi olarak paylaşılır. plotly.js HTML'e gömülmez;
+çıktının yanındaki yerel plotly.min.js dosyasına bağlanır (bir kez yazılır).
+İstenirse çıktı gzip ile sıkıştırılır (.html.gz). 'inline' kipi plotly'nin
+standart tek parça çıktısıdır: plotly.js gömülür, ortak diziler paylaşılmaz.
+
+Sinematik uçuşun kamera yolu genel Plotly.relayout API'siyle sürülür; ölçülen
+kare hızı grafik div'inin data-fps özniteliğine ve konsola yazılır (adres
+'#oynat' ile açılırsa uçuş kendiliğinden başlar).
+
+Kıyaslama:  python arazi_aktarim.py agri_dagi_DEM.tif
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import webbrowser
+
+import numpy as np
+import plotly.offline as pyo
+from plotly.utils import PlotlyJSONEncoder
+
+EXPORT_MODES = ('inline', 'float32', 'uint16')
+
+# Tipli diziye çevrilecek iz (trace) alanları; yalnızca z/surfacecolor nicemlenir
+ARRAY_KEYS = ('x', 'y', 'z', 'surfacecolor')
+QUANTIZED_KEYS = ('z', 'surfacecolor')
+UINT16_NODATA = 65535
+
+PLOTLY_JS_NAME = 'plotly.min.js'
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{plotly_js}"></script>
+</head>
+<body style="margin:0">
+<div id="grafik"></div>
+<script type="application/json" id="veri">{payload}</script>
+<script>
+{decoder}
+var fig = decodeFigure(JSON.parse(document.getElementById('veri').textContent));
+Plotly.newPlot('grafik', fig.data, fig.layout, fig.config || {{}}).then(function () {{
+  if (fig.frames) {{ Plotly.addFrames('grafik', fig.frames); }}
+{post_script}
+}});
+</script>
+</body>
+</html>
+"""
+
+# Tipli dizi çözücü: {"__typed__": {dtype, bdata, shape, scale, offset}} -> Float32Array satırları.
+# {"__ref__": i} ortak tablodaki (__shared__) aynı diziyi gösterir.
+DECODER_JS = """
+function decodeTyped(spec) {
+  var binary = atob(spec.bdata), bytes = new Uint8Array(binary.length);
+  for (var i = 0; i < binary.length; i++) { bytes[i] = binary.charCodeAt(i); }
+  var values;
+  if (spec.dtype === 'u2') {
+    var q = new Uint16Array(bytes.buffer);
+    values = new Float32Array(q.length);
+    for (var j = 0; j < q.length; j++) {
+      values[j] = q[j] === 65535 ? NaN : q[j] * spec.scale + spec.offset;
+    }
+  } else {
+    values = new Float32Array(bytes.buffer);
+  }
+  if (spec.shape.length < 2) { return values; }
+  var rows = new Array(spec.shape[0]), width = spec.shape[1];
+  for (var r = 0; r < rows.length; r++) { rows[r] = values.subarray(r * width, (r + 1) * width); }
+  return rows;
+}
+function decodeFigure(node, shared) {
+  if (shared === undefined) {
+    shared = (node.__shared__ || []).map(function (item) { return decodeTyped(item.__typed__); });
+    delete node.__shared__;
+  }
+  if (Array.isArray(node)) { return node.map(function (item) { return decodeFigure(item, shared); }); }
+  if (node && typeof node === 'object') {
+    if (node.__typed__) { return decodeTyped(node.__typed__); }
+    if (node.__ref__ !== undefined) { return shared[node.__ref__]; }
+    for (var key in node) { node[key] = decodeFigure(node[key], shared); }
+  }
+  return node;
+}
+"""
+
+
+def _to_array(value):
+    """Plotly alan değerini (ndarray, liste ya da plotly>=6 bdata sözlüğü) sayısal diziye çevir"""
+    if isinstance(value, dict) and 'bdata' in value:
+        array = np.frombuffer(base64.b64decode(value['bdata']), dtype=np.dtype(value['dtype']))
+        shape = value.get('shape')
+        if shape:
+            array = array.reshape([int(n) for n in str(shape).split(',')])
+        return array
+    try:
+        array = np.asarray(value, dtype=float)
+    except (TypeError, ValueError):
+        return None
+    return array if array.ndim in (1, 2) else None
+
+
+def encode_array(array, dtype='float32'):
+    """Diziyi base64 tipli dizi tanımına çevir"""
+    array = np.asarray(array, dtype=np.float32)
+    spec = {'shape': list(array.shape)}
+    if dtype == 'uint16':
+        finite = np.isfinite(array)
+        offset = float(array[finite].min()) if finite.any() else 0.0
+        span = float(array[finite].max()) - offset if finite.any() else 0.0
+        scale = span / (UINT16_NODATA - 1) if span > 0 else 1.0
+        quantized = np.full(array.shape, UINT16_NODATA, dtype='<u2')
+        quantized[finite] = np.round((array[finite] - offset) / scale)
+        spec.update(dtype='u2', scale=scale, offset=offset, bdata=base64.b64encode(quantized.tobytes()).decode())
+    else:
+        spec.update(dtype='f4', bdata=base64.b64encode(array.astype('<f4').tobytes()).decode())
+    return {'__typed__': spec}
+
+
+def compact_figure_dict(fig, mode='float32'):
+    """Şekil sözlüğündeki yüzey ızgaralarını tipli dizilere çevir.
+
+    Aynı içerikli diziler ``__shared__`` tablosuna bir kez yazılır; izler ve
+    kareler (frames) bu tabloya ``{"__ref__": i}`` ile başvurur.
+    """
+    figure = fig.to_dict()
+    traces = list(figure.get('data', []))
+    for frame in figure.get('frames', []):
+        traces.extend(frame.get('data', []))
+
+    shared, index = [], {}
+    for trace in traces:
+        for key in ARRAY_KEYS:
+            if key not in trace:
+                continue
+            array = _to_array(trace[key])
+            if array is None or array.dtype.kind not in 'fiu':
+                continue
+            dtype = mode if key in QUANTIZED_KEYS else 'float32'
+            array = np.ascontiguousarray(array, dtype=np.float32)
+            digest = (dtype, array.shape, hashlib.blake2b(array.tobytes(), digest_size=16).hexdigest())
+            if digest not in index:
+                index[digest] = len(shared)
+                shared.append(encode_array(array, dtype))
+            trace[key] = {'__ref__': index[digest]}
+    figure['__shared__'] = shared
+    return figure
+
+
+CAMERA_PATH_JS = """
+(function () {
+  var gd = document.getElementById('{plot_id}');
+  var keys = %(keys)s, center = %(center)s, duration = %(duration)d;
+  var playLabel = %(play_label)s;
+  // Catmull-Rom ile anahtar kameralar arasında yumuşak geçiş
+  function spline(p0, p1, p2, p3, t) {
+    var t2 = t * t, t3 = t2 * t;
+    return 0.5 * (2 * p1 + (p2 - p0) * t + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2 + (3 * p1 - p0 - 3 * p2 + p3) * t3);
+  }
+  function eyeAt(u) {
+    var n = keys.length - 1, s = Math.min(u * n, n - 1e-9), i = Math.floor(s), t = s - i;
+    var a = keys[Math.max(i - 1, 0)], b = keys[i], c = keys[i + 1], d = keys[Math.min(i + 2, n)];
+    return {x: spline(a[0], b[0], c[0], d[0], t), y: spline(a[1], b[1], c[1], d[1], t),
+            z: spline(a[2], b[2], c[2], d[2], t)};
+  }
+  // Genel API: 'scene.camera' düzenlemesi yalnızca kamerayı günceller, yüzey yeniden
+  // üçgenlenmez. Önceki relayout bitmeden yenisi kuyruğa eklenmez (kare atlanır).
+  var pending = false, frames = 0;
+  function setCamera(camera) {
+    if (pending) { return; }
+    pending = true;
+    Plotly.relayout(gd, {'scene.camera': camera}).then(function () { pending = false; frames++; },
+                                                       function () { pending = false; });
+  }
+  function finish() {
+    // Ölçülen kare hızı: kıyaslama betikleri data-fps özniteliğini ya da konsolu okur
+    var fps = frames * 1000 / Math.max(elapsed, 1);
+    gd.setAttribute('data-fps', fps.toFixed(1));
+    console.log('kamera_fps=' + fps.toFixed(1));
+    playing = false; start = null; elapsed = 0; frames = 0;
+  }
+  var playing = false, start = null, elapsed = 0;
+  function step(ts) {
+    if (!playing) { return; }
+    if (start === null) { start = ts - elapsed; }
+    elapsed = ts - start;
+    if (elapsed >= duration) { finish(); return; }
+    setCamera({eye: eyeAt(elapsed / duration), center: center, up: {x: 0, y: 0, z: 1}});
+    requestAnimationFrame(step);
+  }
+  // Adres '#oynat' ile biterse uçuş kendiliğinden başlar (kiosk ekranları, kare hızı ölçümü)
+  if (window.location.hash === '#oynat') { playing = true; requestAnimationFrame(step); }
+  gd.on('plotly_buttonclicked', function (event) {
+    if (event.button.label === playLabel) {
+      if (!playing) { playing = true; start = null; requestAnimationFrame(step); }
+    } else {
+      playing = false; start = null;
+    }
+  });
+})();
+"""
+
+
+def camera_path_script(keyframes, center, duration_ms, play_label):
+    """Anahtar göz konumları arasında requestAnimationFrame ile kamera yolu JS'i üret.
+
+    Kare hızı tarayıcının yenileme hızına bağlıdır; her adımda yalnızca kamera
+    matrisi değişir.
+    """
+    return CAMERA_PATH_JS % {
+        'keys': json.dumps([[round(float(v), 4) for v in key] for key in keyframes]),
+        'center': json.dumps(center), 'duration': int(duration_ms),
+        'play_label': json.dumps(play_label)}
+
+
+def _ensure_plotly_js(output_dir):
+    """plotly.js'i çıktı dizinine bir kez yaz ve göreli yolunu döndür"""
+    path = os.path.join(output_dir, PLOTLY_JS_NAME)
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(pyo.get_plotlyjs())
+    return PLOTLY_JS_NAME
+
+
+def write_html(fig, filename, mode='inline', gzip_output=False, auto_open=True, post_script=None):
+    """Şekli HTML olarak kaydet ve yazılan dosya yolunu döndür.
+
+    ``post_script`` grafik çizildikten sonra çalışacak JS'dir; ``{plot_id}``
+    yer tutucusu grafik div'inin kimliğiyle değiştirilir. gzip_output ile
+    auto_open birlikte verilirse .gz'nin yanına açılabilen düz HTML de yazılır.
+    """
+    if mode not in EXPORT_MODES:
+        raise ValueError(f"Geçersiz dışa aktarım kipi: {mode!r} (seçenekler: {', '.join(EXPORT_MODES)})")
+
+    if mode == 'inline' and not gzip_output:
+        if post_script is None:
+            pyo.plot(fig, filename=filename, auto_open=auto_open)
+        else:
+            fig.write_html(filename, include_plotlyjs=True, post_script=post_script, auto_open=auto_open)
+        return filename
+
+    output_dir = os.path.dirname(os.path.abspath(filename))
+    if mode == 'inline':
+        html = fig.to_html(include_plotlyjs='directory', full_html=True, post_script=post_script)
+    else:
+        # PlotlyJSONEncoder numpy skalerlerini sayı olarak yazar, NaN/inf'i null yapar
+        # (ör. tamamen NaN bir DEM'de renk çubuğunun dtick değeri)
+        payload = json.dumps(compact_figure_dict(fig, mode), cls=PlotlyJSONEncoder,
+                             separators=(',', ':')).replace('</', '<\\/')
+        html = HTML_TEMPLATE.format(title=os.path.basename(filename), plotly_js=PLOTLY_JS_NAME,
+                                    payload=payload, decoder=DECODER_JS,
+                                    post_script=(post_script or '').replace('{plot_id}', 'grafik'))
+    _ensure_plotly_js(output_dir)
+
+    if not gzip_output or auto_open:
+        # Tarayıcılar file:// üzerinden .html.gz açamaz: auto_open için düz HTML de yazılır
+        with open(filename, 'w', encoding='utf-8') as handle:
+            handle.write(html)
+        if auto_open:
+            if gzip_output:
+                print(f"ℹ️ .html.gz yerel olarak açılamadığı için önizleme düz HTML'den açılıyor: {filename}")
+            webbrowser.open('file://' + os.path.abspath(filename))
+    if gzip_output:
+        filename = f'{filename}.gz'
+        with gzip.open(filename, 'wt', encoding='utf-8', compresslevel=6) as handle:
+            handle.write(html)
+    return filename
+
+
+def _node_parse_time(html_path, repeats=5):
+    """Gömülü şekil verisinin node ile ayrıştırma (+ çözme) süresini ölç (ms)"""
+    node = shutil.which('node')
+    if node is None:
+        return None
+    script = r"""
+const fs = require('fs'), zlib = require('zlib');
+let html = fs.readFileSync(process.argv[1]);
+if (process.argv[1].endsWith('.gz')) html = zlib.gunzipSync(html);
+html = html.toString();
+global.atob = s => Buffer.from(s, 'base64').toString('latin1');
+let parse;
+const m = html.match(/<script type="application\/json" id="veri">([\s\S]*?)<\/script>/);
+if (m) {
+  eval(html.match(/function decodeTyped[\s\S]*?\n}\nfunction decodeFigure[\s\S]*?\n}\n/)[0]);
+  parse = () => decodeFigure(JSON.parse(m[1]));
+} else {
+  const call = html.match(/Plotly\.newPlot\(\s*"[^"]+",\s*([\s\S]*?)\)\s*};?\s*<\/script>/)[1];
+  parse = () => new Function('return [' + call + ']')();
+}
+const t0 = process.hrtime.bigint();
+for (let i = 0; i < %d; i++) parse();
+console.log(Number(process.hrtime.bigint() - t0) / 1e6 / %d);
+""" % (repeats, repeats)
+    result = subprocess.run([node, '-e', script, html_path], capture_output=True, text=True)
+    return float(result.stdout.strip()) if result.returncode == 0 else None
+
+
+def benchmark(dem_path):
+    """Üç render yöntemi için kip başına dosya boyutu ve ayrıştırma süresini raporla
+    (boyutlar plotly.js hariç; yerel plotly.min.js tek sefer yazılır)"""
+    from agri_dagi_3d_profesional import AgriDagi3D
+
+    analysis = AgriDagi3D(dem_path)
+    renders = {
+        'ultra_realistic': (analysis.create_ultra_realistic_3d, 'bolge_ultra_realistic_high.html'),
+        'professional': (analysis.create_professional_analysis, 'bolge_profesyonel_analiz.html'),
+        'cinematic': (analysis.create_cinematic_flythrough, 'bolge_cinematic.html'),
+    }
+    variants = [('inline', False), ('float32', False), ('uint16', False), ('uint16', True)]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            for name, (render, filename) in renders.items():
+                for mode, gz in variants:
+                    start = time.perf_counter()
+                    render(export_mode=mode, gzip_output=gz, auto_open=False)
+                    elapsed = time.perf_counter() - start
+                    path = filename + ('.gz' if gz else '')
+                    rows.append((name, mode + (' + gzip' if gz else ''), os.path.getsize(path) / 1e6,
+                                 elapsed, _node_parse_time(path)))
+                    os.remove(path)
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n{'Render':<17}{'Kip':<16}{'Boyut (MB)':>11}{'Yazma (s)':>11}{'Ayrıştırma (ms)':>17}")
+    for name, mode, size, elapsed, parse in rows:
+        parse_text = f'{parse:.1f}' if parse is not None else '-'
+        print(f"{name:<17}{mode:<16}{size:>11.2f}{elapsed:>11.2f}{parse_text:>17}")
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else 'agri_dagi_DEM.tif')
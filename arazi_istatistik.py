@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Blok bazlı (streaming) arazi istatistikleri motoru.
+
+Her katman satır blokları halinde bir kez okunur; min/max/ortalama/standart
+sapma, yüzdelikler ve sınıf histogramları aynı geçişte biriktirilir. Sınıflar
+np.digitize + np.bincount ile sayılır, bölge (zone) tabloları ise bölge
+kimliği ve sınıf indeksinin birleşik bincount'u ile çıkarılır. Katmanlar
+bellekteki diziler ya da raster yolları olabilir; raster'lar pencereli
+okunduğu için belleğe sığmayan DEM'ler de raporlanabilir.
+
+Yüzdelikler sabit çözünürlüklü (ör. yükseklik için 1 m) büyüyen bir
+histogramdan hesaplanır; hata en fazla bir kutu genişliğidir. Histogram
+katmanın geçerli değer aralığıyla (DEFAULT_RANGES) sınırlıdır: tanınmayan
+nodata (-32768, 1e38) ya da aykırı değerler kutulanmaz, alt/üst taşma olarak
+sayılır ve raporda 'out_of_range' altında görünür. Kutu sayısı yine de
+MAX_HISTOGRAM_BINS'i aşarsa komşu kutular birleştirilir (çözünürlük 2 katına
+çıkar, raporda 'percentile_resolution').
+
+Kıyaslama:  python arazi_istatistik.py agri_dagi_DEM.tif
+"""
+
+import csv
+import json
+import sys
+import time
+from contextlib import ExitStack
+
+import numpy as np
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+SLOPE_CLASSES = ([5, 15, 30, 45],
+                 ['Düz (0-5°)', 'Hafif (5-15°)', 'Orta (15-30°)', 'Dik (30-45°)', 'Çok Dik (>45°)'])
+# Kuzey iki uçta (0-22.5° ve 337.5-360°) yer aldığından aynı etiket iki kez geçer
+ASPECT_CLASSES = ([22.5, 67.5, 112.5, 157.5, 202.5, 247.5, 292.5, 337.5],
+                  ['K', 'KD', 'D', 'GD', 'G', 'GB', 'B', 'KB', 'K'])
+DEFAULT_CLASSES = {'slope': SLOPE_CLASSES, 'aspect': ASPECT_CLASSES}
+
+# Yüzdelik histogramlarının kutu genişliği (katman birimi cinsinden)
+DEFAULT_RESOLUTIONS = {'dem': 1.0, 'slope': 0.01, 'aspect': 0.1, 'hillshade': 1.0}
+# Yüzdelik histogramına giren değer aralıkları; yükseklik Mariana çukurundan Everest'e
+DEFAULT_RANGES = {'dem': (-11000.0, 9000.0), 'slope': (0.0, 90.0), 'aspect': (0.0, 360.0),
+                  'hillshade': (0.0, 255.0)}
+# Histogramın en fazla kutu sayısı (int64: 32 MB); aşılırsa kutular ikişer birleştirilir
+MAX_HISTOGRAM_BINS = 1 << 22
+
+
+def _edge_labels(edges):
+    """Sınır listesinden 'a-b' biçiminde sınıf etiketleri üret"""
+    bounds = ['-∞'] + [f'{edge:g}' for edge in edges] + ['∞']
+    return [f'{low}-{high}' for low, high in zip(bounds[:-1], bounds[1:])]
+
+
+class _Histogram:
+    """Değer aralığı önceden bilinmeyen, gerektikçe büyüyen sabit genişlikli histogram.
+
+    value_range dışındaki değerler kutulanmaz, alt/üst taşma sayacına eklenir;
+    kutu sayısı max_bins'i aşacaksa komşu kutular birleştirilir.
+    """
+
+    def __init__(self, resolution, value_range=None, max_bins=MAX_HISTOGRAM_BINS):
+        self.resolution = resolution
+        self.value_range = value_range
+        self.max_bins = max_bins
+        self.origin = None
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.below = self.above = 0
+
+    def _coarsen(self):
+        """Komşu kutu çiftlerini birleştir: kutu genişliği 2 katına çıkar"""
+        counts = np.pad(self.counts, (self.origin % 2, (self.origin + len(self.counts)) % 2))
+        self.counts = counts.reshape(-1, 2).sum(axis=1)
+        self.origin //= 2
+        self.resolution *= 2
+
+    def update(self, values, value_min, value_max):
+        if values.size == 0:
+            return
+        if self.value_range is not None and (value_min < self.value_range[0] or value_max > self.value_range[1]):
+            below, above = values < self.value_range[0], values > self.value_range[1]
+            self.below += int(np.count_nonzero(below))
+            self.above += int(np.count_nonzero(above))
+            values = values[~(below | above)]
+            if values.size == 0:
+                return
+            value_min, value_max = values.min(), values.max()
+        while True:
+            scale = 1 / self.resolution
+            low, high = int(np.floor(value_min * scale)), int(np.floor(value_max * scale))
+            if self.origin is None:
+                self.origin = low
+            top = self.origin + len(self.counts) - 1
+            if max(high, top) - min(low, self.origin) < self.max_bins:
+                break
+            self._coarsen()
+        if low < self.origin or high > top:
+            self.counts = np.pad(self.counts, (max(0, self.origin - low), max(0, high - top)))
+            self.origin = min(low, self.origin)
+        # Başlangıç kutusu çıkarıldıktan sonra değerler negatif olmadığından
+        # tamsayıya kesme (truncation) floor ile aynıdır
+        scaled = values * scale
+        scaled -= self.origin
+        self.counts += np.bincount(scaled.astype(np.intp), minlength=len(self.counts))
+
+    def percentiles(self, percentiles):
+        """Kutu içinde doğrusal interpolasyonla yüzdelik değerleri.
+
+        Taşmaya düşen yüzdelikler aralık sınırına kırpılır (alt taşma -> alt sınır).
+        """
+        if self.origin is None:
+            if self.below or self.above:
+                low, high = self.value_range
+                total = self.below + self.above
+                return [low if q / 100 * total <= self.below else high for q in percentiles]
+            return [float('nan')] * len(percentiles)
+        cumulative = np.cumsum(self.counts)
+        total = self.below + cumulative[-1] + self.above
+        targets = np.asarray(percentiles, dtype=float) / 100 * total - self.below
+        inside = np.clip(targets, 0, cumulative[-1])
+        index = np.minimum(np.searchsorted(cumulative, inside, side='left'), len(self.counts) - 1)
+        before = cumulative[index] - self.counts[index]
+        fraction = (inside - before) / np.maximum(self.counts[index], 1)
+        values = (self.origin + index + fraction) * self.resolution
+        if self.value_range is not None:
+            values = np.where(targets < 0, self.value_range[0], values)
+            values = np.where(targets > cumulative[-1], self.value_range[1], values)
+        return values.tolist()
+
+
+class LayerStatistics:
+    """Tek bir katman için blok blok güncellenen genel ve bölgesel istatistikler.
+
+    Varyans sayısal kararlılık için ilk değere göre kaydırılmış toplamlarla
+    biriktirilir (shifted sums).
+    """
+
+    def __init__(self, name, edges=None, labels=None, resolution=0.01, value_range=None):
+        self.name = name
+        self.edges = None if edges is None else np.asarray(edges, dtype=float)
+        self.labels = list(labels) if labels is not None else (_edge_labels(edges) if edges is not None else [])
+        if self.edges is not None and len(self.labels) != len(self.edges) + 1:
+            raise ValueError(f"{name}: {len(self.edges)} sınır için {len(self.edges) + 1} etiket gerekli")
+        self.n_classes = len(self.labels)
+        self.shift = None
+        # [sayı, toplam, kareler toplamı, min, max]
+        self.moments = np.array([0.0, 0.0, 0.0, np.inf, -np.inf])
+        self.class_counts = np.zeros(self.n_classes, dtype=np.int64)
+        # resolution=None: yüzdelik histogramı tutulmaz
+        self.resolution = resolution
+        self.histogram = _Histogram(resolution, value_range) if resolution else None
+        self.zones = {}
+
+    def update(self, values, zones=None, zone_valid=None):
+        """Bir bloğun geçerli (sonlu) değerlerini biriktir"""
+        valid = np.isfinite(values).reshape(-1)
+        values = values.reshape(-1)
+        if valid.all():
+            # Boşluksuz blokta maske kopyası gereksiz
+            valid = slice(None)
+        values = values[valid].astype(np.float64, copy=False)
+        if values.size == 0:
+            return
+        if self.shift is None:
+            self.shift = float(values[0])
+        shifted = values - self.shift
+        value_min, value_max = values.min(), values.max()
+
+        self.moments[0] += values.size
+        self.moments[1] += shifted.sum()
+        self.moments[2] += np.dot(shifted, shifted)
+        self.moments[3] = min(self.moments[3], value_min)
+        self.moments[4] = max(self.moments[4], value_max)
+        if self.histogram is not None:
+            self.histogram.update(values, value_min, value_max)
+
+        classes = None
+        if self.n_classes:
+            classes = np.digitize(values, self.edges)
+            self.class_counts += np.bincount(classes, minlength=self.n_classes)
+
+        if zones is not None:
+            in_zone = zone_valid.reshape(-1)[valid] if zone_valid is not None else slice(None)
+            self._update_zones(zones.reshape(-1)[valid][in_zone], values[in_zone], shifted[in_zone],
+                               None if classes is None else classes[in_zone])
+
+    def _update_zones(self, zones, values, shifted, classes):
+        if zones.size == 0:
+            return
+        ids, inverse = np.unique(zones, return_inverse=True)
+        n_zones = len(ids)
+        counts = np.bincount(inverse, minlength=n_zones)
+        sums = np.bincount(inverse, shifted, minlength=n_zones)
+        squares = np.bincount(inverse, shifted * shifted, minlength=n_zones)
+
+        # Bölgelere göre sıralanmış değerlerde her bölgenin başlangıcından min/max
+        order = np.argsort(inverse, kind='stable')
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        mins = np.minimum.reduceat(values[order], starts)
+        maxs = np.maximum.reduceat(values[order], starts)
+        if classes is not None:
+            class_table = np.bincount(inverse * self.n_classes + classes,
+                                      minlength=n_zones * self.n_classes).reshape(n_zones, self.n_classes)
+
+        for index, zone in enumerate(ids.tolist()):
+            if zone not in self.zones:
+                self.zones[zone] = (np.array([0.0, 0.0, 0.0, np.inf, -np.inf]),
+                                    np.zeros(self.n_classes, dtype=np.int64))
+            moments, class_counts = self.zones[zone]
+            moments[:3] += (counts[index], sums[index], squares[index])
+            moments[3] = min(moments[3], mins[index])
+            moments[4] = max(moments[4], maxs[index])
+            if classes is not None:
+                class_counts += class_table[index]
+
+    def _summary(self, moments, class_counts):
+        count = int(moments[0])
+        if count == 0:
+            return {'count': 0}
+        mean_shifted = moments[1] / count
+        variance = max(moments[2] / count - mean_shifted ** 2, 0.0)
+        summary = {'count': count, 'min': float(moments[3]), 'max': float(moments[4]),
+                   'mean': self.shift + mean_shifted, 'std': float(np.sqrt(variance))}
+        if self.n_classes:
+            classes = {}
+            for label, class_count in zip(self.labels, class_counts.tolist()):
+                classes[label] = classes.get(label, 0) + class_count
+            summary['classes'] = {label: {'count': class_count, 'percent': 100 * class_count / count}
+                                  for label, class_count in classes.items()}
+        return summary
+
+    def result(self, percentiles=DEFAULT_PERCENTILES):
+        """Genel istatistikler (yüzdelikler dahil)"""
+        summary = self._summary(self.moments, self.class_counts)
+        if summary['count'] and self.histogram is not None and percentiles:
+            summary['percentiles'] = {f'p{q:g}': value for q, value in
+                                      zip(percentiles, self.histogram.percentiles(percentiles))}
+            if self.histogram.below or self.histogram.above:
+                summary['out_of_range'] = {'below': self.histogram.below, 'above': self.histogram.above}
+            if self.histogram.resolution != self.resolution:
+                summary['percentile_resolution'] = self.histogram.resolution
+        return summary
+
+    def zone_results(self):
+        """Bölge kimliği -> istatistikler (yüzdeliksiz)"""
+        return {zone: self._summary(moments, class_counts)
+                for zone, (moments, class_counts) in sorted(self.zones.items())}
+
+
+def _open_source(source, stack):
+    """Dizi ya da raster yolu için (şekil, satır bloğu okuyucu) döndür"""
+    if isinstance(source, np.ndarray):
+        return source.shape, lambda r0, r1: source[r0:r1]
+
+    import rasterio
+    from rasterio.windows import Window
+
+    dataset = stack.enter_context(rasterio.open(source))
+    nodata = dataset.nodata
+
+    def read(r0, r1):
+        block = dataset.read(1, window=Window(0, r0, dataset.width, r1 - r0))
+        if nodata is not None and np.issubdtype(block.dtype, np.floating):
+            block[block == nodata] = np.nan
+        elif nodata is not None:
+            block = np.where(block == nodata, np.nan, block)
+        return block
+
+    return (dataset.height, dataset.width), read
+
+
+def terrain_statistics(layers, zones=None, classes=None, percentiles=DEFAULT_PERCENTILES,
+                       resolutions=None, value_ranges=None, block_rows=1024):
+    """Katmanların istatistiklerini satır bloklarıyla tek geçişte hesapla.
+
+    layers: katman adı -> dizi ya da raster yolu (hepsi aynı boyutta)
+    zones: isteğe bağlı bölge rasterı (dizi ya da yol); NoData/NaN bölgeler atlanır
+    classes: katman adı -> (sınırlar, etiketler); verilmezse eğim ve bakı sınıfları
+    value_ranges: katman adı -> (alt, üst) yüzdelik histogramı aralığı (None: sınırsız)
+    """
+    classes = DEFAULT_CLASSES if classes is None else classes
+    resolutions = {**DEFAULT_RESOLUTIONS, **(resolutions or {})}
+    value_ranges = {**DEFAULT_RANGES, **(value_ranges or {})}
+    stats = {name: LayerStatistics(name, *classes.get(name, (None, None)),
+                                   resolution=resolutions.get(name, 0.01) if percentiles else None,
+                                   value_range=value_ranges.get(name))
+             for name in layers}
+
+    with ExitStack() as stack:
+        readers = {}
+        shape = None
+        for name, source in layers.items():
+            layer_shape, readers[name] = _open_source(source, stack)
+            if shape is not None and layer_shape != shape:
+                raise ValueError(f"{name} boyutu {layer_shape}, beklenen {shape}")
+            shape = layer_shape
+
+        zone_reader = None
+        if zones is not None:
+            zone_shape, zone_reader = _open_source(zones, stack)
+            if zone_shape != shape:
+                raise ValueError(f"Bölge rasterı boyutu {zone_shape}, beklenen {shape}")
+
+        for r0 in range(0, shape[0], block_rows):
+            r1 = min(shape[0], r0 + block_rows)
+            zone_block = zone_valid = None
+            if zone_reader is not None:
+                zone_block = zone_reader(r0, r1)
+                if np.issubdtype(zone_block.dtype, np.floating):
+                    zone_valid = np.isfinite(zone_block)
+            for name, reader in readers.items():
+                stats[name].update(reader(r0, r1), zone_block, zone_valid)
+
+    report = {'shape': list(shape), 'layers': {name: layer.result(percentiles) for name, layer in stats.items()}}
+    if zones is not None:
+        report['zones'] = {name: {str(_zone_key(zone)): summary for zone, summary in layer.zone_results().items()}
+                           for name, layer in stats.items()}
+    return report
+
+
+def _zone_key(zone):
+    """Float bölge kimliklerini mümkünse tamsayı olarak yaz (3.0 -> 3)"""
+    return int(zone) if float(zone).is_integer() else zone
+
+
+def write_json(report, path):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, ensure_ascii=False, indent=2)
+
+
+def _flatten(summary):
+    """İç içe istatistikleri (istatistik adı, değer) satırlarına aç"""
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, dict):
+                    for leaf_key, leaf_value in sub_value.items():
+                        yield f'{key}:{sub_key}:{leaf_key}', leaf_value
+                else:
+                    yield f'{key}:{sub_key}', sub_value
+        else:
+            yield key, value
+
+
+def write_csv(report, path):
+    """Uzun biçimli CSV: zone, layer, statistic, value ('genel' = tüm raster)"""
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['zone', 'layer', 'statistic', 'value'])
+        for layer, summary in report['layers'].items():
+            for statistic, value in _flatten(summary):
+                writer.writerow(['genel', layer, statistic, value])
+        for layer, zone_table in report.get('zones', {}).items():
+            for zone, summary in zone_table.items():
+                for statistic, value in _flatten(summary):
+                    writer.writerow([zone, layer, statistic, value])
+
+
+def _legacy_report(dem, slope, extended=False):
+    """generate_report'un eski çok geçişli hesaplaması (kıyaslama için).
+
+    extended=True: aynı çıktıyı (std ve yüzdelikler) klasik NumPy çağrılarıyla üretir.
+    """
+    values = [np.nanmin(dem), np.nanmax(dem), np.nanmean(dem), np.nanmean(slope), np.nanmax(slope)]
+    if extended:
+        for layer in (dem, slope):
+            values += [np.nanmin(layer), np.nanstd(layer), *np.nanpercentile(layer, DEFAULT_PERCENTILES)]
+    counts = [np.sum((slope >= 0) & (slope < 5)), np.sum((slope >= 5) & (slope < 15)),
+              np.sum((slope >= 15) & (slope < 30)), np.sum((slope >= 30) & (slope < 45)),
+              np.sum(slope >= 45)]
+    total = np.sum(~np.isnan(slope))
+    return values, [100 * count / total for count in counts]
+
+
+def benchmark(dem_path, repeats=3):
+    """Eski çok geçişli raporu blok bazlı motorla kıyasla"""
+    import rasterio
+    from arazi_turevleri import terrain_derivatives
+
+    with rasterio.open(dem_path) as dataset:
+        dem = dataset.read(1).astype(float)
+    large = np.tile(dem, (4, 4))
+
+    for label, data in [('DEM', dem), ('4x4 döşeme', large)]:
+        slope, aspect, hillshade = terrain_derivatives(data, 30.0)
+        print(f"\n📊 {label}: {data.shape}")
+        print(f"{'Yöntem':<34}{'Süre (s)':>10}")
+        timings = [('eski (dem + eğim, 11 geçiş)', lambda: _legacy_report(data, slope)),
+                   ('blok (dem + eğim, yüzdeliksiz)',
+                    lambda: terrain_statistics({'dem': data, 'slope': slope}, percentiles=())),
+                   ('eski + std + nanpercentile', lambda: _legacy_report(data, slope, extended=True)),
+                   ('blok (dem + eğim)', lambda: terrain_statistics({'dem': data, 'slope': slope})),
+                   ('blok (4 katman, yüzdelikler)', lambda: terrain_statistics(
+                       {'dem': data, 'slope': slope, 'aspect': aspect, 'hillshade': hillshade}))]
+        for name, func in timings:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                func()
+            print(f"{name:<34}{(time.perf_counter() - start) / repeats:>10.3f}")
+
+    # Sonuçların eski yöntemle tutarlılığı
+    slope, _, _ = terrain_derivatives(dem, 30.0)
+    (dem_min, dem_max, dem_mean, slope_mean, slope_max), percents = _legacy_report(dem, slope)
+    report = terrain_statistics({'dem': dem, 'slope': slope})
+    new_percents = [entry['percent'] for entry in report['layers']['slope']['classes'].values()]
+    print(f"\n✔️ Ortalama farkı: {abs(report['layers']['dem']['mean'] - dem_mean):.2e} m, "
+          f"sınıf yüzdesi farkı: {max(abs(a - b) for a, b in zip(percents, new_percents)):.2e}")
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else 'agri_dagi_DEM.tif')
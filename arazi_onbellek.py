@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Türetilmiş arazi katmanları için kalıcı disk önbelleği.
+
+Doldurulmuş DEM, eğim, bakı ve gölgeleme dizileri DEM içeriğinin özeti,
+dönüşüm (transform), piksel boyutu, gölgeleme azimut/yükseklik açısı ve türev
+arka ucu ile anahtarlanarak .npy dosyaları + manifest.json olarak saklanır.
+Tekrar kullanımda diziler np.load(mmap_mode='c') ile yazınca-kopyala bellek
+eşlemeli açılır: açılış neredeyse anlıktır, diziler yerinde değiştirilebilir
+ve değişiklikler yalnızca sürecin kendi sayfalarına yazılır (önbellek dosyası
+bozulmaz). Toplam boyut ``max_bytes`` sınırını aşarsa en uzun süredir
+kullanılmayan (LRU) girdiler silinir; az önce yazılan girdi silinmez.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+MANIFEST_NAME = 'manifest.json'
+STAT_INDEX_NAME = 'dosya_ozetleri.json'
+# Türev hesapları değiştiğinde artırılır; eski girdiler yeni anahtarlarla eşleşmez
+# (2: 'legacy' eğimi 4 kat küçük hesaplıyordu)
+KEY_VERSION = 2
+
+
+def file_digest(path, chunk_size=1 << 24):
+    """Dosya içeriğinin BLAKE2b özetini parça parça okuyarak hesapla"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TerrainCache:
+    def __init__(self, cache_dir, max_bytes=10 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def content_hash(self, path):
+        """DEM içerik özetini döndür; dosya değişmediyse (boyut+mtime) yeniden okuma"""
+        stat = os.stat(path)
+        stat_key = f'{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}'
+        index_path = os.path.join(self.cache_dir, STAT_INDEX_NAME)
+        index = self._read_json(index_path) or {}
+        if stat_key not in index:
+            index = self._prune_stat_index(index)
+            index[stat_key] = file_digest(path)
+            self._write_json(index_path, index)
+        return index[stat_key]
+
+    @staticmethod
+    def _prune_stat_index(index):
+        """Silinmiş ya da değişmiş (boyut/mtime farklı) dosyaların özetlerini at"""
+        pruned = {}
+        for stat_key, digest in index.items():
+            path, size, mtime_ns = stat_key.rsplit('|', 2)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if f'{stat.st_size}|{stat.st_mtime_ns}' == f'{size}|{mtime_ns}':
+                pruned[stat_key] = digest
+        return pruned
+
+    def key(self, dem_path, transform, pixel_size, azimuth=315, altitude=45, backend='legacy'):
+        """Önbellek anahtarı: DEM içeriği + geometri + gölgeleme parametreleri"""
+        parts = [str(KEY_VERSION), self.content_hash(dem_path), repr(tuple(transform)[:6]), repr(float(pixel_size)),
+                 repr(float(azimuth)), repr(float(altitude)), backend]
+        return hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+
+    def load(self, key):
+        """Anahtar önbellekteyse dizileri yazınca-kopyala bellek eşlemeli döndür, yoksa None"""
+        entry_dir = os.path.join(self.cache_dir, key)
+        manifest_path = os.path.join(entry_dir, MANIFEST_NAME)
+        manifest = self._read_json(manifest_path)
+        if manifest is None:
+            return None
+        try:
+            arrays = {name: np.load(os.path.join(entry_dir, info['file']), mmap_mode='c')
+                      for name, info in manifest['arrays'].items()}
+        except (OSError, ValueError):
+            # Yarım kalmış ya da bozuk girdi: sil ve yeniden hesaplat
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        manifest['last_access'] = time.time()
+        self._write_json(manifest_path, manifest)
+        return arrays
+
+    def store(self, key, arrays, meta=None):
+        """Dizileri önbelleğe yaz (geçici dizine yazıp atomik olarak yeniden adlandır)"""
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = os.path.join(self.cache_dir, f'.{key}.{uuid.uuid4().hex}.tmp')
+        os.makedirs(tmp_dir)
+        manifest = {'key': key, 'created': time.time(), 'last_access': time.time(),
+                    'meta': meta or {}, 'arrays': {}, 'nbytes': 0}
+        for name, array in arrays.items():
+            file_name = f'{name}.npy'
+            np.save(os.path.join(tmp_dir, file_name), np.ascontiguousarray(array))
+            manifest['arrays'][name] = {'file': file_name, 'dtype': str(array.dtype),
+                                        'shape': list(array.shape)}
+            manifest['nbytes'] += int(array.nbytes)
+        self._write_json(os.path.join(tmp_dir, MANIFEST_NAME), manifest)
+
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Başka bir süreç aynı girdiyi önce yazdı
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Toplam boyut sınırı aşıldıysa en eski erişilen girdileri sil.
+
+        ``keep`` (ör. az önce yazılan anahtar) tek başına sınırı aşsa bile silinmez.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name == keep:
+                continue
+            manifest = self._read_json(os.path.join(self.cache_dir, name, MANIFEST_NAME))
+            if manifest is not None:
+                entries.append((manifest['last_access'], manifest['nbytes'], name))
+
+        kept = self._read_json(os.path.join(self.cache_dir, keep, MANIFEST_NAME)) if keep else None
+        total = sum(nbytes for _, nbytes, _ in entries) + (kept['nbytes'] if kept else 0)
+        for _, nbytes, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            total -= nbytes
+
+    @staticmethod
+    def _read_json(path):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(data, handle)
+        os.replace(tmp_path, path)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çok çözünürlüklü (LOD) raster piramidi.
+
+GDAL overview'larına benzer şekilde her seviye bir öncekinin 2x2 bloklarının
+indirgenmesiyle üretilir. Adım (stride) ile seyreltmenin aksine sırt
+çizgilerinde örtüşme (aliasing) oluşmaz. Toplam ek bellek ~%33'tür.
+
+İndirgeme yöntemleri:
+  'mean'     - blok ortalaması (yükseklik, eğim, gölgeleme)
+  'max'      - blok maksimumu (zirve ve sırtları korur)
+  'circular' - açısal ortalama (bakı, 0-360°)
+"""
+
+import numpy as np
+
+REDUCE_METHODS = ('mean', 'max', 'circular')
+
+
+def _pad_even(array):
+    """Tek sayılı kenarları NaN ile çift boyuta tamamla"""
+    pad_rows, pad_cols = array.shape[0] % 2, array.shape[1] % 2
+    if pad_rows or pad_cols:
+        array = np.pad(array, ((0, pad_rows), (0, pad_cols)), constant_values=np.nan)
+    return array
+
+
+def reduce_2x2(array, method='mean'):
+    """Diziyi her eksende yarıya indir (NaN'lar yok sayılır)"""
+    if method not in REDUCE_METHODS:
+        raise ValueError(f"Geçersiz indirgeme yöntemi: {method!r}")
+    array = _pad_even(np.asarray(array, dtype=np.float32))
+    height, width = array.shape
+    blocks = array.reshape(height // 2, 2, width // 2, 2)
+
+    if method == 'max':
+        return np.nanmax(blocks, axis=(1, 3))
+    if method == 'circular':
+        radians = np.radians(blocks)
+        mean_sin = np.nanmean(np.sin(radians), axis=(1, 3))
+        mean_cos = np.nanmean(np.cos(radians), axis=(1, 3))
+        return (np.degrees(np.arctan2(mean_sin, mean_cos)) + 360) % 360
+    return np.nanmean(blocks, axis=(1, 3))
+
+
+def build_pyramid(array, method='mean', min_size=16):
+    """Seviye 0 (orijinal dizi) ile başlayan ve her adımda 2 kat küçülen piramit"""
+    levels = [array]
+    while min(levels[-1].shape) // 2 >= min_size:
+        levels.append(reduce_2x2(levels[-1], method))
+    return levels
+
+
+def pick_level(levels, max_vertices):
+    """Köşe (vertex) bütçesine sığan en ayrıntılı seviyenin indeksini döndür"""
+    for index, level in enumerate(levels):
+        if level.shape[0] * level.shape[1] <= max_vertices:
+            return index
+    return len(levels) - 1
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tek geçişli (fused) arazi türevleri çekirdeği.
+
+Eğim, bakı ve gölgeleme aynı Horn gradyanlarından türetilir: DEM bir kez
+yumuşatılır, gradyanlar bir kez hesaplanır ve üç katman önceden ayrılmış
+float32/uint8 dizilere yazılır. Ara diziler yalnızca satır şeritleri kadar
+büyüktür, raster kadar değil.
+
+Arka uçlar:
+  'legacy' - AgriDagi3D'nin eski üç ayrı hesaplaması (float64)
+  'fused'  - NumPy/SciPy ile şerit bazlı tek geçiş (float32)
+  'numba'  - aynı tek geçiş, JIT derlenmiş piksel çekirdeği ile (numba kuruluysa)
+
+Kıyaslama:  python arazi_turevleri.py agri_dagi_DEM.tif
+Ölçekleme:  python arazi_turevleri.py scaling [fused|numba]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+from scipy import ndimage
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+DERIVATIVE_BACKENDS = ('legacy', 'fused', 'numba')
+
+# Şerit taşma genişliği: gaussian_filter(sigma=1, truncate=4) yarıçapı 4 + Horn yarıçapı 1
+STRIP_HALO = 5
+
+
+def _strip_numpy(smoothed, top, n_rows, pixel_size, azimuth, altitude, slope, aspect, hillshade):
+    """Bir şeridin çekirdek satırları için eğim/bakı/gölgelemeyi NumPy ile hesapla"""
+    core = slice(top, top + n_rows)
+    # Horn gradyanları (piksel başına yükseklik farkı)
+    dz_row = ndimage.sobel(smoothed, axis=0, output=np.float32)[core]
+    dz_col = ndimage.sobel(smoothed, axis=1, output=np.float32)[core]
+    dz_row /= 8
+    dz_col /= 8
+
+    # Gölgeleme: eski yöntemle aynı eksen düzeni, arctan'sız kapalı form
+    #   cos(s) = 1/sqrt(1+p²), sin(s)cos(az-a) = (cos(az)*dz_row - sin(az)*dz_col)/sqrt(1+p²)
+    azimuth_rad, altitude_rad = np.radians(azimuth), np.radians(altitude)
+    norm = np.hypot(dz_row, dz_col)
+    shade = np.cos(azimuth_rad) * dz_row
+    shade -= np.sin(azimuth_rad) * dz_col
+    shade *= np.cos(altitude_rad)
+    shade += np.sin(altitude_rad)
+    denom = np.square(norm)
+    denom += 1
+    np.sqrt(denom, out=denom)
+    shade /= denom
+    shade *= 255
+    np.clip(shade, 0, 255, out=shade)
+    hillshade[:] = shade
+
+    # Eğim (derece)
+    norm /= pixel_size
+    np.arctan(norm, out=norm)
+    np.degrees(norm, out=slope)
+
+    # Bakı (derece, 0-360)
+    np.arctan2(-dz_row, dz_col, out=dz_row)
+    np.degrees(dz_row, out=dz_row)
+    dz_row += 360
+    np.mod(dz_row, 360, out=aspect)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _horn_kernel_numba(smoothed, top, n_rows, pixel_size, sin_alt, cos_alt, sin_az, cos_az,
+                           slope, aspect, hillshade):
+        """Horn gradyanları ve üç türevi tek piksel döngüsünde hesapla"""
+        height, width = smoothed.shape
+        for i in numba.prange(n_rows):
+            r = top + i
+            # 'reflect' kipinde 1 piksellik kenar yansıması = kenar satırının tekrarı
+            ru = max(r - 1, 0)
+            rd = min(r + 1, height - 1)
+            for j in range(width):
+                jl = max(j - 1, 0)
+                jr = min(j + 1, width - 1)
+                dz_row = ((smoothed[rd, jl] + 2 * smoothed[rd, j] + smoothed[rd, jr]) -
+                          (smoothed[ru, jl] + 2 * smoothed[ru, j] + smoothed[ru, jr])) / 8
+                dz_col = ((smoothed[ru, jr] + 2 * smoothed[r, jr] + smoothed[rd, jr]) -
+                          (smoothed[ru, jl] + 2 * smoothed[r, jl] + smoothed[rd, jl])) / 8
+                norm = np.sqrt(dz_row * dz_row + dz_col * dz_col)
+
+                slope[i, j] = np.degrees(np.arctan(norm / pixel_size))
+                aspect[i, j] = (np.degrees(np.arctan2(-dz_row, dz_col)) + 360) % 360
+
+                shade = (sin_alt + cos_alt * (cos_az * dz_row - sin_az * dz_col)) / np.sqrt(1 + norm * norm)
+                hillshade[i, j] = np.uint8(min(max(shade * 255, 0.0), 255.0))
+
+
+def _strip_numba(smoothed, top, n_rows, pixel_size, azimuth, altitude, slope, aspect, hillshade):
+    """Bir şeridin çekirdek satırlarını numba çekirdeği ile hesapla"""
+    azimuth_rad, altitude_rad = np.radians(azimuth), np.radians(altitude)
+    _horn_kernel_numba(smoothed, top, n_rows, np.float32(pixel_size),
+                       np.float32(np.sin(altitude_rad)), np.float32(np.cos(altitude_rad)),
+                       np.float32(np.sin(azimuth_rad)), np.float32(np.cos(azimuth_rad)),
+                       slope, aspect, hillshade)
+
+
+@contextmanager
+def _numba_threads(n_workers):
+    """numba iş parçacığı sayısını blok süresince ayarla, çıkışta önceki değere döndür"""
+    if numba is None or not n_workers:
+        yield
+        return
+    previous = numba.get_num_threads()
+    numba.set_num_threads(min(n_workers, numba.config.NUMBA_NUM_THREADS))
+    try:
+        yield
+    finally:
+        numba.set_num_threads(previous)
+
+
+def map_strips(func, dem, dtypes, n_workers=1, chunk_rows=512, halo=STRIP_HALO):
+    """DEM'i halo satırlı şeritlere bölüp ``func`` ile işle ve çıktıları birleştir.
+
+    ``func(strip, top, n_rows, outs)`` şeridin ``top`` satırından başlayan
+    ``n_rows`` çekirdek satırı için sonuçları ``outs`` görünümlerine yazar.
+    Şeritler birbirinden bağımsızdır; n_workers > 1 ise GIL'i bırakan
+    NumPy/SciPy çağrıları iş parçacığı havuzunda paralel çalışır.
+    """
+    height = dem.shape[0]
+    outputs = tuple(np.empty(dem.shape, dtype=dtype) for dtype in dtypes)
+    if n_workers > 1:
+        # Her işçiye en az bir şerit düşsün
+        chunk_rows = max(1, min(chunk_rows, -(-height // n_workers)))
+
+    def work(row_off):
+        n_rows = min(chunk_rows, height - row_off)
+        r0 = max(0, row_off - halo)
+        r1 = min(height, row_off + n_rows + halo)
+        core = slice(row_off, row_off + n_rows)
+        func(dem[r0:r1], row_off - r0, n_rows, tuple(output[core] for output in outputs))
+
+    row_offsets = range(0, height, chunk_rows)
+    if n_workers > 1:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(work, row_offsets))
+    else:
+        for row_off in row_offsets:
+            work(row_off)
+    return outputs
+
+
+def terrain_derivatives(dem, pixel_size, azimuth=315, altitude=45, sigma=1.0,
+                        backend='fused', chunk_rows=512, n_workers=1):
+    """DEM'den eğim, bakı ve gölgelemeyi tek geçişte hesapla.
+
+    Dönüş: (slope float32, aspect float32, hillshade uint8)
+    """
+    if backend == 'numba' and numba is None:
+        print("⚠️ numba kurulu değil, 'fused' arka ucu kullanılıyor")
+        backend = 'fused'
+    numba_workers = None
+    if backend == 'numba':
+        # numba çekirdeği kendi içinde prange ile paralel; eşzamanlı çağrılar
+        # numba iş kuyruğu katmanında güvenli olmadığı için şeritler sıralı işlenir
+        strip_kernel, numba_workers, n_workers = _strip_numba, n_workers, 1
+    else:
+        strip_kernel = _strip_numpy
+
+    def strip_func(strip, top, n_rows, outs):
+        smoothed = ndimage.gaussian_filter(strip.astype(np.float32), sigma=sigma, output=np.float32)
+        strip_kernel(smoothed, top, n_rows, pixel_size, azimuth, altitude, *outs)
+
+    with _numba_threads(numba_workers):
+        return map_strips(strip_func, dem, (np.float32, np.float32, np.uint8),
+                          n_workers=n_workers, chunk_rows=chunk_rows)
+
+
+def benchmark(dem_path, repeats=3):
+    """Eski üç ayrı hesaplamayı tek geçişli arka uçlarla kıyasla"""
+    import rasterio
+    from agri_dagi_3d_profesional import AgriDagi3D
+
+    with rasterio.open(dem_path) as dataset:
+        dem = dataset.read(1).astype(float)
+    # Büyük raster davranışı için DEM'i 4x4 döşeyerek sentetik bir raster üret
+    large = np.tile(dem, (4, 4))
+
+    analysis = AgriDagi3D.__new__(AgriDagi3D)
+    analysis.derivatives_backend = 'legacy'
+    pixel_size = 30.0
+
+    def legacy(data):
+        analysis.dem_data = data
+        return (analysis._calculate_slope_advanced(pixel_size),
+                analysis._calculate_aspect(pixel_size),
+                analysis._calculate_hillshade())
+
+    backends = {'legacy': legacy}
+    for name in ('fused', 'numba'):
+        if name == 'numba' and numba is None:
+            continue
+        backends[name] = lambda data, name=name: terrain_derivatives(data, pixel_size, backend=name)
+
+    for label, data in [('DEM', dem), ('4x4 döşeme', large)]:
+        print(f"\n📊 {label}: {data.shape}")
+        print(f"{'Arka uç':<10}{'Süre (s)':>10}{'Tepe bellek (MB)':>18}")
+        for name, func in backends.items():
+            func(data[:64])  # JIT derleme/ısınma
+            tracemalloc.start()
+            start = time.perf_counter()
+            for _ in range(repeats):
+                func(data)
+            elapsed = (time.perf_counter() - start) / repeats
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:<10}{elapsed:>10.3f}{peak / 1e6:>18.1f}")
+
+
+def benchmark_scaling(size=6000, workers=(1, 2, 4, 8, 16), backend='fused'):
+    """Büyük sentetik bir DEM üzerinde işçi sayısına göre ölçeklenmeyi ölç"""
+    rng = np.random.default_rng(42)
+    # Birkaç Gauss tepesi + gürültüden oluşan sentetik arazi
+    yy, xx = np.ogrid[0:size, 0:size]
+    yy, xx = yy / size, xx / size
+    dem = np.zeros((size, size))
+    for _ in range(8):
+        cy, cx, radius, peak = rng.uniform(0, 1), rng.uniform(0, 1), rng.uniform(0.05, 0.3), rng.uniform(500, 3000)
+        dem += peak * np.exp(-((yy - cy) ** 2 + (xx - cx) ** 2) / radius ** 2)
+    dem += rng.normal(0, 2, dem.shape)
+
+    print(f"📊 Sentetik DEM: {dem.shape}, arka uç: {backend}, çekirdek sayısı: {os.cpu_count()}")
+    if max(workers) > (os.cpu_count() or 1):
+        print(f"⚠️ {os.cpu_count()} çekirdekten fazla işçide hızlanma beklenmez (yalnızca ek yük ölçülür)")
+    terrain_derivatives(dem[:64], 30.0, backend=backend)  # JIT derleme/ısınma
+    print(f"{'İşçi':<6}{'Süre (s)':>10}{'Hızlanma':>10}")
+    baseline = None
+    for n_workers in workers:
+        start = time.perf_counter()
+        terrain_derivatives(dem, 30.0, backend=backend, n_workers=n_workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{n_workers:<6}{elapsed:>10.3f}{baseline / elapsed:>10.2f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'scaling':
+        benchmark_scaling(backend=sys.argv[2] if len(sys.argv) > 2 else 'fused')
+    else:
+        benchmark(sys.argv[1] if len(sys.argv) > 1 else 'agri_dagi_DEM.tif')
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DEM NoData boşluk doldurma motoru.
+
+Tüm raster üzerinde tek bir Delaunay üçgenlemesi kurmak yerine her NoData
+bölgesi ayrı etiketlenir ve yalnızca çevresindeki geçerli piksel halkasından
+(ring) kübik interpolasyon yapılır. Bölgeler birbirinden bağımsız olduğu için
+iş parçacığı havuzunda paralel işlenir.
+
+Kıyaslama:  python dem_bosluk_doldurma.py agri_dagi_DEM.tif
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import ndimage
+from scipy.interpolate import griddata
+from scipy.spatial import QhullError
+
+
+def _fill_region(dem, labels, label, bbox, ring_width, method):
+    """Tek bir boşluk bölgesini çevresindeki geçerli halka ile doldur"""
+    rows, cols = bbox
+    # Bölge kutusunu halka genişliği kadar büyüt (raster sınırlarında kırp)
+    r0 = max(0, rows.start - ring_width)
+    r1 = min(dem.shape[0], rows.stop + ring_width)
+    c0 = max(0, cols.start - ring_width)
+    c1 = min(dem.shape[1], cols.stop + ring_width)
+
+    region_void = labels[r0:r1, c0:c1] == label
+    ring = ndimage.binary_dilation(region_void, iterations=ring_width) & ~np.isnan(dem[r0:r1, c0:c1])
+
+    ring_y, ring_x = np.nonzero(ring)
+    void_y, void_x = np.nonzero(region_void)
+    ring_values = dem[r0:r1, c0:c1][ring]
+    if len(ring_values) == 0:
+        return None
+
+    fill_value = ring_values.mean()
+    try:
+        values = griddata(np.column_stack((ring_y, ring_x)), ring_values,
+                          np.column_stack((void_y, void_x)),
+                          method=method, fill_value=fill_value)
+    except (QhullError, ValueError):
+        # Üçgenleme kurulamıyorsa (ör. doğrusal halka) halka ortalamasını kullan
+        values = np.full(len(void_y), fill_value)
+    return void_y + r0, void_x + c0, values
+
+
+def fill_voids(dem, ring_width=3, method='cubic', n_workers=None):
+    """NoData (NaN) bölgelerini yerel halka interpolasyonu ile yerinde doldur.
+
+    Her bağlı NaN bölgesi için yalnızca ``ring_width`` piksellik çevre halkası
+    üçgenlenir; bellek ve süre boşlukların çevresiyle orantılıdır, raster
+    boyutuyla değil.
+    """
+    void = np.isnan(dem)
+    labels, n_regions = ndimage.label(void, structure=np.ones((3, 3), dtype=bool))
+    if n_regions == 0:
+        return dem
+
+    bboxes = ndimage.find_objects(labels)
+
+    def work(label_bbox):
+        label, bbox = label_bbox
+        return _fill_region(dem, labels, label, bbox, ring_width, method)
+
+    # Sonuçlar tüm bölgeler hesaplandıktan sonra yazılır; böylece bir bölgenin
+    # dolgusu komşu bölgenin halkasına karışmaz
+    with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+        results = list(executor.map(work, enumerate(bboxes, start=1)))
+
+    for result in results:
+        if result is not None:
+            ys, xs, values = result
+            dem[ys, xs] = values
+    return dem
+
+
+def _griddata_fill(dem):
+    """Eski yöntem: tüm geçerli pikseller üzerinde global kübik griddata"""
+    mask = ~np.isnan(dem)
+    y, x = np.mgrid[0:dem.shape[0], 0:dem.shape[1]]
+    valid_points = np.column_stack((y[mask], x[mask]))
+    valid_values = dem[mask]
+    missing_points = np.column_stack((y[~mask], x[~mask]))
+    dem[~mask] = griddata(valid_points, valid_values, missing_points,
+                          method='cubic', fill_value=np.nanmean(valid_values))
+    return dem
+
+
+def punch_holes(dem, n_holes=40, max_radius=12, seed=42):
+    """Kıyaslama için DEM'e rastgele dairesel boşluklar aç"""
+    rng = np.random.default_rng(seed)
+    holed = dem.astype(float).copy()
+    yy, xx = np.ogrid[0:dem.shape[0], 0:dem.shape[1]]
+    for _ in range(n_holes):
+        cy, cx = rng.integers(0, dem.shape[0]), rng.integers(0, dem.shape[1])
+        radius = rng.integers(2, max_radius)
+        holed[(yy - cy) ** 2 + (xx - cx) ** 2 <= radius ** 2] = np.nan
+    return holed
+
+
+def _measure(func, dem):
+    """Bir doldurma fonksiyonunun süresini ve tepe bellek kullanımını ölç"""
+    work = dem.copy()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(work)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return work, elapsed, peak / 1e6
+
+
+def benchmark(dem_path, n_holes=40, max_radius=12):
+    """Yerel halka dolgusunu global griddata yöntemiyle kıyasla"""
+    import rasterio
+
+    with rasterio.open(dem_path) as dataset:
+        original = dataset.read(1).astype(float)
+    holed = punch_holes(original, n_holes=n_holes, max_radius=max_radius)
+    void = np.isnan(holed)
+
+    print(f"📊 {dem_path}: {original.shape}, {void.sum()} boş piksel, {n_holes} boşluk")
+    print(f"{'Yöntem':<18}{'Süre (s)':>10}{'Tepe bellek (MB)':>18}{'RMSE (m)':>10}")
+    for name, func in [('griddata (global)', _griddata_fill), ('yerel halka', fill_voids)]:
+        filled, elapsed, peak = _measure(func, holed)
+        rmse = np.sqrt(np.mean((filled[void] - original[void]) ** 2))
+        print(f"{name:<18}{elapsed:>10.3f}{peak:>18.1f}{rmse:>10.2f}")
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else 'agri_dagi_DEM.tif')
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gece ışıkları için bölgesel (zonal) istatistik motoru.
+
+"World Settlement Analysis to the Python" betiği Black Marble görselini ülke
+sınırlarının üzerine yalnızca çizer. Buradaki motor ülke ya da il
+poligonlarını gece ışıkları rasterının ızgarasına bir kez rasterleştirip
+etiket ızgarası olarak önbelleğe alır (arazi_onbellek.TerrainCache; anahtar:
+poligon dosyasının içerik özeti + raster ızgarası) ve raster'ı satır blokları
+halinde tek geçişte okuyarak her bölge için np.bincount ile
+
+  piksel sayısı, ışık toplamı, ortalama, ışıklı alan (km²) ve ışıklı oran
+
+biriktirir. Etiket ızgarası da blok blok rasterleştirilip bellek eşlemeli
+(.npy) tutulduğundan 500 m'lik küresel mozaikler (86400 x 43200) belleğe
+sığmak zorunda değildir.
+
+Girdiler yerel dosyalardır:
+  raster     GeoTIFF (ör. VNP46 radyansı) ya da coğrafi bilgisi olmayan küresel
+             JPEG (BlackMarble_2016_01deg.jpg; betikteki gibi -180..180 / -90..90
+             kabul edilir, RGB bantların ortalaması kullanılır)
+  bölgeler   GeoPackage ya da GeoJSON (standart kütüphaneyle okunur); geopandas
+             kuruluysa Shapefile/.zip (ör. ne_110m_admin_0_countries.zip) de okunur
+
+Kullanım:   python gece_isiklari.py BlackMarble_2016_01deg.jpg ne_110m_admin_0_countries.gpkg -o ulkeler.csv
+Kıyaslama:  python gece_isiklari.py --benchmark
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+import weakref
+
+import numpy as np
+
+from arazi_onbellek import TerrainCache
+from risk_agi_yukleyici import read_table
+
+try:
+    import geopandas as gpd
+except ImportError:
+    gpd = None
+
+BLOCK_ROWS = 512
+# Işıklı piksel eşiği (raster birimi: JPEG'de 0-255 parlaklık, VNP46'da nW/cm²/sr)
+LIT_THRESHOLD = 10.0
+EARTH_RADIUS_KM = 6371.0088
+NAME_FIELDS = ('NAME', 'name', 'ADMIN', 'NAME_1', 'shapeName')
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'gece_isiklari_onbellek')
+TABLE_COLUMNS = ('zone', 'name', 'pixels', 'sum', 'mean', 'lit_area_km2', 'lit_fraction')
+
+
+# --- Bölgeler ------------------------------------------------------------------------
+
+def _geojson(kind, coords):
+    """risk_agi_yukleyici'nin (tür, koordinatlar) geometrisini GeoJSON sözlüğüne çevir"""
+    if kind == 'Polygon':
+        return {'type': 'Polygon', 'coordinates': [ring.tolist() for ring in coords]}
+    if kind == 'MultiPolygon':
+        return {'type': 'MultiPolygon', 'coordinates': [[ring.tolist() for ring in part] for part in coords]}
+    raise ValueError(f"Bölge geometrisi poligon olmalı, {kind} bulundu")
+
+
+def _bounds(geometry):
+    coordinates = geometry['coordinates']
+    rings = coordinates if geometry['type'] == 'Polygon' else [ring for part in coordinates for ring in part]
+    points = np.concatenate([np.asarray(ring, dtype=np.float64)[:, :2] for ring in rings])
+    return (*points.min(axis=0), *points.max(axis=0))
+
+
+def read_zones(path, name_field=None, layer=None):
+    """Poligonları oku: [{'zone': 1.., 'name', 'geometry' (GeoJSON), 'bounds'}]"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.geojson', '.json'):
+        with open(path, encoding='utf-8') as handle:
+            features = json.load(handle)['features']
+        records = [(feature['properties'] or {}, feature['geometry']) for feature in features]
+    elif extension == '.gpkg':
+        records = []
+        for chunk in read_table(path, layer=layer):
+            geometries = chunk.pop('geometry')
+            columns = list(chunk)
+            for index, (kind, coords) in enumerate(geometries):
+                records.append(({column: chunk[column][index] for column in columns}, _geojson(kind, coords)))
+    elif gpd is not None:
+        frame = gpd.read_file(path, layer=layer)
+        records = [(dict(row.drop('geometry')), row.geometry.__geo_interface__) for _, row in frame.iterrows()]
+    else:
+        raise RuntimeError(f"{extension} okumak için geopandas gerekli; ya da dosyayı .gpkg/.geojson'a çevirin")
+
+    zones = []
+    for properties, geometry in records:
+        if geometry is None or geometry['type'] not in ('Polygon', 'MultiPolygon'):
+            continue
+        field = name_field or next((field for field in NAME_FIELDS if field in properties), None)
+        name = str(properties[field]) if field else str(len(zones) + 1)
+        zones.append({'zone': len(zones) + 1, 'name': name, 'geometry': geometry, 'bounds': _bounds(geometry)})
+    if not zones:
+        raise ValueError(f"{path}: poligon bulunamadı")
+    return zones
+
+
+# --- Raster --------------------------------------------------------------------------
+
+class NightLights:
+    """Gece ışıkları rasterını satır blokları halinde okur (NoData -> NaN, RGB -> bant ortalaması)"""
+
+    def __init__(self, path):
+        import rasterio
+        from rasterio.transform import from_bounds
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', rasterio.errors.NotGeoreferencedWarning)
+            self.dataset = rasterio.open(path)
+        self.shape = (self.dataset.height, self.dataset.width)
+        self.transform = self.dataset.transform
+        self.geographic = self.dataset.crs is None or self.dataset.crs.is_geographic
+        if self.transform.is_identity:
+            # Coğrafi bilgisi olmayan görsel: betikteki gibi tüm dünya
+            self.transform = from_bounds(-180, -90, 180, 90, self.dataset.width, self.dataset.height)
+        self.bands = [1, 2, 3] if self.dataset.count >= 3 and self.dataset.dtypes[0] == 'uint8' else [1]
+
+    def close(self):
+        self.dataset.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, r0, r1):
+        from rasterio.windows import Window
+
+        window = Window(0, r0, self.shape[1], r1 - r0)
+        if len(self.bands) == 1:
+            block = self.dataset.read(1, window=window).astype(np.float32, copy=False)
+        else:
+            block = self.dataset.read(self.bands, window=window).mean(axis=0, dtype=np.float32)
+        nodata = self.dataset.nodata
+        if nodata is not None:
+            block[block == nodata] = np.nan
+        return block
+
+    def row_areas(self, r0, r1):
+        """Satır başına piksel alanı (km²); coğrafi ızgarada enleme göre küçülür"""
+        a, e, f = self.transform.a, self.transform.e, self.transform.f
+        if not self.geographic:
+            return np.full(r1 - r0, abs(a * e) / 1e6)
+        top = np.radians(f + e * np.arange(r0, r1))
+        bottom = top + np.radians(e)
+        return EARTH_RADIUS_KM ** 2 * np.radians(abs(a)) * np.abs(np.sin(top) - np.sin(bottom))
+
+
+# --- Etiket ızgarası -----------------------------------------------------------------
+
+def _label_dtype(n_zones):
+    return np.uint16 if n_zones < np.iinfo(np.uint16).max else np.uint32
+
+
+def rasterize_zones(zones, shape, transform, out, block_rows=BLOCK_ROWS, all_touched=False):
+    """Bölgeleri 'out' dizisine (memmap olabilir) satır blokları halinde rasterleştir; 0 = bölge dışı"""
+    from rasterio import features
+    from rasterio.windows import Window, transform as window_transform
+
+    bounds = np.array([zone['bounds'] for zone in zones])
+    for r0 in range(0, shape[0], block_rows):
+        r1 = min(shape[0], r0 + block_rows)
+        # Bloğun enlem aralığı (kuzey yukarıda: e < 0)
+        y_top, y_bottom = transform.f + transform.e * r0, transform.f + transform.e * r1
+        y_min, y_max = min(y_top, y_bottom), max(y_top, y_bottom)
+        inside = (bounds[:, 1] <= y_max) & (bounds[:, 3] >= y_min)
+        if not inside.any():
+            out[r0:r1] = 0
+            continue
+        shapes = [(zones[index]['geometry'], zones[index]['zone']) for index in np.flatnonzero(inside)]
+        out[r0:r1] = features.rasterize(shapes, out_shape=(r1 - r0, shape[1]), fill=0, dtype=out.dtype,
+                                        transform=window_transform(Window(0, r0, shape[1], r1 - r0), transform),
+                                        all_touched=all_touched)
+    return out
+
+
+def label_grid(zones, zones_path, shape, transform, cache_dir=DEFAULT_CACHE_DIR, all_touched=False,
+               block_rows=BLOCK_ROWS, layer=None, name_field=None, scratch_dir=None):
+    """Raster ızgarasına hizalı etiket ızgarası; önbellekteyse bellek eşlemeli açılır.
+
+    layer/name_field bölgelerin okunduğu ayarlardır: aynı GeoPackage'ın farklı
+    katmanları farklı etiket ızgaraları verir, anahtar bunları da içerir.
+    Önbellek yoksa ızgara scratch_dir'deki bir dosyaya eşlenir (ömrü çağırana
+    aittir); scratch_dir de verilmezse geçici dizin ızgarayla birlikte silinir.
+    """
+    cache = TerrainCache(cache_dir) if cache_dir else None
+    key = None
+    if cache is not None:
+        parts = [cache.content_hash(zones_path), repr(layer), repr(name_field), repr(tuple(transform)[:6]),
+                 repr(tuple(shape)), repr(bool(all_touched)), str(len(zones))]
+        key = 'etiket_' + hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+        cached = cache.load(key)
+        if cached is not None:
+            return cached['labels'], True
+
+    if cache is None:
+        # Izgara RAM'e kopyalanmaz: bellek eşlemeli dosya olarak döner
+        owned = scratch_dir is None
+        tmp = tempfile.mkdtemp(prefix='etiket_') if owned else scratch_dir
+        labels = np.lib.format.open_memmap(os.path.join(tmp, 'labels.npy'), mode='w+',
+                                           dtype=_label_dtype(len(zones)), shape=shape)
+        if owned:
+            weakref.finalize(labels, shutil.rmtree, tmp, ignore_errors=True)
+        rasterize_zones(zones, shape, transform, labels, block_rows, all_touched)
+        return labels, False
+
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp:
+        labels = np.lib.format.open_memmap(os.path.join(tmp, 'labels.npy'), mode='w+',
+                                           dtype=_label_dtype(len(zones)), shape=shape)
+        rasterize_zones(zones, shape, transform, labels, block_rows, all_touched)
+        labels.flush()
+        cache.store(key, {'labels': labels}, meta={'zones': os.path.abspath(zones_path), 'shape': list(shape)})
+        del labels
+    return cache.load(key)['labels'], False
+
+
+# --- İstatistikler -------------------------------------------------------------------
+
+def zonal_statistics(raster_path, zones_path, name_field=None, layer=None, lit_threshold=LIT_THRESHOLD,
+                     cache_dir=DEFAULT_CACHE_DIR, block_rows=BLOCK_ROWS, all_touched=False):
+    """Bölge başına gece ışığı istatistikleri (tablo satırları, toplam ışığa göre azalan)"""
+    zones = read_zones(zones_path, name_field, layer)
+    n_bins = len(zones) + 1
+    counts = np.zeros(n_bins, dtype=np.int64)
+    sums = np.zeros(n_bins)
+    lit_areas = np.zeros(n_bins)
+    areas = np.zeros(n_bins)
+
+    with NightLights(raster_path) as lights, tempfile.TemporaryDirectory() as scratch:
+        labels, _ = label_grid(zones, zones_path, lights.shape, lights.transform, cache_dir,
+                               all_touched, block_rows, layer, name_field, scratch_dir=scratch)
+        for r0 in range(0, lights.shape[0], block_rows):
+            r1 = min(lights.shape[0], r0 + block_rows)
+            values = lights.read(r0, r1)
+            # Piksel alanı yalnız satıra bağlı: (satır, bölge) sayım tablosu x satır alanı
+            keys = np.asarray(labels[r0:r1], dtype=np.intp) + (np.arange(r1 - r0) * n_bins)[:, None]
+            valid = ~np.isnan(values)
+            if not valid.all():
+                keys, values = keys[valid], values[valid]
+            keys, values = keys.ravel(), values.ravel()
+            row_area = lights.row_areas(r0, r1)
+            table = np.bincount(keys, minlength=(r1 - r0) * n_bins).reshape(r1 - r0, n_bins)
+            lit_table = np.bincount(keys[values > lit_threshold],
+                                    minlength=(r1 - r0) * n_bins).reshape(r1 - r0, n_bins)
+            counts += table.sum(axis=0)
+            areas += row_area @ table
+            lit_areas += row_area @ lit_table
+            sums += np.bincount(keys, values, minlength=(r1 - r0) * n_bins).reshape(r1 - r0, n_bins).sum(axis=0)
+        del labels  # geçici dizin silinmeden önce eşleme kapansın
+
+    rows = []
+    for zone in zones:
+        index = zone['zone']
+        count = int(counts[index])
+        rows.append({'zone': index, 'name': zone['name'], 'pixels': count, 'sum': float(sums[index]),
+                     'mean': float(sums[index] / count) if count else float('nan'),
+                     'lit_area_km2': float(lit_areas[index]),
+                     'lit_fraction': float(lit_areas[index] / areas[index]) if areas[index] else 0.0})
+    rows.sort(key=lambda row: row['sum'], reverse=True)
+    return rows
+
+
+def write_table(rows, path):
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=TABLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_table(rows, limit=15):
+    print(f"{'Bölge':<28}{'piksel':>10}{'toplam':>14}{'ortalama':>10}{'ışıklı km²':>14}{'oran':>8}")
+    for row in rows[:limit]:
+        print(f"{row['name'][:27]:<28}{row['pixels']:>10,}{row['sum']:>14,.0f}{row['mean']:>10.2f}"
+              f"{row['lit_area_km2']:>14,.0f}{row['lit_fraction']:>8.1%}")
+
+
+# --- Kıyaslama -----------------------------------------------------------------------
+
+def _synthetic_zones(path, n_cols=24, n_rows=12, seed=0):
+    """Küreyi kaplayan, köşeleri oynatılmış n_cols x n_rows dörtgen 'ülke' (GeoJSON)"""
+    rng = np.random.default_rng(seed)
+    lon = np.linspace(-180, 180, n_cols + 1)
+    lat = np.linspace(-90, 90, n_rows + 1)
+    grid_x, grid_y = np.meshgrid(lon, lat)
+    jitter = rng.uniform(-0.3, 0.3, grid_x.shape + (2,)) * (360 / n_cols, 180 / n_rows)
+    jitter[:, [0, -1], 0] = 0
+    jitter[[0, -1], :, 1] = 0
+    grid_x, grid_y = grid_x + jitter[..., 0], grid_y + jitter[..., 1]
+    features = []
+    for i in range(n_rows):
+        for j in range(n_cols):
+            ring = [(grid_x[i, j], grid_y[i, j]), (grid_x[i, j + 1], grid_y[i, j + 1]),
+                    (grid_x[i + 1, j + 1], grid_y[i + 1, j + 1]), (grid_x[i + 1, j], grid_y[i + 1, j])]
+            ring = [[float(x), float(y)] for x, y in ring + ring[:1]]
+            features.append({'type': 'Feature', 'properties': {'NAME': f'Bölge {i * n_cols + j + 1}'},
+                             'geometry': {'type': 'Polygon', 'coordinates': [ring]}})
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump({'type': 'FeatureCollection', 'features': features}, handle)
+
+
+def _synthetic_raster(path, width, height, seed=0, block_rows=BLOCK_ROWS):
+    """Işık kümeleri içeren küresel float32 GeoTIFF (satır blokları halinde yazılır)"""
+    import rasterio
+    from rasterio.transform import from_bounds
+    from rasterio.windows import Window
+
+    rng = np.random.default_rng(seed)
+    profile = {'driver': 'GTiff', 'width': width, 'height': height, 'count': 1, 'dtype': 'float32',
+               'crs': 'EPSG:4326', 'transform': from_bounds(-180, -90, 180, 90, width, height),
+               'tiled': True, 'blockxsize': 512, 'blockysize': 512, 'nodata': -1.0}
+    with rasterio.open(path, 'w', **profile) as dataset:
+        for r0 in range(0, height, block_rows):
+            r1 = min(height, r0 + block_rows)
+            block = rng.gamma(0.3, 8.0, (r1 - r0, width)).astype(np.float32)
+            block[rng.random(block.shape) < 0.01] = -1.0
+            dataset.write(block, 1, window=Window(0, r0, width, r1 - r0))
+
+
+def _naive_statistics(raster_path, zones, lit_threshold=LIT_THRESHOLD):
+    """Bölge başına maske (geometry_mask) ile tüm raster üzerinden toplama: betiğin doğal uzantısı"""
+    from rasterio import features
+
+    with NightLights(raster_path) as lights:
+        values = lights.read(0, lights.shape[0])
+        areas = np.broadcast_to(lights.row_areas(0, lights.shape[0])[:, None], values.shape)
+        result = {}
+        for zone in zones:
+            mask = features.geometry_mask([zone['geometry']], lights.shape, lights.transform, invert=True)
+            mask &= ~np.isnan(values)
+            zone_values = values[mask]
+            result[zone['zone']] = (zone_values.size, float(zone_values.sum(dtype=np.float64)),
+                                    float(areas[mask][zone_values > lit_threshold].sum()))
+    return result
+
+
+def benchmark(sizes=((3600, 1800), (21600, 10800)), naive_limit=3600 * 1800):
+    print(f"{'raster':<14}{'bölge':>7}{'maske/bölge (s)':>17}{'ilk (s)':>10}{'önbellekli (s)':>16}{'fark':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        zones_path = os.path.join(tmp, 'bolgeler.geojson')
+        _synthetic_zones(zones_path)
+        zones = read_zones(zones_path)
+        cache_dir = os.path.join(tmp, 'onbellek')
+        for width, height in sizes:
+            raster_path = os.path.join(tmp, f'isik_{width}.tif')
+            _synthetic_raster(raster_path, width, height)
+
+            started = time.perf_counter()
+            first = zonal_statistics(raster_path, zones_path, cache_dir=cache_dir)
+            cold = time.perf_counter() - started
+            started = time.perf_counter()
+            zonal_statistics(raster_path, zones_path, cache_dir=cache_dir)
+            warm = time.perf_counter() - started
+
+            naive, difference = '-', '-'
+            if width * height <= naive_limit:
+                started = time.perf_counter()
+                reference = _naive_statistics(raster_path, zones)
+                naive = f'{time.perf_counter() - started:.2f}'
+                difference = max(abs(row['sum'] - reference[row['zone']][1]) / max(reference[row['zone']][1], 1)
+                                 for row in first)
+                difference = f'{difference:.1e}'
+            print(f"{f'{width}x{height}':<14}{len(zones):>7}{naive:>17}{cold:>10.2f}{warm:>16.2f}{difference:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gece ışıkları için ülke/il bazında bölgesel istatistikler')
+    parser.add_argument('raster', nargs='?', help='Gece ışıkları rasterı (GeoTIFF ya da küresel JPEG)')
+    parser.add_argument('zones', nargs='?', help='Bölge poligonları (.gpkg, .geojson; geopandas ile .shp/.zip)')
+    parser.add_argument('-o', '--output', default='gece_isiklari_bolgeler.csv', help='Çıktı tablosu (CSV)')
+    parser.add_argument('--name-field', help='Bölge adı sütunu (varsayılan: NAME, ADMIN, NAME_1, ...)')
+    parser.add_argument('--layer', help='GeoPackage katmanı')
+    parser.add_argument('--threshold', type=float, default=LIT_THRESHOLD, help='Işıklı piksel eşiği')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Etiket ızgarası önbelleği')
+    parser.add_argument('--no-cache', action='store_true', help='Etiket ızgarasını önbelleğe alma')
+    parser.add_argument('--all-touched', action='store_true', help='Poligona değen tüm pikselleri say')
+    parser.add_argument('--benchmark', action='store_true', help='Sentetik verilerle kıyaslama')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark()
+        return 0
+    if not args.raster or not args.zones:
+        parser.error('raster ve bölge dosyası ya da --benchmark gerekli')
+    started = time.perf_counter()
+    rows = zonal_statistics(args.raster, args.zones, args.name_field, args.layer, args.threshold,
+                            None if args.no_cache else args.cache_dir, all_touched=args.all_touched)
+    write_table(rows, args.output)
+    print(f"✅ {len(rows)} bölge -> {args.output} ({time.perf_counter() - started:.2f} s)\n")
+    print_table(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vektörel güneş geometrisi ve gölge hesabı.
+
+"Calculate to the Sun rays" betiğindeki solar_elevation / shadow_length
+fonksiyonları tek şehir, gün ve saat için math skalerleriyle çalışır. Buradaki
+sürümler enlem, gün ve saat dizilerini NumPy kurallarıyla yayınlar (broadcast)
+ve yükseklik, azimut ve gölge dizileri döndürür.
+
+Model (NOAA güneş hesaplayıcısının kullandığı Spencer 1971 Fourier serileri):
+  kesirli yıl   g = 2π/365 * (gün - 1 + (saat - 12) / 24)
+  deklinasyon   δ = 0.006918 - 0.399912 cos g + 0.070257 sin g - 0.006758 cos 2g
+                    + 0.000907 sin 2g - 0.002697 cos 3g + 0.00148 sin 3g       (radyan)
+  zaman denk.   E = 229.18 (0.000075 + 0.001868 cos g - 0.032077 sin g
+                    - 0.014615 cos 2g - 0.040849 sin 2g)                       (dakika)
+Eski formülün (23.44 cos) deklinasyon hatası ~1°'ye, zaman denkleminin
+yokluğu ise ±16 dakikaya (±4° saat açısı) varır.
+
+Boylam verilmezse saat yerel ortalama güneş zamanıdır (eski betikteki gibi);
+boylam verilirse saat, utc_offset saat dilimindeki saat olarak yorumlanır.
+
+Büyük ızgaralar (binlerce yerleşim x 365 gün x 24 saat) solar_table ile
+yerleşim parçaları halinde hesaplanır; gün/saat terimleri bir kez hesaplanır,
+sonuçlar float32 dizilere (ya da verilen memmap'lere) yazılır.
+
+Kıyaslama:  python gunes_geometrisi.py --benchmark
+"""
+
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+# Parça başına en fazla bu kadar (yerleşim x gün x saat) elemanı hesaplanır
+CHUNK_ELEMENTS = 2_000_000
+TABLE_FIELDS = ('elevation', 'azimuth', 'shadow')
+
+
+# --- Eski skaler sürümler (karşılaştırma ve kıyaslama için) -------------------------
+
+def scalar_solar_elevation(latitude, day_of_year, hour):
+    """Betikteki basitleştirilmiş skaler formül (derece, negatifse 0)"""
+    declination = 23.44 * math.cos(math.radians((360 / 365) * (day_of_year - 172)))
+    hour_angle = 15 * (hour - 12)
+    sin_elevation = (math.sin(math.radians(latitude)) * math.sin(math.radians(declination)) +
+                     math.cos(math.radians(latitude)) * math.cos(math.radians(declination)) *
+                     math.cos(math.radians(hour_angle)))
+    elevation_angle = math.degrees(math.asin(sin_elevation))
+    return max(elevation_angle, 0)
+
+
+def scalar_shadow_length(elevation_angle):
+    if elevation_angle <= 0:
+        return float("inf")
+    return round(1 / math.tan(math.radians(elevation_angle)), 2)
+
+
+# --- Vektörel model -----------------------------------------------------------------
+
+def _fractional_year(day_of_year, hour):
+    return 2 * np.pi / 365 * (np.asarray(day_of_year, dtype=np.float64) - 1 +
+                              (np.asarray(hour, dtype=np.float64) - 12) / 24)
+
+
+def declination(day_of_year, hour=12):
+    """Güneş deklinasyonu (radyan)"""
+    g = _fractional_year(day_of_year, hour)
+    return (0.006918 - 0.399912 * np.cos(g) + 0.070257 * np.sin(g) - 0.006758 * np.cos(2 * g)
+            + 0.000907 * np.sin(2 * g) - 0.002697 * np.cos(3 * g) + 0.00148 * np.sin(3 * g))
+
+
+def equation_of_time(day_of_year, hour=12):
+    """Zaman denklemi (dakika): gerçek güneş zamanı - ortalama güneş zamanı"""
+    g = _fractional_year(day_of_year, hour)
+    return 229.18 * (0.000075 + 0.001868 * np.cos(g) - 0.032077 * np.sin(g)
+                     - 0.014615 * np.cos(2 * g) - 0.040849 * np.sin(2 * g))
+
+
+def hour_angle(day_of_year, hour, longitude=None, utc_offset=None):
+    """Saat açısı (derece); öğlen 0, öğleden önce negatif"""
+    hour = np.asarray(hour, dtype=np.float64)
+    solar_minutes = hour * 60 + equation_of_time(day_of_year, hour)
+    if longitude is not None:
+        longitude = np.asarray(longitude, dtype=np.float64)
+        if utc_offset is None:
+            utc_offset = np.round(longitude / 15)
+        solar_minutes = solar_minutes + 4 * longitude - 60 * np.asarray(utc_offset, dtype=np.float64)
+    return solar_minutes / 4 - 180
+
+
+def _position(sin_lat, cos_lat, sin_dec, tan_dec, cos_dec_cos_ha, cos_ha, sin_ha):
+    """Güneş yüksekliğinin sinüsü, yükseklik ve azimut (derece, azimut kuzeyden saat yönünde)"""
+    sin_elevation = np.clip(sin_lat * sin_dec + cos_lat * cos_dec_cos_ha, -1.0, 1.0)
+    elevation = np.degrees(np.arcsin(sin_elevation))
+    azimuth = np.degrees(np.arctan2(sin_ha, cos_ha * sin_lat - tan_dec * cos_lat))
+    azimuth += 180.0
+    return sin_elevation, elevation, azimuth
+
+
+def _shadow(sin_elevation, height):
+    # cot(e) = cos(e) / sin(e); güneş ufkun altındaysa inf
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shadow = height * np.sqrt(1.0 - sin_elevation ** 2) / sin_elevation
+    shadow[sin_elevation <= 0] = np.inf
+    return shadow
+
+
+def solar_position(latitude, day_of_year, hour, longitude=None, utc_offset=None):
+    """Güneş yüksekliği (ufkun altında negatif) ve azimutu; girdiler yayınlanır"""
+    latitude = np.radians(np.asarray(latitude, dtype=np.float64))
+    dec = declination(day_of_year, hour)
+    ha = np.radians(hour_angle(day_of_year, hour, longitude, utc_offset))
+    cos_ha = np.cos(ha)
+    _, elevation, azimuth = _position(np.sin(latitude), np.cos(latitude), np.sin(dec), np.tan(dec),
+                                      np.cos(dec) * cos_ha, cos_ha, np.sin(ha))
+    return elevation, azimuth
+
+
+def solar_elevation(latitude, day_of_year, hour, longitude=None, utc_offset=None):
+    """Güneş yüksekliği (derece, ufkun altında 0; eski fonksiyonla aynı sözleşme)"""
+    elevation, _ = solar_position(latitude, day_of_year, hour, longitude, utc_offset)
+    return np.maximum(elevation, 0.0)
+
+
+def shadow_length(elevation_angle, height=1.0):
+    """'height' boyundaki cismin gölge boyu; güneş ufkun altındaysa inf"""
+    elevation = np.radians(np.asarray(elevation_angle, dtype=np.float64))
+    with np.errstate(divide='ignore'):
+        return np.where(elevation > 0, height / np.tan(np.maximum(elevation, 1e-12)), np.inf)
+
+
+def iter_solar_table(latitudes, days, hours, longitudes=None, utc_offset=None, height=1.0,
+                     chunk_elements=CHUNK_ELEMENTS):
+    """Yerleşim x gün x saat tablosunu parça parça üret: (yerleşim dilimi, {alan: dizi})
+
+    Gün ve saate bağlı terimler (deklinasyon, zaman denklemi, saat açısı) bir kez
+    hesaplanır. Boylamın saat açısına kattığı kayma toplama formülüyle eklenir
+    (cos(a+b) = cos a cos b - sin a sin b); eleman başına trigonometri yalnızca
+    arcsin ve arctan2'dir.
+    """
+    latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+    days = np.atleast_1d(np.asarray(days, dtype=np.float64))[:, None]
+    hours = np.atleast_1d(np.asarray(hours, dtype=np.float64))[None, :]
+    shift = None
+    if longitudes is not None:
+        longitudes = np.broadcast_to(np.asarray(longitudes, dtype=np.float64), latitudes.shape)
+        offsets = np.round(longitudes / 15) if utc_offset is None else \
+            np.broadcast_to(np.asarray(utc_offset, dtype=np.float64), latitudes.shape)
+        shift = np.radians((4 * longitudes - 60 * offsets) / 4)   # dakika -> derece -> radyan
+
+    dec = declination(days, hours)
+    ha = np.radians(hour_angle(days, hours))
+    sin_dec, tan_dec = np.sin(dec)[None], np.tan(dec)[None]
+    cos_ha, sin_ha = np.cos(ha)[None], np.sin(ha)[None]
+    cos_dec = np.cos(dec)[None]
+    per_site = max(1, chunk_elements // dec.size)
+    for start in range(0, len(latitudes), per_site):
+        sites = slice(start, min(start + per_site, len(latitudes)))
+        lat = np.radians(latitudes[sites])[:, None, None]
+        if shift is None:
+            site_cos_ha, site_sin_ha = cos_ha, sin_ha
+        else:
+            cos_shift, sin_shift = np.cos(shift[sites])[:, None, None], np.sin(shift[sites])[:, None, None]
+            site_cos_ha = cos_ha * cos_shift - sin_ha * sin_shift
+            site_sin_ha = sin_ha * cos_shift + cos_ha * sin_shift
+        sin_elevation, elevation, azimuth = _position(np.sin(lat), np.cos(lat), sin_dec, tan_dec,
+                                                      cos_dec * site_cos_ha, site_cos_ha, site_sin_ha)
+        yield sites, {'elevation': elevation, 'azimuth': np.broadcast_to(azimuth, elevation.shape),
+                      'shadow': _shadow(sin_elevation, height)}
+
+
+def solar_table(latitudes, days, hours, longitudes=None, utc_offset=None, height=1.0,
+                chunk_elements=CHUNK_ELEMENTS, out=None, dtype=np.float32):
+    """Tüm tabloyu (yerleşim, gün, saat) biçiminde doldur
+
+    out verilirse ({'elevation', 'azimuth', 'shadow'} -> dizi ya da np.memmap) sonuçlar
+    oraya yazılır; böylece bellekten büyük tablolar diske parça parça akıtılabilir.
+    """
+    shape = (np.size(latitudes), np.size(days), np.size(hours))
+    if out is None:
+        out = {name: np.empty(shape, dtype=dtype) for name in TABLE_FIELDS}
+    for sites, chunk in iter_solar_table(latitudes, days, hours, longitudes, utc_offset, height, chunk_elements):
+        for name in TABLE_FIELDS:
+            out[name][sites] = chunk[name]
+    return out
+
+
+def benchmark(n_sites=3_000, scalar_sites=30, seed=0):
+    """Yıllık saatlik tablo: skaler döngü ile vektörel motorun karşılaştırılması"""
+    rng = np.random.default_rng(seed)
+    latitudes = rng.uniform(36, 42, n_sites)
+    longitudes = rng.uniform(26, 45, n_sites)
+    days, hours = np.arange(1, 366), np.arange(24) + 0.5
+    per_site = len(days) * len(hours)
+
+    start = time.perf_counter()
+    for latitude in latitudes[:scalar_sites].tolist():
+        for day in days.tolist():
+            for hour in hours.tolist():
+                scalar_shadow_length(scalar_solar_elevation(latitude, day, hour))
+    scalar = (time.perf_counter() - start) / scalar_sites * n_sites
+
+    start = time.perf_counter()
+    table = solar_table(latitudes, days, hours)
+    vector = time.perf_counter() - start
+    start = time.perf_counter()
+    solar_table(latitudes, days, hours, longitudes)
+    vector_longitude = time.perf_counter() - start
+
+    print(f"🌞 {n_sites:,} yerleşim x 365 gün x 24 saat = {n_sites * per_site:,} konum")
+    print(f"{'Yöntem':<44}{'süre (s)':>10}")
+    print(f"{f'skaler döngü (ilk {scalar_sites} yerleşimden kestirim)':<44}{scalar:>10.1f}")
+    print(f"{'vektörel, yerel güneş saati':<44}{vector:>10.2f}")
+    print(f"{'vektörel, boylam + saat dilimi':<44}{vector_longitude:>10.2f}")
+    print(f"   hızlanma: {scalar / vector:.0f}x, tablo belleği "
+          f"{sum(array.nbytes for array in table.values()) / 1e6:.0f} MB (float32)")
+
+    # Eski basitleştirilmiş model ile fark (aynı yerel güneş saati)
+    reference = np.array([[scalar_solar_elevation(latitudes[0], day, hour) for hour in hours.tolist()]
+                          for day in days.tolist()])
+    difference = np.abs(np.maximum(table['elevation'][0], 0) - reference)
+    print(f"   eski modelden fark: en fazla {difference.max():.2f}°, ortalama {difference.mean():.2f}°")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Vektörel güneş yüksekliği, azimut ve gölge hesabı')
+    parser.add_argument('--benchmark', action='store_true', help='Skaler döngü ile karşılaştır')
+    parser.add_argument('--sites', type=int, default=3_000, help='Kıyaslamadaki yerleşim sayısı')
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        benchmark(args.sites)
+        return 0
+    parser.print_help()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
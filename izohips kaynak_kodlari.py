@@ -1,6 +1,8 @@
 import rasterio
 import matplotlib.pyplot as plt
-import numpy as np
+
+from izohips_aktarim import export_isolines
+from izohips_motoru import IsolineEngine, output_pixels
 
 # --- AYARLAR ---
 # İndirdiğiniz GeoTIFF dosyasının adını buraya yazın
@@ -12,17 +14,19 @@ kontur_sayisi = 15           # Siyah izohips çizgilerinin sayısı
 renk_paleti = 'terrain'      # Renk paleti. Diğer seçenekler: 'gist_earth', 'viridis', 'plasma', 'jet'
 harita_basligi = 'Bölgenin İzohips Haritası'
 
+# İzohipsleri CBS'de kullanmak için vektör dosyası olarak da kaydedebilirsiniz
+vektor_cikti = None          # Örn. 'izohipsler.gpkg' (.geojson ve .shp de desteklenir)
+izohips_araligi = 10         # Vektör çıktıdaki izohips aralığı (metre)
+harita_olcegi = 25000        # Çizgi sadeleştirme ölçeği (1:25.000 -> haritada 0.2 mm tolerans)
+
 # 2. DEM verisini oku
+# İzohips motoru DEM'i doğrudan çıktı çözünürlüğüne göre küçültülmüş okur
+# (tam çözünürlüklü dizi bellekte tutulmaz) ve çizgi geometrisini önbellekte
+# tutar (stil değişikliklerinde konturlar yeniden izlenmez). Kalıcı önbellek için: cache_dir='.arazi_onbellek'
 try:
-    with rasterio.open(dem_dosyasi) as src:
-        elevation = src.read(1)
-        nodata = src.nodata
-        if nodata is not None:
-            elevation = np.ma.masked_equal(elevation, nodata)
-        bounds = src.bounds
-        extent = [bounds.left, bounds.right, bounds.bottom, bounds.top]
-
-except FileNotFoundError:
+    motor = IsolineEngine(dem_dosyasi)
+
+except rasterio.errors.RasterioIOError:
     print(f"HATA: '{dem_dosyasi}' adında bir dosya bulunamadı.")
     print("Lütfen dosya adını kontrol edin ve dosyanın kodla aynı klasörde olduğundan emin olun.")
     exit()
@@ -33,25 +37,22 @@ except Exception as e:
 # 3. Haritayı çizmeye başla
 fig, ax = plt.subplots(figsize=(12, 10))
 
-# X ve Y koordinatları için bir grid oluşturalım (contour ve contourf için gerekli)
-x = np.linspace(extent[0], extent[1], elevation.shape[1])
-y = np.linspace(extent[2], extent[3], elevation.shape[0])
-X, Y = np.meshgrid(x, y)
+# Izgara, eksenin çıktıdaki piksel sayısına göre seçilir (tam çözünürlüklü meshgrid yok)
+piksel_butcesi = output_pixels(fig, ax)
 
-# 4. Arka planı pürüzsüz bir şekilde renklendir (YENİ YÖNTEM)
-# contourf fonksiyonu, yumuşak renk geçişleri oluşturur.
-# levels sayısını yüksek tutarak (örn. 100) pürüzsüzlüğü artırıyoruz.
-image = ax.contourf(X, Y, elevation, levels=100, cmap=renk_paleti)
+# 4. Arka planı pürüzsüz bir şekilde renklendir
+# contourf(levels=100) yerine 100 bantlı renk haritasıyla tek bir imshow çizilir.
+image = motor.draw_fill(ax, cmap=renk_paleti, bands=100, max_pixels=piksel_butcesi)
 
 # 5. İzohips (kontur) çizgilerini çiz
-# Bu kısım aynı kalıyor
-konturlar = ax.contour(X, Y, elevation, levels=kontur_sayisi, colors='black', linewidths=0.5)
+# Belirli bir aralık için (ör. 10 m): motor.draw_lines(ax, interval=10, ...)
+konturlar = motor.draw_lines(ax, levels=kontur_sayisi, max_pixels=piksel_butcesi,
+                             colors='black', linewidths=0.5)
 
 # 6. İzohips çizgilerinin üzerine yükseklik değerlerini yazdır
 ax.clabel(konturlar, inline=True, fontsize=8, fmt='%1.0f m')
 
 # 7. Renk skalası (Colorbar) ekle (GÜNCELLENDİ)
-# Artık colorbar'ı imshow'dan değil, contourf'den oluşturulan 'image' değişkeninden alıyoruz.
 cbar = fig.colorbar(image, ax=ax, shrink=0.7, orientation='vertical', label='Yükseklik (metre)')
 
 # 8. Haritaya başlık ve eksen etiketleri ekle
@@ -62,7 +63,13 @@ ax.set_ylabel('Enlem (Latitude)')
 # Haritanın en-boy oranını koru
 ax.set_aspect('equal', adjustable='box')
 
-# 9. Haritayı göster
+# 9. İsteğe bağlı: izohipsleri vektör dosyasına aktar
+# Büyük DEM'lerde paralel karo işleme için komut satırını kullanın:
+#   python izohips_aktarim.py dem_verisi.tif izohipsler.gpkg --interval 10 --scale 25000 --workers 8
+if vektor_cikti:
+    export_isolines(dem_dosyasi, vektor_cikti, interval=izohips_araligi, map_scale=harita_olcegi, n_workers=1)
+
+# 10. Haritayı göster
 plt.show()
 
 print("Pürüzsüz harita başarıyla oluşturuldu!")
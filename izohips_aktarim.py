@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İzohipslerin CBS için vektör dışa aktarımı (GeoJSON / GeoPackage / Shapefile).
+
+DEM karo karo, süreç havuzundaki işçilerde pencereli okunur ve her karoda
+izohipsler contourpy ile izlenir. Komşu karolar sınır satır/sütununu
+paylaştığından karo dikişini kesen çizgilerin uçları aynı noktaya düşer;
+bu parçalar ana süreçte geldikçe birleştirilir (stitch). Tamamlanan çizgiler
+hemen dosyaya yazılır; bellekte yalnızca henüz işlenmemiş karolara uzanan
+açık zincirler kalır.
+
+Douglas-Peucker sadeleştirmesi uç noktaları koruduğundan tüm parçalar
+işçilerde paralel sadeleştirilir ve dikiş noktaları sabit kalır (numba
+kuruluysa JIT çekirdeği kullanılır).
+
+Seviyeler sabit bir aralığın katlarıdır (ör. 10 m); her karo kendi değer
+aralığındaki katları izlediği için tüm raster üzerinde ön geçiş gerekmez.
+
+Yazıcılar yalnızca standart kütüphaneyi kullanır (json, sqlite3, struct).
+
+Çalıştırma:  python izohips_aktarim.py dem.tif izohipsler.gpkg --interval 10 --scale 25000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import rasterio
+from contourpy import contour_generator
+from rasterio.crs import CRS
+from rasterio.windows import Window
+from scipy.ndimage import gaussian_filter
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+VECTOR_FORMATS = {'.geojson': 'GeoJSON', '.json': 'GeoJSON', '.gpkg': 'GPKG', '.shp': 'ESRI Shapefile'}
+
+# Haritada ayırt edilebilen en küçük uzunluk (0.2 mm); tolerans = ölçek paydası * bu değer
+MAP_RESOLUTION_M = 0.0002
+
+# Dikiş uçlarının eşleştirme hassasiyeti (piksel boyutunun kesri)
+SEAM_TOLERANCE = 1e-6
+
+
+# --- Douglas-Peucker sadeleştirme ------------------------------------------------
+
+def _douglas_peucker(points, tolerance):
+    """Tutulacak köşelerin maskesi (yığın tabanlı, özyinelemesiz)"""
+    n_points = len(points)
+    keep = np.zeros(n_points, dtype=np.bool_)
+    keep[0] = keep[-1] = True
+    stack = [(0, n_points - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        inner = points[start + 1:end]
+        origin = points[start]
+        direction = points[end] - origin
+        length = np.hypot(*direction)
+        if length == 0:
+            # Kapalı halka: başlangıç noktasına uzaklık
+            distance = np.hypot(inner[:, 0] - origin[0], inner[:, 1] - origin[1])
+        else:
+            distance = np.abs(direction[0] * (inner[:, 1] - origin[1]) -
+                              direction[1] * (inner[:, 0] - origin[0])) / length
+        index = int(np.argmax(distance))
+        if distance[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _douglas_peucker_numba(points, tolerance):
+        """_douglas_peucker ile aynı algoritma, JIT derlenmiş köşe döngüsü ile"""
+        n_points = len(points)
+        keep = np.zeros(n_points, dtype=np.bool_)
+        keep[0] = keep[-1] = True
+        stack = np.empty((n_points, 2), dtype=np.int64)
+        stack[0, 0], stack[0, 1] = 0, n_points - 1
+        depth = 1
+        while depth:
+            depth -= 1
+            start, end = stack[depth, 0], stack[depth, 1]
+            if end - start < 2:
+                continue
+            x0, y0 = points[start, 0], points[start, 1]
+            dx, dy = points[end, 0] - x0, points[end, 1] - y0
+            length = np.sqrt(dx * dx + dy * dy)
+            best, split = -1.0, start
+            for i in range(start + 1, end):
+                if length == 0:
+                    distance = np.sqrt((points[i, 0] - x0) ** 2 + (points[i, 1] - y0) ** 2)
+                else:
+                    distance = abs(dx * (points[i, 1] - y0) - dy * (points[i, 0] - x0)) / length
+                if distance > best:
+                    best, split = distance, i
+            if best > tolerance:
+                keep[split] = True
+                stack[depth, 0], stack[depth, 1] = start, split
+                stack[depth + 1, 0], stack[depth + 1, 1] = split, end
+                depth += 2
+        return keep
+
+
+def simplify_line(points, tolerance):
+    """Douglas-Peucker ile sadeleştir; uç noktalar (ve kapalı halkalar) korunur"""
+    if len(points) < 3 or not tolerance:
+        return points
+    if numba is not None:
+        return points[_douglas_peucker_numba(np.ascontiguousarray(points, dtype=np.float64), tolerance)]
+    return points[_douglas_peucker(points, tolerance)]
+
+
+# --- karo izleme (işçi süreçleri) ------------------------------------------------
+
+_dataset = None
+
+
+def _init_worker(dem_path):
+    """Her işçi DEM'i bir kez açar"""
+    global _dataset
+    _dataset = rasterio.open(dem_path)
+
+
+def _smooth_nan(z, sigma):
+    """NaN'ları yaymadan gaussian yumuşatma (normalize konvolüsyon)"""
+    valid = np.isfinite(z)
+    weights = gaussian_filter(valid.astype(np.float64), sigma)
+    smoothed = gaussian_filter(np.where(valid, z, 0.0), sigma)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        smoothed /= weights
+    smoothed[~valid] = np.nan
+    return smoothed
+
+
+def interval_levels(zmin, zmax, interval):
+    """[zmin, zmax] içindeki aralık katlarını tam sayı k'dan k*interval olarak üret.
+
+    np.arange(başlangıç, ..., interval) birikimli toplam yaptığından aynı seviye
+    farklı karolarda farklı float'a düşebilir (1003.1000000000007 / 1003.1) ve
+    dikiş anahtarları eşleşmez; k*interval her karoda aynı değeri verir.
+    """
+    first, last = np.ceil(zmin / interval), np.floor(zmax / interval)
+    return np.round(np.arange(first, last + 1) * interval, 10)
+
+
+def _trace_tile(row_off, col_off, n_rows, n_cols, interval, levels, sigma, tolerance):
+    """Bir karonun izohipslerini izle.
+
+    Dönüş: (tamamlanmış çizgiler, dikiş parçaları); çizgiler (seviye, (N, 2) dizi),
+    parçalar ayrıca hangi ucun dikişte olduğunu taşır: (seviye, dizi, baş, son)
+    """
+    dataset = _dataset
+    height, width = dataset.height, dataset.width
+    # Yumuşatma için halo; sağ/alt komşuyla paylaşılan sınır satır/sütunu dahil
+    halo = int(4 * sigma + 0.5) if sigma else 0
+    r0, c0 = max(0, row_off - halo), max(0, col_off - halo)
+    r1 = min(height, row_off + n_rows + 1 + halo)
+    c1 = min(width, col_off + n_cols + 1 + halo)
+    z = dataset.read(1, window=Window(c0, r0, c1 - c0, r1 - r0)).astype(np.float64)
+    if dataset.nodata is not None:
+        z[z == dataset.nodata] = np.nan
+    if sigma:
+        z = _smooth_nan(z, sigma)
+
+    # Halo'yu kırp: karo + paylaşılan sınır
+    rows = slice(row_off - r0, min(height, row_off + n_rows + 1) - r0)
+    cols = slice(col_off - c0, min(width, col_off + n_cols + 1) - c0)
+    z = z[rows, cols]
+    if z.shape[0] < 2 or z.shape[1] < 2 or not np.isfinite(z).any():
+        return [], []
+
+    transform = dataset.transform
+    x = transform.c + (col_off + np.arange(z.shape[1]) + 0.5) * transform.a
+    y = transform.f + (row_off + np.arange(z.shape[0]) + 0.5) * transform.e
+
+    if levels is None:
+        tile_levels = interval_levels(np.nanmin(z), np.nanmax(z), interval)
+    else:
+        tile_levels = [level for level in levels if np.nanmin(z) <= level <= np.nanmax(z)]
+
+    # Yalnızca raster içindeki karo kenarları dikiştir
+    seams = []
+    if row_off > 0:
+        seams.append((1, y[0]))
+    if row_off + n_rows < height - 1:
+        seams.append((1, y[-1]))
+    if col_off > 0:
+        seams.append((0, x[0]))
+    if col_off + n_cols < width - 1:
+        seams.append((0, x[-1]))
+
+    # Kenar üzerindeki noktalar (1-f)*x0 + f*x1 ile hesaplandığından tam eşitlik beklenmez
+    seam_tolerance = abs(transform.a) * SEAM_TOLERANCE
+
+    def on_seam(point):
+        return any(abs(point[axis] - value) <= seam_tolerance for axis, value in seams)
+
+    generator = contour_generator(x, y, np.ma.masked_invalid(z), line_type='Separate')
+    complete, fragments = [], []
+    for level in tile_levels:
+        for line in generator.lines(float(level)):
+            closed = len(line) > 2 and np.array_equal(line[0], line[-1])
+            # Sadeleştirme uç noktaları koruduğu için dikiş parçaları da işçide sadeleştirilir
+            line = simplify_line(line, tolerance)
+            head_on_seam = not closed and on_seam(line[0])
+            tail_on_seam = not closed and on_seam(line[-1])
+            if head_on_seam or tail_on_seam:
+                fragments.append((float(level), line, head_on_seam, tail_on_seam))
+            else:
+                complete.append((float(level), line))
+    return complete, fragments
+
+
+# --- dikiş birleştirme -----------------------------------------------------------
+
+class _Chain:
+    """Birleştirilmekte olan parça zinciri; head/tail: dikişteki açık uç anahtarı ya da None"""
+    __slots__ = ('level', 'parts', 'head', 'tail')
+
+    def __init__(self, level, line, head, tail):
+        self.level, self.parts, self.head, self.tail = level, [line], head, tail
+
+    def reverse(self):
+        self.parts = [part[::-1] for part in reversed(self.parts)]
+        self.head, self.tail = self.tail, self.head
+
+    def merged(self):
+        return np.concatenate(self.parts)
+
+
+class SeamStitcher:
+    """Karo dikişlerinde uçları çakışan aynı seviyeli parçaları geldikçe birleştirir.
+
+    Açık uçlar sözlükte tutulur; iki ucu da dikişten kurtulan (ya da halkaya
+    kapanan) zincirler hemen döndürülür. Karolar satır sırasıyla geldiğinden
+    bellekte yalnızca henüz işlenmemiş karolara uzanan zincirler kalır.
+    """
+
+    def __init__(self, quantum):
+        self.quantum = quantum
+        self.open_ends = {}
+
+    def _key(self, level, point):
+        return level, round(point[0] / self.quantum), round(point[1] / self.quantum)
+
+    def add(self, level, line, head_on_seam, tail_on_seam):
+        """Bir parçayı ekle; tamamlanan (seviye, çizgi) listesini döndür"""
+        chain = _Chain(level, line, self._key(level, line[0]) if head_on_seam else None,
+                       self._key(level, line[-1]) if tail_on_seam else None)
+        for end in ('head', 'tail'):
+            end_key = getattr(chain, end)
+            if end_key is None:
+                continue
+            other = self.open_ends.pop(end_key, None)
+            if other is None:
+                continue
+            if other is chain:
+                # Zincir kendi öbür ucuna ulaştı: kapalı halka
+                merged = chain.merged()
+                merged[-1] = merged[0]
+                return [(level, merged)]
+            chain = self._join(other, chain, end_key)
+
+        if chain.head is None and chain.tail is None:
+            return [(level, chain.merged())]
+        for end_key in (chain.head, chain.tail):
+            if end_key is not None:
+                self.open_ends[end_key] = chain
+        return []
+
+    @staticmethod
+    def _join(first, second, end_key):
+        """``second``'ı ``first``'e ortak uçtan ekle (first yerinde güncellenir)"""
+        if first.tail != end_key:
+            first.reverse()
+        if second.head != end_key:
+            second.reverse()
+        first.parts.append(second.parts[0][1:])
+        first.parts.extend(second.parts[1:])
+        first.tail = second.tail
+        return first
+
+    def flush(self):
+        """Eşi bulunamayan açık zincirleri olduğu gibi döndür"""
+        chains = {id(chain): chain for chain in self.open_ends.values()}
+        self.open_ends = {}
+        return [(chain.level, chain.merged()) for chain in chains.values()]
+
+
+# --- vektör yazıcılar ------------------------------------------------------------
+
+def _epsg(crs):
+    return crs.to_epsg() if crs is not None else None
+
+
+class GeoJSONWriter:
+    """Özellikleri akış halinde yazan GeoJSON FeatureCollection"""
+
+    def __init__(self, path, crs, layer_name):
+        self.handle = open(path, 'w', encoding='utf-8')
+        header = {'type': 'FeatureCollection', 'name': layer_name}
+        epsg = _epsg(crs)
+        if epsg and epsg != 4326:
+            # RFC 7946 dışı ama QGIS/GDAL'ın tanıdığı eski 'crs' üyesi
+            header['crs'] = {'type': 'name', 'properties': {'name': f'urn:ogc:def:crs:EPSG::{epsg}'}}
+        self.handle.write(json.dumps(header, ensure_ascii=False)[:-1] + ', "features": [\n')
+        self.count = 0
+
+    def write(self, level, line):
+        feature = {'type': 'Feature', 'properties': {'elev': level},
+                   'geometry': {'type': 'LineString', 'coordinates': np.round(line, 9).tolist()}}
+        self.handle.write((',\n' if self.count else '') + json.dumps(feature))
+        self.count += 1
+
+    def close(self):
+        self.handle.write('\n]}\n')
+        self.handle.close()
+
+
+def _wkb_linestring(line):
+    return struct.pack('<BII', 1, 2, len(line)) + np.ascontiguousarray(line, dtype='<f8').tobytes()
+
+
+class GeoPackageWriter:
+    """OGC GeoPackage 1.2 LineString katmanı (sqlite3 ile)"""
+
+    def __init__(self, path, crs, layer_name, batch_size=10_000):
+        if os.path.exists(path):
+            os.remove(path)
+        self.connection = sqlite3.connect(path)
+        self.layer_name = layer_name
+        self.srs_id = _epsg(crs) or -1
+        self.batch_size = batch_size
+        self.batch = []
+        self.bounds = [np.inf, np.inf, -np.inf, -np.inf]
+        self.count = 0
+
+        cursor = self.connection.cursor()
+        cursor.execute('PRAGMA application_id = 1196444487')  # 'GPKG'
+        cursor.execute('PRAGMA user_version = 10200')
+        cursor.execute('''CREATE TABLE gpkg_spatial_ref_sys (
+            srs_name TEXT NOT NULL, srs_id INTEGER PRIMARY KEY, organization TEXT NOT NULL,
+            organization_coordsys_id INTEGER NOT NULL, definition TEXT NOT NULL, description TEXT)''')
+        # Standardın zorunlu kıldığı üç kayıt + katmanın kendi CRS'i
+        srs_rows = [('Undefined cartesian SRS', -1, 'NONE', -1, 'undefined', None),
+                    ('Undefined geographic SRS', 0, 'NONE', 0, 'undefined', None),
+                    ('WGS 84 geodetic', 4326, 'EPSG', 4326, CRS.from_epsg(4326).to_wkt(), None)]
+        if self.srs_id != -1:
+            srs_rows.append((crs.to_string(), self.srs_id, 'EPSG', self.srs_id, crs.to_wkt(), None))
+        cursor.executemany('INSERT OR IGNORE INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)', srs_rows)
+        cursor.execute('''CREATE TABLE gpkg_contents (
+            table_name TEXT NOT NULL PRIMARY KEY, data_type TEXT NOT NULL, identifier TEXT UNIQUE,
+            description TEXT DEFAULT '', last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+            min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE, srs_id INTEGER)''')
+        cursor.execute('''CREATE TABLE gpkg_geometry_columns (
+            table_name TEXT NOT NULL, column_name TEXT NOT NULL, geometry_type_name TEXT NOT NULL,
+            srs_id INTEGER NOT NULL, z TINYINT NOT NULL, m TINYINT NOT NULL,
+            PRIMARY KEY (table_name, column_name))''')
+        cursor.execute(f'CREATE TABLE "{layer_name}" (fid INTEGER PRIMARY KEY AUTOINCREMENT, '
+                       f'geom LINESTRING, elev REAL)')
+        cursor.execute('INSERT INTO gpkg_geometry_columns VALUES (?, ?, ?, ?, 0, 0)',
+                       (layer_name, 'geom', 'LINESTRING', self.srs_id))
+
+    def write(self, level, line):
+        min_x, min_y = line.min(axis=0)
+        max_x, max_y = line.max(axis=0)
+        self.bounds = [min(self.bounds[0], min_x), min(self.bounds[1], min_y),
+                       max(self.bounds[2], max_x), max(self.bounds[3], max_y)]
+        # GeoPackage geometri başlığı: 'GP', sürüm 0, bayraklar (küçük endian + xy zarfı), srs_id, zarf
+        header = b'GP' + struct.pack('<BBi4d', 0, 0b011, self.srs_id, min_x, max_x, min_y, max_y)
+        self.batch.append((header + _wkb_linestring(line), level))
+        self.count += 1
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        self.connection.executemany(f'INSERT INTO "{self.layer_name}" (geom, elev) VALUES (?, ?)', self.batch)
+        self.batch = []
+
+    def close(self):
+        self._flush()
+        bounds = [float(value) if np.isfinite(value) else None for value in self.bounds]
+        self.connection.execute('INSERT INTO gpkg_contents (table_name, data_type, identifier, min_x, min_y, '
+                                'max_x, max_y, srs_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                (self.layer_name, 'features', self.layer_name, *bounds, self.srs_id))
+        self.connection.commit()
+        self.connection.close()
+
+
+class ShapefileWriter:
+    """ESRI Shapefile PolyLine (.shp/.shx/.dbf/.prj) yazıcısı; başlıklar kapanışta güncellenir"""
+
+    SHAPE_POLYLINE = 3
+
+    def __init__(self, path, crs, layer_name):
+        base = os.path.splitext(path)[0]
+        self.shp = open(base + '.shp', 'wb')
+        self.shx = open(base + '.shx', 'wb')
+        self.dbf = open(base + '.dbf', 'wb')
+        for handle in (self.shp, self.shx):
+            handle.write(b'\0' * 100)
+        # dBase III başlığı: tek sayısal alan 'ELEV' (N 12.2)
+        self.dbf.write(b'\0' * 32 + b'ELEV'.ljust(11, b'\0') + b'N' + b'\0' * 4 +
+                       bytes([12, 2]) + b'\0' * 14 + b'\r')
+        if crs is not None:
+            with open(base + '.prj', 'w', encoding='ascii') as prj:
+                prj.write(crs.to_wkt(version='WKT1_ESRI'))
+        with open(base + '.cpg', 'w', encoding='ascii') as cpg:
+            cpg.write('UTF-8')
+        self.bounds = [np.inf, np.inf, -np.inf, -np.inf]
+        self.count = 0
+
+    def write(self, level, line):
+        min_x, min_y = line.min(axis=0)
+        max_x, max_y = line.max(axis=0)
+        self.bounds = [min(self.bounds[0], min_x), min(self.bounds[1], min_y),
+                       max(self.bounds[2], max_x), max(self.bounds[3], max_y)]
+        content = (struct.pack('<i4dii', self.SHAPE_POLYLINE, min_x, min_y, max_x, max_y, 1, len(line)) +
+                   struct.pack('<i', 0) + np.ascontiguousarray(line, dtype='<f8').tobytes())
+        self.count += 1
+        offset = self.shp.tell() // 2
+        self.shp.write(struct.pack('>ii', self.count, len(content) // 2) + content)
+        self.shx.write(struct.pack('>ii', offset, len(content) // 2))
+        self.dbf.write(b' ' + f'{level:12.2f}'.encode('ascii'))
+
+    def _header(self, handle):
+        bounds = [float(value) if np.isfinite(value) else 0.0 for value in self.bounds]
+        length = handle.tell() // 2
+        handle.seek(0)
+        handle.write(struct.pack('>i5ii', 9994, 0, 0, 0, 0, 0, length) +
+                     struct.pack('<ii8d', 1000, self.SHAPE_POLYLINE, *bounds, 0, 0, 0, 0))
+
+    def close(self):
+        for handle in (self.shp, self.shx):
+            self._header(handle)
+            handle.close()
+        self.dbf.write(b'\x1a')
+        today = time.localtime()
+        self.dbf.seek(0)
+        self.dbf.write(struct.pack('<4BIHH', 3, today.tm_year - 1900, today.tm_mon, today.tm_mday,
+                                   self.count, 32 + 32 + 1, 1 + 12))
+        self.dbf.close()
+
+
+WRITERS = {'GeoJSON': GeoJSONWriter, 'GPKG': GeoPackageWriter, 'ESRI Shapefile': ShapefileWriter}
+
+
+def open_writer(path, crs, layer_name='izohips'):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in VECTOR_FORMATS:
+        raise ValueError(f"Desteklenmeyen vektör biçimi: {extension!r} "
+                         f"(seçenekler: {', '.join(VECTOR_FORMATS)})")
+    return WRITERS[VECTOR_FORMATS[extension]](path, crs, layer_name)
+
+
+# --- dışa aktarım ----------------------------------------------------------------
+
+def _tile_results(dem_path, tiles, n_workers, *args):
+    """Karo sonuçlarını karo sırasıyla üret; uçuştaki karo sayısı sınırlıdır"""
+    if n_workers == 1:
+        # Süreç havuzu olmadan (ör. __main__ koruması olmayan betiklerden çağrı)
+        _init_worker(dem_path)
+        try:
+            for tile in tiles:
+                yield _trace_tile(*tile, *args)
+        finally:
+            _dataset.close()
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(dem_path,)) as executor:
+        pending = deque()
+        tile_iter = iter(tiles)
+        while True:
+            while len(pending) < 2 * n_workers and (tile := next(tile_iter, None)) is not None:
+                pending.append(executor.submit(_trace_tile, *tile, *args))
+            if not pending:
+                break
+            yield pending.popleft().result()
+
+
+def export_isolines(dem_path, output_path, interval=10, levels=None, tile_size=2048, n_workers=None,
+                    sigma=0.0, tolerance=None, map_scale=None, layer_name='izohips'):
+    """DEM'in izohipslerini karo karo paralel izleyip vektör dosyasına yaz.
+
+    interval: seviye aralığı (m); levels verilirse yalnızca bu seviyeler izlenir
+    tolerance: sadeleştirme toleransı (CRS birimi); map_scale verilirse
+               (ör. 25000) tolerans haritada 0.2 mm'ye karşılık gelen uzunluktur
+    """
+    start = time.perf_counter()
+    with rasterio.open(dem_path) as dataset:
+        height, width = dataset.height, dataset.width
+        crs = dataset.crs
+        pixel_size = abs(dataset.transform.a)
+    if tolerance is None and map_scale:
+        tolerance = map_scale * MAP_RESOLUTION_M
+        if crs is not None and crs.is_geographic:
+            tolerance /= 111000  # Metre -> derece (yaklaşık)
+    if levels is not None:
+        levels = sorted(float(level) for level in levels)
+
+    tiles = [(row_off, col_off, min(tile_size, height - row_off), min(tile_size, width - col_off))
+             for row_off in range(0, height, tile_size) for col_off in range(0, width, tile_size)]
+    n_workers = max(1, min(n_workers or os.cpu_count(), len(tiles)))
+    print(f"🗺️ {height}x{width} DEM, {len(tiles)} karo, {n_workers} işçi süreci")
+
+    writer = open_writer(output_path, crs, layer_name)
+    stitcher = SeamStitcher(pixel_size * SEAM_TOLERANCE)
+    n_fragments = n_vertices = 0
+    try:
+        for complete, fragments in _tile_results(dem_path, tiles, n_workers, interval, levels, sigma, tolerance):
+            n_fragments += len(fragments)
+            for fragment in fragments:
+                complete.extend(stitcher.add(*fragment))
+            for level, line in complete:
+                writer.write(level, line)
+                n_vertices += len(line)
+
+        for level, line in stitcher.flush():
+            writer.write(level, line)
+            n_vertices += len(line)
+    finally:
+        writer.close()
+
+    summary = {'features': writer.count, 'vertices': n_vertices, 'seam_fragments': n_fragments,
+               'seconds': time.perf_counter() - start}
+    print(f"✅ {summary['features']} izohips, {n_vertices} köşe -> {output_path} "
+          f"({summary['seconds']:.1f} s)")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='DEM izohipslerini vektör dosyasına aktar')
+    parser.add_argument('dem_path')
+    parser.add_argument('output_path', help='.geojson, .gpkg ya da .shp')
+    parser.add_argument('--interval', type=float, default=10, help='İzohips aralığı (m)')
+    parser.add_argument('--tile-size', type=int, default=2048)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--sigma', type=float, default=0.0, help='Gaussian yumuşatma (piksel)')
+    parser.add_argument('--scale', type=float, default=None, help='Harita ölçeği paydası (ör. 25000)')
+    parser.add_argument('--tolerance', type=float, default=None, help='Sadeleştirme toleransı (CRS birimi)')
+    args = parser.parse_args(argv)
+    export_isolines(args.dem_path, args.output_path, interval=args.interval, tile_size=args.tile_size,
+                    n_workers=args.workers, sigma=args.sigma, tolerance=args.tolerance, map_scale=args.scale)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hızlı izohips (kontur) motoru.
+
+Tam çözünürlüklü meshgrid ve 100 seviyeli contourf yerine:
+  - DEM, rasterio'nun indirgenmiş okumasıyla (out_shape, ortalama örnekleme)
+    doğrudan çıktı DPI'ına göre boyutlanan 2'nin kuvveti katlı bir ızgaraya
+    okunur (tam çözünürlüklü dizi ve piramit bellekte tutulmaz) ve isteğe
+    bağlı olarak hafifçe yumuşatılır,
+  - dolgu, bantlı (BoundaryNorm) bir renk haritasıyla tek bir imshow'dur,
+  - izohipsler contourpy'nin marching-squares geçişiyle 1-B koordinat
+    vektörleri üzerinde çıkarılır,
+  - çizgi geometrisi seviye ve ızgara başına bellekte (ve istenirse diskte)
+    önbelleklenir; renk/kalınlık/etiket değişiklikleri yeniden izleme yapmaz.
+
+Kıyaslama:  python izohips_motoru.py agri_dagi_DEM.tif
+"""
+
+import hashlib
+import sys
+import time
+
+import numpy as np
+import rasterio
+from contourpy import contour_generator
+from rasterio.enums import Resampling
+from rasterio.windows import Window
+from scipy.ndimage import gaussian_filter
+
+from arazi_onbellek import TerrainCache
+
+# Yükseklik aralığı taramasında bir okumada işlenen satır sayısı
+RANGE_BLOCK_ROWS = 1024
+
+# En kaba ızgaranın kısa kenarı (arazi_piramit.build_pyramid ile aynı alt sınır)
+MIN_GRID_SIZE = 16
+
+
+def output_pixels(fig, ax=None):
+    """Eksenin (yoksa şeklin) çıktı DPI'ındaki piksel sayısı"""
+    width, height = fig.get_size_inches() * fig.dpi
+    if ax is not None:
+        box = ax.get_position()
+        width, height = width * box.width, height * box.height
+    return int(width * height)
+
+
+def contour_levels(zmin, zmax, levels=15, interval=None):
+    """Seviye listesi: sabit aralık (ör. 10 m), sayı (matplotlib gibi MaxNLocator) ya da dizi"""
+    if interval is not None:
+        return np.arange(np.ceil(zmin / interval) * interval, zmax + interval / 2, interval)
+    if np.iterable(levels):
+        return np.asarray(levels, dtype=float)
+    from matplotlib.ticker import MaxNLocator
+    values = MaxNLocator(levels + 1).tick_values(zmin, zmax)
+    # matplotlib.contour gibi aralık dışındaki seviyeleri at
+    return values[(values >= zmin) & (values <= zmax)]
+
+
+class IsolineEngine:
+    """Bir DEM için ızgara, dolgu ve izohips geometrisini üreten ve önbellekleyen motor"""
+
+    def __init__(self, dem_path, sigma=1.0, cache_dir=None):
+        self.dem_path = dem_path
+        self.sigma = sigma
+        self.cache = TerrainCache(cache_dir) if cache_dir else None
+
+        with rasterio.open(dem_path) as src:
+            self.bounds = src.bounds
+            self.transform = src.transform
+            self.crs = src.crs
+            self.shape = (src.height, src.width)
+            # Seviye aralığı tüm ızgaralarda aynı olsun diye tam çözünürlükte, şerit şerit
+            self.zmin, self.zmax = _elevation_range(src)
+        self.extent = [self.bounds.left, self.bounds.right, self.bounds.bottom, self.bounds.top]
+        self._grids = {}
+        self._isolines = {}
+
+    def grid_step(self, max_pixels):
+        """Piksel bütçesine sığan en küçük 2'nin kuvveti indirgeme katı"""
+        height, width = self.shape
+        step = 1
+        while (-(-height // step)) * (-(-width // step)) > max_pixels and \
+                min(height, width) // (2 * step) >= MIN_GRID_SIZE:
+            step *= 2
+        return step
+
+    def grid(self, max_pixels):
+        """Piksel bütçesine sığan (x, y, z) ızgarası; x/y 1-B piksel merkezleri"""
+        step = self.grid_step(max_pixels)
+        if step not in self._grids:
+            height, width = self.shape
+            out_shape = (-(-height // step), -(-width // step))
+            with rasterio.open(self.dem_path) as src:
+                # Ortalama örnekleme nodata'yı yok sayar (eski 2x2 NaN-ortalama piramidi gibi)
+                z = src.read(1, out_shape=out_shape, resampling=Resampling.average, masked=True)
+            z = z.astype(np.float32).filled(np.nan)
+            if self.sigma:
+                # NaN'lar yayılmasın diye yumuşatma doldurulmuş kopyada yapılır
+                invalid = np.isnan(z)
+                z = gaussian_filter(np.where(invalid, np.nanmean(z), z), self.sigma)
+                z[invalid] = np.nan
+            # Izgara kenarı DEM sınırına oturur; tam bölünmeyen boyutlarda hücre step'ten biraz büyüktür
+            dx = (self.bounds.right - self.bounds.left) / out_shape[1]
+            dy = (self.bounds.top - self.bounds.bottom) / out_shape[0]
+            x = self.bounds.left + (np.arange(out_shape[1]) + 0.5) * dx
+            y = self.bounds.top - (np.arange(out_shape[0]) + 0.5) * dy
+            self._grids[step] = (x, y, z)
+        return self._grids[step]
+
+    def isolines(self, levels=15, interval=None, max_pixels=1_000_000):
+        """(seviyeler, seviye başına [(N, 2) köşe dizileri]) — önbellekten ya da izleyerek"""
+        x, y, z = self.grid(max_pixels)
+        levels = contour_levels(self.zmin, self.zmax, levels, interval)
+        memo_key = (z.shape, tuple(levels.tolist()))
+        if memo_key in self._isolines:
+            return levels, self._isolines[memo_key]
+
+        cache_key = None
+        if self.cache is not None:
+            parts = [self.cache.content_hash(self.dem_path), repr(z.shape), repr(self.sigma), repr(levels.tolist())]
+            cache_key = 'izohips-' + hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+            cached = self.cache.load(cache_key)
+            if cached is not None:
+                allsegs = _unpack_lines(cached, len(levels))
+                self._isolines[memo_key] = allsegs
+                return levels, allsegs
+
+        generator = contour_generator(x, y, np.ma.masked_invalid(z), line_type='Separate')
+        allsegs = [generator.lines(level) for level in levels]
+        self._isolines[memo_key] = allsegs
+        if cache_key is not None:
+            self.cache.store(cache_key, _pack_lines(allsegs), meta={'dem_path': self.dem_path})
+        return levels, allsegs
+
+    def draw_fill(self, ax, cmap='terrain', bands=100, max_pixels=1_000_000):
+        """contourf(levels=bands) görünümünü bantlı renk haritalı tek bir imshow ile çiz"""
+        from matplotlib.colors import BoundaryNorm
+        import matplotlib.pyplot as plt
+
+        _, _, z = self.grid(max_pixels)
+        boundaries = np.linspace(self.zmin, self.zmax, bands + 1)
+        colormap = plt.get_cmap(cmap)
+        return ax.imshow(z, extent=self.extent, origin='upper', cmap=colormap,
+                         norm=BoundaryNorm(boundaries, colormap.N), interpolation='nearest')
+
+    def draw_lines(self, ax, levels=15, interval=None, max_pixels=1_000_000, **style):
+        """Önbellekteki izohipsleri ContourSet olarak çiz (clabel ile etiketlenebilir)"""
+        from matplotlib.contour import ContourSet
+
+        levels, allsegs = self.isolines(levels, interval, max_pixels)
+        style.setdefault('colors', 'black')
+        style.setdefault('linewidths', 0.5)
+        return ContourSet(ax, levels, allsegs, **style)
+
+
+def _elevation_range(src, block_rows=RANGE_BLOCK_ROWS):
+    """Bandın (min, max) değeri; DEM bellekte tümüyle tutulmadan şerit şerit okunur"""
+    zmin, zmax = np.inf, -np.inf
+    for row in range(0, src.height, block_rows):
+        window = Window(0, row, src.width, min(block_rows, src.height - row))
+        block = src.read(1, window=window, masked=True)
+        if block.count():
+            zmin, zmax = min(zmin, float(block.min())), max(zmax, float(block.max()))
+    if zmin > zmax:
+        raise ValueError(f"DEM'de geçerli yükseklik yok: {src.name}")
+    return zmin, zmax
+
+
+def _pack_lines(allsegs):
+    """Seviye başına çizgi listelerini önbellek için düz dizilere paketle"""
+    lines = [(index, line) for index, segs in enumerate(allsegs) for line in segs]
+    vertices = np.concatenate([line for _, line in lines]) if lines else np.zeros((0, 2))
+    lengths = np.array([len(line) for _, line in lines], dtype=np.int64)
+    return {'vertices': vertices,
+            'offsets': np.concatenate(([0], np.cumsum(lengths))),
+            'level_index': np.array([index for index, _ in lines], dtype=np.int64)}
+
+
+def _unpack_lines(arrays, n_levels):
+    vertices = np.asarray(arrays['vertices'])
+    offsets = np.asarray(arrays['offsets'])
+    allsegs = [[] for _ in range(n_levels)]
+    for index, start, stop in zip(np.asarray(arrays['level_index']).tolist(), offsets[:-1], offsets[1:]):
+        allsegs[index].append(vertices[start:stop])
+    return allsegs
+
+
+def benchmark(dem_path, levels=15):
+    """Eski meshgrid + contourf(100) + contour(15) yolunu motorla kıyasla"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    with rasterio.open(dem_path) as src:
+        data = src.read(1).astype(float)
+        bounds = src.bounds
+    large = np.tile(data, (4, 4))
+
+    def legacy(elevation):
+        fig, ax = plt.subplots(figsize=(12, 10))
+        x = np.linspace(bounds.left, bounds.right, elevation.shape[1])
+        y = np.linspace(bounds.bottom, bounds.top, elevation.shape[0])
+        X, Y = np.meshgrid(x, y)
+        ax.contourf(X, Y, elevation, levels=100, cmap='terrain')
+        contours = ax.contour(X, Y, elevation, levels=levels, colors='black', linewidths=0.5)
+        ax.clabel(contours, inline=True, fontsize=8, fmt='%1.0f m')
+        fig.canvas.draw()
+        plt.close(fig)
+
+    def engine_draw(engine):
+        fig, ax = plt.subplots(figsize=(12, 10))
+        max_pixels = output_pixels(fig, ax)
+        engine.draw_fill(ax, 'terrain', max_pixels=max_pixels)
+        contours = engine.draw_lines(ax, levels, max_pixels=max_pixels)
+        ax.clabel(contours, inline=True, fontsize=8, fmt='%1.0f m')
+        fig.canvas.draw()
+        plt.close(fig)
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, elevation in [('DEM', data), ('4x4 döşeme', large)]:
+            path = f'{tmp}/dem.tif'
+            with rasterio.open(dem_path) as src:
+                profile = src.profile.copy()
+            profile.update(height=elevation.shape[0], width=elevation.shape[1], dtype='float32')
+            with rasterio.open(path, 'w', **profile) as dst:
+                dst.write(elevation.astype(np.float32), 1)
+
+            print(f"\n📊 {label}: {elevation.shape}")
+            print(f"{'Yöntem':<30}{'Süre (s)':>10}")
+            start = time.perf_counter()
+            legacy(elevation)
+            print(f"{'eski (meshgrid + contourf)':<30}{time.perf_counter() - start:>10.3f}")
+
+            start = time.perf_counter()
+            engine = IsolineEngine(path)
+            engine_draw(engine)
+            print(f"{'motor (ilk çizim)':<30}{time.perf_counter() - start:>10.3f}")
+
+            start = time.perf_counter()
+            engine_draw(engine)
+            print(f"{'motor (yeniden stil)':<30}{time.perf_counter() - start:>10.3f}")
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else 'agri_dagi_DEM.tif')
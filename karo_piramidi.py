@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DEM türevi katmanlar için web haritası (XYZ / MBTiles) karo piramidi.
+
+Katmanlar:
+  'hillshade' - gri tonlu gölgeleme
+  'slope'     - eğim sınıflarına göre renklendirilmiş, gölgelemeyle
+                modüle edilmiş renkli kabartma
+  'contours'  - şeffaf zemin üzerinde izohips bindirmesi (her 5. çizgi kalın)
+
+Her karo, kaynak GeoTIFF'lerden EPSG:3857 karo sınırlarına doğrudan
+(pencereli) yeniden projeksiyonla üretilir; mozaik hiçbir zaman bellekte
+tutulmaz. Karolar süreç havuzunda gruplar halinde render edilir ve geldikçe
+z/x/y dizinine ya da MBTiles (SQLite) dosyasına yazılır.
+
+Kirli karo takibi: kaynak raster'ların 256x256 blok özetleri bir manifestte
+saklanır. DEM (ve türevleri) değiştiğinde yalnızca değişen bloklara değen
+karolar yeniden render edilir; render ayarları değişirse tümü yenilenir.
+
+Çalıştırma:  python karo_piramidi.py agri_dagi_DEM.tif karolar/ --layer slope --format webp
+             python karo_piramidi.py agri_dagi_DEM.tif agri.mbtiles --layer contours --zoom 9 14
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import rasterio
+from rasterio.transform import Affine
+from rasterio.warp import Resampling, reproject, transform_bounds
+from rasterio.windows import from_bounds
+
+from arazi_istatistik import SLOPE_CLASSES
+
+TILE_SIZE = 256
+WEB_MERCATOR = 'EPSG:3857'
+ORIGIN = 20037508.342789244
+TILE_LAYERS = {'hillshade': ('hillshade',), 'slope': ('slope', 'hillshade'), 'contours': ('dem',)}
+TILE_FORMATS = ('png', 'webp')
+
+# Eğim sınıfı renkleri (Düz -> Çok Dik)
+SLOPE_COLORS = np.array([[26, 152, 80], [145, 207, 96], [254, 224, 139], [252, 141, 89], [215, 48, 39]],
+                        dtype=np.float32)
+CONTOUR_COLOR = (70, 40, 20)
+MANIFEST_NAME = 'karo_manifest.json'
+HASH_BLOCK = 256
+
+
+# --- web mercator karo geometrisi ------------------------------------------------
+
+def tile_bounds(z, x, y):
+    """Karonun EPSG:3857 sınırları (left, bottom, right, top)"""
+    size = 2 * ORIGIN / 2 ** z
+    left, top = -ORIGIN + x * size, ORIGIN - y * size
+    return left, top - size, left + size, top
+
+
+def tiles_for_bounds(bounds, z):
+    """EPSG:3857 sınırlarıyla kesişen karoların (x, y) listesi"""
+    size = 2 * ORIGIN / 2 ** z
+    n_tiles = 2 ** z
+    x0 = max(0, int((bounds[0] + ORIGIN) // size))
+    x1 = min(n_tiles - 1, int(math.ceil((bounds[2] + ORIGIN) / size)) - 1)
+    y0 = max(0, int((ORIGIN - bounds[3]) // size))
+    y1 = min(n_tiles - 1, int(math.ceil((ORIGIN - bounds[1]) / size)) - 1)
+    return [(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+
+def default_zoom_range(path):
+    """Kaynak çözünürlüğüne eşit en büyük zoom ve tüm rasterın tek karoya sığdığı en küçük zoom"""
+    with rasterio.open(path) as dataset:
+        bounds = transform_bounds(dataset.crs, WEB_MERCATOR, *dataset.bounds)
+        resolution = (bounds[2] - bounds[0]) / dataset.width
+    max_zoom = int(math.ceil(math.log2(2 * ORIGIN / (TILE_SIZE * resolution))))
+    min_zoom = int(math.floor(math.log2(2 * ORIGIN / max(bounds[2] - bounds[0], bounds[3] - bounds[1]))))
+    return max(0, min(min_zoom, max_zoom)), max_zoom
+
+
+# --- karo render (işçi süreçleri) ------------------------------------------------
+
+_sources = None
+
+
+def _init_worker(sources):
+    """Her işçi kaynak raster'ları bir kez açar"""
+    global _sources
+    _sources = {name: rasterio.open(path) for name, path in sources.items()}
+
+
+def _warp(name, z, x, y, margin, resampling):
+    """Kaynağı karo (+ kenar payı) ızgarasına EPSG:3857'de yeniden projeksiyonla örnekle"""
+    dataset = _sources[name]
+    left, _, right, top = tile_bounds(z, x, y)
+    resolution = (right - left) / TILE_SIZE
+    size = TILE_SIZE + 2 * margin
+    destination = np.full((size, size), np.nan, dtype=np.float32)
+    reproject(rasterio.band(dataset, 1), destination, src_nodata=dataset.nodata,
+              dst_transform=Affine(resolution, 0, left - margin * resolution,
+                                   0, -resolution, top + margin * resolution),
+              dst_crs=WEB_MERCATOR, dst_nodata=np.nan, resampling=resampling)
+    return destination
+
+
+def render_hillshade(hillshade):
+    rgba = np.zeros(hillshade.shape + (4,), dtype=np.uint8)
+    valid = np.isfinite(hillshade)
+    rgba[..., :3] = np.where(valid, np.clip(hillshade, 0, 255), 0)[..., None]
+    rgba[..., 3] = valid * 255
+    return rgba
+
+
+def render_slope(slope, hillshade):
+    """Eğim sınıfı rengi x (0.35 + 0.65 * gölgeleme) renkli kabartma"""
+    valid = np.isfinite(slope)
+    classes = np.digitize(np.where(valid, slope, 0), SLOPE_CLASSES[0])
+    shade = 0.35 + 0.65 * np.nan_to_num(hillshade, nan=255.0)[..., None] / 255
+    rgba = np.zeros(slope.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = np.clip(SLOPE_COLORS[classes] * shade, 0, 255)
+    rgba[..., 3] = valid * 255
+    return rgba
+
+
+def render_contours(dem, interval, major_every=5):
+    """Raster izohips: komşusundan daha yüksek seviye bandındaki pikseller çizgi olur.
+
+    ``dem`` her kenarda 1 piksel paya sahiptir; komşu karolarda çizgiler kesintisizdir.
+    """
+    band = np.floor(np.nan_to_num(dem, nan=-np.inf) / interval)
+    core = band[1:-1, 1:-1]
+    crossed = np.full(core.shape, -np.inf)
+    for neighbour in (band[:-2, 1:-1], band[2:, 1:-1], band[1:-1, :-2], band[1:-1, 2:]):
+        # Pikselin kendi bandı komşudan yüksekse aradaki en yüksek seviye 'core * interval'dir
+        higher = (core > neighbour) & np.isfinite(neighbour)
+        crossed = np.where(higher, core, crossed)
+    line = np.isfinite(crossed) & np.isfinite(core)
+    major = line.copy()
+    major[line] = np.mod(crossed[line], major_every) == 0
+
+    rgba = np.zeros(core.shape + (4,), dtype=np.uint8)
+    rgba[line, :3] = CONTOUR_COLOR
+    rgba[line, 3] = 150
+    rgba[major, 3] = 255
+    return rgba
+
+
+def _encode(rgba, fmt):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    image = Image.fromarray(rgba, 'RGBA')
+    if fmt == 'webp':
+        image.save(buffer, format='WEBP', quality=85, method=4)
+    else:
+        image.save(buffer, format='PNG', compress_level=6)
+    return buffer.getvalue()
+
+
+def _render_batch(tiles, layer, fmt, options):
+    """Bir grup karoyu render et; boş (tamamen şeffaf) karolar için None döndür"""
+    results = []
+    for z, x, y in tiles:
+        # Kaynak çözünürlüğünden küçük zoom'larda ortalama, büyüklerde bilineer örnekleme
+        resampling = Resampling.average if z < options['max_zoom'] else Resampling.bilinear
+        if layer == 'hillshade':
+            rgba = render_hillshade(_warp('hillshade', z, x, y, 0, resampling))
+        elif layer == 'slope':
+            rgba = render_slope(_warp('slope', z, x, y, 0, resampling),
+                                _warp('hillshade', z, x, y, 0, resampling))
+        else:
+            # Küçük zoom'larda aralık her seviyede iki katına çıkar
+            interval = options['interval'] * 2 ** max(0, options['max_zoom'] - z)
+            rgba = render_contours(_warp('dem', z, x, y, 1, resampling), interval)
+        results.append((z, x, y, _encode(rgba, fmt) if rgba[..., 3].any() else None))
+    return results
+
+
+# --- karo yazıcılar --------------------------------------------------------------
+
+class DirectoryTileWriter:
+    """{kök}/{z}/{x}/{y}.{biçim} dizin yapısı; manifest kökte JSON olarak tutulur"""
+
+    def __init__(self, root, fmt, metadata):
+        self.root, self.fmt = root, fmt
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, z, x, y):
+        return os.path.join(self.root, str(z), str(x), f'{y}.{self.fmt}')
+
+    def write(self, z, x, y, data):
+        path = self._path(z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+
+    def delete(self, z, x, y):
+        try:
+            os.remove(self._path(z, x, y))
+        except FileNotFoundError:
+            pass
+
+    def read_manifest(self):
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME), encoding='utf-8') as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def write_manifest(self, manifest):
+        with open(os.path.join(self.root, MANIFEST_NAME), 'w', encoding='utf-8') as handle:
+            json.dump(manifest, handle)
+
+    def close(self):
+        pass
+
+
+class MBTilesWriter:
+    """MBTiles 1.3 SQLite dosyası (TMS satır düzeni); manifest metadata tablosunda tutulur"""
+
+    def __init__(self, path, fmt, metadata, batch_size=500):
+        self.connection = sqlite3.connect(path)
+        self.batch_size = batch_size
+        self.batch = []
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, tile_column INTEGER,
+                                              tile_row INTEGER, tile_data BLOB);
+            CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row);
+        ''')
+        metadata = {**metadata, 'format': fmt}
+        self.connection.executemany('INSERT OR REPLACE INTO metadata VALUES (?, ?)',
+                                    [(name, str(value)) for name, value in metadata.items()])
+
+    def write(self, z, x, y, data):
+        self.batch.append((z, x, 2 ** z - 1 - y, data))
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    def delete(self, z, x, y):
+        self._flush()
+        self.connection.execute('DELETE FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?',
+                                (z, x, 2 ** z - 1 - y))
+
+    def _flush(self):
+        if self.batch:
+            self.connection.executemany('INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)', self.batch)
+            self.connection.commit()
+            self.batch = []
+
+    def read_manifest(self):
+        row = self.connection.execute("SELECT value FROM metadata WHERE name = 'karo_manifest'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def write_manifest(self, manifest):
+        self.connection.execute("INSERT OR REPLACE INTO metadata VALUES ('karo_manifest', ?)",
+                                (json.dumps(manifest),))
+
+    def close(self):
+        self._flush()
+        self.connection.commit()
+        self.connection.close()
+
+
+# --- kirli karo takibi -----------------------------------------------------------
+
+def block_hashes(path, block=HASH_BLOCK):
+    """Raster'ın blok x blok içerik özetleri (satır bantları halinde tek okuma)"""
+    from rasterio.windows import Window
+
+    with rasterio.open(path) as dataset:
+        hashes = []
+        for row_off in range(0, dataset.height, block):
+            rows = dataset.read(1, window=Window(0, row_off, dataset.width,
+                                                 min(block, dataset.height - row_off)))
+            hashes.append([hashlib.blake2b(np.ascontiguousarray(rows[:, col:col + block]).tobytes(),
+                                           digest_size=8).hexdigest()
+                           for col in range(0, dataset.width, block)])
+        return {'transform': list(dataset.transform)[:6], 'crs': str(dataset.crs), 'hashes': hashes}
+
+
+def _changed_blocks(old, new):
+    """Değişen blokların mantıksal ızgarası; geometri değiştiyse None (hepsi kirli)"""
+    if old is None or old['transform'] != new['transform'] or old['crs'] != new['crs']:
+        return None
+    old_hashes, new_hashes = np.array(old['hashes']), np.array(new['hashes'])
+    if old_hashes.shape != new_hashes.shape:
+        return None
+    return old_hashes != new_hashes
+
+
+def _tile_is_dirty(dataset, changed, z, x, y, margin=2):
+    """Karonun kaynak penceresi (+ pay) değişen bir bloğa değiyor mu"""
+    bounds = transform_bounds(WEB_MERCATOR, dataset.crs, *tile_bounds(z, x, y))
+    window = from_bounds(*bounds, transform=dataset.transform)
+    row0 = max(0, int(window.row_off) - margin) // HASH_BLOCK
+    col0 = max(0, int(window.col_off) - margin) // HASH_BLOCK
+    row1 = int(math.ceil(window.row_off + window.height)) + margin
+    col1 = int(math.ceil(window.col_off + window.width)) + margin
+    return bool(changed[row0:row1 // HASH_BLOCK + 1, col0:col1 // HASH_BLOCK + 1].any())
+
+
+# --- piramit üretimi -------------------------------------------------------------
+
+def _batch_results(sources, batches, n_workers, *args):
+    """Grup sonuçlarını sırayla üret; uçuştaki grup sayısı sınırlıdır"""
+    # Aynı süreçte türevler numba ile hesaplandıysa TBB iş parçacığı havuzu fork ile
+    # güvenle kopyalanamaz (çıkışta ana süreç kilitlenir): 'spawn' kullanılır
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(sources,),
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        pending = deque()
+        batch_iter = iter(batches)
+        while True:
+            while len(pending) < 2 * n_workers and (batch := next(batch_iter, None)) is not None:
+                pending.append(executor.submit(_render_batch, batch, *args))
+            if not pending:
+                break
+            yield pending.popleft().result()
+
+
+def build_tiles(sources, output, layer='hillshade', zooms=None, fmt='png', interval=50,
+                n_workers=None, batch_size=32, force=False):
+    """Katmanın karo piramidini üret (yalnızca kirli karolar).
+
+    sources: kaynak adı -> GeoTIFF yolu ('dem', 'slope', 'hillshade'; aynı ızgara)
+    output: dizin (z/x/y) ya da .mbtiles dosyası
+    interval: en büyük zoom'daki izohips aralığı (m)
+    """
+    if layer not in TILE_LAYERS:
+        raise ValueError(f"Geçersiz katman: {layer!r} (seçenekler: {', '.join(TILE_LAYERS)})")
+    if fmt not in TILE_FORMATS:
+        raise ValueError(f"Geçersiz karo biçimi: {fmt!r} (seçenekler: {', '.join(TILE_FORMATS)})")
+    start = time.perf_counter()
+    sources = {name: sources[name] for name in TILE_LAYERS[layer]}
+    reference = next(iter(sources.values()))
+    min_zoom, max_zoom = zooms or default_zoom_range(reference)
+
+    with rasterio.open(reference) as dataset:
+        bounds = transform_bounds(dataset.crs, WEB_MERCATOR, *dataset.bounds)
+        lonlat = transform_bounds(dataset.crs, 'EPSG:4326', *dataset.bounds)
+    metadata = {'name': f'{os.path.splitext(os.path.basename(reference))[0]} {layer}',
+                'type': 'overlay' if layer == 'contours' else 'baselayer',
+                'bounds': ','.join(f'{value:.6f}' for value in lonlat),
+                'minzoom': min_zoom, 'maxzoom': max_zoom}
+    writer_class = MBTilesWriter if output.lower().endswith('.mbtiles') else DirectoryTileWriter
+    writer = writer_class(output, fmt, metadata)
+
+    # Önceki manifestle kıyaslayarak kirli blokları bul
+    params = {'layer': layer, 'format': fmt, 'interval': interval, 'zooms': [min_zoom, max_zoom]}
+    old_manifest = None if force else writer.read_manifest()
+    new_manifest = {'params': params, 'sources': {name: block_hashes(path) for name, path in sources.items()}}
+    changed = {}
+    if old_manifest is not None and old_manifest.get('params') == params:
+        for name in sources:
+            changed[name] = _changed_blocks(old_manifest['sources'].get(name), new_manifest['sources'][name])
+    full_render = not changed or any(grid is None for grid in changed.values())
+
+    tiles = []
+    with rasterio.open(reference) as dataset:
+        for z in range(min_zoom, max_zoom + 1):
+            for x, y in tiles_for_bounds(bounds, z):
+                if full_render or any(_tile_is_dirty(dataset, grid, z, x, y) for grid in changed.values()):
+                    tiles.append((z, x, y))
+    total = sum(len(tiles_for_bounds(bounds, z)) for z in range(min_zoom, max_zoom + 1))
+    n_workers = max(1, min(n_workers or os.cpu_count(), -(-len(tiles) // batch_size) or 1))
+    print(f"🧩 {layer}: zoom {min_zoom}-{max_zoom}, {len(tiles)}/{total} karo render edilecek, "
+          f"{n_workers} işçi süreci")
+
+    written = removed = 0
+    batches = [tiles[index:index + batch_size] for index in range(0, len(tiles), batch_size)]
+    options = {'max_zoom': max_zoom, 'interval': interval}
+    try:
+        for results in _batch_results(sources, batches, n_workers, layer, fmt, options):
+            for z, x, y, data in results:
+                if data is None:
+                    writer.delete(z, x, y)
+                    removed += 1
+                else:
+                    writer.write(z, x, y, data)
+                    written += 1
+        # Manifest yalnızca tüm karolar yazıldıktan sonra güncellenir
+        writer.write_manifest(new_manifest)
+    finally:
+        writer.close()
+
+    summary = {'rendered': len(tiles), 'total': total, 'written': written, 'empty': removed,
+               'seconds': time.perf_counter() - start}
+    print(f"✅ {written} karo yazıldı, {removed} boş karo -> {output} ({summary['seconds']:.1f} s)")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='DEM türevi katmanlardan XYZ/MBTiles karo piramidi')
+    parser.add_argument('dem_path')
+    parser.add_argument('output', help='Karo dizini ya da .mbtiles dosyası')
+    parser.add_argument('--layer', choices=tuple(TILE_LAYERS), default='hillshade')
+    parser.add_argument('--format', choices=TILE_FORMATS, default='png')
+    parser.add_argument('--zoom', type=int, nargs=2, default=None, metavar=('MIN', 'MAX'))
+    parser.add_argument('--interval', type=float, default=50, help='En büyük zoom için izohips aralığı (m)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--layers-dir', default=None, help='Türetilmiş GeoTIFF katmanlarının dizini')
+    parser.add_argument('--cache-dir', default=None,
+                        help='DEM içerik özetleri için önbellek dizini (yoksa boyut + mtime karşılaştırılır)')
+    parser.add_argument('--force', action='store_true',
+                        help='Manifesti ve türev katmanlarını yok say, her şeyi yeniden üret')
+    args = parser.parse_args(argv)
+
+    from agri_dagi_3d_profesional import AgriDagi3D
+    # Karo modu türetilmiş katmanları GeoTIFF olarak, RAM'e sığmayan DEM'lerde de üretir;
+    # DEM ve ayarlar değişmediyse önceki çalıştırmanın GeoTIFF'leri yeniden kullanılır
+    analysis = AgriDagi3D(args.dem_path, tiled=True, output_dir=args.layers_dir, cache_dir=args.cache_dir,
+                          reuse_derived=not args.force)
+    build_tiles({'dem': args.dem_path, **analysis.derived_paths}, args.output, layer=args.layer,
+                zooms=args.zoom, fmt=args.format, interval=args.interval, n_workers=args.workers,
+                force=args.force)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kıyaslamalar için süre ve tepe bellek ölçümü.
+
+Yağış hattı, yakıt yükü, yangın tehlikesi ve risk ağı yükleyicisinin
+--benchmark kipleri aynı yardımcıları kullanır. measure() yöntemi ayrı bir
+(spawn) süreçte çalıştırır; böylece ardışık yöntemlerin tepe bellekleri
+birbirine karışmaz. 'resource' modülü olmayan sistemlerde (Windows) tepe
+bellek NaN döner.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def peak_rss_mb():
+    """Sürecin tepe RSS'i; ru_maxrss exec'ten sonra ebeveynin tepesini taşır, VmHWM taşımaz"""
+    try:
+        with open('/proc/self/status') as handle:
+            for line in handle:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource  # Yalnızca Unix; Windows'ta ölçüm yapılmaz
+    except ImportError:
+        return float('nan')
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_measured(function, args, keep_result=True):
+    """(süre, tepe bellek, sonuç); keep_result=False ise sonuç None döner (büyük nesne taşınmaz)"""
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, peak_rss_mb(), result if keep_result else None
+
+
+def measure(function, *args, keep_result=True):
+    """Yöntemi ayrı bir süreçte çalıştır; tepe bellekler birbirine karışmasın"""
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(run_measured, function, args, keep_result).result()
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orman yangını risk ağı haritasının canlı güncelleme modu.
+
+Sensör ölçümleri bir asyncio kuyruğundan okunur; kuyruğu izlenen bir dosya
+(tail -f gibi) ya da yerel bir TCP soketi besler. Her satır bir ölçümdür:
+
+  temp1,41.5            (kimlik,değer)
+  {"id": "hum2", "value": 12}
+
+Ölçümler RiskPropagator ile artımlı işlenir ve yalnızca değişen çizim
+öğeleri güncellenir: faktör düğümlerinin boyutu, bitki örtüsü düğümlerinin
+risk rengi, bölge dolguları ve uyarı bağlantılarının vurgusu. Kare
+oluşturulurken tüm harita yeniden çizilmez; değişen öğelerin piksel
+kutuları karolara yuvarlanır ve yalnızca bu dikdörtgenlere değen öğeler
+(koleksiyonlarda yalnızca değen parçalar) dikdörtgenlere kırpılarak yeniden
+çizilir. Kareler sabit hızda diske yazılır (canli.png); yanındaki
+canli.html tarayıcıda kareyi aynı hızda yeniler.
+
+Kullanım:   python orman_yangini_risk_agi.py --live olcumler.txt -o cikti/
+            python orman_yangini_risk_agi.py --live 127.0.0.1:8765
+Kıyaslama:  python risk_agi_canli.py --benchmark
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import matplotlib.pyplot as plt
+from matplotlib.collections import Collection, LineCollection, PathCollection
+from matplotlib.colors import to_rgba, to_rgba_array
+from matplotlib.legend import Legend
+from matplotlib.path import Path
+from matplotlib.transforms import Bbox, IdentityTransform, TransformedPath
+
+from risk_agi_cizim import EDGE_ALPHA, node_sizes
+from risk_agi_skor import RiskPropagator, risk_tier
+from risk_agi_tanimlari import RISK_LEVELS
+from risk_agi_yukleyici import NODE_TYPE_NAMES
+
+FRAME_NAME = 'canli.png'
+PAGE_NAME = 'canli.html'
+LIVE_DPI = 100
+# Kirli pikseller bu boyuttaki karolara yuvarlanır
+TILE = 64
+# Uyarı bağlantıları, uçlarından birinin bölgesi bu seviyelerdeyse vurgulanır
+ALERT_TIERS = {'alert': ('critical',), 'routine_alert': ('high', 'critical')}
+IDLE_ALPHA = 0.15
+QUEUE_SIZE = 100_000
+POLL_INTERVAL = 0.2
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8"><title>Orman Yangını Risk Ağı - Canlı</title></head>
+<body style="margin:0;background:#fff">
+<img id="kare" src="{frame}" style="max-width:100%">
+<script>
+setInterval(function () {{
+  document.getElementById('kare').src = '{frame}?t=' + Date.now();
+}}, {interval_ms});
+</script>
+</body></html>
+"""
+
+
+# --- Ölçüm kaynakları ---------------------------------------------------------------
+
+def parse_reading(line):
+    """'kimlik,değer', 'kimlik değer' ya da JSON satırını (kimlik, değer) yap; geçersizse None"""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    try:
+        if line.startswith('{'):
+            record = json.loads(line)
+            return str(record['id']), float(record['value'])
+        node_id, value = line.replace(',', ' ').split()
+        return node_id, float(value)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+async def _put(queue, line, stats):
+    reading = parse_reading(line)
+    if reading is None:
+        stats['invalid'] += bool(line.strip())
+        return
+    await queue.put(reading)
+
+
+async def tail_file(path, queue, from_start=False, poll=POLL_INTERVAL, stats=None):
+    """Dosyaya eklenen satırları kuyruğa aktar (dosya kısalırsa baştan okunur)"""
+    stats = stats if stats is not None else {'invalid': 0}
+    while not os.path.exists(path):
+        await asyncio.sleep(poll)
+    with open(path, encoding='utf-8') as stream:
+        if not from_start:
+            stream.seek(0, os.SEEK_END)
+        pending = ''
+        while True:
+            chunk = stream.readline()
+            if chunk:
+                pending += chunk
+                if pending.endswith('\n'):
+                    await _put(queue, pending, stats)
+                    pending = ''
+                continue
+            if os.path.getsize(path) < stream.tell():
+                stream.seek(0)
+                pending = ''
+            await asyncio.sleep(poll)
+
+
+async def serve_socket(queue, host='127.0.0.1', port=8765, stats=None):
+    """Yerel TCP soketinden gelen satırları kuyruğa aktar (sensör ağı yerine geçer)"""
+    stats = stats if stats is not None else {'invalid': 0}
+
+    async def handle(reader, writer):
+        try:
+            async for line in reader:
+                await _put(queue, line.decode('utf-8', errors='replace'), stats)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"📡 Ölçümler {host}:{port} adresinden dinleniyor")
+    async with server:
+        await server.serve_forever()
+
+
+# --- Canlı harita -----------------------------------------------------------------
+
+class LiveMap:
+    """Haritayı bir kez çizer; ölçümlerle yalnızca değişen öğeleri ve pikselleri günceller"""
+
+    def __init__(self, network, regions, dpi=LIVE_DPI):
+        import matplotlib
+
+        matplotlib.use('Agg')
+        from orman_yangini_risk_agi import draw_map
+
+        self.network = network
+        self.propagator = RiskPropagator(network, regions)
+        for region_id, tier in self.propagator.region_tiers().items():
+            regions[region_id]['risk'] = tier
+        artists = draw_map(network, regions)
+        self.figure, self.ax = plt.gcf(), plt.gca()
+        self.figure.set_dpi(dpi)
+        self.canvas = self.figure.canvas
+        self._dirty = []
+        self._changed_collections = set()
+        self.stats = {'readings': 0, 'unknown': 0, 'frames': 0, 'rects': 0}
+
+        # Düğüm -> (koleksiyon, koleksiyondaki sıra); boyut ve renk dizileri yerinde değiştirilir
+        node_count = network.node_count
+        self._node_collection = np.full(node_count, -1, dtype=np.intp)
+        self._node_slot = np.zeros(node_count, dtype=np.intp)
+        self._collections = []
+        for number, (collection, index) in enumerate(artists['nodes'].values()):
+            self._node_collection[index] = number
+            self._node_slot[index] = np.arange(len(index))
+            colors = np.broadcast_to(collection.get_facecolor(), (len(index), 4)).copy()
+            self._collections.append((collection, collection.get_sizes().astype(float), colors))
+        self._node_px = self.ax.transData.transform(network.xy)
+        self._type_names = np.array(NODE_TYPE_NAMES)[network.node_type]
+        self._tier_code = {tier: code for code, tier in enumerate(RISK_LEVELS)}
+        self._tier_colors = to_rgba_array([style['color'] for style in RISK_LEVELS.values()])
+        self._patches = artists['regions']
+        self._region_number = {region_id: number for number, region_id in enumerate(self.propagator.region_ids)}
+
+        # Uyarı bağlantıları: tür -> (koleksiyon, renkler, parça kutuları); bölge -> [(tür, parça, kenar)]
+        # Saydamlık renklere işlenir, koleksiyon düzeyindeki alpha kaldırılır
+        sources, targets = artists['edge_nodes']
+        membership = self.propagator.region_membership
+        self._edge_regions = (membership[sources], membership[targets])
+        self._alerts, self._region_edges, self._alert_state = {}, {}, {}
+        for name in ALERT_TIERS:
+            if name not in artists['edges']['edges']:
+                continue
+            collection, edges = artists['edges']['edges'][name], artists['edges']['index'][name]
+            colors = np.broadcast_to(to_rgba(collection.get_edgecolor()[0], EDGE_ALPHA), (len(edges), 4)).copy()
+            collection.set_alpha(None)
+            self._alerts[name] = (collection, colors, self._segment_boxes(collection.get_paths()))
+            for slot, edge in enumerate(edges.tolist()):
+                for region in {int(membership[sources[edge]]), int(membership[targets[edge]])} - {-1}:
+                    self._region_edges.setdefault(region, []).append((name, slot, edge))
+        self._arrow_slot = np.full(len(sources), -1, dtype=np.intp)
+        self._arrow_slot[artists['edges']['arrow_index']] = np.arange(len(artists['edges']['arrow_index']))
+        self._arrows = []
+        if artists['edges']['shafts'] is not None:
+            shafts, heads = artists['edges']['shafts'], artists['edges']['heads']
+            self._arrows = [(shafts, shafts.get_edgecolor().copy(), self._segment_boxes(shafts.get_paths())),
+                            (heads, heads.get_facecolor().copy(),
+                             self._segment_boxes(heads.get_paths()))]
+
+        # Başlangıç durumu (bitki örtüsü renkleri, uyarı vurguları) ve tek tam çizim
+        self._vegetation_tier = np.full(node_count, -1, dtype=np.intp)
+        self._set_vegetation_colors(np.flatnonzero(self.propagator.is_vegetation))
+        for region in list(self._region_edges):
+            self._update_alerts(region)
+        self._flush_collections()
+        self.canvas.draw()
+        # Kırpma dikdörtgenleri tam piksellere oturur; kenar pikselleri iki kez harmanlanmaz
+        x0, y0, x1, y1 = self.ax.bbox.extents
+        self._axes_box = (np.ceil(x0), np.ceil(y0), np.floor(x1), np.floor(y1))
+        self._dirty = []
+        self._build_layers()
+
+    # --- öğe güncellemeleri ----------------------------------------------------
+
+    def _segment_boxes(self, paths):
+        """Her yolun (veri koordinatlarında) piksel kutusu (x0, y0, x1, y1)"""
+        boxes = np.empty((len(paths), 4))
+        for number, path in enumerate(paths):
+            pixels = self.ax.transData.transform(path.vertices)
+            boxes[number, :2], boxes[number, 2:] = pixels.min(axis=0), pixels.max(axis=0)
+        return boxes
+
+    def _mark(self, boxes, margin=3.0):
+        boxes = np.atleast_2d(np.asarray(boxes, dtype=float))
+        if len(boxes):
+            self._dirty.append(boxes + (-margin, -margin, margin, margin))
+
+    def _mark_nodes(self, nodes, sizes):
+        # scatter boyutu nokta² cinsinden; döndürülmüş işaretçiler için yarıçap ~0.75 * sqrt(s) nokta
+        radius = np.sqrt(sizes) * 0.75 * self.figure.dpi / 72 + 2
+        centers = self._node_px[nodes]
+        self._mark(np.column_stack((centers - radius[:, None], centers + radius[:, None])))
+
+    def _set_vegetation_colors(self, nodes):
+        """Bitki örtüsü düğümlerini kendi risk seviyesinin rengine boya; rengi değişenleri döndür"""
+        tiers = np.array([self._tier_code[tier] for tier in risk_tier(self.propagator.risk[nodes]).tolist()],
+                         dtype=np.intp).reshape(-1)
+        changed = tiers != self._vegetation_tier[nodes]
+        nodes, tiers = nodes[changed], tiers[changed]
+        self._vegetation_tier[nodes] = tiers
+        for number in np.unique(self._node_collection[nodes]).tolist():
+            selected = self._node_collection[nodes] == number
+            self._collections[number][2][self._node_slot[nodes[selected]], :3] = self._tier_colors[tiers[selected], :3]
+            self._changed_collections.add(number)
+        return nodes
+
+    def _update_alerts(self, region):
+        """Bölgenin seviyesi değişince ona dokunan uyarı bağlantılarının vurgusunu güncelle"""
+        tiers = self.propagator.tiers
+        sources, targets = self._edge_regions
+        for name, slot, edge in self._region_edges.get(region, ()):
+            active = any(end >= 0 and tiers[end] in ALERT_TIERS[name] for end in (sources[edge], targets[edge]))
+            if self._alert_state.get(edge) == active:
+                continue
+            self._alert_state[edge] = active
+            collection, colors, boxes = self._alerts[name]
+            colors[slot, 3] = EDGE_ALPHA if active else IDLE_ALPHA
+            collection.set_color(colors)
+            self._mark(boxes[slot])
+            arrow = self._arrow_slot[edge]
+            if arrow >= 0:
+                for arrow_collection, arrow_colors, arrow_boxes in self._arrows:
+                    arrow_colors[arrow, 3] = 1.0 if active else IDLE_ALPHA
+                    arrow_collection.set_color(arrow_colors)
+                    self._mark(arrow_boxes[arrow])
+
+    def _flush_collections(self):
+        for number in self._changed_collections:
+            collection, sizes, colors = self._collections[number]
+            collection.set_sizes(sizes)
+            collection.set_facecolor(colors)
+        self._changed_collections.clear()
+
+    def apply(self, readings):
+        """Ölçüm listesini [(kimlik, değer)] uygula; seviyesi değişen bölgeleri döndür"""
+        index = self.network.index
+        nodes = [index.get(node_id, -1) for node_id, _ in readings]
+        nodes = np.array(nodes, dtype=np.intp)
+        values = np.array([value for _, value in readings], dtype=np.float32)
+        known = nodes >= 0
+        self.stats['readings'] += len(readings)
+        self.stats['unknown'] += int((~known).sum())
+        nodes, values = nodes[known], values[known]
+        if not len(nodes):
+            return []
+
+        changed_regions = self.propagator.set_values(nodes, values)
+
+        # Faktör düğümlerinin boyutu değere göre ölçeklenir
+        nodes, last = np.unique(nodes[::-1], return_index=True)
+        sizes = node_sizes(self._type_names[nodes], values[::-1][last])
+        numbers, slots = self._node_collection[nodes], self._node_slot[nodes]
+        for number in np.unique(numbers).tolist():
+            selected = numbers == number
+            _, collection_sizes, _ = self._collections[number]
+            old = collection_sizes[slots[selected]]
+            resized = old != sizes[selected]
+            if resized.any():
+                collection_sizes[slots[selected][resized]] = sizes[selected][resized]
+                self._mark_nodes(nodes[selected][resized], np.maximum(old[resized], sizes[selected][resized]))
+                self._changed_collections.add(number)
+
+        recoloured = self._set_vegetation_colors(self.propagator.changed_nodes)
+        if len(recoloured):
+            numbers = self._node_collection[recoloured]
+            sizes = np.array([self._collections[number][1][slot]
+                              for number, slot in zip(numbers, self._node_slot[recoloured])])
+            self._mark_nodes(recoloured, sizes)
+
+        for region_id, tier in changed_regions:
+            style = RISK_LEVELS[tier]
+            for patch in self._patches.get(region_id, ()):
+                patch.set_facecolor(style['color'])
+                patch.set_alpha(style['alpha'])
+                self._mark(patch.get_window_extent().extents)
+            self._update_alerts(self._region_number[region_id])
+        self._flush_collections()
+        return changed_regions
+
+    # --- kısmi yeniden çizim -------------------------------------------------------
+
+    def _dirty_rects(self):
+        """Kirli kutuları karolara yuvarla; her karo satırındaki bitişik karolar tek dikdörtgen"""
+        boxes = np.concatenate(self._dirty)
+        self._dirty = []
+        x0, y0, x1, y1 = self._axes_box
+        boxes = np.column_stack((np.maximum(np.floor(boxes[:, 0]), x0), np.maximum(np.floor(boxes[:, 1]), y0),
+                                 np.minimum(np.ceil(boxes[:, 2]), x1), np.minimum(np.ceil(boxes[:, 3]), y1)))
+        boxes = boxes[(boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])]
+        if not len(boxes):
+            return np.zeros((0, 4))
+        tiles = set()
+        for tx0, ty0, tx1, ty1 in (boxes // TILE).astype(int).tolist():
+            tiles.update((row, column) for row in range(ty0, ty1 + 1) for column in range(tx0, tx1 + 1))
+        rects = []
+        for row, column in sorted(tiles):
+            if rects and rects[-1][0] == row and rects[-1][2] == column:
+                rects[-1][2] = column + 1
+            else:
+                rects.append([row, column, column + 1])
+        return np.array([(max(column0 * TILE, x0), max(row * TILE, y0), min(column1 * TILE, x1),
+                          min((row + 1) * TILE, y1)) for row, column0, column1 in rects])
+
+    def _build_layers(self):
+        """Çizim sırası ve piksel kutuları; kısmi çizimde dikdörtgene değmeyenler atlanır
+
+        Sabit öğelerin (yazı, yama, çizgi) kutusu ilk çizimden alınır. Koleksiyonlarda
+        parça başına kutu tutulur; scatter kutuları güncel boyutlardan hesaplanır.
+        """
+        renderer = self.canvas.get_renderer()
+        artists = [artist for artist in self.ax.get_children()
+                   if artist.get_visible() and not isinstance(artist, Legend)
+                   and artist not in (self.ax.xaxis, self.ax.yaxis, self.ax.patch)]
+        self._layers = []
+        self._member_boxes = {}
+        # Şekil düzeyindeki yazılar (alt bilgi) eksenin üstüne taşabilir; en son çizilir
+        figure_texts = sorted(self.figure.texts, key=lambda artist: artist.zorder)
+        for artist in [self.ax.patch] + sorted(artists, key=lambda artist: artist.zorder) + figure_texts:
+            if isinstance(artist, PathCollection):
+                self._layers.append((artist, None))
+            elif isinstance(artist, Collection):
+                self._member_boxes[artist] = self._segment_boxes(artist.get_paths())
+                self._layers.append((artist, None))
+            else:
+                # Yazı çevresindeki beyaz kontur için birkaç piksel pay
+                self._layers.append((artist, artist.get_window_extent(renderer).extents + (-4, -4, 4, 4)))
+
+    @staticmethod
+    def _touching(boxes, rects):
+        """Dikdörtgenlerden en az birine değen kutular (maske)"""
+        return ((boxes[:, None, 0] < rects[None, :, 2]) & (boxes[:, None, 2] > rects[None, :, 0]) &
+                (boxes[:, None, 1] < rects[None, :, 3]) & (boxes[:, None, 3] > rects[None, :, 1])).any(axis=1)
+
+    def _members(self, collection, rects):
+        """Koleksiyonun dikdörtgenlere değen parçaları"""
+        if isinstance(collection, PathCollection):
+            centers = collection.get_offset_transform().transform(collection.get_offsets())
+            # Elmas gibi döndürülmüş işaretçiler sqrt(s)/2 yarıçapını aşar (~0.71 * sqrt(s))
+            radius = np.sqrt(collection.get_sizes()) * 0.75 * self.figure.dpi / 72 + 2
+            radius = np.broadcast_to(radius, len(centers))
+            boxes = np.column_stack((centers - radius[:, None], centers + radius[:, None]))
+        else:
+            boxes = self._member_boxes[collection] + (-2, -2, 2, 2)
+        # Önce dikdörtgenlerin toplam kutusuyla ele, sonra tek tek dene
+        union = np.concatenate((rects[:, :2].min(axis=0), rects[:, 2:].max(axis=0)))[None]
+        candidates = np.flatnonzero(self._touching(boxes, union))
+        return candidates[self._touching(boxes[candidates], rects)]
+
+    @staticmethod
+    def _subset(collection, members):
+        """Koleksiyonun yalnızca verilen parçalarını içeren geçici kopyası"""
+        proxy = copy.copy(collection)
+        # Tek parçalı kopyada da renk/boyut dizileri en az iki satır kalır (fazlası döngüde
+        # kullanılmaz); yoksa matplotlib tek-yol kısayoluna geçer ve pikseller tam çizimden ayrılır
+        repeated = np.resize(members, max(2, len(members)))
+        for getter, setter in (('get_facecolor', 'set_facecolor'), ('get_edgecolor', 'set_edgecolor'),
+                               ('get_linewidth', 'set_linewidth')):
+            values = getattr(collection, getter)()
+            if not isinstance(values, str) and len(values) > 1:
+                getattr(proxy, setter)(np.asarray(values)[repeated])
+        if isinstance(collection, PathCollection):
+            proxy.set_offsets(collection.get_offsets()[members])
+            sizes = collection.get_sizes()
+            if len(sizes) > 1:
+                proxy.set_sizes(sizes[repeated])
+        elif isinstance(collection, LineCollection):
+            # get_segments() tüm yolları dönüştürür; açık çizgilerde köşeler yeterli
+            paths = collection.get_paths()
+            proxy.set_segments([paths[member].vertices for member in members])
+        else:
+            paths = collection.get_paths()
+            # Kapalı çokgenler: son köşe ilk köşenin tekrarıdır, set_verts yeniden kapatır
+            proxy.set_verts([paths[member].vertices[:-1] for member in members])
+        return proxy
+
+    def _redraw(self, rects):
+        """Dikdörtgenlere değen öğeleri zorder sırasıyla tek geçişte yeniden çiz
+
+        Kırpma, dikdörtgenlerden oluşan tek bir yol (piksel koordinatlarında) ile
+        yapılır; böylece öğe başına bir çizim çağrısı yeterlidir.
+        """
+        renderer = self.canvas.get_renderer()
+        union = Bbox.from_extents(*rects[:, :2].min(axis=0), *rects[:, 2:].max(axis=0))
+        corners = rects[:, [0, 1, 2, 1, 2, 3, 0, 3, 0, 1]].reshape(-1, 2)
+        codes = np.tile([Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY], len(rects))
+        clip_path = TransformedPath(Path(corners, codes), IdentityTransform())
+        for artist, extent in self._layers:
+            if extent is not None and not self._touching(extent[None], rects)[0]:
+                continue
+            clip_on, clip_box = artist.get_clip_on(), artist.get_clip_box()
+            box = Bbox.intersection(union, clip_box) if clip_on and clip_box is not None else union
+            if box is None:
+                continue
+            if isinstance(artist, Collection):
+                members = self._members(artist, rects)
+                if not len(members):
+                    continue
+                artist = self._subset(artist, members)
+            saved = artist.get_clip_path()
+            try:
+                artist.set_clip_box(box)
+                artist.set_clip_path(clip_path)
+                artist.set_clip_on(True)
+                artist.draw(renderer)
+            finally:
+                artist.set_clip_box(clip_box)
+                artist.set_clip_path(saved)
+                artist.set_clip_on(clip_on)
+
+    def render(self):
+        """Kirli dikdörtgenleri yeniden çiz; değişiklik yoksa False"""
+        if not self._dirty:
+            return False
+        rects = self._dirty_rects()
+        if len(rects):
+            self._redraw(rects)
+        self.stats['rects'] += len(rects)
+        return bool(len(rects))
+
+    def save(self, path):
+        """Geçerli kareyi PNG olarak yaz (önce geçici dosyaya; okuyucu yarım kare görmez)"""
+        temporary = path + '.tmp'
+        frame = np.asarray(self.canvas.buffer_rgba())
+        plt.imsave(temporary, frame, format='png', pil_kwargs={'compress_level': 1})
+        os.replace(temporary, path)
+        self.stats['frames'] += 1
+
+
+async def stream(live_map, queue, output_dir, fps=2.0, duration=None):
+    """Kuyruğu boşaltıp ölçümleri uygula; sabit hızda değişen kareleri yaz"""
+    loop = asyncio.get_running_loop()
+    frame_path = os.path.join(output_dir, FRAME_NAME)
+    live_map.render()
+    live_map.save(frame_path)
+    interval = 1.0 / fps
+    started = next_frame = loop.time()
+    while duration is None or loop.time() - started < duration:
+        readings = []
+        try:
+            readings.append(await asyncio.wait_for(queue.get(), max(0.0, next_frame - loop.time())))
+            while len(readings) < QUEUE_SIZE:
+                readings.append(queue.get_nowait())
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            pass
+        if readings:
+            for region_id, tier in live_map.apply(readings):
+                print(f"🔥 {region_id}: {tier}")
+        if loop.time() >= next_frame:
+            if live_map.render():
+                live_map.save(frame_path)
+            next_frame = max(next_frame + interval, loop.time())
+
+
+def run_live(network, regions, source, output_dir, fps=2.0, from_start=False, duration=None):
+    """Canlı modu çalıştır; kaynak bir dosya yolu ya da 'host:port'"""
+    live_map = LiveMap(network, regions)
+    with open(os.path.join(output_dir, PAGE_NAME), 'w', encoding='utf-8') as page:
+        page.write(PAGE_TEMPLATE.format(frame=FRAME_NAME, interval_ms=int(1000 / fps)))
+    print(f"🖼️ Kareler: {os.path.join(output_dir, FRAME_NAME)} (tarayıcı: {PAGE_NAME}), {fps:g} kare/s")
+
+    async def main():
+        queue = asyncio.Queue(QUEUE_SIZE)
+        host, _, port = source.rpartition(':')
+        if host and port.isdigit() and not os.path.exists(source):
+            producer = serve_socket(queue, host, int(port))
+        else:
+            producer = tail_file(source, queue, from_start=from_start)
+        task = asyncio.create_task(producer)
+        try:
+            await stream(live_map, queue, output_dir, fps, duration)
+        finally:
+            task.cancel()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    stats = live_map.stats
+    print(f"✅ {stats['readings']:,} ölçüm ({stats['unknown']} bilinmeyen kimlik), {stats['frames']} kare")
+    return 0
+
+
+def benchmark(n_vegetation=(2_000, 20_000), batch_sizes=(1, 10, 100), repeats=20, seed=0):
+    """Kısmi kare maliyeti değişiklik sayısıyla, tam çizim ağ boyutuyla büyür"""
+    from risk_agi_skor import _synthetic
+
+    rng = np.random.default_rng(seed)
+    print(f"{'Düğüm':>10}{'tam çizim (ms)':>16}" + ''.join(f"{f'{size} ölçüm (ms)':>18}" for size in batch_sizes))
+    for count in n_vegetation:
+        network, regions = _synthetic(count, 64, seed)
+        # Sentetik koordinatları haritanın görünen alanına taşı; faktörler bağlı oldukları
+        # bitki örtüsünün yakınında durur (gerçek ağdaki gibi kısa etki kenarları)
+        network.x[:] = network.x * 0.45 - 25
+        network.y[:] = network.y * 0.25 - 15
+        factors, vegetation = network.source, network.target
+        network.x[factors] = network.x[vegetation] + rng.normal(0, 0.3, len(factors))
+        network.y[factors] = network.y[vegetation] + rng.normal(0, 0.3, len(factors))
+        regions = {region_id: {**region, 'rings': [np.array([(-25, -15), (-24, -15), (-24, -14)])]}
+                   for region_id, region in regions.items()}
+        live_map = LiveMap(network, regions)
+        start = time.perf_counter()
+        live_map.canvas.draw()
+        full = (time.perf_counter() - start) * 1000
+
+        ids = np.array(network.ids)
+        row = f"{network.node_count:>10,}{full:>16.0f}"
+        for size in batch_sizes:
+            elapsed = 0.0
+            for _ in range(repeats):
+                picks = rng.integers(count, network.node_count, size)
+                readings = list(zip(ids[picks].tolist(), rng.uniform(0, 60, size).tolist()))
+                start = time.perf_counter()
+                live_map.apply(readings)
+                live_map.render()
+                elapsed += time.perf_counter() - start
+            row += f"{elapsed / repeats * 1000:>18.1f}"
+        print(row)
+        plt.close(live_map.figure)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Risk ağı canlı harita kıyaslaması')
+    parser.add_argument('--benchmark', action='store_true', help='Kısmi ve tam kare çizim sürelerini karşılaştır')
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        benchmark()
+        return 0
+    parser.print_help()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
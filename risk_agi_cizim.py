@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orman yangını risk ağı için toplu (batched) çizim.
+
+Düğüm ve bağlantı başına bir plt.scatter / plt.plot / plt.arrow yerine:
+  - düğümler işaretçi (marker) başına tek bir scatter ile çizilir; renk ve
+    boyut nokta başına dizilerle verilir,
+  - bir bağlantı türünün tüm kenarları tek bir LineCollection'dır; eğri
+    kenarların ikinci derece Bézier noktaları tek bir dizi işlemiyle
+    hesaplanır,
+  - ok başları tek bir PolyCollection, ok gövdeleri tek bir LineCollection.
+
+Sanatçı (artist) sayısı ağ boyutundan bağımsızdır: tür ve işaretçi sayısıyla
+sınırlıdır. Dönen koleksiyonlar canlı güncelleme için saklanabilir.
+
+Kıyaslama:  python risk_agi_cizim.py
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from risk_agi_tanimlari import ARROW_EDGE_TYPES, EDGE_TYPES, FACTOR_TYPES, NODE_TYPES
+
+# Uzun mesafeli bağlantılar eğri çizilir: |dx| > 10 ya da |dy| > 5
+CURVE_THRESHOLD = (10.0, 5.0)
+CURVE_BEND = 3.0
+CURVE_POINTS = 32
+# Eğri oklarının eğri üzerindeki yeri (eski çizimde 100 noktanın 80.'si)
+ARROW_T = 80 / 99
+ARROW_HEAD = {'width': 0.3, 'length': 0.5}
+EDGE_ALPHA = 0.7
+
+
+def _lookup(types, table, kind):
+    """Tür dizisini (benzersiz adlar, ters indeks) olarak kodla; bilinmeyen türde hata ver"""
+    names, inverse = np.unique(np.asarray(types, dtype=str), return_inverse=True)
+    unknown = [str(name) for name in names if name not in table]
+    if unknown:
+        raise ValueError(f"Bilinmeyen {kind} türü: {', '.join(map(repr, unknown))}")
+    return names, inverse
+
+
+def node_sizes(types, values=None, node_types=NODE_TYPES):
+    """Nokta boyutları; risk faktörlerinde boyut * (0.5 + value / 100)"""
+    names, inverse = _lookup(types, node_types, 'düğüm')
+    sizes = np.array([node_types[name]['size'] for name in names], dtype=float)[inverse]
+    if values is not None:
+        values = np.asarray(values, dtype=float)
+        scaled = np.isin(names, FACTOR_TYPES)[inverse] & ~np.isnan(values)
+        sizes[scaled] *= 0.5 + values[scaled] / 100
+    return sizes
+
+
+def draw_nodes(ax, xy, types, values=None, node_types=NODE_TYPES, **style):
+    """Düğümleri işaretçi başına tek scatter ile çiz; {işaretçi: (koleksiyon, düğüm indeksleri)}"""
+    from matplotlib.colors import to_rgba_array
+
+    xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+    names, inverse = _lookup(types, node_types, 'düğüm')
+    sizes = node_sizes(types, values, node_types)
+    colors = to_rgba_array([node_types[name]['color'] for name in names])[inverse]
+    markers = np.array([node_types[name]['shape'] for name in names])[inverse]
+
+    style = {'edgecolors': 'black', 'linewidths': 1, 'alpha': 0.9, **style}
+    collections = {}
+    for marker in dict.fromkeys(markers.tolist()):
+        index = np.flatnonzero(markers == marker)
+        collections[marker] = (ax.scatter(xy[index, 0], xy[index, 1], s=sizes[index], c=colors[index],
+                                          marker=marker, **style), index)
+    return collections
+
+
+def curved_mask(start, end, threshold=CURVE_THRESHOLD):
+    delta = np.abs(np.asarray(end, dtype=float) - np.asarray(start, dtype=float))
+    return (delta[:, 0] > threshold[0]) | (delta[:, 1] > threshold[1])
+
+
+def control_points(start, end, bend=CURVE_BEND):
+    """Eğri kontrol noktası: orta nokta, y yönünde hedefe doğru 'bend' kadar kaydırılmış"""
+    control = (start + end) / 2
+    control[:, 1] += np.sign(end[:, 1] - start[:, 1]) * bend
+    return control
+
+
+def bezier(start, control, end, t):
+    """(E, 2) uç ve kontrol noktaları için (E, len(t), 2) ikinci derece Bézier noktaları"""
+    t = np.asarray(t, dtype=float)[None, :, None]
+    return ((1 - t) ** 2 * start[:, None] + 2 * (1 - t) * t * control[:, None] + t ** 2 * end[:, None])
+
+
+def _unit(vectors):
+    norm = np.hypot(vectors[:, 0], vectors[:, 1])
+    return vectors / np.where(norm > 0, norm, 1)[:, None]
+
+
+def arrow_geometry(start, end, curved, head_width=ARROW_HEAD['width'], head_length=ARROW_HEAD['length']):
+    """plt.arrow ile aynı yerleşimde ok gövdeleri (A, 2, 2) ve üçgen ok başları (A, 3, 2)
+
+    Eğri kenarda ok eğrinin %80'inde teğet yönünde 0.5 birim, düz kenarda orta
+    noktadan 1 birim uzunluktadır; baş gövdenin ucuna eklenir.
+    """
+    origin = (start + end) / 2
+    direction = _unit(end - start)
+    shaft = np.ones(len(start))
+
+    if curved.any():
+        p0, p2 = start[curved], end[curved]
+        p1 = control_points(p0, p2)
+        origin[curved] = bezier(p0, p1, p2, [ARROW_T])[:, 0]
+        direction[curved] = _unit(2 * (1 - ARROW_T) * (p1 - p0) + 2 * ARROW_T * (p2 - p1))
+        shaft[curved] = 0.5
+    straight = ~curved
+    origin[straight] -= direction[straight] * 0.5
+
+    base = origin + direction * shaft[:, None]
+    tip = base + direction * head_length
+    normal = np.column_stack((-direction[:, 1], direction[:, 0])) * (head_width / 2)
+    shafts = np.stack((origin, base), axis=1)
+    heads = np.stack((base + normal, tip, base - normal), axis=1)
+    return shafts, heads
+
+
+def draw_edges(ax, start, end, types, edge_types=EDGE_TYPES, arrow_types=ARROW_EDGE_TYPES,
+               n_points=CURVE_POINTS, alpha=EDGE_ALPHA):
+    """Kenarları tür başına tek LineCollection, okları tek PolyCollection ile çiz
+
+    Dönen sözlük: {'edges': {tür: LineCollection}, 'shafts': LineCollection|None,
+    'heads': PolyCollection|None, 'index': {tür: kenar indeksleri}, 'arrow_index': kenar indeksleri}
+    İndeksler koleksiyonlardaki parça sırasıyla girdi kenarlarını eşler (canlı güncelleme için).
+    """
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.colors import to_rgba_array
+
+    start = np.asarray(start, dtype=float).reshape(-1, 2)
+    end = np.asarray(end, dtype=float).reshape(-1, 2)
+    names, inverse = _lookup(types, edge_types, 'bağlantı')
+    curved = curved_mask(start, end)
+
+    # Tüm eğri kenarlar tek seferde; satırlar curved sırasındadır
+    curve_row = np.cumsum(curved) - 1
+    curves = bezier(start[curved], control_points(start[curved], end[curved]), end[curved],
+                    np.linspace(0, 1, n_points))
+    straights = np.stack((start, end), axis=1)
+
+    artists = {'edges': {}, 'shafts': None, 'heads': None, 'index': {}, 'arrow_index': np.zeros(0, dtype=np.intp)}
+    for code, name in enumerate(names):
+        selected = inverse == code
+        artists['index'][name] = np.concatenate((np.flatnonzero(selected & curved), np.flatnonzero(selected & ~curved)))
+        segments = [*curves[curve_row[selected & curved]], *straights[selected & ~curved]]
+        edge_style = edge_types[name]
+        # Line2D ile aynı zorder: kenarlar yama (patch) ve scatter'ların üstünde
+        collection = LineCollection(segments, colors=edge_style['color'], linewidths=edge_style['width'],
+                                    linestyles=edge_style['style'], alpha=alpha, zorder=2)
+        artists['edges'][name] = ax.add_collection(collection, autolim=False)
+
+    arrows = np.isin(names, arrow_types)[inverse]
+    if arrows.any():
+        shafts, heads = arrow_geometry(start[arrows], end[arrows], curved[arrows])
+        colors = to_rgba_array([edge_types[name]['color'] for name in names])[inverse[arrows]]
+        artists['arrow_index'] = np.flatnonzero(arrows)
+        artists['shafts'] = ax.add_collection(LineCollection(shafts, colors=colors, linewidths=1), autolim=False)
+        artists['heads'] = ax.add_collection(PolyCollection(heads, facecolors=colors, edgecolors=colors,
+                                                            linewidths=1), autolim=False)
+    return artists
+
+
+def draw_labels(ax, xy, names, max_labels=500, **style):
+    """Düğüm adlarını yaz; kalabalık ağlarda ilk 'max_labels' ad ile sınırlı"""
+    import matplotlib.patheffects as PathEffects
+
+    style = {'ha': 'center', 'va': 'top', 'fontsize': 8, **style}
+    texts = []
+    for (x, y), name in zip(np.asarray(xy, dtype=float)[:max_labels], list(names)[:max_labels]):
+        text = ax.text(x, y - 0.5, name, **style)
+        text.set_path_effects([PathEffects.withStroke(linewidth=2, foreground='white')])
+        texts.append(text)
+    return texts
+
+
+def synthetic_network(n_nodes, n_edges, seed=0, extent=(-25, 20, -15, 10)):
+    """Kıyaslama için rastgele ağ: (xy, düğüm türleri, değerler, kenar uçları, kenar türleri)"""
+    rng = np.random.default_rng(seed)
+    xy = np.column_stack((rng.uniform(extent[0], extent[1], n_nodes), rng.uniform(extent[2], extent[3], n_nodes)))
+    node_types = rng.choice(list(NODE_TYPES), n_nodes)
+    values = np.where(np.isin(node_types, FACTOR_TYPES), rng.uniform(0, 100, n_nodes), np.nan)
+    # Çoğu kenar yakın komşuya, bir kısmı uzak düğümlere (eğri) bağlanır
+    source = rng.integers(0, n_nodes, n_edges)
+    near = np.argsort(xy[:, 0])
+    rank = np.empty(n_nodes, dtype=np.int64)
+    rank[near] = np.arange(n_nodes)
+    offset = rng.integers(1, 20, n_edges)
+    target = near[np.clip(rank[source] + offset, 0, n_nodes - 1)]
+    far = rng.random(n_edges) < 0.2
+    target[far] = rng.integers(0, n_nodes, far.sum())
+    edge_types = rng.choice(list(EDGE_TYPES), n_edges)
+    return xy, node_types, values, source, target, edge_types
+
+
+def _legacy_draw(ax, xy, node_types, values, source, target, edge_types):
+    """orman_yangini_risk_agi.py'deki eski düğüm/kenar başına çizim"""
+    for u, v, edge_type in zip(source, target, edge_types):
+        edge_style = EDGE_TYPES[edge_type]
+        (x1, y1), (x2, y2) = xy[u], xy[v]
+        if abs(x1 - x2) > 10 or abs(y1 - y2) > 5:
+            control_x = (x1 + x2) / 2
+            control_y = (y1 + y2) / 2 + np.sign(y2 - y1) * 3
+            t = np.linspace(0, 1, 100)
+            x = (1-t)**2 * x1 + 2*(1-t)*t * control_x + t**2 * x2
+            y = (1-t)**2 * y1 + 2*(1-t)*t * control_y + t**2 * y2
+            ax.plot(x, y, linestyle=edge_style['style'], color=edge_style['color'],
+                    linewidth=edge_style['width'], alpha=0.7)
+            if edge_type in ARROW_EDGE_TYPES:
+                dx, dy = x[81] - x[79], y[81] - y[79]
+                length = np.hypot(dx, dy)
+                ax.arrow(x[80], y[80], dx / length * 0.5, dy / length * 0.5, head_width=0.3, head_length=0.5,
+                         fc=edge_style['color'], ec=edge_style['color'])
+        else:
+            ax.plot([x1, x2], [y1, y2], linestyle=edge_style['style'], color=edge_style['color'],
+                    linewidth=edge_style['width'], alpha=0.7)
+            if edge_type in ARROW_EDGE_TYPES:
+                dx, dy = x2 - x1, y2 - y1
+                length = np.hypot(dx, dy) or 1
+                dx, dy = dx / length, dy / length
+                ax.arrow((x1 + x2) / 2 - dx * 0.5, (y1 + y2) / 2 - dy * 0.5, dx, dy, head_width=0.3,
+                         head_length=0.5, fc=edge_style['color'], ec=edge_style['color'])
+    sizes = node_sizes(node_types, values)
+    for (x, y), node_type, size in zip(xy, node_types, sizes):
+        node_style = NODE_TYPES[node_type]
+        ax.scatter(x, y, s=size, c=node_style['color'], marker=node_style['shape'],
+                   edgecolors='black', linewidths=1, alpha=0.9)
+
+
+def benchmark(edge_counts=(1_000, 10_000, 30_000, 100_000), legacy_limit=10_000):
+    """Eski artist-başına çizim ile toplu çizimin render süresi (Agg, 16x12 in, 100 dpi)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    def render(draw):
+        fig, ax = plt.subplots(figsize=(16, 12), dpi=100)
+        start = time.perf_counter()
+        draw(ax)
+        ax.set_xlim(-30, 30)
+        ax.set_ylim(-20, 15)
+        fig.canvas.draw()
+        elapsed = time.perf_counter() - start
+        plt.close(fig)
+        return elapsed
+
+    def batched(ax, network):
+        xy, node_types, values, source, target, edge_types = network
+        draw_edges(ax, xy[source], xy[target], edge_types)
+        draw_nodes(ax, xy, node_types, values)
+
+    print(f"{'Kenar':>8}{'Düğüm':>8}{'eski (s)':>12}{'toplu (s)':>12}{'hızlanma':>10}")
+    for n_edges in edge_counts:
+        network = synthetic_network(max(n_edges // 2, 2), n_edges)
+        batched_time = render(lambda ax: batched(ax, network))
+        if n_edges <= legacy_limit:
+            legacy_time = render(lambda ax: _legacy_draw(ax, *network))
+            legacy_text, speedup = f'{legacy_time:.2f}', f'{legacy_time / batched_time:.0f}x'
+        else:
+            legacy_text, speedup = '—', '—'
+        print(f"{n_edges:>8}{len(network[0]):>8}{legacy_text:>12}{batched_time:>12.2f}{speedup:>10}")
+
+
+if __name__ == '__main__':
+    benchmark(*(tuple(int(arg) for arg in sys.argv[1:]),) if len(sys.argv) > 1 else ())
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Risk ağı için mekânsal indeks: en yakın birim, yarıçap ve bölge sorguları.
+
+Düğümler tür başına bir KD-ağacında (scipy cKDTree) tutulur. cKDTree sonradan
+nokta eklemeyi desteklemediğinden yeni düğümler (ör. eklenen sensörler) önce
+küçük bir bekleme tamponuna yazılır ve sorgularda kaba kuvvetle taranır;
+tampon ağacın %5'ini aşınca yalnızca o türün ağacı yeniden kurulur. Böylece
+ekleme maliyeti amortize O(log n) kalır ve indeks hiçbir zaman bütünüyle
+yeniden kurulmaz.
+
+Bölge poligonları sınır kutusu (bbox) ön elemesi ve vektörel ışın atma
+(ray casting) ile sorgulanır.
+
+Koordinatlar düzlemse (geographic=False) mesafeler koordinat biriminde,
+boylam/enlem ise (geographic=True) birim küre üzerindeki kiriş mesafesinden
+çevrilerek km cinsindendir.
+
+Kıyaslama:  python risk_agi_mekansal.py --benchmark 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from risk_agi_tanimlari import RESPONSE_TYPES, SETTLEMENT_TYPES
+from risk_agi_yukleyici import NODE_TYPE_NAMES, ArrayGraph, find_table, load_network, load_regions
+
+EARTH_RADIUS_KM = 6371.0088
+PENDING_FRACTION = 0.05
+MIN_PENDING = 256
+# Toplu sorgularda kaba kuvvet taramasının (nokta x tampon) üst sınırı
+BRUTE_FORCE_LIMIT = 1_000_000
+
+
+def _type_codes(types):
+    if types is None:
+        return list(range(len(NODE_TYPE_NAMES)))
+    types = (types,) if isinstance(types, str) else types
+    unknown = [name for name in types if name not in NODE_TYPE_NAMES]
+    if unknown:
+        raise ValueError(f"Bilinmeyen düğüm türü: {', '.join(map(repr, unknown))}")
+    return [NODE_TYPE_NAMES.index(name) for name in types]
+
+
+class _TypeIndex:
+    """Bir düğüm türünün KD-ağacı ve henüz ağaca girmemiş noktaları"""
+
+    def __init__(self, rebuild_fraction):
+        self.rebuild_fraction = rebuild_fraction
+        self.tree = None
+        self.tree_nodes = np.zeros(0, dtype=np.int64)
+        self.pending_points = []
+        self.pending_nodes = []
+        self._pending = (np.zeros((0, 3)), np.zeros(0, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.tree_nodes) + sum(len(nodes) for nodes in self.pending_nodes)
+
+    def add(self, points, nodes):
+        self.pending_points.append(points)
+        self.pending_nodes.append(nodes)
+        self._pending = None
+        if self.pending_size > max(MIN_PENDING, self.rebuild_fraction * len(self.tree_nodes)):
+            self.rebuild()
+
+    @property
+    def pending_size(self):
+        return sum(len(nodes) for nodes in self.pending_nodes)
+
+    def pending(self):
+        if self._pending is None:
+            self._pending = (np.concatenate(self.pending_points), np.concatenate(self.pending_nodes))
+        return self._pending
+
+    def rebuild(self):
+        if not self.pending_nodes:
+            return
+        points, nodes = self.pending()
+        if self.tree is not None:
+            points = np.concatenate((self.tree.data, points))
+            nodes = np.concatenate((self.tree_nodes, nodes))
+        self.tree = cKDTree(points)
+        self.tree_nodes = nodes
+        self.pending_points, self.pending_nodes = [], []
+        self._pending = (np.zeros((0, points.shape[1])), np.zeros(0, dtype=np.int64))
+
+    def nearest(self, points, k):
+        """(N, k) kiriş/düzlem mesafeleri ve düğüm indeksleri; eksik komşular inf / -1"""
+        if self.pending_size * len(points) > BRUTE_FORCE_LIMIT:
+            self.rebuild()
+        distances = np.full((len(points), 0), np.inf)
+        nodes = np.zeros((len(points), 0), dtype=np.int64)
+        if self.tree is not None:
+            tree_distances, tree_index = self.tree.query(points, k=np.arange(1, k + 1))
+            found = tree_index < len(self.tree_nodes)
+            distances = tree_distances
+            nodes = np.where(found, self.tree_nodes[np.minimum(tree_index, len(self.tree_nodes) - 1)], -1)
+        pending_points, pending_nodes = self.pending()
+        if len(pending_nodes):
+            brute = np.linalg.norm(points[:, None, :] - pending_points[None, :, :], axis=2)
+            distances = np.concatenate((distances, brute), axis=1)
+            nodes = np.concatenate((nodes, np.broadcast_to(pending_nodes, brute.shape)), axis=1)
+        return distances, nodes
+
+    def within(self, point, radius):
+        """Yarıçap içindeki (düğümler, mesafeler)"""
+        nodes, points = np.zeros(0, dtype=np.int64), np.zeros((0, len(point)))
+        if self.tree is not None:
+            hits = self.tree.query_ball_point(point, radius)
+            nodes, points = self.tree_nodes[hits], self.tree.data[hits]
+        pending_points, pending_nodes = self.pending()
+        if len(pending_nodes):
+            nodes = np.concatenate((nodes, pending_nodes))
+            points = np.concatenate((points, pending_points))
+        distances = np.linalg.norm(points - point, axis=1)
+        close = distances <= radius
+        return nodes[close], distances[close]
+
+
+def _points_in_ring(x, y, ring, block=1_000_000):
+    """Işın atma: (x, y) noktalarının kapalı halka içinde olup olmadığı"""
+    ring = np.asarray(ring, dtype=float)
+    if not np.array_equal(ring[0], ring[-1]):
+        ring = np.vstack((ring, ring[:1]))
+    x0, y0, x1, y1 = ring[:-1, 0], ring[:-1, 1], ring[1:, 0], ring[1:, 1]
+    slope = np.divide(x1 - x0, y1 - y0, out=np.zeros_like(x0), where=y1 != y0)
+    inside = np.zeros(len(x), dtype=bool)
+    step = max(1, block // len(x0))
+    for start in range(0, len(x), step):
+        px, py = x[start:start + step, None], y[start:start + step, None]
+        crosses = (y0 > py) != (y1 > py)
+        inside[start:start + step] = np.count_nonzero(crosses & (px < x0 + (py - y0) * slope), axis=1) % 2 == 1
+    return inside
+
+
+class SpatialIndex:
+    """Düğüm konumları ve bölge poligonları üzerinde mekânsal sorgular
+
+    graph verilirse düğümleri indekslenir; graf büyüdükçe update(graph) yalnızca
+    yeni düğümleri ekler.
+    """
+
+    def __init__(self, graph=None, regions=None, geographic=False, rebuild_fraction=PENDING_FRACTION):
+        self.geographic = geographic
+        self.rebuild_fraction = rebuild_fraction
+        self.size = 0
+        self._types = {}
+        self.region_ids = []
+        self._region_boxes = np.zeros((0, 4))
+        self._region_rings = []
+        if graph is not None:
+            self.update(graph)
+        if regions is not None:
+            self.set_regions(regions)
+
+    # --- düğümler ---------------------------------------------------------------
+
+    def _project(self, x, y):
+        """Sorgu uzayına çevir: düzlemde (x, y), coğrafi modda birim küre (X, Y, Z)"""
+        x, y = np.atleast_1d(np.asarray(x, dtype=float)), np.atleast_1d(np.asarray(y, dtype=float))
+        if not self.geographic:
+            return np.column_stack((x, y))
+        lon, lat = np.radians(x), np.radians(y)
+        return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+    def _to_query(self, distance):
+        if not self.geographic:
+            return distance
+        return 2 * np.sin(np.minimum(np.asarray(distance, dtype=float) / EARTH_RADIUS_KM, np.pi) / 2)
+
+    def _from_query(self, distance):
+        if not self.geographic:
+            return distance
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(distance / 2, 1.0))
+
+    def add(self, x, y, types, nodes=None):
+        """Noktaları ekle; nodes verilmezse sıradaki düğüm indeksleri kullanılır"""
+        points = self._project(x, y)
+        codes = np.atleast_1d(np.asarray(types))
+        if codes.dtype.kind in 'US':
+            codes = np.array(_type_codes(codes.tolist()))
+        nodes = np.arange(self.size, self.size + len(points)) if nodes is None else np.asarray(nodes, np.int64)
+        for code in np.unique(codes):
+            selected = codes == code
+            index = self._types.setdefault(int(code), _TypeIndex(self.rebuild_fraction))
+            index.add(points[selected], nodes[selected])
+        self.size = max(self.size, int(nodes.max()) + 1) if len(nodes) else self.size
+        return nodes
+
+    def update(self, graph):
+        """Grafta henüz indekslenmemiş düğümleri ekle (artımlı)"""
+        if graph.node_count > self.size:
+            new = slice(self.size, graph.node_count)
+            self.add(graph.x[new], graph.y[new], graph.node_type[new], np.arange(self.size, graph.node_count))
+        return self
+
+    def flush(self):
+        """Bekleyen tüm noktaları ağaçlara al (toplu sorgulardan önce yararlı)"""
+        for index in self._types.values():
+            index.rebuild()
+
+    def nearest(self, x, y, types=RESPONSE_TYPES, k=1, max_distance=np.inf):
+        """Her sorgu noktası için verilen türlerdeki en yakın k düğüm
+
+        Dönüş: (mesafeler (N, k), düğüm indeksleri (N, k)); bulunamayanlar inf / -1.
+        """
+        points = self._project(x, y)
+        distances = [np.full((len(points), k), np.inf)]
+        nodes = [np.full((len(points), k), -1, dtype=np.int64)]
+        for code in _type_codes(types):
+            if code in self._types:
+                type_distances, type_nodes = self._types[code].nearest(points, k)
+                distances.append(type_distances)
+                nodes.append(type_nodes)
+        distances, nodes = np.concatenate(distances, axis=1), np.concatenate(nodes, axis=1)
+        order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        distances = self._from_query(np.take_along_axis(distances, order, axis=1))
+        nodes = np.take_along_axis(nodes, order, axis=1)
+        nodes[~(distances <= max_distance)] = -1
+        distances[nodes < 0] = np.inf
+        return distances, nodes
+
+    def within(self, x, y, radius, types=None):
+        """Tek nokta çevresinde yarıçap içindeki düğümler, mesafeye göre sıralı: (indeksler, mesafeler)"""
+        point = self._project(x, y)[0]
+        query_radius = self._to_query(radius)
+        found = [self._types[code].within(point, query_radius) for code in _type_codes(types) if code in self._types]
+        if not found:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        nodes = np.concatenate([nodes for nodes, _ in found])
+        distances = self._from_query(np.concatenate([distances for _, distances in found]))
+        order = np.argsort(distances, kind='stable')
+        return nodes[order], distances[order]
+
+    # --- bölgeler ---------------------------------------------------------------
+
+    def set_regions(self, regions):
+        """load_regions çıktısı ({id: {'rings': [...]}}) ile bölge poligonlarını indeksle"""
+        self.region_ids = list(regions)
+        self._region_rings = [[np.asarray(ring, dtype=float) for ring in region['rings']] for region in regions.values()]
+        boxes = []
+        for rings in self._region_rings:
+            stacked = np.vstack(rings)
+            boxes.append((*stacked.min(axis=0), *stacked.max(axis=0)))
+        self._region_boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+
+    def region_of(self, x, y):
+        """Her nokta için içinde bulunduğu ilk bölgenin kimliği ('' = hiçbiri)"""
+        x, y = np.atleast_1d(np.asarray(x, dtype=float)), np.atleast_1d(np.asarray(y, dtype=float))
+        result = np.full(len(x), -1, dtype=np.int64)
+        if not len(x):
+            return np.zeros(0, dtype=object)
+        # Yalnızca sorgu noktalarının kapsayan kutusuyla kesişen bölgeler taranır;
+        # çakışan bölgelerde tablo sırasındaki ilk bölge kazanır: ters sırada yazılır
+        min_x, min_y, max_x, max_y = self._region_boxes.T
+        active = np.flatnonzero((min_x <= x.max()) & (max_x >= x.min()) & (min_y <= y.max()) & (max_y >= y.min()))
+        for region in active[::-1]:
+            min_x, min_y, max_x, max_y = self._region_boxes[region]
+            candidates = np.flatnonzero((x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y))
+            if not len(candidates):
+                continue
+            inside = np.zeros(len(candidates), dtype=bool)
+            for ring in self._region_rings[region]:
+                inside |= _points_in_ring(x[candidates], y[candidates], ring)
+            result[candidates[inside]] = region
+        ids = np.array(self.region_ids + [''], dtype=object)
+        return ids[result]
+
+    def regions_at(self, x, y):
+        """Tek noktayı içeren tüm bölgelerin kimlikleri"""
+        min_x, min_y, max_x, max_y = self._region_boxes.T
+        found = []
+        for region in np.flatnonzero((x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)):
+            if any(_points_in_ring(np.array([x], float), np.array([y], float), ring)[0]
+                   for ring in self._region_rings[region]):
+                found.append(self.region_ids[region])
+        return found
+
+    # --- grafa kenar ekleme -----------------------------------------------------
+
+    def _members(self, graph, types):
+        return np.flatnonzero(np.isin(graph.node_type, _type_codes(types)))
+
+    def link_nearest(self, graph, from_types, to_types, edge_type, k=1, max_distance=np.inf):
+        """Her 'from' düğümünü en yakın k 'to' düğümüne bağla; eklenen kenar sayısı"""
+        self.update(graph)
+        self.flush()
+        sources = self._members(graph, from_types)
+        _, targets = self.nearest(graph.x[sources], graph.y[sources], to_types, k + 1, max_distance)
+        sources = np.broadcast_to(sources[:, None], targets.shape)
+        # Kendine bağlantıyı at, satır başına en fazla k kenar bırak
+        valid = (targets >= 0) & (targets != sources)
+        valid &= np.cumsum(valid, axis=1) <= k
+        graph.add_edge_indices(sources[valid], targets[valid], edge_type)
+        return int(valid.sum())
+
+    def link_within(self, graph, from_types, to_types, radius, edge_type):
+        """Her 'from' düğümünü yarıçap içindeki tüm 'to' düğümlerine bağla; eklenen kenar sayısı"""
+        self.update(graph)
+        self.flush()
+        sources = self._members(graph, from_types)
+        points = self._project(graph.x[sources], graph.y[sources])
+        query_radius = self._to_query(radius)
+        pairs_u, pairs_v = [], []
+        for code in _type_codes(to_types):
+            index = self._types.get(code)
+            if index is None or index.tree is None:
+                continue
+            for source, hits in zip(sources, index.tree.query_ball_point(points, query_radius)):
+                if hits:
+                    targets = index.tree_nodes[hits]
+                    targets = targets[targets != source]
+                    pairs_u.append(np.full(len(targets), source))
+                    pairs_v.append(targets)
+        if not pairs_u:
+            return 0
+        sources, targets = np.concatenate(pairs_u), np.concatenate(pairs_v)
+        graph.add_edge_indices(sources, targets, edge_type)
+        return len(sources)
+
+
+def _timed(function, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def benchmark(n_nodes=100_000, repeats=2000, seed=0):
+    """n_nodes düğümlük sentetik ağda kurulum, sorgu ve artımlı ekleme süreleri"""
+    rng = np.random.default_rng(seed)
+    graph = ArrayGraph()
+    extent = (-25.0, 20.0, -15.0, 10.0)
+    x, y = rng.uniform(extent[0], extent[1], n_nodes), rng.uniform(extent[2], extent[3], n_nodes)
+    types = rng.choice(NODE_TYPE_NAMES, n_nodes)
+    graph.add_nodes([f'n{index}' for index in range(n_nodes)], x, y, types)
+    regions = {f'b{row}{col}': {'rings': [np.array([(x0, y0), (x0 + 5, y0), (x0 + 5, y0 + 5), (x0, y0 + 5), (x0, y0)])]}
+               for row, y0 in enumerate(np.arange(extent[2], extent[3], 5.0))
+               for col, x0 in enumerate(np.arange(extent[0], extent[1], 5.0))}
+
+    start = time.perf_counter()
+    index = SpatialIndex(graph, regions)
+    index.flush()
+    print(f"🗂️ {n_nodes:,} düğüm, {len(regions)} bölge: kurulum {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    qx, qy = rng.uniform(extent[0], extent[1], repeats), rng.uniform(extent[2], extent[3], repeats)
+    points = iter(zip(np.tile(qx, 4), np.tile(qy, 4)))
+    print(f"{'Sorgu':<40}{'ms/sorgu':>10}")
+    rows = [('en yakın müdahale birimi', lambda: index.nearest(*next(points))),
+            ('en yakın 5 müdahale birimi', lambda: index.nearest(*next(points), k=5)),
+            ('2 birim yarıçaplı itfaiyeler', lambda: index.within(*next(points), 2.0, 'fire_station')),
+            ('nokta hangi bölgede', lambda: index.region_of(*next(points)))]
+    for label, function in rows:
+        print(f"{label:<40}{_timed(function, repeats):>10.4f}")
+
+    # Artımlı sensör ekleme: her seferinde 10 sensör, ağaç yalnızca tampon dolunca yeniden kurulur
+    added = 0
+    start = time.perf_counter()
+    for batch in range(100):
+        count = 10
+        graph.add_nodes([f's{batch}_{i}' for i in range(count)], rng.uniform(-25, 20, count),
+                        rng.uniform(-15, 10, count), ['sensor'] * count)
+        index.update(graph)
+        index.nearest(0.0, 0.0, 'sensor')
+        added += count
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{'artımlı ekleme + sorgu (10 sensör)':<40}{elapsed / 100:>10.4f}")
+
+    start = time.perf_counter()
+    linked = index.link_nearest(graph, SETTLEMENT_TYPES, RESPONSE_TYPES, 'ground_response', k=2)
+    print(f"🔗 {linked:,} yerleşim -> en yakın 2 birim kenarı: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Risk ağı mekânsal sorguları')
+    parser.add_argument('data_dir', nargs='?', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                    'risk_agi_verisi'))
+    parser.add_argument('--radius', type=float, default=15.0, help='Yarıçap sorgusu (koordinat birimi ya da km)')
+    parser.add_argument('--geographic', action='store_true', help='Koordinatlar boylam/enlem')
+    parser.add_argument('--benchmark', type=int, metavar='DÜĞÜM', help='Sentetik ağla gecikme kıyaslaması')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return 0
+
+    graph = load_network(find_table(args.data_dir, 'dugumler'), find_table(args.data_dir, 'baglantilar'))
+    index = SpatialIndex(graph, load_regions(find_table(args.data_dir, 'bolgeler')), geographic=args.geographic)
+    settlements = np.flatnonzero(np.isin(graph.node_type, _type_codes(SETTLEMENT_TYPES)))
+    regions = index.region_of(graph.x[settlements], graph.y[settlements])
+    distances, nearest = index.nearest(graph.x[settlements], graph.y[settlements])
+    for node, region, distance, unit in zip(settlements, regions, distances[:, 0], nearest[:, 0]):
+        stations, _ = index.within(graph.x[node], graph.y[node], args.radius, 'fire_station')
+        # Müdahale birimi yoksa nearest -1 döner; names[-1] son düğümün adıdır
+        closest = f"{graph.names[unit]} ({distance:.1f})" if unit >= 0 else '-'
+        print(f"🏘️ {graph.names[node]} [{region or '-'}]: en yakın birim {closest}, "
+              f"{args.radius:g} içinde {len(stations)} itfaiye")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
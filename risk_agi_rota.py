@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Risk ağı üzerinde müdahale süresi rotalama motoru.
+
+ground_response / air_response kenarları seyahat süresi (dakika) ağırlıklı
+seyrek bir grafa (scipy.sparse.csgraph) çevrilir:
+  - her müdahale biriminden (itfaiye, orman ekibi, hava üssü) tüm düğümlere en
+    kısa süreler birim başına bir Dijkstra satırı olarak tabloya yazılır,
+  - tablo önbellektedir; kısalan ya da eklenen bir kenar tabloyu iki Dijkstra
+    ile yerinde onarır, uzayan ya da kaldırılan bir kenar yalnızca onu en kısa
+    yolunda kullanan satırları bayatlatır ve bunlar ilk sorguda yeniden
+    hesaplanır,
+  - bir sensör tetiklendiğinde sıralı birim listesi tablonun tek sütunudur
+    (arama yok, yalnızca sıralama).
+
+Tablo yalnızca hedef düğümler için tutulur: bütçeye sığıyorsa tüm düğümler,
+sığmıyorsa yerleşimler ve izleme düğümleri. Tablo dışındaki bir düğüm için
+ters yönde tek bir Dijkstra çalıştırılır.
+
+Kıyaslama:  python risk_agi_rota.py --benchmark 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from risk_agi_mekansal import EARTH_RADIUS_KM
+from risk_agi_tanimlari import RESPONSE_TYPES, SETTLEMENT_TYPES
+from risk_agi_yukleyici import EDGE_TYPE_NAMES, NODE_TYPE_NAMES, ArrayGraph, find_table, load_network
+
+# Kenar türüne göre ortalama hız (km/sa); diğer kenarlar rotalamaya girmez
+ROUTE_SPEEDS = {'ground_response': 50.0, 'air_response': 200.0}
+# Tablo dışı kalmaması gereken düğümler (tetiklenebilen izleme noktaları)
+MONITOR_TYPES = ('sensor', 'camera', 'meteo_station', 'satellite')
+# Birim x hedef tablosunun en fazla hücre sayısı (float32: 4 bayt/hücre)
+TABLE_BUDGET = 50_000_000
+MIN_MINUTES = 1e-6
+
+
+def _codes(types):
+    return [NODE_TYPE_NAMES.index(name) for name in types]
+
+
+def _lengths(x, y, u, v, geographic):
+    if not geographic:
+        return np.hypot(x[u] - x[v], y[u] - y[v])
+    lon1, lat1, lon2, lat2 = map(np.radians, (x[u], y[u], x[v], y[v]))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class RoutingEngine:
+    """Müdahale birimlerinden hedeflere en kısa seyahat süreleri (dakika)
+
+    Kenarlar yönsüzdür (yollar iki yönlüdür). Koordinatlar km cinsinden düzlemse
+    geographic=False, boylam/enlem ise geographic=True.
+    """
+
+    def __init__(self, graph, speeds=ROUTE_SPEEDS, unit_types=RESPONSE_TYPES, geographic=False,
+                 table_budget=TABLE_BUDGET):
+        self.graph = graph
+        self.n_nodes = graph.node_count
+        self.units = np.flatnonzero(np.isin(graph.node_type, _codes(unit_types)))
+
+        # Hedefler: bütçeye sığıyorsa tüm düğümler, sığmıyorsa yerleşim + izleme düğümleri
+        if len(self.units) * self.n_nodes <= table_budget:
+            self.targets = np.arange(self.n_nodes)
+        else:
+            self.targets = np.flatnonzero(np.isin(graph.node_type, _codes(SETTLEMENT_TYPES + MONITOR_TYPES)))
+        self.target_column = np.full(self.n_nodes, -1, dtype=np.int64)
+        self.target_column[self.targets] = np.arange(len(self.targets))
+
+        # Kenar ağırlıkları: {(küçük, büyük) düğüm çifti: dakika}; paralel kenarlarda en hızlısı
+        speed = np.array([speeds.get(name, 0.0) for name in EDGE_TYPE_NAMES])[graph.edge_type]
+        routable = speed > 0
+        u, v = graph.source[routable].astype(np.int64), graph.target[routable].astype(np.int64)
+        # csgraph sıfır ağırlığı 'kenar yok' sayar: çakışık düğümler için alt sınır
+        minutes = np.maximum(_lengths(graph.x, graph.y, u, v, geographic) / speed[routable] * 60, MIN_MINUTES)
+        self.weights = {}
+        for a, b, weight in zip(np.minimum(u, v).tolist(), np.maximum(u, v).tolist(), minutes.tolist()):
+            if a != b and weight < self.weights.get((a, b), np.inf):
+                self.weights[(a, b)] = weight
+
+        self._matrix = None
+        self._positions = {}
+        self._table = None
+        self._stale = np.ones(len(self.units), dtype=bool)
+
+    @classmethod
+    def from_networkx(cls, G, **options):
+        """type/pos düğüm ve type kenar öznitelikli bir networkx grafından motor kur"""
+        graph = ArrayGraph()
+        ids = list(G.nodes)
+        xy = np.array([G.nodes[node]['pos'] for node in ids], dtype=float).reshape(-1, 2)
+        graph.add_nodes(ids, xy[:, 0], xy[:, 1], [G.nodes[node]['type'] for node in ids],
+                        names=[G.nodes[node].get('name', str(node)) for node in ids])
+        edges = list(G.edges(data='type'))
+        graph.add_edges([u for u, _, _ in edges], [v for _, v, _ in edges], [kind for _, _, kind in edges])
+        return cls(graph, **options)
+
+    # --- seyrek matris -------------------------------------------------------------
+
+    def _csr(self):
+        """Simetrik CSR matrisi; (u, v) -> veri konumu eşlemesi yerinde güncelleme içindir"""
+        if self._matrix is None:
+            pairs = np.array(list(self.weights), dtype=np.int64).reshape(-1, 2)
+            weights = np.fromiter(self.weights.values(), float, len(self.weights))
+            rows = np.concatenate((pairs[:, 0], pairs[:, 1]))
+            cols = np.concatenate((pairs[:, 1], pairs[:, 0]))
+            matrix = csr_matrix((np.concatenate((weights, weights)), (rows, cols)), shape=(self.n_nodes,) * 2)
+            matrix.sort_indices()
+            self._matrix = matrix
+            self._positions = {}
+        return self._matrix
+
+    def _position(self, a, b):
+        key = (a, b)
+        if key not in self._positions:
+            matrix = self._matrix
+            start, stop = matrix.indptr[a], matrix.indptr[a + 1]
+            self._positions[key] = start + np.searchsorted(matrix.indices[start:stop], b)
+        return self._positions[key]
+
+    # --- tablo -------------------------------------------------------------------
+
+    def _refresh(self):
+        """Bayat satırları (birimleri) yeniden hesapla"""
+        if not self._stale.any():
+            return
+        rows = np.flatnonzero(self._stale)
+        distances = dijkstra(self._csr(), directed=False, indices=self.units[rows])
+        if self._table is None:
+            self._table = np.full((len(self.units), len(self.targets)), np.inf, dtype=np.float32)
+        self._table[rows] = distances[:, self.targets]
+        self._stale[:] = False
+
+    def table(self):
+        """(birim düğümleri, hedef düğümleri, süreler (U, T) dakika)"""
+        self._refresh()
+        return self.units, self.targets, self._table
+
+    def dispatch(self, node, limit=None, max_minutes=np.inf):
+        """Düğüme en hızlı ulaşan birimler: [(birim düğüm indeksi, dakika), ...] sıralı"""
+        column = self.target_column[node]
+        if column >= 0:
+            self._refresh()
+            times = self._table[:, column]
+        else:
+            # Tablo dışı düğüm: tek Dijkstra (yönsüz grafta ters yön aynıdır)
+            times = dijkstra(self._csr(), directed=False, indices=node, limit=max_minutes)[self.units]
+        reachable = np.flatnonzero(np.isfinite(times) & (times <= max_minutes))
+        count = len(reachable) if limit is None else min(limit, len(reachable))
+        if count < len(reachable):
+            reachable = reachable[np.argpartition(times[reachable], count - 1)[:count]]
+        order = reachable[np.argsort(times[reachable], kind='stable')]
+        return [(int(self.units[row]), float(times[row])) for row in order]
+
+    def nearest_units(self):
+        """Çok kaynaklı tek Dijkstra: her düğüm için (en yakın birim, dakika); ulaşılamayan -1 / inf"""
+        distances, _, sources = dijkstra(self._csr(), directed=False, indices=self.units, min_only=True,
+                                         return_predecessors=True)
+        return np.where(np.isfinite(distances), sources, -1), distances
+
+    # --- kenar değişiklikleri ------------------------------------------------------
+
+    def _endpoint_times(self, a, b):
+        """Birimlerin kenar uçlarına (değişiklikten önceki) süreleri: iki (U,) dizi"""
+        if len(self.targets) == self.n_nodes:
+            return self._table[:, a].astype(float), self._table[:, b].astype(float)
+        # Tablo uçları kapsamıyor: yönsüz grafta uçlardan iki Dijkstra yeterli
+        times = dijkstra(self._csr(), directed=False, indices=[a, b])[:, self.units]
+        return times[0], times[1]
+
+    def _relax(self, a, b, ta, tb, minutes):
+        """Kısalan/eklenen kenar için tabloyu yerinde onar
+
+        Yeni bir en kısa yol kenarı en fazla bir kez kullanır, bu yüzden
+        süre(r, x) = min(eski, süre(r, a) + w + süre(b, x), süre(r, b) + w + süre(a, x));
+        süre(a, .) ve süre(b, .) yeni grafta iki Dijkstra ile bulunur.
+        """
+        with np.errstate(invalid='ignore'):
+            rows = np.flatnonzero(~self._stale & ((ta + minutes < tb) | (tb + minutes < ta)))
+        if not len(rows):
+            return
+        from_a, from_b = dijkstra(self._csr(), directed=False, indices=[a, b])[:, self.targets]
+        via_a = ta[rows, None] + minutes + from_b[None, :]
+        via_b = tb[rows, None] + minutes + from_a[None, :]
+        self._table[rows] = np.minimum(self._table[rows], np.minimum(via_a, via_b))
+
+    def _invalidate(self, ta, tb, old):
+        """Uzayan/kaldırılan kenar en kısa yol üzerindeyse (sıkı kenar) o satırları bayatla"""
+        tolerance = 1e-4 * np.maximum(1.0, np.minimum(ta, tb))
+        with np.errstate(invalid='ignore'):
+            tight = (np.abs(ta + old - tb) <= tolerance) | (np.abs(tb + old - ta) <= tolerance)
+        self._stale |= tight
+
+    def set_travel_time(self, u, v, minutes):
+        """Kenar süresini değiştir, yoksa ekle; minutes=inf kenarı kaldırır"""
+        a, b = min(u, v), max(u, v)
+        minutes = max(float(minutes), MIN_MINUTES)
+        old = self.weights.get((a, b), np.inf)
+        if minutes == old:
+            return
+        # Tablo hiç hesaplanmadıysa tüm satırlar zaten bayat
+        endpoint_times = self._endpoint_times(a, b) if self._table is not None and not self._stale.all() else None
+        if np.isfinite(minutes) and np.isfinite(old) and self._matrix is not None:
+            # Yapı değişmedi: CSR verisi yerinde güncellenir
+            self._matrix.data[self._position(a, b)] = minutes
+            self._matrix.data[self._position(b, a)] = minutes
+        else:
+            self._matrix = None
+        if np.isfinite(minutes):
+            self.weights[(a, b)] = minutes
+        else:
+            self.weights.pop((a, b), None)
+        if endpoint_times is None:
+            return
+        if minutes < old:
+            self._relax(a, b, *endpoint_times, minutes)
+        else:
+            self._invalidate(*endpoint_times, old)
+
+    def remove_edge(self, u, v):
+        self.set_travel_time(u, v, np.inf)
+
+    @property
+    def stale_rows(self):
+        return int(self._stale.sum())
+
+
+def _synthetic_graph(n_nodes, seed=0):
+    """Kıyaslama ağı: km ölçeğinde düğümler, k-en-yakın komşu yol ağı, az sayıda birim"""
+    from scipy.spatial import cKDTree
+
+    rng = np.random.default_rng(seed)
+    x, y = rng.uniform(0, 150, n_nodes), rng.uniform(0, 100, n_nodes)
+    weights = {'village': 40, 'sensor': 40, 'city': 2, 'critical_facility': 3, 'camera': 5,
+               'fire_station': 1.0, 'forest_team': 1.0, 'air_base': 0.1}
+    names = list(weights)
+    probabilities = np.array(list(weights.values())) / sum(weights.values())
+    types = rng.choice(names, n_nodes, p=probabilities)
+    graph = ArrayGraph()
+    graph.add_nodes([f'n{index}' for index in range(n_nodes)], x, y, types)
+    # Yol ağı: her düğüm en yakın 4 komşusuna kara yoluyla bağlı; hava üsleri uzak noktalara
+    _, neighbours = cKDTree(np.column_stack((x, y))).query(np.column_stack((x, y)), k=5)
+    graph.add_edge_indices(np.repeat(np.arange(n_nodes), 4), neighbours[:, 1:].ravel(), 'ground_response')
+    bases = np.flatnonzero(types == 'air_base')
+    graph.add_edge_indices(np.repeat(bases, 50), rng.integers(0, n_nodes, len(bases) * 50), 'air_response')
+    return graph
+
+
+def benchmark(n_nodes=50_000, n_dispatch=1000, n_changes=200, seed=0):
+    rng = np.random.default_rng(seed)
+    graph = _synthetic_graph(n_nodes, seed)
+    start = time.perf_counter()
+    engine = RoutingEngine(graph)
+    _, targets, table = engine.table()
+    build = time.perf_counter() - start
+    print(f"🚒 {n_nodes:,} düğüm, {len(engine.weights):,} yol, {len(engine.units)} birim: "
+          f"tablo {len(engine.units)}x{len(targets):,} {build:.2f} s")
+
+    sensors = np.flatnonzero(graph.node_type == NODE_TYPE_NAMES.index('sensor'))
+    trips = rng.choice(sensors, n_dispatch)
+    start = time.perf_counter()
+    for node in trips:
+        engine.dispatch(node, limit=10)
+    dispatch_ms = (time.perf_counter() - start) / n_dispatch * 1000
+
+    start = time.perf_counter()
+    for node in trips[:20]:
+        distances = dijkstra(engine._csr(), directed=False, indices=node)
+        np.argsort(distances[engine.units])[:10]
+    search_ms = (time.perf_counter() - start) / 20 * 1000
+    print(f"{'Sensör tetiklenince sıralı 10 birim':<45}{'ms':>8}")
+    print(f"{'  tablodan':<45}{dispatch_ms:>8.3f}")
+    print(f"{'  istek başına Dijkstra':<45}{search_ms:>8.3f}")
+
+    # Kenar değişiklikleri: kısalmalar yerinde onarılır, uzamalar yalnızca sıkı satırları bayatlatır
+    pairs = list(engine.weights)
+    timings = {0.5: [], 3.0: []}
+    recomputed = 0
+    for change in range(n_changes):
+        a, b = pairs[rng.integers(len(pairs))]
+        factor = (0.5, 3.0)[change % 2]
+        start = time.perf_counter()
+        engine.set_travel_time(a, b, engine.weights[(a, b)] * factor)
+        recomputed += engine.stale_rows
+        engine.dispatch(int(rng.choice(sensors)), limit=10)
+        timings[factor].append(time.perf_counter() - start)
+    print(f"✏️ {n_changes} kenar değişikliği (değişiklik + ilk sorgu):")
+    print(f"{'  kısalma (yerinde onarım)':<45}{np.mean(timings[0.5]) * 1000:>8.1f} ms")
+    print(f"{'  uzama (sıkı satırlar yeniden)':<45}{np.mean(timings[3.0]) * 1000:>8.1f} ms, "
+          f"ortalama {recomputed / len(timings[3.0]):.1f}/{len(engine.units)} satır")
+    check = RoutingEngine(graph)
+    for (a, b), weight in engine.weights.items():
+        check.weights[(a, b)] = weight
+    _, _, expected = check.table()
+    same = np.allclose(engine.table()[2], expected, rtol=1e-5)
+
+    start = time.perf_counter()
+    engine._stale[:] = True
+    engine.table()
+    print(f"{'  karşılaştırma: tüm tabloyu yeniden hesapla':<45}{(time.perf_counter() - start) * 1000:>8.1f} ms")
+    print(f"✅ artımlı tablo, tam yeniden hesaplanan tabloyla aynı: {same}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Risk ağı müdahale süresi rotalama')
+    parser.add_argument('data_dir', nargs='?', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                    'risk_agi_verisi'))
+    parser.add_argument('--geographic', action='store_true', help='Koordinatlar boylam/enlem')
+    parser.add_argument('--benchmark', type=int, metavar='DÜĞÜM', help='Sentetik ağla kıyaslama')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return 0
+
+    graph = load_network(find_table(args.data_dir, 'dugumler'), find_table(args.data_dir, 'baglantilar'))
+    engine = RoutingEngine(graph, geographic=args.geographic)
+    settlements = np.flatnonzero(np.isin(graph.node_type, _codes(SETTLEMENT_TYPES)))
+    for node in settlements:
+        ranked = engine.dispatch(node, limit=3)
+        units = ', '.join(f"{graph.names[unit]} ({minutes:.0f} dk)" for unit, minutes in ranked) or 'ulaşılamıyor'
+        print(f"🏘️ {graph.names[node]}: {units}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Risk ağında artımlı risk skoru yayılımı.
+
+Risk faktörlerinin (sıcaklık, nem, rüzgar, topografya) ölçümleri
+high_impact / medium_impact / low_impact kenarları boyunca bitki örtüsü
+düğümlerine, oradan bölgelere yayılır:
+
+  faktör skoru   s_f = ölçeklenmiş değer (0-1; nemde ters çevrilir)
+  karışım        m_v = Σ w_e s_f / Σ w_e      (seyrek W matrisi, satır-normalize)
+  bitki riski    r_v = yakıt_v * m_v          (yakıt = bitki düğümünün kendi değeri)
+  bölge skoru    R_b = bölgedeki r_v ortalaması -> risk seviyesi (low ... critical)
+
+Tam hesap bir seyrek matris-vektör çarpımıdır. Tek bir ölçüm değiştiğinde
+yalnızca o faktörün W sütunundaki bitki düğümleri ve onların bölgeleri
+güncellenir (farklar eklenir), böylece sensör akışı hızında güncelleme yapılabilir.
+Kayan nokta birikimini sınırlamak için belirli aralıklarla tam hesap yapılır.
+
+Kıyaslama:  python risk_agi_skor.py --benchmark
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from risk_agi_tanimlari import FACTOR_TYPES, RISK_LEVELS
+from risk_agi_yukleyici import EDGE_TYPE_NAMES, NODE_TYPE_NAMES, ArrayGraph, find_table, load_network, load_regions
+
+# Faktör değerlerinin 0-1 aralığına ölçeklenmesi: (alt, üst, ters mi)
+FACTOR_SCALES = {
+    'temperature': (10.0, 45.0, False),   # °C
+    'humidity': (0.0, 100.0, True),       # % (nem arttıkça risk azalır)
+    'wind': (0.0, 60.0, False),           # km/sa
+    'vegetation': (0.0, 100.0, False),    # yanıcı yakıt yükü
+    'topography': (0.0, 100.0, False),    # eğim şiddeti
+}
+IMPACT_WEIGHTS = {'high_impact': 1.0, 'medium_impact': 0.6, 'low_impact': 0.3}
+# Faktör bağlantısı olmayan bitki örtüsünün karışım değeri
+NEUTRAL_MIX = 0.5
+# Bölge skoru sınırları: < 0.25 düşük, < 0.45 orta, < 0.65 yüksek, üstü kritik
+RISK_THRESHOLDS = (0.25, 0.45, 0.65)
+RISK_TIERS = tuple(RISK_LEVELS)
+RESYNC_INTERVAL = 100_000
+
+
+def risk_tier(score):
+    """Skor(lar)ı risk seviyesi adına çevir"""
+    return np.array(RISK_TIERS)[np.searchsorted(RISK_THRESHOLDS, score, side='right')]
+
+
+class RiskPropagator:
+    """Faktör ölçümlerinden bitki örtüsü ve bölge risk skorlarını artımlı hesaplar
+
+    regions verilirse (load_regions çıktısı) bölge kimliği boş olan düğümler
+    poligonlara göre atanır; bitki örtüsü olmayan bölgeler yüklenen seviyesini korur.
+    """
+
+    def __init__(self, graph, regions=None, resync_interval=RESYNC_INTERVAL):
+        self.graph = graph
+        self.resync_interval = resync_interval
+        n_nodes = graph.node_count
+        types = graph.node_type
+        vegetation_code = NODE_TYPE_NAMES.index('vegetation')
+        self.is_vegetation = types == vegetation_code
+
+        # Tür başına ölçek tabloları (faktör olmayan türlerde skor 0)
+        lower = np.zeros(len(NODE_TYPE_NAMES))
+        span = np.ones(len(NODE_TYPE_NAMES))
+        inverted = np.zeros(len(NODE_TYPE_NAMES), dtype=bool)
+        self._is_factor_type = np.zeros(len(NODE_TYPE_NAMES), dtype=bool)
+        for name in FACTOR_TYPES:
+            code = NODE_TYPE_NAMES.index(name)
+            low, high, invert = FACTOR_SCALES[name]
+            lower[code], span[code], inverted[code] = low, high - low, invert
+            self._is_factor_type[code] = True
+        self._lower, self._span, self._inverted = lower[types], span[types], inverted[types]
+        self._scored = self._is_factor_type[types]
+
+        # W: bitki örtüsü satırları x faktör sütunları, kenar ağırlıklı ve satır-normalize
+        weight_of_type = np.array([IMPACT_WEIGHTS.get(name, 0.0) for name in EDGE_TYPE_NAMES])
+        weights = weight_of_type[graph.edge_type]
+        u, v = graph.source.astype(np.int64), graph.target.astype(np.int64)
+        impact = weights > 0
+        u, v, weights = u[impact], v[impact], weights[impact]
+        # Kenar yönü veride önemsiz: bitki örtüsü ucu satır, diğer faktör ucu sütundur
+        forward = self.is_vegetation[v] & ~self.is_vegetation[u] & self._scored[u]
+        backward = self.is_vegetation[u] & ~self.is_vegetation[v] & self._scored[v]
+        rows = np.concatenate((v[forward], u[backward]))
+        cols = np.concatenate((u[forward], v[backward]))
+        data = np.concatenate((weights[forward], weights[backward]))
+        matrix = csr_matrix((data, (rows, cols)), shape=(n_nodes, n_nodes))
+        row_sum = np.asarray(matrix.sum(axis=1)).ravel()
+        self.has_factors = row_sum > 0
+        scale = np.divide(1.0, row_sum, out=np.zeros(n_nodes), where=row_sum > 0)
+        self.W = csr_matrix(matrix.multiply(scale[:, None]))
+        self._W_csc = self.W.tocsc()
+
+        # Bölge üyeliği: önce düğümün kendi 'region' alanı, boşsa poligon sorgusu
+        self.region_ids = list(regions) if regions is not None else sorted({name for name in graph.regions if name})
+        region_lookup = {name: index for index, name in enumerate(self.region_ids)}
+        membership = np.array([region_lookup.get(name, -1) for name in graph.regions], dtype=np.int64)
+        if regions is not None and (membership < 0).any():
+            from risk_agi_mekansal import SpatialIndex
+
+            missing = np.flatnonzero(membership < 0)
+            assigned = SpatialIndex(regions=regions).region_of(graph.x[missing], graph.y[missing])
+            membership[missing] = [region_lookup.get(name, -1) for name in assigned]
+        self.region_membership = membership
+        self.region_of_node = np.where(self.is_vegetation, membership, -1)
+        counts = np.bincount(self.region_of_node[self.region_of_node >= 0], minlength=len(self.region_ids))
+        self._region_weight = np.divide(1.0, counts, out=np.zeros(len(counts)), where=counts > 0)
+        self.has_vegetation = counts > 0
+        self.default_tiers = np.array([regions[name]['risk'] if regions is not None else RISK_TIERS[0]
+                                       for name in self.region_ids])
+
+        self.updates = 0
+        self.changed_nodes = np.zeros(0, dtype=np.int64)
+        self.recompute()
+
+    # --- tam hesap ---------------------------------------------------------------
+
+    def _scale(self, nodes, values):
+        values = np.asarray(values, dtype=np.float64)
+        score = np.clip((values - self._lower[nodes]) / self._span[nodes], 0.0, 1.0)
+        score = np.where(self._inverted[nodes], 1.0 - score, score)
+        return np.where(self._scored[nodes] & ~np.isnan(values), score, 0.0)
+
+    def recompute(self):
+        """Tüm skorları baştan hesapla (seyrek matris-vektör çarpımı)"""
+        nodes = np.arange(self.graph.node_count)
+        self.score = self._scale(nodes, self.graph.value)
+        self.mix = np.where(self.has_factors, self.W @ self.score, NEUTRAL_MIX)
+        self.risk = np.where(self.is_vegetation, self.score * self.mix, 0.0)
+        members = self.region_of_node >= 0
+        self.region_score = np.bincount(self.region_of_node[members], self.risk[members],
+                                        minlength=len(self.region_ids)) * self._region_weight
+        self.tiers = self._tiers(np.arange(len(self.region_ids)))
+        self.updates = 0
+
+    def _tiers(self, regions):
+        return np.where(self.has_vegetation[regions], risk_tier(self.region_score[regions]),
+                        self.default_tiers[regions])
+
+    def region_tiers(self):
+        """{bölge kimliği: risk seviyesi}"""
+        return dict(zip(self.region_ids, self.tiers.tolist()))
+
+    # --- artımlı güncelleme --------------------------------------------------------
+
+    def set_value(self, node, value):
+        """Tek ölçümü güncelle; seviyesi değişen bölgeler [(bölge, yeni seviye)] döner"""
+        value = np.float32(value)   # graph.value ile aynı hassasiyette ölçekle
+        new_score = float(self._scale(np.array([node]), [value])[0])
+        delta = new_score - self.score[node]
+        self.graph.value[node] = value
+        self.score[node] = new_score
+        if delta == 0.0:
+            self.changed_nodes = np.zeros(0, dtype=np.int64)
+            return []
+
+        W = self._W_csc
+        start, stop = W.indptr[node], W.indptr[node + 1]
+        rows = W.indices[start:stop]
+        risk_delta = self.score[rows] * W.data[start:stop] * delta
+        self.mix[rows] += W.data[start:stop] * delta
+        if self.is_vegetation[node]:
+            # Bitki örtüsünün kendi yakıt yükü değişti
+            rows = np.append(rows, node)
+            risk_delta = np.append(risk_delta, delta * self.mix[node])
+        return self._apply_risk_delta(rows, risk_delta)
+
+    def set_values(self, nodes, values):
+        """Toplu güncelleme (aynı düğüm birden fazla kez gelirse sonuncusu geçerlidir)"""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        nodes, last = np.unique(nodes[::-1], return_index=True)
+        values = np.asarray(values, dtype=np.float32)[::-1][last]
+        new_score = self._scale(nodes, values)
+        delta = new_score - self.score[nodes]
+        self.graph.value[nodes] = values
+        changed = delta != 0
+        nodes, delta, new_score = nodes[changed], delta[changed], new_score[changed]
+        if not len(nodes):
+            self.changed_nodes = np.zeros(0, dtype=np.int64)
+            return []
+
+        columns = self._W_csc[:, nodes]
+        affected = np.unique(columns.indices)
+        self.mix[affected] += (columns @ delta)[affected]
+        rows = np.union1d(affected, nodes[self.is_vegetation[nodes]])
+        self.score[nodes] = new_score
+        new_risk = self.score[rows] * self.mix[rows]
+        risk_delta = new_risk - self.risk[rows]
+        return self._apply_risk_delta(rows, risk_delta)
+
+    def _apply_risk_delta(self, rows, risk_delta):
+        self.changed_nodes = rows   # son güncellemede riski değişen bitki örtüsü düğümleri
+        self.risk[rows] += risk_delta
+        regions = self.region_of_node[rows]
+        inside = regions >= 0
+        regions = regions[inside]
+        np.add.at(self.region_score, regions, risk_delta[inside] * self._region_weight[regions])
+
+        self.updates += 1
+        if self.updates >= self.resync_interval:
+            old = self.tiers.copy()
+            self.recompute()
+            touched = np.flatnonzero(old != self.tiers)
+        else:
+            regions = np.unique(regions)
+            new_tiers = self._tiers(regions)
+            moved = new_tiers != self.tiers[regions]
+            touched = regions[moved]
+            self.tiers[touched] = new_tiers[moved]
+        return [(self.region_ids[region], str(self.tiers[region])) for region in touched]
+
+
+def _synthetic(n_vegetation, n_regions, seed=0):
+    """Kıyaslama ağı: her bitki düğümüne ~4 faktör, bölgeler ızgara hücreleri"""
+    rng = np.random.default_rng(seed)
+    n_factors = n_vegetation * 4
+    graph = ArrayGraph()
+    factor_types = rng.choice(['temperature', 'humidity', 'wind', 'topography'], n_factors)
+    side = int(np.ceil(np.sqrt(n_regions)))
+    regions_of = [f'b{index}' for index in rng.integers(0, side * side, n_vegetation)]
+    graph.add_nodes([f'v{index}' for index in range(n_vegetation)], rng.uniform(0, 100, n_vegetation),
+                    rng.uniform(0, 100, n_vegetation), ['vegetation'] * n_vegetation,
+                    rng.uniform(30, 100, n_vegetation), regions=regions_of)
+    graph.add_nodes([f'f{index}' for index in range(n_factors)], rng.uniform(0, 100, n_factors),
+                    rng.uniform(0, 100, n_factors), factor_types, rng.uniform(0, 60, n_factors))
+    vegetation = np.repeat(np.arange(n_vegetation), 4)
+    factors = n_vegetation + rng.permutation(n_factors)
+    graph.add_edge_indices(factors, vegetation, 'high_impact')
+    regions = {f'b{index}': {'label': f'b{index}', 'risk': 'medium', 'rings': [np.zeros((4, 2))]}
+               for index in range(side * side)}
+    return graph, regions
+
+
+def benchmark(n_vegetation=100_000, n_regions=400, n_updates=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    graph, regions = _synthetic(n_vegetation, n_regions, seed)
+    start = time.perf_counter()
+    propagator = RiskPropagator(graph, regions)
+    print(f"🔥 {graph.node_count:,} düğüm, {graph.edge_count:,} etki kenarı, {len(regions)} bölge: "
+          f"kurulum {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    factors = rng.integers(n_vegetation, graph.node_count, n_updates)
+    values = rng.uniform(0, 60, n_updates)
+
+    start = time.perf_counter()
+    for node, value in zip(factors[:50].tolist(), values[:50].tolist()):
+        graph.value[node] = value
+        propagator.recompute()
+    full_rate = 50 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    changed = 0
+    for node, value in zip(factors.tolist(), values.tolist()):
+        changed += len(propagator.set_value(node, value))
+    single_rate = n_updates / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for batch in range(0, n_updates, 1000):
+        propagator.set_values(factors[batch:batch + 1000], values[batch:batch + 1000] * 0.9)
+    batch_rate = n_updates / (time.perf_counter() - start)
+
+    incremental = propagator.region_score.copy()
+    propagator.recompute()
+    error = np.nanmax(np.abs(incremental - propagator.region_score))
+    print(f"{'Güncelleme yolu':<40}{'güncelleme/s':>14}")
+    print(f"{'her ölçümde tam hesap':<40}{full_rate:>14,.0f}")
+    print(f"{'artımlı, tek tek':<40}{single_rate:>14,.0f}")
+    print(f"{'artımlı, 1000lik gruplar':<40}{batch_rate:>14,.0f}")
+    print(f"   {changed} seviye değişimi; tam hesapla en büyük fark {error:.2e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Risk ağı bölge risk skorları')
+    parser.add_argument('data_dir', nargs='?', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                    'risk_agi_verisi'))
+    parser.add_argument('--benchmark', action='store_true', help='Sentetik ağla güncelleme hızı kıyaslaması')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark()
+        return 0
+
+    graph = load_network(find_table(args.data_dir, 'dugumler'), find_table(args.data_dir, 'baglantilar'))
+    regions = load_regions(find_table(args.data_dir, 'bolgeler'))
+    propagator = RiskPropagator(graph, regions)
+    for index, region_id in enumerate(propagator.region_ids):
+        score = propagator.region_score[index]
+        source = f"skor {score:.2f}" if propagator.has_vegetation[index] else 'bitki örtüsü yok, veriden'
+        print(f"🗺️ {regions[region_id]['label']:<22}{propagator.tiers[index]:<10}({source}; "
+              f"veride {regions[region_id]['risk']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orman yangını risk ağının düğüm, bağlantı ve risk seviyesi tanımları.
+
+Harita betiği (orman_yangini_risk_agi.py), toplu çizim motoru ve ağ
+araçları aynı sözlükleri kullanır; tür adları doğrulama için de buradan okunur.
+"""
+
+# Düğüm türleri ve özellikleri
+NODE_TYPES = {
+    # Risk Faktörleri
+    'temperature': {'shape': 'o', 'color': 'red', 'size': 300, 'label': 'Sıcaklık'},
+    'humidity': {'shape': 'o', 'color': 'blue', 'size': 300, 'label': 'Nem'},
+    'wind': {'shape': '^', 'color': 'gray', 'size': 300, 'label': 'Rüzgar'},
+    'vegetation': {'shape': 's', 'color': 'green', 'size': 300, 'label': 'Bitki Örtüsü'},
+    'topography': {'shape': 'd', 'color': 'brown', 'size': 300, 'label': 'Topografya'},
+
+    # İzleme İstasyonları
+    'meteo_station': {'shape': '*', 'color': 'dodgerblue', 'size': 350, 'label': 'Meteoroloji İstasyonu'},
+    'satellite': {'shape': 'h', 'color': 'skyblue', 'size': 350, 'label': 'Uydu İzleme Noktası'},
+    'camera': {'shape': '^', 'color': 'deepskyblue', 'size': 250, 'label': 'Kamera Sistemi'},
+    'sensor': {'shape': 'o', 'color': 'lightblue', 'size': 150, 'label': 'Sensör Ağı'},
+
+    # Müdahale Birimleri
+    'fire_station': {'shape': 's', 'color': 'orange', 'size': 350, 'label': 'İtfaiye İstasyonu'},
+    'forest_team': {'shape': '^', 'color': 'darkorange', 'size': 300, 'label': 'Orman Yangın Ekibi'},
+    'air_base': {'shape': 'd', 'color': 'orangered', 'size': 350, 'label': 'Hava Araçları Üssü'},
+    'emergency': {'shape': '*', 'color': 'coral', 'size': 300, 'label': 'Acil Durum Merkezi'},
+
+    # Yerleşim Yerleri
+    'village': {'shape': 'o', 'color': 'black', 'size': 100, 'label': 'Köy'},
+    'city': {'shape': 'o', 'color': 'black', 'size': 250, 'label': 'Şehir'},
+    'critical_facility': {'shape': 's', 'color': 'black', 'size': 200, 'label': 'Kritik Tesis'},
+
+    # Karar Verme Merkezleri
+    'management': {'shape': 's', 'color': 'purple', 'size': 300, 'label': 'Yönetim Birimi'},
+    'crisis_center': {'shape': '*', 'color': 'darkviolet', 'size': 350, 'label': 'Kriz Merkezi'},
+    'coordination': {'shape': '^', 'color': 'mediumpurple', 'size': 300, 'label': 'Koordinasyon Merkezi'},
+
+    # Su Kaynakları
+    'lake': {'shape': 'o', 'color': 'lightblue', 'size': 400, 'label': 'Göl/Baraj'},
+    'fire_pool': {'shape': 's', 'color': 'lightblue', 'size': 200, 'label': 'Yangın Havuzu'}
+}
+
+# Risk seviyeleri ve renkleri
+RISK_LEVELS = {
+    'low': {'color': '#8BC34A', 'alpha': 0.3, 'label': 'Düşük Risk'},
+    'medium': {'color': '#FFEB3B', 'alpha': 0.4, 'label': 'Orta Risk'},
+    'high': {'color': '#FF9800', 'alpha': 0.5, 'label': 'Yüksek Risk'},
+    'critical': {'color': '#F44336', 'alpha': 0.6, 'label': 'Kritik Risk'}
+}
+
+# Bağlantı türleri
+EDGE_TYPES = {
+    'data_flow': {'style': '-', 'color': 'blue', 'width': 1.5, 'label': 'Veri Akışı'},
+    'alert': {'style': '--', 'color': 'red', 'width': 2.0, 'label': 'Acil Uyarı'},
+    'routine_alert': {'style': '--', 'color': 'orange', 'width': 1.0, 'label': 'Rutin Uyarı'},
+    'ground_response': {'style': '-', 'color': 'orange', 'width': 2.0, 'label': 'Kara Müdahalesi'},
+    'air_response': {'style': ':', 'color': 'orange', 'width': 2.0, 'label': 'Hava Müdahalesi'},
+    'high_impact': {'style': '-', 'color': 'red', 'width': 2.0, 'label': 'Yüksek Etki'},
+    'medium_impact': {'style': '-', 'color': 'orange', 'width': 1.5, 'label': 'Orta Etki'},
+    'low_impact': {'style': '-', 'color': 'yellow', 'width': 1.0, 'label': 'Düşük Etki'},
+    'coordination': {'style': ':', 'color': 'purple', 'width': 1.5, 'label': 'Koordinasyon'},
+    'hierarchical': {'style': '-', 'color': 'purple', 'width': 1.0, 'label': 'Hiyerarşik İletişim'}
+}
+
+# Boyutu 'value' ile ölçeklenen risk faktörleri
+FACTOR_TYPES = ('temperature', 'humidity', 'wind', 'vegetation', 'topography')
+
+# Ok başıyla çizilen (yönlü) bağlantılar
+ARROW_EDGE_TYPES = ('data_flow', 'alert', 'routine_alert')
+
+# Haritada adı yazılan önemli düğümler
+LABELLED_TYPES = ('city', 'fire_station', 'air_base', 'crisis_center', 'lake')
+
+# Müdahale birimleri ve korunan yerleşimler (yakınlık ve rota sorguları)
+RESPONSE_TYPES = ('fire_station', 'forest_team', 'air_base')
+SETTLEMENT_TYPES = ('village', 'city', 'critical_facility')
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Orman yangını risk ağını dosyalardan yükleme.
+
+Düğümler, bağlantılar ve bölgeler CSV, GeoPackage ya da Parquet dosyalarından
+parça parça (chunk) okunur; türler NODE_TYPES / EDGE_TYPES / RISK_LEVELS ile
+doğrulanır ve kompakt, dizi tabanlı bir grafa (ArrayGraph) eklenir. Graf
+istenirse networkx'e dönüştürülür.
+
+Beklenen sütunlar:
+  düğümler     id, type, x, y (ya da lon, lat veya nokta geometrisi),
+               isteğe bağlı name, value, region
+  bağlantılar  source, target, type
+  bölgeler     id, label, risk ve x_min, x_max, y_min, y_max (CSV) ya da
+               poligon geometrisi (GeoPackage)
+
+Parquet için pyarrow gerekir; CSV ve GeoPackage yalnızca standart kütüphaneyle
+okunur.
+
+Kıyaslama:  python risk_agi_yukleyici.py --benchmark 1000000
+"""
+
+import argparse
+import csv
+import gc
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from itertools import repeat
+
+import numpy as np
+
+from olcum import peak_rss_mb
+from risk_agi_tanimlari import EDGE_TYPES, NODE_TYPES, RISK_LEVELS
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+CHUNK_SIZE = 200_000
+NODE_TYPE_NAMES = tuple(NODE_TYPES)
+EDGE_TYPE_NAMES = tuple(EDGE_TYPES)
+TABLE_EXTENSIONS = ('.csv', '.gpkg', '.parquet')
+COORDINATE_ALIASES = (('x', 'y'), ('lon', 'lat'), ('longitude', 'latitude'))
+
+# GeoPackage geometri başlığındaki zarf (envelope) türüne göre zarf boyutu (bayt)
+_GPKG_ENVELOPE_BYTES = (0, 32, 48, 48, 64)
+
+
+# --- Okuyucular ------------------------------------------------------------------
+
+def _read_csv(path, chunk_size):
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        reader = csv.reader(handle)
+        header = [name.strip() for name in next(reader)]
+        while True:
+            rows = [row for _, row in zip(range(chunk_size), reader)]
+            if not rows:
+                return
+            yield dict(zip(header, map(list, zip(*rows))))
+
+
+def _parse_wkb(blob, offset=0):
+    """ISO WKB'den (tür, koordinatlar, son konum); noktalar (2,), halkalar (N, 2) dizisidir"""
+    order = '<' if blob[offset] == 1 else '>'
+    kind, = struct.unpack_from(order + 'I', blob, offset + 1)
+    offset += 5
+    base, dims = kind % 1000, (2, 3, 3, 4)[kind // 1000]
+    dtype = np.dtype(order + 'f8')
+
+    def points(count):
+        nonlocal offset
+        values = np.frombuffer(blob, dtype, count * dims, offset).reshape(count, dims)[:, :2]
+        offset += count * dims * 8
+        return values
+
+    if base == 1:
+        return 'Point', points(1)[0], offset
+    if base == 3:
+        n_rings, = struct.unpack_from(order + 'I', blob, offset)
+        offset += 4
+        rings = []
+        for _ in range(n_rings):
+            n_points, = struct.unpack_from(order + 'I', blob, offset)
+            offset += 4
+            rings.append(points(n_points))
+        return 'Polygon', rings, offset
+    if base in (4, 6):
+        n_parts, = struct.unpack_from(order + 'I', blob, offset)
+        offset += 4
+        parts = []
+        for _ in range(n_parts):
+            _, part, offset = _parse_wkb(blob, offset)
+            parts.append(part)
+        return ('MultiPoint' if base == 4 else 'MultiPolygon'), parts, offset
+    raise ValueError(f"Desteklenmeyen WKB geometri türü: {kind}")
+
+
+def _gpkg_geometry(blob):
+    """GeoPackage geometri blob'unu (tür, koordinatlar) olarak çöz"""
+    if blob is None or blob[:2] != b'GP':
+        raise ValueError("Geçersiz GeoPackage geometrisi")
+    envelope = (blob[3] >> 1) & 0b111
+    kind, coords, _ = _parse_wkb(blob, 8 + _GPKG_ENVELOPE_BYTES[envelope])
+    return kind, coords
+
+
+def _read_gpkg(path, chunk_size, layer=None):
+    connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        if layer is None:
+            row = connection.execute("SELECT table_name FROM gpkg_contents WHERE data_type = 'features' "
+                                     "ORDER BY table_name LIMIT 1").fetchone()
+            if row is None:
+                raise ValueError(f"{path}: GeoPackage içinde öznitelik katmanı yok")
+            layer = row[0]
+        geometry_row = connection.execute('SELECT column_name FROM gpkg_geometry_columns WHERE table_name = ?',
+                                          (layer,)).fetchone()
+        geometry_column = geometry_row[0] if geometry_row else None
+
+        cursor = connection.execute(f'SELECT * FROM "{layer}"')
+        header = [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            chunk = dict(zip(header, map(list, zip(*rows))))
+            if geometry_column is not None:
+                chunk['geometry'] = [_gpkg_geometry(blob) for blob in chunk.pop(geometry_column)]
+            yield chunk
+    finally:
+        connection.close()
+
+
+def _read_parquet(path, chunk_size):
+    if pq is None:
+        raise RuntimeError("Parquet okumak için pyarrow gerekli (pip install pyarrow)")
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        chunk = {name: batch.column(index).to_numpy(zero_copy_only=False)
+                 for index, name in enumerate(batch.schema.names)}
+        # GeoParquet: WKB geometri sütunu
+        if 'geometry' in chunk:
+            chunk['geometry'] = [_parse_wkb(blob)[:2] for blob in chunk['geometry']]
+        yield chunk
+
+
+def read_table(path, chunk_size=CHUNK_SIZE, layer=None):
+    """Tabloyu {sütun: değerler} parçaları olarak oku (.csv, .gpkg, .parquet)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.csv', '.txt'):
+        return _read_csv(path, chunk_size)
+    if extension == '.gpkg':
+        return _read_gpkg(path, chunk_size, layer)
+    if extension in ('.parquet', '.pq'):
+        return _read_parquet(path, chunk_size)
+    raise ValueError(f"Desteklenmeyen dosya biçimi: {extension!r} (.csv, .gpkg, .parquet)")
+
+
+def find_table(directory, stem):
+    """Dizindeki 'stem' adlı tabloyu bul (.csv, .gpkg, .parquet sırasıyla)"""
+    for extension in TABLE_EXTENSIONS:
+        path = os.path.join(directory, stem + extension)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"{directory} içinde {stem}{'/'.join(TABLE_EXTENSIONS)} bulunamadı")
+
+
+# --- Dizi tabanlı graf -----------------------------------------------------------
+
+def _floats(values):
+    """Sayı dizisi; boş hücreler NaN"""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except ValueError:
+        return np.array([float(value) if value not in ('', None) else np.nan for value in values])
+
+
+def _strings(values):
+    """Kimlik sütununu str listesine çevir (Parquet'te tamsayı, karışık sütunlarda her iki tür olabilir)"""
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'U':
+        return values.tolist()
+    values = values.tolist() if isinstance(values, np.ndarray) else list(values)
+    # Tüm değerler denetlenir: ilk değer str olsa da sonrakiler tamsayı olabilir
+    return values if all(isinstance(value, str) for value in values) else [str(value) for value in values]
+
+
+@contextmanager
+def _gc_paused():
+    """Yükleme boyunca çöp toplayıcıyı durdur
+
+    Parçalar milyonlarca kısa ömürlü str/list nesnesi üretir; döngüsel çöp
+    toplayıcı bunları tekrar tekrar tarayıp yüklemeyi ~2.5 kat yavaşlatır.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _type_codes(values, names, kind, source=''):
+    """Tür adlarını tablo sırasındaki kodlara çevir; bilinmeyen tür varsa hata ver"""
+    unique, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    lookup = {name: code for code, name in enumerate(names)}
+    unknown = [str(name) for name in unique if name not in lookup]
+    if unknown:
+        raise ValueError(f"{source}Bilinmeyen {kind} türü: {', '.join(map(repr, unknown))} "
+                         f"(geçerli türler: {', '.join(names)})")
+    return np.array([lookup[name] for name in unique], dtype=np.int16)[inverse]
+
+
+def _coordinates(chunk):
+    for x_name, y_name in COORDINATE_ALIASES:
+        if x_name in chunk and y_name in chunk:
+            return _floats(chunk[x_name]), _floats(chunk[y_name])
+    if 'geometry' in chunk:
+        points = [coords for kind, coords in chunk['geometry']]
+        if any(kind != 'Point' for kind, _ in chunk['geometry']):
+            raise ValueError("Düğüm geometrileri nokta (Point) olmalı")
+        xy = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return xy[:, 0], xy[:, 1]
+    raise ValueError("Düğüm koordinatları bulunamadı: x/y, lon/lat sütunları ya da nokta geometrisi gerekli")
+
+
+class ArrayGraph:
+    """Numpy dizileriyle tutulan kompakt ağ; düğüm ve kenarlar parça parça eklenir
+
+    Düğümler: x, y (float64), node_type (NODE_TYPE_NAMES kodu), value (float32, yoksa NaN)
+    Kenarlar: source, target (int32 düğüm indeksi), edge_type (EDGE_TYPE_NAMES kodu)
+    Kimlik, ad ve bölge gibi metin öznitelikleri Python listelerinde tutulur.
+    """
+
+    NODE_FIELDS = (('x', np.float64), ('y', np.float64), ('node_type', np.int16), ('value', np.float32))
+    EDGE_FIELDS = (('source', np.int32), ('target', np.int32), ('edge_type', np.int16))
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+        self.names = []
+        self.regions = []
+        self._parts = {name: [] for name, _ in self.NODE_FIELDS + self.EDGE_FIELDS}
+
+    def _field(self, name):
+        # Parçalar ilk erişimde birleştirilir; sonraki eklemeler yeniden birleştirir
+        parts = self._parts[name]
+        if len(parts) != 1:
+            dtype = dict(self.NODE_FIELDS + self.EDGE_FIELDS)[name]
+            parts[:] = [np.concatenate(parts) if parts else np.zeros(0, dtype)]
+        return parts[0]
+
+    x = property(lambda self: self._field('x'))
+    y = property(lambda self: self._field('y'))
+    node_type = property(lambda self: self._field('node_type'))
+    value = property(lambda self: self._field('value'))
+    source = property(lambda self: self._field('source'))
+    target = property(lambda self: self._field('target'))
+    edge_type = property(lambda self: self._field('edge_type'))
+
+    @property
+    def xy(self):
+        return np.column_stack((self.x, self.y))
+
+    @property
+    def node_count(self):
+        return len(self.ids)
+
+    @property
+    def edge_count(self):
+        return sum(len(part) for part in self._parts['source'])
+
+    def node_type_names(self):
+        return np.array(NODE_TYPE_NAMES)[self.node_type]
+
+    def edge_type_names(self):
+        return np.array(EDGE_TYPE_NAMES)[self.edge_type]
+
+    def add_nodes(self, ids, x, y, types, values=None, names=None, regions=None, source=''):
+        """Bir düğüm parçası ekle; tekrarlanan kimlikte hata ver"""
+        ids = _strings(ids)
+        codes = _type_codes(types, NODE_TYPE_NAMES, 'düğüm', source)
+        start = len(self.ids)
+        new_index = dict(zip(ids, range(start, start + len(ids))))
+        duplicates = self.index.keys() & new_index.keys()
+        if len(new_index) != len(ids):
+            duplicates |= {node_id for node_id, count in Counter(ids).items() if count > 1}
+        if duplicates:
+            raise ValueError(f"{source}Tekrarlanan düğüm kimliği: {', '.join(sorted(duplicates)[:5])}")
+        self.index.update(new_index)
+        self.ids.extend(ids)
+        self.names.extend(names if names is not None else ids)
+        self.regions.extend(regions if regions is not None else [''] * len(ids))
+        values = np.full(len(ids), np.nan) if values is None else _floats(values)
+        for name, column in (('x', x), ('y', y), ('node_type', codes), ('value', values)):
+            self._parts[name].append(np.asarray(column, dtype=dict(self.NODE_FIELDS)[name]))
+
+    def add_edges(self, sources, targets, types, strict=True, source=''):
+        """Bir kenar parçası ekle; uçlar önceden eklenmiş düğümlere çözülür
+
+        strict=False ise bilinmeyen düğüme giden kenarlar atlanır; atlanan sayı döner.
+        """
+        codes = _type_codes(types, EDGE_TYPE_NAMES, 'bağlantı', source)
+        sources, targets = _strings(sources), _strings(targets)
+        u = np.fromiter(map(self.index.get, sources, repeat(-1)), np.int64, len(codes))
+        v = np.fromiter(map(self.index.get, targets, repeat(-1)), np.int64, len(codes))
+        valid = (u >= 0) & (v >= 0)
+        if not valid.all():
+            if strict:
+                found = np.concatenate((u, v)) >= 0
+                missing = sorted({node_id for node_id, known in zip(sources + targets, found) if not known})
+                raise ValueError(f"{source}Bilinmeyen düğüme bağlantı: {', '.join(missing[:5])}"
+                                 f"{' ...' if len(missing) > 5 else ''}")
+            u, v, codes = u[valid], v[valid], codes[valid]
+        self._append_edges(u, v, codes)
+        return int((~valid).sum())
+
+    def add_edge_indices(self, sources, targets, edge_type):
+        """Düğüm indeksleriyle tek türde kenar parçası ekle (ör. mekânsal sorgu sonuçları)"""
+        code = _type_codes([edge_type], EDGE_TYPE_NAMES, 'bağlantı')[0]
+        sources = np.asarray(sources, dtype=np.int64).ravel()
+        targets = np.asarray(targets, dtype=np.int64).ravel()
+        if len(sources) != len(targets):
+            raise ValueError("Kaynak ve hedef dizileri aynı uzunlukta olmalı")
+        if len(sources) and (min(sources.min(), targets.min()) < 0 or max(sources.max(), targets.max()) >= self.node_count):
+            raise ValueError("Kenar uçları geçerli düğüm indeksleri olmalı")
+        self._append_edges(sources, targets, np.full(len(sources), code))
+
+    def _append_edges(self, sources, targets, codes):
+        for name, column in (('source', sources), ('target', targets), ('edge_type', codes)):
+            self._parts[name].append(np.asarray(column).astype(dict(self.EDGE_FIELDS)[name]))
+
+    def to_networkx(self, directed=False):
+        """networkx grafı: düğümlerde type, name, value, region, pos; kenarlarda type"""
+        import networkx as nx
+
+        graph = nx.DiGraph() if directed else nx.Graph()
+        types, values = self.node_type_names(), self.value
+        graph.add_nodes_from(
+            (node_id, {'type': node_type, 'name': name, 'region': region, 'pos': (x, y),
+                       **({'value': float(value)} if not np.isnan(value) else {})})
+            for node_id, node_type, name, region, x, y, value
+            in zip(self.ids, types, self.names, self.regions, self.x.tolist(), self.y.tolist(), values))
+        ids = self.ids
+        graph.add_edges_from((ids[u], ids[v], {'type': edge_type}) for u, v, edge_type
+                             in zip(self.source.tolist(), self.target.tolist(), self.edge_type_names()))
+        return graph
+
+
+# --- Yükleme ---------------------------------------------------------------------
+
+def load_nodes(graph, path, chunk_size=CHUNK_SIZE, layer=None):
+    """Düğüm tablosunu grafa ekle; eklenen düğüm sayısını döndür"""
+    count = 0
+    with _gc_paused():
+        for chunk in read_table(path, chunk_size, layer):
+            x, y = _coordinates(chunk)
+            label = f"{os.path.basename(path)} ({count + 1}. satırdan itibaren): "
+            graph.add_nodes(chunk['id'], x, y, chunk['type'], chunk.get('value'), chunk.get('name'),
+                            chunk.get('region'), source=label)
+            count += len(x)
+    return count
+
+
+def load_edges(graph, path, chunk_size=CHUNK_SIZE, layer=None, strict=True):
+    """Bağlantı tablosunu grafa ekle; (eklenen, atlanan) döndür"""
+    added = skipped = 0
+    with _gc_paused():
+        for chunk in read_table(path, chunk_size, layer):
+            label = f"{os.path.basename(path)} ({added + skipped + 1}. satırdan itibaren): "
+            dropped = graph.add_edges(chunk['source'], chunk['target'], chunk['type'], strict, source=label)
+            added += len(chunk['source']) - dropped
+            skipped += dropped
+    return added, skipped
+
+
+def load_regions(path, layer=None):
+    """Bölgeler: {id: {'label', 'risk', 'rings': [(N, 2) dış halkalar]}}
+
+    CSV'de dikdörtgen sınırlar (x_min, x_max, y_min, y_max), GeoPackage/Parquet'te
+    poligon ya da çoklu poligon geometrisi beklenir. İç halkalar (delikler) yok sayılır.
+    """
+    regions = {}
+    for chunk in read_table(path, CHUNK_SIZE, layer):
+        if 'geometry' in chunk:
+            rings = []
+            for kind, coords in chunk['geometry']:
+                if kind not in ('Polygon', 'MultiPolygon'):
+                    raise ValueError(f"{os.path.basename(path)}: bölge geometrisi poligon olmalı, {kind} bulundu")
+                rings.append([coords[0]] if kind == 'Polygon' else [part[0] for part in coords])
+        else:
+            x_min, x_max, y_min, y_max = (_floats(chunk[name]) for name in ('x_min', 'x_max', 'y_min', 'y_max'))
+            rings = [[np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)])]
+                     for x0, x1, y0, y1 in zip(x_min, x_max, y_min, y_max)]
+        for region_id, label, risk, region_rings in zip(chunk['id'], chunk['label'], chunk['risk'], rings):
+            if risk not in RISK_LEVELS:
+                raise ValueError(f"{os.path.basename(path)}: {region_id!r} için bilinmeyen risk seviyesi {risk!r} "
+                                 f"(geçerli: {', '.join(RISK_LEVELS)})")
+            regions[str(region_id)] = {'label': label, 'risk': risk, 'rings': region_rings}
+    return regions
+
+
+def load_network(nodes_path, edges_path=None, chunk_size=CHUNK_SIZE, strict=True, graph=None):
+    """Düğüm ve bağlantı dosyalarını (yeni ya da verilen) bir ArrayGraph'a yükle"""
+    graph = ArrayGraph() if graph is None else graph
+    load_nodes(graph, nodes_path, chunk_size)
+    if edges_path is not None:
+        _, skipped = load_edges(graph, edges_path, chunk_size, strict=strict)
+        if skipped:
+            print(f"⚠️ Bilinmeyen düğüme giden {skipped} bağlantı atlandı")
+    return graph
+
+
+# --- Kıyaslama -------------------------------------------------------------------
+
+def benchmark(n_edges=1_000_000, seed=0):
+    """Sentetik CSV ağını (n_edges kenar, n_edges/2 düğüm) yükle; süre ve bellek"""
+    rng = np.random.default_rng(seed)
+    n_nodes = max(n_edges // 2, 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        nodes_path, edges_path = os.path.join(tmp, 'dugumler.csv'), os.path.join(tmp, 'baglantilar.csv')
+        node_types = rng.choice(NODE_TYPE_NAMES, n_nodes)
+        with open(nodes_path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(('id', 'type', 'x', 'y', 'value'))
+            writer.writerows(zip((f'n{index}' for index in range(n_nodes)), node_types,
+                                 np.round(rng.uniform(28.0, 30.0, n_nodes), 6),
+                                 np.round(rng.uniform(39.5, 40.5, n_nodes), 6),
+                                 np.round(rng.uniform(0, 100, n_nodes), 1)))
+        with open(edges_path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(('source', 'target', 'type'))
+            writer.writerows(zip((f'n{index}' for index in rng.integers(0, n_nodes, n_edges)),
+                                 (f'n{index}' for index in rng.integers(0, n_nodes, n_edges)),
+                                 rng.choice(EDGE_TYPE_NAMES, n_edges)))
+        del node_types
+
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        graph = load_network(nodes_path, edges_path)
+        elapsed = time.perf_counter() - start
+        arrays_mb = sum(graph._field(name).nbytes for name, _ in graph.NODE_FIELDS + graph.EDGE_FIELDS) / 2**20
+        print(f"📥 {graph.node_count:,} düğüm, {graph.edge_count:,} kenar: {elapsed:.2f} s")
+        print(f"   diziler {arrays_mb:.1f} MB, tepe bellek artışı {peak_rss_mb() - rss_before:.0f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Orman yangını risk ağını dosyalardan yükle')
+    parser.add_argument('nodes', nargs='?', help='Düğüm dosyası (.csv, .gpkg, .parquet)')
+    parser.add_argument('edges', nargs='?', help='Bağlantı dosyası')
+    parser.add_argument('--lenient', action='store_true', help='Bilinmeyen düğüme giden bağlantıları atla')
+    parser.add_argument('--benchmark', type=int, metavar='KENAR', help='Sentetik ağla yükleme kıyaslaması')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return 0
+    if not args.nodes:
+        parser.error('düğüm dosyası ya da --benchmark gerekli')
+    graph = load_network(args.nodes, args.edges, strict=not args.lenient)
+    types, counts = np.unique(graph.node_type_names(), return_counts=True)
+    print(f"✅ {graph.node_count} düğüm, {graph.edge_count} bağlantı")
+    for node_type, count in zip(types, counts):
+        print(f"   {NODE_TYPES[node_type]['label']:<25}{count:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""AgriDagi3D karo modu ile bellek içi yolun eşdeğerliği"""
+
+import os
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip('rasterio')
+from scipy import ndimage  # noqa: E402
+
+from agri_dagi_3d_profesional import AgriDagi3D  # noqa: E402
+from conftest import ROOT  # noqa: E402
+
+DEM_PATH = os.path.join(ROOT, 'agri_dagi_DEM.tif')
+TILE_SIZE = 128
+NODATA = -9999.0
+LAYERS = ('slope', 'aspect', 'hillshade')
+
+
+@pytest.fixture(scope='module')
+def dem():
+    with rasterio.open(DEM_PATH) as dataset:
+        return dataset.read(1, window=((0, 300), (0, 400))), dataset.profile, dataset.transform
+
+
+def _write_dem(path, dem, voids=()):
+    data, profile, transform = dem
+    data = data.copy()
+    for rows, cols in voids:
+        data[rows, cols] = NODATA
+    profile = dict(profile, width=data.shape[1], height=data.shape[0], transform=transform, nodata=NODATA)
+    with rasterio.open(path, 'w', **profile) as dataset:
+        dataset.write(data, 1)
+    return str(path)
+
+
+def _pair(tmp_path, dem_path, backend):
+    memory = AgriDagi3D(dem_path, derivatives_backend=backend)
+    tiled = AgriDagi3D(dem_path, tiled=True, tile_size=TILE_SIZE, output_dir=str(tmp_path / 'karo'),
+                       derivatives_backend=backend)
+    layers = {}
+    for name in LAYERS:
+        with rasterio.open(tiled.derived_paths[name]) as dataset:
+            layers[name] = dataset.read(1)
+    return memory, tiled, layers
+
+
+@pytest.mark.parametrize('backend', ['legacy', 'fused'])
+def test_tiled_matches_in_memory_without_nodata(tmp_path, dem, backend):
+    memory, _, layers = _pair(tmp_path, _write_dem(tmp_path / 'dem.tif', dem), backend)
+    for name in LAYERS:
+        np.testing.assert_array_equal(layers[name], getattr(memory, f'{name}_data'), err_msg=name)
+
+
+def test_tiled_matches_in_memory_with_voids_inside_tiles(tmp_path, dem):
+    # Boşluk + doldurma halkası + halo tek bir karo penceresinde kalıyor
+    voids = [(slice(40, 50), slice(40, 52)), (slice(170, 176), slice(300, 310))]
+    memory, _, layers = _pair(tmp_path, _write_dem(tmp_path / 'dem.tif', dem, voids), 'fused')
+    for name in LAYERS:
+        np.testing.assert_array_equal(layers[name], getattr(memory, f'{name}_data'), err_msg=name)
+
+
+def test_tiled_void_across_tile_border_differs_only_near_void(tmp_path, dem):
+    # Karo sınırını (satır 128) kesen boşluk her karoda kendi penceresiyle doldurulur:
+    # belgelenmiş sapma yalnız boşluk ve türev halosu çevresinde kalmalı
+    void = (slice(118, 140), slice(60, 90))
+    memory, tiled, layers = _pair(tmp_path, _write_dem(tmp_path / 'dem.tif', dem, [void]), 'fused')
+    mask = np.zeros(dem[0].shape, dtype=bool)
+    mask[void] = True
+    near = ndimage.binary_dilation(mask, iterations=AgriDagi3D.TILE_HALO + 3)
+    for name in LAYERS:
+        expected = getattr(memory, f'{name}_data')
+        assert np.isfinite(layers[name].astype(float)).all(), name
+        np.testing.assert_array_equal(layers[name][~near], expected[~near], err_msg=name)
+
+
+def test_tiled_mode_renders_from_disk(tmp_path, dem):
+    dem_path = _write_dem(tmp_path / 'dem.tif', dem)
+    memory, tiled, _ = _pair(tmp_path, dem_path, 'fused')
+    assert tiled.dem_data is None
+    tiled_layers, x, y = tiled._sample_layers(max_vertices=20_000)
+    memory_layers, _, _ = memory._sample_layers(max_vertices=20_000)
+    for name in ('dem', 'slope', 'aspect', 'hillshade'):
+        assert tiled_layers[name].shape == memory_layers[name].shape, name
+    assert len(x) == tiled_layers['dem'].shape[1] and len(y) == tiled_layers['dem'].shape[0]
+    figure = tiled.create_ultra_realistic_3d(max_vertices=20_000, save_html=False, auto_open=False)
+    assert figure.data[0].z.shape == tiled_layers['dem'].shape
+
+
+def test_tiled_mode_reuses_derived_layers_until_dem_changes(tmp_path, dem):
+    dem_path = _write_dem(tmp_path / 'dem.tif', dem)
+    options = dict(tiled=True, tile_size=TILE_SIZE, output_dir=str(tmp_path / 'karo'), derivatives_backend='fused')
+    first = AgriDagi3D(dem_path, **options)
+    mtimes = {name: os.stat(path).st_mtime_ns for name, path in first.derived_paths.items()}
+
+    AgriDagi3D(dem_path, **options)
+    assert {name: os.stat(path).st_mtime_ns for name, path in first.derived_paths.items()} == mtimes
+
+    # Farklı arka uç ya da değişen DEM türevleri yeniden üretir
+    AgriDagi3D(dem_path, **dict(options, derivatives_backend='legacy'))
+    legacy = {name: os.stat(path).st_mtime_ns for name, path in first.derived_paths.items()}
+    assert all(legacy[name] != mtimes[name] for name in LAYERS)
+    _write_dem(tmp_path / 'dem.tif', dem, [(slice(10, 20), slice(10, 20))])
+    changed = AgriDagi3D(dem_path, **dict(options, derivatives_backend='legacy'))
+    assert all(os.stat(changed.derived_paths[name]).st_mtime_ns != legacy[name] for name in LAYERS)
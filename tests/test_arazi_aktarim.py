@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""3D HTML dışa aktarımı: varsayılan kipte ortak ızgaraların paylaşımı ve kamera betiği"""
+
+import base64
+import gzip
+import json
+import os
+import re
+
+import numpy as np
+import pytest
+
+pytest.importorskip('rasterio')
+pytest.importorskip('plotly')
+import plotly.graph_objects as go  # noqa: E402
+
+from agri_dagi_3d_profesional import AgriDagi3D  # noqa: E402
+from arazi_aktarim import camera_path_script, compact_figure_dict  # noqa: E402
+from conftest import ROOT  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def analysis():
+    return AgriDagi3D(os.path.join(ROOT, 'agri_dagi_DEM.tif'))
+
+
+def test_default_export_shares_dashboard_z_grid(analysis, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fig = analysis.create_professional_analysis(max_vertices=20_000, auto_open=False)
+    html = (tmp_path / 'bolge_profesyonel_analiz.html').read_text(encoding='utf-8')
+    assert os.path.exists(tmp_path / 'plotly.min.js')
+    payload = json.loads(re.search(r'id="veri">(.*?)</script>', html, re.S).group(1))
+    z_refs = {trace['z']['__ref__'] for trace in payload['data']}
+    # Dört panelin z ızgarası tek bir ortak diziye başvurur
+    assert len(payload['data']) == 4 and len(z_refs) == 1
+    shared = payload['__shared__'][z_refs.pop()]['__typed__']
+    assert shared['shape'] == list(fig.data[0].z.shape)
+
+
+def test_compact_dict_round_trips_values(analysis):
+    fig = analysis.create_ultra_realistic_3d(max_vertices=20_000, save_html=False, auto_open=False)
+    figure = compact_figure_dict(fig, 'float32')
+    spec = figure['__shared__'][figure['data'][0]['z']['__ref__']]['__typed__']
+    values = np.frombuffer(base64.b64decode(spec['bdata']), dtype='<f4').reshape(spec['shape'])
+    np.testing.assert_array_equal(values, np.asarray(fig.data[0].z, dtype=np.float32))
+
+
+def test_camera_script_uses_public_api_only():
+    script = camera_path_script([(1, 1, 1), (2, 0, 1), (0, 2, 1)], {'x': 0, 'y': 0, 'z': 0}, 1000, 'oynat')
+    assert '_fullLayout' not in script and '_scene' not in script
+    assert "Plotly.relayout(gd, {'scene.camera': camera})" in script
+    assert 'data-fps' in script
+
+
+def test_gzip_with_auto_open_writes_openable_html(tmp_path, monkeypatch):
+    import arazi_aktarim
+    opened = []
+    monkeypatch.setattr(arazi_aktarim.webbrowser, 'open', opened.append)
+    fig = go.Figure(go.Surface(z=np.arange(12, dtype=float).reshape(3, 4)))
+    path = arazi_aktarim.write_html(fig, str(tmp_path / 'yuzey.html'), 'uint16', gzip_output=True, auto_open=True)
+    assert path.endswith('.html.gz') and os.path.exists(path)
+    assert opened == ['file://' + str(tmp_path / 'yuzey.html')]
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        assert handle.read() == (tmp_path / 'yuzey.html').read_text(encoding='utf-8')
+
+    arazi_aktarim.write_html(fig, str(tmp_path / 'sessiz.html'), 'uint16', gzip_output=True, auto_open=False)
+    assert not os.path.exists(tmp_path / 'sessiz.html') and len(opened) == 1
+
+
+def test_payload_keeps_numpy_scalars_numeric_and_nan_null(tmp_path):
+    import arazi_aktarim
+    # Tamamen NaN bir DEM'de renk çubuğunun dtick değeri NaN olur
+    colorbar = dict(tick0=np.float64(4500.0), dtick=np.float64(np.nan))
+    fig = go.Figure(go.Surface(z=np.full((3, 4), np.nan), colorbar=colorbar))
+    path = arazi_aktarim.write_html(fig, str(tmp_path / 'duz.html'), 'float32', auto_open=False)
+    html = open(path, encoding='utf-8').read()
+    payload = json.loads(re.search(r'id="veri">(.*?)</script>', html, re.S).group(1))
+    colorbar = payload['data'][0]['colorbar']
+    assert colorbar['tick0'] == 4500.0 and isinstance(colorbar['tick0'], float)
+    assert colorbar.get('dtick') is None
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Blok istatistikleri: yüzdelik histogramı aykırı ve tanınmayan nodata değerlerinde sınırlı kalmalı"""
+
+import numpy as np
+
+import arazi_istatistik
+from arazi_istatistik import LayerStatistics, terrain_statistics
+
+
+def _dem(seed=0, shape=(400, 300)):
+    rng = np.random.default_rng(seed)
+    return rng.normal(3000, 600, shape)
+
+
+def test_percentiles_match_numpy_within_one_bin():
+    dem = _dem()
+    report = terrain_statistics({'dem': dem}, block_rows=64)['layers']['dem']
+    expected = np.percentile(dem, arazi_istatistik.DEFAULT_PERCENTILES)
+    np.testing.assert_allclose(list(report['percentiles'].values()), expected, atol=1.0)
+    assert 'out_of_range' not in report and 'percentile_resolution' not in report
+
+
+def test_unrecognised_nodata_is_counted_not_binned():
+    dem = _dem()
+    clean = np.percentile(dem, arazi_istatistik.DEFAULT_PERCENTILES)
+    dem[:3] = -32768
+    dem[-1, :5] = 1e38
+    stats = LayerStatistics('dem', resolution=1.0, value_range=arazi_istatistik.DEFAULT_RANGES['dem'])
+    for r0 in range(0, dem.shape[0], 50):
+        stats.update(dem[r0:r0 + 50])
+    # Yalnızca geçerli değer aralığı kutulanır (-11000..9000 m -> en fazla 20001 kutu)
+    assert len(stats.histogram.counts) <= 20_001
+    result = stats.result()
+    assert result['out_of_range'] == {'below': 900, 'above': 5}
+    # 900 / 120000 piksel alt taşma: medyan yalnızca birkaç metre kayar
+    assert abs(result['percentiles']['p50'] - clean[2]) < 20
+
+
+def test_tail_percentiles_clip_to_range():
+    values = np.concatenate([np.full(90, -32768.0), np.linspace(100, 200, 10)])
+    stats = LayerStatistics('dem', resolution=1.0, value_range=(-500.0, 9000.0))
+    stats.update(values)
+    percentiles = stats.result((5, 95))['percentiles']
+    assert percentiles['p5'] == -500.0
+    assert 100 <= percentiles['p95'] <= 200
+
+
+def test_unbounded_span_coarsens_instead_of_allocating():
+    values = np.concatenate([_dem().ravel(), [1e12]])
+    stats = LayerStatistics('ham', resolution=0.01)
+    stats.update(values[:1000])
+    stats.update(values[1000:])
+    assert len(stats.histogram.counts) <= arazi_istatistik.MAX_HISTOGRAM_BINS
+    result = stats.result()
+    assert result['count'] == values.size
+    assert result['percentile_resolution'] > 0.01
+    # Birleştirme sayımları korur
+    assert stats.histogram.counts.sum() == values.size
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Türev önbelleği: yazılabilir diziler, özet dizini budama ve LRU silme"""
+
+import json
+import os
+
+import numpy as np
+
+from arazi_onbellek import STAT_INDEX_NAME, TerrainCache
+
+
+def test_loaded_arrays_are_writable_without_touching_cache(tmp_path):
+    cache = TerrainCache(str(tmp_path / 'onbellek'))
+    cache.store('girdi', {'slope': np.arange(12, dtype=np.float32).reshape(3, 4)})
+    slope = cache.load('girdi')['slope']
+    slope[0, 0] = -1
+    slope += 1
+    assert slope[0, 0] == 0
+    np.testing.assert_array_equal(cache.load('girdi')['slope'], np.arange(12, dtype=np.float32).reshape(3, 4))
+
+
+def test_stat_index_drops_changed_and_deleted_files(tmp_path):
+    cache = TerrainCache(str(tmp_path / 'onbellek'))
+    dem, other = tmp_path / 'dem.tif', tmp_path / 'diger.tif'
+    dem.write_bytes(b'a' * 10)
+    other.write_bytes(b'b' * 10)
+    cache.content_hash(str(dem))
+    cache.content_hash(str(other))
+    for size in range(11, 15):
+        dem.write_bytes(b'a' * size)
+        os.utime(dem, ns=(size * 10 ** 9, size * 10 ** 9))
+        cache.content_hash(str(dem))
+    other.unlink()
+    dem.write_bytes(b'c' * 20)
+    digest = cache.content_hash(str(dem))
+    with open(tmp_path / 'onbellek' / STAT_INDEX_NAME) as handle:
+        index = json.load(handle)
+    assert list(index.values()) == [digest]
+
+
+def test_evict_keeps_just_stored_entry(tmp_path):
+    cache = TerrainCache(str(tmp_path / 'onbellek'), max_bytes=1000)
+    cache.store('eski', {'dem': np.zeros(100, dtype=np.float32)})
+    # Sınırdan büyük yeni girdi: eskiler silinir, yenisi kalır
+    cache.store('yeni', {'dem': np.zeros(400, dtype=np.float32)})
+    assert cache.load('eski') is None
+    assert cache.load('yeni') is not None
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""LOD piramidi: 2x2 indirgeme yöntemleri ve seviye seçimi"""
+
+import numpy as np
+import pytest
+
+from arazi_piramit import build_pyramid, pick_level, reduce_2x2
+
+
+def test_reduce_methods_and_odd_edges():
+    array = np.arange(15, dtype=float).reshape(3, 5)
+    array[0, 0] = np.nan
+    mean = reduce_2x2(array)
+    assert mean.shape == (2, 3)
+    assert mean[0, 0] == pytest.approx((1 + 5 + 6) / 3)       # NaN yok sayılır
+    assert mean[1, 2] == 14                                   # tek sayılı köşe: yalnız kendisi
+    assert reduce_2x2(array, 'max')[0, 1] == 8
+
+
+def test_circular_mean_wraps_north():
+    aspect = np.array([[350.0, 10.0], [355.0, 5.0]])
+    circular = reduce_2x2(aspect, 'circular')[0, 0]
+    assert min(circular, 360.0 - circular) == pytest.approx(0.0, abs=1e-3)
+    assert reduce_2x2(aspect, 'mean')[0, 0] == pytest.approx(180.0)
+    with pytest.raises(ValueError):
+        reduce_2x2(aspect, 'median')
+
+
+def test_pyramid_levels_and_vertex_budget():
+    levels = build_pyramid(np.zeros((300, 500), dtype=np.float32), min_size=16)
+    assert [level.shape for level in levels] == [(300, 500), (150, 250), (75, 125), (38, 63), (19, 32)]
+    assert pick_level(levels, 10**6) == 0
+    assert pick_level(levels, 150 * 250) == 1
+    assert pick_level(levels, 3000) == 3
+    assert pick_level(levels, 1) == len(levels) - 1
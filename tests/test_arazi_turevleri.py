@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Türev çekirdekleri: arka uç ve şerit/işçi sayısından bağımsız sonuç, numba iş parçacığı ayarı"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import arazi_turevleri
+
+
+@pytest.fixture(scope='module')
+def dem():
+    rng = np.random.default_rng(3)
+    y, x = np.mgrid[0:300, 0:260]
+    return 2000 + 800 * np.exp(-((x - 130) ** 2 + (y - 150) ** 2) / 6000) + rng.normal(0, 1, x.shape)
+
+
+@pytest.mark.parametrize('chunk_rows, n_workers', [(512, 1), (37, 1), (64, 4)])
+def test_strips_and_workers_do_not_change_result(dem, chunk_rows, n_workers):
+    expected = arazi_turevleri.terrain_derivatives(dem, 30.0)
+    result = arazi_turevleri.terrain_derivatives(dem, 30.0, chunk_rows=chunk_rows, n_workers=n_workers)
+    for name, a, b in zip(('slope', 'aspect', 'hillshade'), expected, result):
+        np.testing.assert_array_equal(a, b, err_msg=name)
+
+
+@pytest.mark.skipif(arazi_turevleri.numba is None, reason='numba kurulu değil')
+def test_numba_matches_fused(dem):
+    slope, aspect, hillshade = arazi_turevleri.terrain_derivatives(dem, 30.0, backend='numba', n_workers=1)
+    fused = arazi_turevleri.terrain_derivatives(dem, 30.0)
+    np.testing.assert_allclose(slope, fused[0], atol=1e-3)
+    assert np.abs(hillshade.astype(int) - fused[2]).max() <= 1
+
+
+class _FakeNumba:
+    """İş parçacığı ayarını kaydeden numba yerine geçen nesne (tek çekirdekli makinede de sınanabilsin)"""
+
+    def __init__(self, threads, limit):
+        self.threads, self.calls = threads, []
+        self.config = SimpleNamespace(NUMBA_NUM_THREADS=limit)
+
+    def get_num_threads(self):
+        return self.threads
+
+    def set_num_threads(self, n):
+        self.calls.append(n)
+        self.threads = n
+
+
+@pytest.mark.parametrize('module_name', ['arazi_turevleri', 'yagis_akis'])
+def test_numba_threads_are_scoped_and_restored(monkeypatch, module_name):
+    module = pytest.importorskip(module_name)
+    fake = _FakeNumba(threads=16, limit=16)
+    monkeypatch.setattr(module, 'numba', fake)
+    with module._numba_threads(4):
+        assert fake.threads == 4
+    assert fake.threads == 16
+    with pytest.raises(RuntimeError):
+        with module._numba_threads(64):
+            assert fake.threads == 16  # NUMBA_NUM_THREADS ile sınırlı
+            raise RuntimeError
+    assert fake.threads == 16
+    with module._numba_threads(None):
+        pass
+    assert fake.calls == [4, 16, 16, 16]
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Yerel halka doldurma: yalnızca boşluklar değişir ve düzgün yüzey korunur"""
+
+import numpy as np
+
+from dem_bosluk_doldurma import _griddata_fill, fill_voids, punch_holes
+
+
+def _surface(shape=(120, 160)):
+    y, x = np.mgrid[0:shape[0], 0:shape[1]].astype(float)
+    return 1500 + 3.0 * x - 2.0 * y + 0.01 * x * y
+
+
+def test_fills_only_voids_and_recovers_plane():
+    dem = _surface()
+    holed = punch_holes(dem, n_holes=15, max_radius=8, seed=1)
+    void = np.isnan(holed)
+    assert void.any()
+    filled = fill_voids(holed.copy(), n_workers=2)
+    assert not np.isnan(filled).any()
+    np.testing.assert_array_equal(filled[~void], dem[~void])
+    # İkinci dereceden düzgün yüzeyde kübik halka interpolasyonu neredeyse tam
+    np.testing.assert_allclose(filled[void], dem[void], atol=0.5)
+
+
+def test_matches_global_griddata_on_smooth_surface():
+    holed = punch_holes(_surface(), n_holes=10, max_radius=6, seed=7)
+    local = fill_voids(holed.copy(), n_workers=1)
+    reference = _griddata_fill(holed.copy())
+    np.testing.assert_allclose(local, reference, atol=0.5)
+
+
+def test_degenerate_and_empty_cases():
+    dem = _surface((20, 20))
+    assert fill_voids(dem) is dem                             # boşluk yoksa dokunulmaz
+    # Tek sütunlu halka üçgenlenemez: halka ortalamasına düşer
+    strip = np.full((5, 1), 10.0)
+    strip[2, 0] = np.nan
+    assert fill_voids(strip)[2, 0] == 10.0
+    # Hiç geçerli komşusu olmayan boşluk NaN kalır
+    empty = np.full((4, 4), np.nan)
+    assert np.isnan(fill_voids(empty)).all()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Gece ışıkları: etiket ızgarası önbelleği katman ve ad alanına göre ayrılmalı"""
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('rasterio')
+from rasterio.transform import from_bounds  # noqa: E402
+
+from gece_isiklari import label_grid  # noqa: E402
+
+SHAPE = (20, 40)
+TRANSFORM = from_bounds(0, 0, 40, 20, SHAPE[1], SHAPE[0])
+
+
+def _box(zone, x0, x1):
+    geometry = {'type': 'Polygon', 'coordinates': [[[x0, 0], [x1, 0], [x1, 20], [x0, 20], [x0, 0]]]}
+    return {'zone': zone, 'name': str(zone), 'geometry': geometry, 'bounds': (x0, 0, x1, 20)}
+
+
+def test_layers_of_same_file_get_separate_cache_entries(tmp_path):
+    zones_path = tmp_path / 'bolgeler.gpkg'
+    zones_path.write_bytes(b'ayni dosya, iki katman')
+    cache_dir = str(tmp_path / 'onbellek')
+    west, east = [_box(1, 0, 10)], [_box(1, 30, 40)]
+
+    labels, cached = label_grid(west, str(zones_path), SHAPE, TRANSFORM, cache_dir, layer='bati')
+    assert not cached and labels[:, :10].all() and not labels[:, 10:].any()
+    labels, cached = label_grid(east, str(zones_path), SHAPE, TRANSFORM, cache_dir, layer='dogu')
+    assert not cached and labels[:, 30:].all() and not labels[:, :30].any()
+
+    labels, cached = label_grid(west, str(zones_path), SHAPE, TRANSFORM, cache_dir, layer='bati')
+    assert cached and labels[:, :10].all()
+    _, cached = label_grid(west, str(zones_path), SHAPE, TRANSFORM, cache_dir, layer='bati', name_field='AD')
+    assert not cached
+
+
+def test_label_grid_without_cache(tmp_path):
+    zones_path = tmp_path / 'bolgeler.geojson'
+    zones_path.write_text('{}')
+    zones = [_box(1, 0, 20), _box(2, 20, 40)]
+    labels, cached = label_grid(zones, str(zones_path), SHAPE, TRANSFORM, None)
+    assert not cached and isinstance(labels, np.memmap)
+    np.testing.assert_array_equal(np.unique(labels), [1, 2])
+    # Sahipsiz geçici dizin ızgarayla birlikte silinir
+    owned_dir = os.path.dirname(labels.filename)
+    del labels
+    assert not os.path.exists(owned_dir)
+
+    scratch = tmp_path / 'gecici'
+    scratch.mkdir()
+    labels, _ = label_grid(zones, str(zones_path), SHAPE, TRANSFORM, None, scratch_dir=str(scratch))
+    assert isinstance(labels, np.memmap) and os.path.dirname(labels.filename) == str(scratch)
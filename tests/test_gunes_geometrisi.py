@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Vektörel güneş geometrisi: skaler formül, parçalı tablo ve gölge tutarlılığı"""
+
+import numpy as np
+import pytest
+
+import gunes_geometrisi as gg
+
+
+def test_solstice_declination_and_noon_elevation():
+    assert np.degrees(gg.declination(172)) == pytest.approx(23.44, abs=0.05)
+    assert np.degrees(gg.declination(355)) == pytest.approx(-23.44, abs=0.05)
+    # Gerçek güneş öğlesinde yükseklik 90 - |enlem - δ|
+    noon = 12 - gg.equation_of_time(172) / 60
+    dec = np.degrees(gg.declination(172, noon))
+    assert float(gg.solar_elevation(40.0, 172, noon)) == pytest.approx(90 - (40 - dec), abs=1e-3)
+    assert float(gg.solar_position(40.0, 172, noon)[1]) == pytest.approx(180.0, abs=0.01)
+
+
+def test_close_to_legacy_scalar_formula():
+    latitudes, days, hours = np.meshgrid([0.0, 39.7, 60.0], [20, 100, 172, 300], np.arange(6, 19), indexing='ij')
+    vector = gg.solar_elevation(latitudes, days, hours)
+    legacy = np.vectorize(gg.scalar_solar_elevation)(latitudes, days, hours)
+    # Fark zaman denklemi (±4°) ve deklinasyon (~1°) kaynaklı
+    assert np.abs(vector - legacy).max() < 5.0
+
+
+@pytest.mark.parametrize('chunk_elements', [50, gg.CHUNK_ELEMENTS])
+def test_table_matches_solar_position(chunk_elements):
+    latitudes = np.array([36.5, 39.7, 41.0, 42.1])
+    longitudes = np.array([30.7, 44.3, 28.9, 26.0])
+    days, hours = np.array([1, 80, 172, 266]), np.arange(0, 24, 3.5)
+    table = gg.solar_table(latitudes, days, hours, longitudes, utc_offset=3, height=2.0,
+                           chunk_elements=chunk_elements, dtype=np.float64)
+    lat, day, hour = np.meshgrid(latitudes, days, hours, indexing='ij')
+    lon = np.broadcast_to(longitudes[:, None, None], lat.shape)
+    elevation, azimuth = gg.solar_position(lat, day, hour, lon, utc_offset=3)
+    np.testing.assert_allclose(table['elevation'], elevation, atol=1e-9)
+    np.testing.assert_allclose(np.cos(np.radians(table['azimuth'] - azimuth)), 1.0, atol=1e-12)
+    np.testing.assert_allclose(table['shadow'], gg.shadow_length(elevation, height=2.0), rtol=1e-9)
+    assert np.isinf(table['shadow'][elevation <= 0]).all()
+
+
+def test_shadow_length_matches_scalar():
+    for angle in (0.0, -5.0, 10.0, 45.0, 80.0):
+        assert float(gg.shadow_length(angle)) == pytest.approx(gg.scalar_shadow_length(angle), abs=0.005)
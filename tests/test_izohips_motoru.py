@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""İzohips motoru: indirgenmiş okuma eski 2x2 ortalama piramidiyle aynı ızgarayı vermeli"""
+
+import os
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip('rasterio')
+pytest.importorskip('contourpy')
+
+from arazi_piramit import build_pyramid, pick_level  # noqa: E402
+from conftest import ROOT  # noqa: E402
+from izohips_motoru import IsolineEngine  # noqa: E402
+
+DEM_PATH = os.path.join(ROOT, 'agri_dagi_DEM.tif')
+
+
+@pytest.fixture(scope='module')
+def dem_path(tmp_path_factory):
+    # Kenarları 2'nin kuvvetlerine tam bölünen kırpma: GDAL ortalaması 2x2 blok ortalamasına eşit olur
+    with rasterio.open(DEM_PATH) as dataset:
+        data = dataset.read(1, window=((0, 256), (0, 384)))
+        profile = dict(dataset.profile, height=256, width=384)
+    path = tmp_path_factory.mktemp('izohips') / 'dem.tif'
+    with rasterio.open(path, 'w', **profile) as dataset:
+        dataset.write(data, 1)
+    return str(path)
+
+
+@pytest.mark.parametrize('max_pixels', [10 ** 9, 30_000, 5_000, 100])
+def test_decimated_grid_matches_pyramid(dem_path, max_pixels):
+    engine = IsolineEngine(dem_path, sigma=0)
+    with rasterio.open(dem_path) as dataset:
+        pyramid = build_pyramid(dataset.read(1).astype(np.float32), 'mean')
+    expected = pyramid[pick_level(pyramid, max_pixels)]
+    x, y, z = engine.grid(max_pixels)
+    assert z.shape == expected.shape
+    np.testing.assert_allclose(z, expected, rtol=0, atol=1e-3)
+    step = 2 ** pick_level(pyramid, max_pixels)
+    assert engine.grid_step(max_pixels) == step
+    np.testing.assert_allclose(x[0], engine.transform.c + 0.5 * step * engine.transform.a)
+    np.testing.assert_allclose(y[0], engine.transform.f + 0.5 * step * engine.transform.e)
+    assert (engine.zmin, engine.zmax) == (float(pyramid[0].min()), float(pyramid[0].max()))
+
+
+def test_engine_keeps_no_full_resolution_array(dem_path):
+    engine = IsolineEngine(dem_path)
+    levels, allsegs = engine.isolines(levels=10, max_pixels=5_000)
+    assert len(allsegs) == len(levels) and any(allsegs)
+    assert [z.shape for _, _, z in engine._grids.values()] == [(32, 48)]
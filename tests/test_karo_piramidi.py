@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Karo piramidi: web mercator geometrisi, kirli karo takibi ve MBTiles yazımı"""
+
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip('rasterio')
+pytest.importorskip('PIL')
+
+import karo_piramidi as kp  # noqa: E402
+from conftest import ROOT  # noqa: E402
+
+ZOOMS = (10, 12)
+
+
+@pytest.fixture
+def hillshade(tmp_path):
+    with rasterio.open(os.path.join(ROOT, 'agri_dagi_DEM.tif')) as dataset:
+        dem, profile = dataset.read(1), dataset.profile
+    shade = np.clip((dem - dem.min()) / np.ptp(dem) * 255, 0, 255).astype(np.float32)
+    path = str(tmp_path / 'golge.tif')
+    with rasterio.open(path, 'w', **dict(profile, nodata=None)) as dataset:
+        dataset.write(shade, 1)
+    return path, shade, profile
+
+
+def _rewrite(path, shade, profile):
+    with rasterio.open(path, 'w', **dict(profile, nodata=None)) as dataset:
+        dataset.write(shade, 1)
+
+
+def test_tile_geometry():
+    assert kp.tile_bounds(0, 0, 0) == pytest.approx((-kp.ORIGIN, -kp.ORIGIN, kp.ORIGIN, kp.ORIGIN))
+    left, bottom, right, top = kp.tile_bounds(3, 5, 2)
+    inner = (left + 1, bottom + 1, right - 1, top - 1)
+    assert kp.tiles_for_bounds(inner, 3) == [(5, 2)]
+    assert len(kp.tiles_for_bounds((left + 1, bottom + 1, right + 1, top - 1), 3)) == 2
+    assert len(kp.tiles_for_bounds((-kp.ORIGIN, -kp.ORIGIN, kp.ORIGIN, kp.ORIGIN), 2)) == 16
+
+
+def test_only_dirty_tiles_are_rerendered(tmp_path, hillshade):
+    path, shade, profile = hillshade
+    output = str(tmp_path / 'karolar')
+    first = kp.build_tiles({'hillshade': path}, output, zooms=ZOOMS, n_workers=1)
+    assert first['rendered'] == first['total'] and first['written'] > 0
+    assert kp.build_tiles({'hillshade': path}, output, zooms=ZOOMS, n_workers=1)['rendered'] == 0
+
+    # Yalnızca sol üst 256x256 blok değişti
+    shade = shade.copy()
+    shade[:100, :100] = 0
+    _rewrite(path, shade, profile)
+    partial = kp.build_tiles({'hillshade': path}, output, zooms=ZOOMS, n_workers=1)
+    assert 0 < partial['rendered'] < partial['total']
+    # Ayar değişikliği ya da force her şeyi yeniden üretir
+    assert kp.build_tiles({'hillshade': path}, output, zooms=ZOOMS, fmt='webp', n_workers=1)['rendered'] == \
+        partial['total']
+    assert kp.build_tiles({'hillshade': path}, output, zooms=ZOOMS, fmt='webp', n_workers=1,
+                          force=True)['rendered'] == partial['total']
+
+
+def test_mbtiles_uses_tms_rows(tmp_path, hillshade):
+    path, _, _ = hillshade
+    directory = str(tmp_path / 'karolar')
+    mbtiles = str(tmp_path / 'agri.mbtiles')
+    kp.build_tiles({'hillshade': path}, directory, zooms=ZOOMS, n_workers=1)
+    summary = kp.build_tiles({'hillshade': path}, mbtiles, zooms=ZOOMS, n_workers=1)
+    connection = sqlite3.connect(mbtiles)
+    try:
+        rows = connection.execute('SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles').fetchall()
+        metadata = dict(connection.execute('SELECT name, value FROM metadata').fetchall())
+    finally:
+        connection.close()
+    assert len(rows) == summary['written']
+    assert metadata['format'] == 'png' and 'karo_manifest' in metadata
+    for z, x, tms_row, data in rows:
+        with open(os.path.join(directory, str(z), str(x), f'{2 ** z - 1 - tms_row}.png'), 'rb') as handle:
+            assert handle.read() == data
+
+
+def test_render_contours_marks_levels():
+    dem = np.tile(np.arange(0, 120, 10, dtype=np.float32)[:, None], (1, 6))
+    rgba = kp.render_contours(dem, interval=25, major_every=2)
+    lines = rgba[..., 3] > 0
+    # 25, 50, 75, 100 m seviyeleri; 50 ve 100 kalın
+    assert lines.any(axis=1).sum() == 4
+    assert (rgba[..., 3].max(axis=1)[lines.any(axis=1)] == [150, 255, 150, 255]).all()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Canlı harita: ölçüm ayrıştırma ve kısmi yeniden çizimin tam çizimle eşdeğerliği"""
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('matplotlib')
+import matplotlib  # noqa: E402
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from conftest import ROOT  # noqa: E402
+from risk_agi_canli import LiveMap, parse_reading  # noqa: E402
+from risk_agi_yukleyici import find_table, load_network, load_regions  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT, 'risk_agi_verisi')
+
+
+def test_parse_reading():
+    assert parse_reading('temp1,41.5\n') == ('temp1', 41.5)
+    assert parse_reading('hum2 12') == ('hum2', 12.0)
+    assert parse_reading('{"id": 7, "value": "3.5"}') == ('7', 3.5)
+    for line in ('', '# yorum', 'temp1', 'temp1,sicak', '{"id": "x"}', '{bozuk'):
+        assert parse_reading(line) is None
+
+
+@pytest.fixture
+def live_map():
+    network = load_network(find_table(DATA_DIR, 'dugumler'), find_table(DATA_DIR, 'baglantilar'))
+    live_map = LiveMap(network, load_regions(find_table(DATA_DIR, 'bolgeler')))
+    yield live_map
+    plt.close(live_map.figure)
+
+
+def test_partial_redraw_matches_full_draw(live_map):
+    network = live_map.network
+    factors = np.flatnonzero(live_map.propagator._scored)
+    rng = np.random.default_rng(0)
+    changed = []
+    # Önce tüm faktörleri en kötü değere, sonra rastgele değerlere çek: seviyeler ve uyarılar değişir
+    for values in (np.full(len(factors), 100.0), rng.uniform(0, 100, len(factors))):
+        readings = [(network.ids[node], float(value)) for node, value in zip(factors, values)]
+        changed += live_map.apply(readings + [('bilinmeyen', 1.0)])
+        assert live_map.render()
+    assert changed and live_map.stats['unknown'] == 2
+    partial = np.asarray(live_map.canvas.buffer_rgba()).astype(int)
+    live_map.canvas.draw()
+    full = np.asarray(live_map.canvas.buffer_rgba()).astype(int)
+    assert np.abs(partial - full).max() <= 2
+    assert not live_map.render()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Toplu çizim: sabit sanatçı sayısı, kenar indeksleri ve eski ok yerleşimi"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('matplotlib')
+import matplotlib  # noqa: E402
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+import risk_agi_cizim as rc  # noqa: E402
+
+
+@pytest.fixture
+def ax():
+    figure, ax = plt.subplots()
+    yield ax
+    plt.close(figure)
+
+
+def test_node_sizes_scale_factors_only():
+    sizes = rc.node_sizes(['temperature', 'temperature', 'village'], [100.0, np.nan, 50.0])
+    base = [rc.NODE_TYPES[name]['size'] for name in ('temperature', 'temperature', 'village')]
+    np.testing.assert_allclose(sizes, [base[0] * 1.5, base[1], base[2]])
+    with pytest.raises(ValueError):
+        rc.node_sizes(['depo'])
+
+
+@pytest.mark.parametrize('n_edges', [50, 2000])
+def test_artist_count_is_bounded_and_indices_cover_edges(ax, n_edges):
+    xy, node_types, values, source, target, edge_types = rc.synthetic_network(300, n_edges, seed=1)
+    nodes = rc.draw_nodes(ax, xy, node_types, values)
+    artists = rc.draw_edges(ax, xy[source], xy[target], edge_types)
+    assert len(ax.collections) <= len(rc.NODE_TYPES) + len(rc.EDGE_TYPES) + 2
+
+    node_index = np.concatenate([index for _, index in nodes.values()])
+    assert sorted(node_index.tolist()) == list(range(len(xy)))
+    edge_index = np.concatenate(list(artists['index'].values()))
+    assert sorted(edge_index.tolist()) == list(range(n_edges))
+    curved = rc.curved_mask(xy[source], xy[target])
+    for name, collection in artists['edges'].items():
+        for path, edge in zip(collection.get_paths(), artists['index'][name]):
+            vertices = path.vertices
+            assert len(vertices) == (rc.CURVE_POINTS if curved[edge] else 2)
+            np.testing.assert_allclose(vertices[[0, -1]], [xy[source[edge]], xy[target[edge]]])
+    arrows = np.isin(edge_types, rc.ARROW_EDGE_TYPES)
+    np.testing.assert_array_equal(artists['arrow_index'], np.flatnonzero(arrows))
+
+
+def test_arrow_geometry_matches_legacy_placement():
+    start = np.array([[0.0, 0.0], [0.0, 0.0]])
+    end = np.array([[3.0, 4.0], [20.0, 8.0]])
+    curved = rc.curved_mask(start, end)
+    assert curved.tolist() == [False, True]
+    shafts, heads = rc.arrow_geometry(start, end, curved)
+    # Düz kenar: orta noktadan yarım birim geride başlayan 1 birimlik gövde
+    direction = np.array([0.6, 0.8])
+    np.testing.assert_allclose(shafts[0], [[1.5 - 0.3, 2.0 - 0.4], [1.5 + 0.3, 2.0 + 0.4]])
+    np.testing.assert_allclose(heads[0, 1], shafts[0, 1] + direction * rc.ARROW_HEAD['length'])
+    # Eğri kenar: eski çizimdeki 100 noktalı eğrinin 80. noktası ve merkezi fark yönü
+    t = np.linspace(0, 1, 100)
+    control = rc.control_points(start[1:], end[1:])[0]
+    curve = (1 - t)[:, None] ** 2 * start[1] + 2 * ((1 - t) * t)[:, None] * control + (t ** 2)[:, None] * end[1]
+    tangent = curve[81] - curve[79]
+    tangent /= np.hypot(*tangent)
+    np.testing.assert_allclose(shafts[1, 0], curve[80], atol=1e-12)
+    np.testing.assert_allclose(shafts[1, 1], curve[80] + tangent * 0.5, atol=1e-4)
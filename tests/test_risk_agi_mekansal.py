@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Mekânsal indeks: ağaç + bekleme tamponu kaba kuvvet sonucuyla aynı olmalı"""
+
+import numpy as np
+import pytest
+
+from risk_agi_mekansal import EARTH_RADIUS_KM, SpatialIndex
+
+
+def _haversine(lon1, lat1, lon2, lat2):
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@pytest.mark.parametrize('geographic', [False, True])
+def test_nearest_and_within_match_brute_force_after_incremental_adds(geographic):
+    rng = np.random.default_rng(4)
+    index = SpatialIndex(geographic=geographic)
+    x, y = rng.uniform(26, 45, 2000), rng.uniform(36, 42, 2000)
+    types = rng.choice(['fire_station', 'forest_team', 'village'], 2000)
+    # İlk parti ağaca girer, sonraki küçük partiler bekleme tamponunda kalır
+    index.add(x[:1800], y[:1800], types[:1800])
+    for start in range(1800, 2000, 50):
+        index.add(x[start:start + 50], y[start:start + 50], types[start:start + 50])
+    assert any(type_index.pending_size for type_index in index._types.values())
+
+    units = np.flatnonzero(np.isin(types, ['fire_station', 'forest_team']))
+    qx, qy = rng.uniform(26, 45, 30), rng.uniform(36, 42, 30)
+    if geographic:
+        brute = _haversine(qx[:, None], qy[:, None], x[units][None], y[units][None])
+    else:
+        brute = np.hypot(qx[:, None] - x[units][None], qy[:, None] - y[units][None])
+    distances, nodes = index.nearest(qx, qy, ('fire_station', 'forest_team'), k=3)
+    order = np.argsort(brute, axis=1)[:, :3]
+    np.testing.assert_array_equal(nodes, units[order])
+    np.testing.assert_allclose(distances, np.take_along_axis(brute, order, axis=1), rtol=1e-9)
+
+    radius = 60.0 if geographic else 0.6
+    found, found_distances = index.within(qx[0], qy[0], radius, ('fire_station', 'forest_team'))
+    inside = units[brute[0] <= radius]
+    assert sorted(found.tolist()) == sorted(inside.tolist())
+    assert np.all(np.diff(found_distances) >= 0)
+
+    limited = index.nearest(qx, qy, ('fire_station', 'forest_team'), k=3, max_distance=radius)[1]
+    assert np.array_equal(limited >= 0, np.take_along_axis(brute, order, axis=1) <= radius)
+
+
+def test_region_queries_follow_table_order_and_multipart_rings():
+    square = np.array([[0, 0], [10, 0], [10, 10], [0, 10]], dtype=float)
+    regions = {
+        'a': {'rings': [square]},
+        'b': {'rings': [square + 5, square + [20, 0]]},   # çok parçalı; a ile örtüşüyor
+    }
+    index = SpatialIndex(regions=regions)
+    ids = index.region_of([1, 7, 12, 25, 50], [1, 7, 12, 5, 50])
+    assert ids.tolist() == ['a', 'a', 'b', 'b', '']
+    assert index.regions_at(7.0, 7.0) == ['a', 'b']
+    assert index.regions_at(50.0, 50.0) == []
+    with pytest.raises(ValueError):
+        index.nearest([0], [0], ('depo',))
+
+
+def test_cli_prints_dash_without_response_units(tmp_path, capsys):
+    from risk_agi_mekansal import main
+    (tmp_path / 'dugumler.csv').write_text('id,type,x,y,name,value,region\n'
+                                           'koy1,village,1,1,Köy,1,a\nsens1,sensor,2,2,Sensör,1,a\n',
+                                           encoding='utf-8')
+    (tmp_path / 'baglantilar.csv').write_text('source,target,type\n', encoding='utf-8')
+    (tmp_path / 'bolgeler.csv').write_text('id,label,risk,x_min,x_max,y_min,y_max\na,A,low,0,10,0,10\n',
+                                           encoding='utf-8')
+    assert main([str(tmp_path)]) == 0
+    output = capsys.readouterr().out
+    assert 'en yakın birim -,' in output and 'Sensör' not in output
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Rotalama tablosunun artımlı onarımı tam yeniden hesapla aynı kalmalı"""
+
+import numpy as np
+import pytest
+
+from risk_agi_rota import RoutingEngine, _synthetic_graph
+
+N_NODES = 400
+
+
+def _full_table(engine, **options):
+    check = RoutingEngine(engine.graph, **options)
+    check.weights = dict(engine.weights)
+    return check.table()[2]
+
+
+@pytest.mark.parametrize('table_budget', [None, 1])
+def test_incremental_table_matches_full_recompute(table_budget):
+    # table_budget=1: tablo yalnızca yerleşim/izleme düğümlerini kapsar, uçlar Dijkstra ile bulunur
+    rng = np.random.default_rng(3)
+    graph = _synthetic_graph(N_NODES, seed=3)
+    options = {} if table_budget is None else {'table_budget': table_budget}
+    engine = RoutingEngine(graph, **options)
+    assert (len(engine.targets) == N_NODES) == (table_budget is None)
+    engine.table()
+
+    pairs = list(engine.weights)
+    for step in range(60):
+        a, b = pairs[rng.integers(len(pairs))]
+        kind = step % 4
+        if kind == 0:
+            engine.set_travel_time(a, b, engine.weights.get((a, b), 1.0) * 0.3)     # kısalma: _relax
+        elif kind == 1:
+            engine.set_travel_time(a, b, engine.weights.get((a, b), 1.0) * 4.0)     # uzama: _invalidate
+        elif kind == 2:
+            engine.remove_edge(a, b)
+        else:
+            u, v = rng.integers(N_NODES, size=2)                                    # yeni kenar
+            if u != v:
+                engine.set_travel_time(int(u), int(v), float(rng.uniform(0.5, 5.0)))
+        if step % 10 == 9:
+            np.testing.assert_allclose(engine.table()[2], _full_table(engine, **options), rtol=1e-5, err_msg=step)
+    np.testing.assert_allclose(engine.table()[2], _full_table(engine, **options), rtol=1e-5)
+
+
+def test_dispatch_follows_edge_changes():
+    graph = _synthetic_graph(N_NODES, seed=5)
+    engine = RoutingEngine(graph)
+    node = int(engine.targets[np.isin(engine.targets, engine.units, invert=True)][0])
+    ranked = engine.dispatch(node)
+    unit = ranked[-1][0]
+    original = engine.weights.get((min(unit, node), max(unit, node)), np.inf)
+    # En uzak birimden düğüme neredeyse sıfır süreli bir kestirme ekle, sonra geri al
+    engine.set_travel_time(unit, node, 1e-3)
+    assert engine.dispatch(node, limit=1)[0] == pytest.approx((unit, 1e-3), rel=1e-3)
+    engine.set_travel_time(unit, node, original)
+    assert engine.stale_rows > 0
+    assert engine.dispatch(node) == pytest.approx(ranked, rel=1e-5)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Artımlı risk yayılımı tam hesapla aynı skorları vermeli"""
+
+import numpy as np
+import pytest
+
+from risk_agi_skor import RiskPropagator, _synthetic
+
+N_VEGETATION = 300
+
+
+def _assert_matches_recompute(propagator):
+    incremental = {name: getattr(propagator, name).copy() for name in ('score', 'mix', 'risk', 'region_score')}
+    tiers = propagator.tiers.copy()
+    propagator.recompute()
+    for name, values in incremental.items():
+        np.testing.assert_allclose(values, getattr(propagator, name), rtol=1e-9, atol=1e-12, err_msg=name)
+    np.testing.assert_array_equal(tiers, propagator.tiers)
+
+
+@pytest.fixture
+def propagator():
+    graph, regions = _synthetic(N_VEGETATION, n_regions=9, seed=2)
+    return RiskPropagator(graph, regions)
+
+
+def test_set_value_matches_recompute(propagator):
+    rng = np.random.default_rng(0)
+    # Faktör ve bitki örtüsü (yakıt) okumaları, ölçek dışı ve NaN değerler dahil
+    nodes = rng.integers(0, propagator.graph.node_count, 300)
+    values = rng.uniform(-20, 120, 300)
+    values[::17] = np.nan
+    for node, value in zip(nodes.tolist(), values.tolist()):
+        propagator.set_value(node, value)
+    assert propagator.is_vegetation[nodes].any() and (~propagator.is_vegetation[nodes]).any()
+    _assert_matches_recompute(propagator)
+
+
+def test_set_values_matches_recompute_and_last_duplicate_wins(propagator):
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        nodes = rng.integers(0, propagator.graph.node_count, 200)
+        values = rng.uniform(0, 100, 200)
+        propagator.set_values(nodes, values)
+        _assert_matches_recompute(propagator)
+    node = N_VEGETATION
+    propagator.set_values([node, node], [5.0, 40.0])
+    assert propagator.graph.value[node] == np.float32(40.0)
+    _assert_matches_recompute(propagator)
+
+
+def test_reported_tier_changes_match_recompute(propagator):
+    before = propagator.region_tiers()
+    factors = np.arange(N_VEGETATION, propagator.graph.node_count)
+    moved = dict(propagator.set_values(factors, np.full(len(factors), 60.0)))
+    after = propagator.region_tiers()
+    assert moved
+    assert moved == {region: tier for region, tier in after.items() if before[region] != tier}
+    _assert_matches_recompute(propagator)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Risk ağı yükleyici: karışık tipli kimlikler ve Unix'e bağlı olmayan içe aktarım"""
+
+import importlib
+import sys
+
+import numpy as np
+import pytest
+
+from risk_agi_yukleyici import ArrayGraph, _strings
+
+
+def test_strings_checks_every_value():
+    assert _strings(['a', 2, 3]) == ['a', '2', '3']
+    assert _strings(np.array(['a', 2, 3], dtype=object)) == ['a', '2', '3']
+    assert _strings(np.array([10, 20])) == ['10', '20']
+    assert _strings(np.array(['x', 'y'])) == ['x', 'y']
+
+
+def test_mixed_ids_resolve_edges():
+    graph = ArrayGraph()
+    graph.add_nodes(['kaynak', 7, 8], [0.0, 1.0, 2.0], [0.0, 0.0, 0.0], ['village', 'village', 'city'])
+    skipped = graph.add_edges(['kaynak', 7], [7, '8'], ['alert', 'alert'])
+    assert not skipped
+    assert graph.index['7'] == 1 and graph.index['8'] == 2
+
+
+@pytest.mark.parametrize('module_name', ['olcum', 'risk_agi_yukleyici', 'yagis_analizi', 'yakit_yuku',
+                                         'yangin_tehlikesi'])
+def test_imports_without_resource_module(monkeypatch, module_name):
+    # Windows'ta 'resource' modülü yoktur: içe aktarım yine çalışmalı
+    monkeypatch.setitem(sys.modules, 'resource', None)
+    monkeypatch.delitem(sys.modules, module_name, raising=False)
+    monkeypatch.delitem(sys.modules, 'olcum', raising=False)
+    try:
+        importlib.import_module(module_name)
+    except ImportError as exc:
+        if 'resource' in str(exc):
+            raise
+        pytest.skip(f'{module_name} bağımlılıkları kurulu değil: {exc}')
+    # Tepe bellek ölçümü modüller arasında paylaşılan olcum.peak_rss_mb'dedir
+    assert isinstance(sys.modules['olcum'].peak_rss_mb(), float)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Toplu render: çöken işçi süreci toplu işi ve raporu yarıda bırakmamalı"""
+
+import os
+
+import toplu_render
+
+
+def _crashing_worker(dem_path, jobs):
+    # Segfault/OOM benzeri sert ölüm: süreç havuzu BrokenProcessPool ile bozulur
+    if dem_path == 'coker.tif':
+        os._exit(1)
+    if dem_path == 'istisna.tif':
+        raise ValueError('bozuk DEM')
+    return [{'dem': dem_path, 'render': job['render'], 'output': job['output'], 'status': 'tamam', 'seconds': 0.0}
+            for job in jobs]
+
+
+def test_crashed_worker_marks_only_its_dem_as_failed(tmp_path):
+    config = {'dems': ['a.tif', 'coker.tif', 'b.tif', 'istisna.tif', 'c.tif'],
+              'jobs': [{'render': 'ultra_realistic'}, {'render': 'professional'}], 'output_dir': str(tmp_path)}
+    results = toplu_render.run_batch(config, workers=2, function=_crashing_worker)
+    assert len(results) == 10
+    status = {(result['dem'], result['render']): result['status'] for result in results}
+    for dem in ('a.tif', 'b.tif', 'c.tif'):
+        assert status[(dem, 'ultra_realistic')] == status[(dem, 'professional')] == 'tamam'
+    for dem in ('coker.tif', 'istisna.tif'):
+        assert status[(dem, 'ultra_realistic')] == status[(dem, 'professional')] == 'hata'
+    errors = {result['dem']: result['error'] for result in results if result['status'] == 'hata'}
+    assert errors['coker.tif'].startswith('BrokenProcessPool')
+    assert errors['istisna.tif'] == 'ValueError: bozuk DEM'
+
+
+def test_unfinished_dems_are_retried_in_a_full_pool_first(tmp_path, monkeypatch):
+    calls = []
+    run_units = toplu_render._run_units
+
+    def recording(units, workers, context, function):
+        calls.append(([dem for dem, _ in units], workers))
+        return run_units(units, workers, context, function)
+
+    monkeypatch.setattr(toplu_render, '_run_units', recording)
+    config = {'dems': ['a.tif', 'coker.tif', 'b.tif', 'c.tif'], 'jobs': [{'render': 'professional'}],
+              'output_dir': str(tmp_path)}
+    results = toplu_render.run_batch(config, workers=2, function=_crashing_worker)
+    assert len(results) == 4
+    first, retry, *isolated = calls
+    assert first == (['a.tif', 'coker.tif', 'b.tif', 'c.tif'], 2)
+    # Çökmeden bitmeyen DEM'ler önce tam genişlikte bir havuzda yeniden denenir
+    assert retry[1] == 2 and 'coker.tif' in retry[0]
+    assert all(workers == 1 and len(dems) == 1 and dems[0] in retry[0] for dems, workers in isolated)
+    assert (['coker.tif'], 1) in isolated
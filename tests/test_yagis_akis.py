@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""GR4J çekirdeklerinin yayımlanmış denklemlere karşı doğrulaması"""
+
+import numpy as np
+import pytest
+
+import yagis_akis
+
+# airGR başlangıç örneğinin (L0123001) parametreleri
+AIRGR_PARAMS = (257.238, 1.012, 88.235, 2.208)
+BACKENDS = [backend for backend in yagis_akis.GR4J_BACKENDS if backend != 'numba' or yagis_akis.numba is not None]
+
+
+@pytest.mark.parametrize('x4', [0.6, 1.0, 2.208, 7.5, 19.9])
+def test_unit_hydrographs_follow_perrin_2003(x4):
+    uh1, uh2 = (ordinates[0] for ordinates in yagis_akis.unit_hydrographs(x4))
+    t = np.arange(1, 2 * yagis_akis.NH + 1, dtype=float)
+    # SH1(t) = (t/X4)^2.5 (t < X4); SH2(t) = 0.5 (t/X4)^2.5 (t <= X4), 1 - 0.5 (2 - t/X4)^2.5 (t < 2 X4)
+    sh1 = np.minimum(t / x4, 1.0) ** 2.5
+    sh2 = np.where(t <= x4, 0.5 * (t / x4) ** 2.5, np.where(t < 2 * x4, 1 - 0.5 * np.abs(2 - t / x4) ** 2.5, 1.0))
+    np.testing.assert_allclose(np.cumsum(uh1), sh1[:yagis_akis.NH], atol=1e-15)
+    np.testing.assert_allclose(np.cumsum(uh2), sh2, atol=1e-15)
+    assert uh1.sum() == pytest.approx(1.0) and uh2.sum() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_first_day_flow_from_published_equations(backend):
+    x1, x2, x3, x4 = AIRGR_PARAMS
+    p = 10.0
+    # Perrin vd. (2003) denklemleri, başlangıç doluluğu %30 / %50, E = 0
+    s, r = 0.3 * x1, 0.5 * x3
+    tws = np.tanh(p / x1)
+    ps = x1 * (1 - (s / x1) ** 2) * tws / (1 + s / x1 * tws)
+    s += ps
+    perc = s * (1 - (1 + (4 / 9 * s / x1) ** 4) ** -0.25)
+    pr = p - ps + perc
+    q9, q1 = 0.9 * pr * (1 / x4) ** 2.5, 0.1 * pr * 0.5 * (1 / x4) ** 2.5
+    exchange = x2 * (r / x3) ** 3.5
+    r = max(0.0, r + q9 + exchange)
+    qr = r * (1 - (1 + (r / x3) ** 4) ** -0.25)
+    expected = qr + max(0.0, q1 + exchange)
+    flows = yagis_akis.gr4j(np.array([p]), np.array([0.0]), np.array(AIRGR_PARAMS), backend=backend)
+    assert flows[0] == pytest.approx(expected, rel=1e-12)
+
+
+def test_backends_agree_and_close_water_balance():
+    basin = yagis_akis.synthetic_basin(n_years=4)
+    params = yagis_akis._random_params(8)
+    reference = np.array([yagis_akis._gr4j_reference(basin['precip'], basin['evap'], row)[0] for row in params])
+    for backend in BACKENDS:
+        np.testing.assert_allclose(yagis_akis.gr4j(basin['precip'], basin['evap'], params, backend=backend),
+                                   reference, rtol=1e-12, atol=1e-12, err_msg=backend)
+    for row in params:
+        _, closure = yagis_akis._gr4j_reference(basin['precip'], basin['evap'], row)
+        assert abs(closure) < 1e-8
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Parçalı yağış hattının Zarr ürünleri bellekte hesaplanan ürünlerle aynı olmalı"""
+
+import numpy as np
+import pytest
+
+xr = pytest.importorskip('xarray')
+pytest.importorskip('dask')
+pytest.importorskip('zarr')
+
+import yagis_analizi as ya  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def pipeline(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('yagis')
+    paths = ya.write_synthetic_years(str(directory), 2, n_lat=36, n_lon=72, start_year=2003)
+    store = str(directory / 'urunler.zarr')
+    ya.run_pipeline(paths, store, chunks={'lat': 18, 'lon': 36}, workers=1)
+    return paths, store
+
+
+def test_month_lengths():
+    days = np.arange('2004-01-30', '2004-03-02', dtype='datetime64[D]')
+    assert ya._month_lengths(days) == (2, 29, 1)
+
+
+def test_products_match_eager_computation(pipeline):
+    paths, store = pipeline
+    monthly, seasonal, counts, climatology, regional = ya._eager_products(paths, ya.EXCEEDANCE_THRESHOLDS)
+
+    stored = ya.open_product(store, 'aylik')['aylik_toplam']
+    assert stored['lat'].values[0] < stored['lat'].values[-1] and float(stored['lon'].min()) < 0
+    np.testing.assert_allclose(stored.values, monthly.values, rtol=1e-5)
+    np.testing.assert_allclose(ya.open_product(store, 'mevsimlik')['mevsimlik_toplam'].values,
+                               seasonal.values, rtol=1e-5)
+    np.testing.assert_array_equal(ya.open_product(store, 'asim')['asim_gun_sayisi'].values, counts.values)
+    np.testing.assert_allclose(ya.open_product(store, 'klimatoloji')['aylik_klimatoloji'].values,
+                               climatology.values, rtol=1e-5)
+    np.testing.assert_allclose(ya.open_product(store, 'bolgesel')['bolgesel_ortalama'].values,
+                               regional.values, rtol=1e-5)
+    for group in ya.PRODUCT_GROUPS:
+        assert ya.open_product(store, group).data_vars, group
+
+
+def test_bbox_subset_reads_only_turkey(pipeline):
+    _, store = pipeline
+    full = ya.open_product(store, 'aylik')['aylik_toplam']
+    turkey = ya.open_product(store, 'aylik', bbox=ya.TURKEY_BBOX)['aylik_toplam']
+    south, north, west, east = ya.TURKEY_BBOX
+    assert turkey.sizes['lat'] and turkey.sizes['lon']
+    assert turkey['lat'].min() >= south and turkey['lat'].max() <= north
+    assert turkey['lon'].min() >= west and turkey['lon'].max() <= east
+    np.testing.assert_array_equal(turkey.values, full.sel(lat=turkey['lat'], lon=turkey['lon']).values)
+
+
+def test_overwrite_refuses_non_zarr_directory(pipeline, tmp_path):
+    _, store = pipeline
+    products = {'aylik': ya.open_product(store, 'aylik').isel(time=slice(0, 1))}
+    keep = tmp_path / 'belgeler'
+    keep.mkdir()
+    (keep / 'not.txt').write_text('silinmemeli')
+    with pytest.raises(ValueError):
+        ya.write_products(products, str(keep))
+    assert (keep / 'not.txt').read_text() == 'silinmemeli'
+
+    again = str(tmp_path / 'yeni.zarr')
+    ya.write_products(products, again)
+    ya.write_products(products, again)
+    assert 'aylik' in xr.open_datatree(again, engine='zarr', consolidated=False).children
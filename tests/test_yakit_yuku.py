@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Yakıt yükü hattı: ofsetle negatife düşen yansıtım ve NaN nodata'lı kayan noktalı bantlar"""
+
+import os
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip('rasterio')
+from rasterio.transform import from_origin  # noqa: E402
+
+import yakit_yuku  # noqa: E402
+
+SIZE = 64
+
+
+def _write(path, data, nodata):
+    profile = {'driver': 'GTiff', 'width': SIZE, 'height': SIZE, 'count': 1, 'dtype': data.dtype.name,
+               'crs': 'EPSG:32636', 'transform': from_origin(600000, 4070000, 10, 10), 'nodata': nodata}
+    with rasterio.open(path, 'w', **profile) as dataset:
+        dataset.write(data, 1)
+
+
+def _scenes(directory, dtype, nodata, n_scenes=3):
+    rng = np.random.default_rng(0)
+    paths = []
+    for index in range(n_scenes):
+        scene_dir = os.path.join(directory, f'S2_MSIL2A_202308{index + 2:02d}T083601_T36SUF')
+        os.makedirs(scene_dir)
+        bands = {'B04': rng.uniform(900, 1400, (SIZE, SIZE)), 'B08': rng.uniform(1500, 4000, (SIZE, SIZE)),
+                 'B12': rng.uniform(1000, 2400, (SIZE, SIZE))}
+        # Koyu su: -1000 ofsetle sıfırın altına düşen yansıtım
+        for data in bands.values():
+            data[:16, :16] = rng.uniform(950, 1000, (16, 16))
+        bands['B08'][:16, :16] = 1001
+        for band, data in bands.items():
+            data = data.astype(dtype)
+            data[40:48, 40:48] = nodata
+            _write(os.path.join(scene_dir, f'T36SUF_{band}_10m.tif'), data, nodata)
+        paths.append(scene_dir)
+    return yakit_yuku.find_scenes(paths)
+
+
+@pytest.mark.parametrize('dtype, nodata', [('uint16', 0), ('float32', np.nan)])
+def test_offset_and_nodata_keep_fuel_bounded(tmp_path, dtype, nodata):
+    scenes = _scenes(str(tmp_path / 'sahneler'), dtype, nodata)
+    result = yakit_yuku.fuel_load_map(scenes, str(tmp_path / 'cikti'), offset=-1000, n_workers=1)
+    with rasterio.open(result['fuel_path']) as dataset:
+        fuel = dataset.read(1)
+    valid = np.isfinite(fuel)
+    # Nodata blok her sahnede boş: NaN olmalı, geri kalan her piksel geçerli
+    assert not valid[40:48, 40:48].any()
+    assert valid.sum() == SIZE * SIZE - 64
+    assert np.abs(fuel[valid]).max() <= 1
+    assert all(-1 <= value <= 1 for value in result['thresholds'].values())
+    assert sum(row['pixels'] for row in result['classes']) == valid.sum()
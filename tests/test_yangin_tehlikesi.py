@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Yangın tehlikesi: faktör puanları, blok bağımsızlığı, nodata ve yeniden örnekleme"""
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip('rasterio')
+from rasterio.crs import CRS as RasterCRS  # noqa: E402
+from rasterio.transform import from_origin  # noqa: E402
+
+import yangin_tehlikesi as yt  # noqa: E402
+
+CRS = RasterCRS.from_epsg(32638)
+TRANSFORM = from_origin(400000.0, 4400000.0, 30.0, 30.0)
+
+
+def _layers(shape=(70, 90)):
+    rng = np.random.default_rng(0)
+    slope = rng.uniform(0, 40, shape).astype(np.float32)
+    aspect = rng.uniform(0, 360, shape).astype(np.float32)
+    fuel = rng.uniform(0, 0.6, shape).astype(np.float32)
+    aspect[5, 7] = np.nan
+    fuel[30:33, 40:44] = np.nan
+    return {name: (array, TRANSFORM, CRS) for name, array in
+            (('slope', slope), ('aspect', aspect), ('fuel', fuel))}
+
+
+def test_factor_scores():
+    assert yt.factor_score('slope', np.array([0.0, 10.0, 50.0])).tolist() == pytest.approx([0, 0.375, 1])
+    # AgriDagi3D bakısı 45° (yukarı eğim kuzeydoğu) -> yamaç güneybatıya bakar: en yüksek puan
+    assert yt.factor_score('aspect', np.array([45.0]))[0] == pytest.approx(1.0)
+    assert yt.factor_score('aspect', np.array([225.0]), aspect_convention='compass')[0] == pytest.approx(1.0)
+    assert yt.factor_score('aspect', np.array([45.0]), slope=np.array([1.0]))[0] == yt.FLAT_ASPECT_SCORE
+    with pytest.raises(ValueError):
+        yt.factor_score('aspect', np.array([0.0]), aspect_convention='pusula')
+    assert yt.normalized_weights(['slope', 'fuel']) == pytest.approx({'slope': 0.25 / 0.6, 'fuel': 0.35 / 0.6})
+    with pytest.raises(ValueError):
+        yt.normalized_weights(['slope'], {'ruzgar': 1.0})
+
+
+def test_map_is_independent_of_block_rows(tmp_path):
+    layers = _layers()
+    results = [yt.fire_hazard_map(layers, str(tmp_path / str(rows)), block_rows=rows) for rows in (7, 512)]
+    arrays = []
+    for result in results:
+        with rasterio.open(result['hazard_path']) as hazard, rasterio.open(result['class_path']) as classes:
+            arrays.append((hazard.read(1), classes.read(1)))
+    np.testing.assert_array_equal(arrays[0][0], arrays[1][0])
+    np.testing.assert_array_equal(arrays[0][1], arrays[1][1])
+    for small, large in zip(results[0]['classes'], results[1]['classes']):
+        assert small['pixels'] == large['pixels'] and small['hectares'] == pytest.approx(large['hectares'])
+
+    hazard, classes = arrays[0]
+    weights = yt.normalized_weights(layers)
+    expected = yt.hazard_block({name: source[0] for name, source in layers.items()}, weights)
+    np.testing.assert_allclose(hazard, expected, rtol=1e-6, equal_nan=True)
+    # Herhangi bir faktör eksikse piksel sınıflanmaz
+    missing = np.isnan(layers['aspect'][0]) | np.isnan(layers['fuel'][0])
+    assert np.isnan(hazard[missing]).all() and (classes[missing] == 0).all()
+    assert (classes[~missing] > 0).all()
+    assert sum(row['pixels'] for row in results[0]['classes']) == (~missing).sum()
+    # Sınır değeri üst seviyeye girer (risk_agi_skor.risk_tier ile aynı)
+    np.testing.assert_array_equal(classes[~missing], np.digitize(hazard[~missing], yt.RISK_THRESHOLDS) + 1)
+
+
+def test_coarser_layer_is_resampled_to_reference(tmp_path):
+    layers = _layers()
+    # 60 m pürüzlülük rasterı, nodata -9999: 30 m referans ızgarasına okunur
+    roughness = np.full((35, 45), 25.0, dtype=np.float32)
+    roughness[:5, :5] = -9999
+    path = str(tmp_path / 'puruzluluk.tif')
+    profile = {'driver': 'GTiff', 'width': 45, 'height': 35, 'count': 1, 'dtype': 'float32', 'nodata': -9999,
+               'crs': CRS, 'transform': from_origin(400000.0, 4400000.0, 60.0, 60.0)}
+    with rasterio.open(path, 'w', **profile) as dataset:
+        dataset.write(roughness, 1)
+    result = yt.fire_hazard_map(dict(layers, roughness=path), str(tmp_path / 'out'), block_rows=16)
+    with rasterio.open(result['hazard_path']) as dataset:
+        hazard = dataset.read(1)
+    assert hazard.shape == layers['slope'][0].shape
+    assert np.isnan(hazard[:8, :8]).all()
+    weights = yt.normalized_weights(dict(layers, roughness=path))
+    blocks = {name: source[0][20:, 20:] for name, source in layers.items()}
+    blocks['roughness'] = np.full(blocks['slope'].shape, 25.0, dtype=np.float32)
+    np.testing.assert_allclose(hazard[20:, 20:], yt.hazard_block(blocks, weights), rtol=1e-5, equal_nan=True)
+
+
+def test_cli_rejects_reference_that_was_not_supplied(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        yt.main([str(tmp_path / 'dem.tif'), '--reference', 'fuel'])
+    assert exit_info.value.code == 2
+    assert '--reference fuel' in capsys.readouterr().err
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tarayıcı açmadan toplu (headless) render: PNG görüntüler ve MP4 uçuş videoları.
+
+Bir DEM listesi ve render işleri tanımlayan JSON dosyası okunur; her DEM'in
+işleri sınırlı bir süreç havuzunda (ProcessPoolExecutor) ayrı bir süreçte
+çalışır. Hatalı bir iş diğerlerini durdurmaz; sonuçlar rapor JSON'una yazılır.
+
+İş dosyası örneği (isler.json):
+    {
+      "dems": ["agri_dagi_DEM.tif", "dagar/uludag.tif"],
+      "output_dir": "renderlar",
+      "cache_dir": ".arazi_onbellek",
+      "backend": "pyvista",
+      "jobs": [
+        {"render": "ultra_realistic", "format": "png", "width": 1400, "height": 900},
+        {"render": "professional", "format": "png"},
+        {"render": "flythrough", "format": "mp4", "duration": 15, "fps": 30}
+      ]
+    }
+
+Arka uçlar:
+  'pyvista' - VTK ekran dışı (off-screen) render; PNG ve MP4
+  'kaleido' - Plotly şekillerinin kaleido ile statik dışa aktarımı; PNG ve
+              kare kare MP4 (ffmpeg gerekir)
+
+Çalıştırma:  python toplu_render.py isler.json --workers 8
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+RENDERS = ('ultra_realistic', 'professional', 'flythrough')
+BACKENDS = ('pyvista', 'kaleido')
+
+# Plotly sahnesindeki aspectratio=(1, 1, 0.3) ile aynı normalize kutu
+SCENE_ASPECT = (1.0, 1.0, 0.3)
+SCENE_CENTER = (0.0, 0.0, 0.0)
+FLYTHROUGH_CENTER = (0.0, 0.0, 0.3)
+
+PANEL_CMAPS = {'dem': 'gist_earth', 'slope': 'Reds', 'aspect': 'hsv', 'hillshade': 'gray'}
+PANEL_TITLES = {'dem': '3D Topografik Model', 'slope': 'Eğim Analizi',
+                'aspect': 'Bakı Analizi', 'hillshade': 'Gölgeleme Analizi'}
+
+
+def expand_jobs(config):
+    """İş dosyasını DEM başına iş listelerine aç"""
+    output_dir = config.get('output_dir', 'renderlar')
+    defaults = {key: config[key] for key in ('cache_dir', 'backend', 'derivatives_backend') if key in config}
+    units = []
+    for dem_path in config['dems']:
+        stem = os.path.splitext(os.path.basename(dem_path))[0]
+        jobs = []
+        for job in config['jobs']:
+            if job['render'] not in RENDERS:
+                raise ValueError(f"Geçersiz render: {job['render']!r} (seçenekler: {', '.join(RENDERS)})")
+            job = {**defaults, **job}
+            fmt = job.get('format', 'mp4' if job['render'] == 'flythrough' else 'png')
+            job.setdefault('output', os.path.join(output_dir, f"{stem}_{job['render']}.{fmt}"))
+            jobs.append(job)
+        units.append((dem_path, jobs))
+    return units
+
+
+def _ffmpeg_exe():
+    """Sistem ffmpeg'i ya da imageio-ffmpeg ile gelen ikiliyi bul"""
+    exe = shutil.which('ffmpeg')
+    if exe is None:
+        try:
+            import imageio_ffmpeg
+            exe = imageio_ffmpeg.get_ffmpeg_exe()
+        except ImportError:
+            raise RuntimeError("MP4 için ffmpeg ya da imageio-ffmpeg gerekli") from None
+    return exe
+
+
+# --- pyvista arka ucu -----------------------------------------------------------
+
+def _terrain_grid(layers):
+    """LOD katmanlarından Plotly sahnesiyle aynı normalize kutuda bir yüzey ızgarası kur"""
+    import pyvista as pv
+
+    dem = np.asarray(layers['dem'], dtype=float)
+    height, width = dem.shape
+    xs = np.linspace(-SCENE_ASPECT[0], SCENE_ASPECT[0], width)
+    ys = np.linspace(-SCENE_ASPECT[1], SCENE_ASPECT[1], height)
+    dem_min, dem_max = np.nanmin(dem), np.nanmax(dem)
+    zs = ((dem - dem_min) / ((dem_max - dem_min) or 1) - 0.5) * 2 * SCENE_ASPECT[2]
+
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    grid = pv.StructuredGrid(grid_x, grid_y, zs)
+    # StructuredGrid noktaları Fortran sırasındadır
+    for name, layer in layers.items():
+        grid.point_data[name] = np.asarray(layer, dtype=np.float32).ravel(order='F')
+    return grid
+
+
+def _camera(eye, center=SCENE_CENTER):
+    return [tuple(eye), center, (0, 0, 1)]
+
+
+def _render_pyvista(analysis, job):
+    import pyvista as pv
+
+    size = (job.get('width', 1400), job.get('height', 900))
+    layers, _, _ = analysis._sample_layers(None, job.get('max_vertices', 250_000), job.get('lod_method', 'mean'))
+    grid = _terrain_grid(layers)
+    colors = analysis._generate_realistic_colors(layers['dem'], layers['slope'], layers['hillshade'])
+    grid.point_data['renk'] = np.asarray(colors, dtype=np.float32).ravel(order='F')
+    topo_cmap = [color for _, color in analysis._create_topographic_colorscale()]
+
+    if job['render'] == 'professional':
+        plotter = pv.Plotter(shape=(2, 2), off_screen=True, window_size=size)
+        for index, name in enumerate(('dem', 'slope', 'aspect', 'hillshade')):
+            plotter.subplot(index // 2, index % 2)
+            # Dört panel aynı geometriyi paylaşır, yalnızca etkin skaler değişir
+            plotter.add_mesh(grid.copy(deep=False), scalars=name, cmap=PANEL_CMAPS[name], show_scalar_bar=False)
+            plotter.add_text(PANEL_TITLES[name], font_size=10)
+            plotter.camera_position = _camera((2.0, 2.0, 1.6))
+        plotter.screenshot(job['output'])
+        plotter.close()
+        return
+
+    plotter = pv.Plotter(off_screen=True, window_size=size)
+    plotter.add_mesh(grid, scalars='renk', cmap=topo_cmap, show_scalar_bar=False,
+                     ambient=0.3, diffuse=0.8, specular=0.2)
+    plotter.set_background('black')
+
+    if job['render'] == 'ultra_realistic':
+        plotter.camera_position = _camera((1.8, 1.8, 1.2))
+        plotter.screenshot(job['output'])
+    else:
+        fps = job.get('fps', 30)
+        eyes = analysis._flythrough_eyes(int(job.get('duration', 15) * fps))
+        plotter.open_movie(job['output'], framerate=fps, quality=job.get('quality', 7))
+        for eye in eyes:
+            plotter.camera_position = _camera(eye, FLYTHROUGH_CENTER)
+            plotter.write_frame()
+    plotter.close()
+
+
+# --- kaleido arka ucu -----------------------------------------------------------
+
+def _render_kaleido(analysis, job):
+    width, height = job.get('width', 1400), job.get('height', 900)
+    options = dict(max_vertices=job.get('max_vertices', 250_000), lod_method=job.get('lod_method', 'mean'),
+                   auto_open=False, save_html=False)
+
+    if job['render'] == 'ultra_realistic':
+        analysis.create_ultra_realistic_3d(**options).write_image(job['output'], width=width, height=height)
+        return
+    if job['render'] == 'professional':
+        analysis.create_professional_analysis(**options).write_image(job['output'], width=width, height=height)
+        return
+
+    fps = job.get('fps', 30)
+    duration = job.get('duration', 15)
+    fig = analysis.create_cinematic_flythrough(duration=duration, **options)
+    # Oynat/duraklat düğmeleri tarayıcı içindir; video karelerinde görünmesin
+    fig.update_layout(updatemenus=[])
+    center = dict(zip('xyz', FLYTHROUGH_CENTER))
+    command = [_ffmpeg_exe(), '-y', '-loglevel', 'error', '-f', 'image2pipe', '-framerate', str(fps),
+               '-i', '-', '-c:v', 'libx264', '-pix_fmt', 'yuv420p', job['output']]
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as ffmpeg:
+        for eye in analysis._flythrough_eyes(int(duration * fps)):
+            fig.update_layout(scene_camera=dict(eye=dict(zip('xyz', eye)), center=center))
+            ffmpeg.stdin.write(fig.to_image(format='png', width=width, height=height))
+        ffmpeg.stdin.close()
+    if ffmpeg.returncode != 0:
+        raise RuntimeError(f"ffmpeg hata kodu: {ffmpeg.returncode}")
+
+
+def run_dem_jobs(dem_path, jobs):
+    """Bir DEM'in tüm işlerini tek süreçte çalıştır (DEM bir kez yüklenir)"""
+    from agri_dagi_3d_profesional import AgriDagi3D
+
+    results = []
+    try:
+        options = jobs[0] if jobs else {}
+        analysis = AgriDagi3D(dem_path, cache_dir=options.get('cache_dir'),
+                              derivatives_backend=options.get('derivatives_backend', 'legacy'))
+    except Exception as exc:
+        return [{'dem': dem_path, 'render': job['render'], 'output': job['output'], 'status': 'hata', 'seconds': 0.0,
+                 'error': f'{type(exc).__name__}: {exc}', 'traceback': traceback.format_exc()} for job in jobs]
+
+    for job in jobs:
+        start = time.perf_counter()
+        result = {'dem': dem_path, 'render': job['render'], 'output': job['output']}
+        try:
+            backend = job.get('backend', 'pyvista')
+            if backend not in BACKENDS:
+                raise ValueError(f"Geçersiz arka uç: {backend!r} (seçenekler: {', '.join(BACKENDS)})")
+            os.makedirs(os.path.dirname(os.path.abspath(job['output'])), exist_ok=True)
+            (_render_pyvista if backend == 'pyvista' else _render_kaleido)(analysis, job)
+            result['status'] = 'tamam'
+        except Exception as exc:
+            result.update(status='hata', error=f'{type(exc).__name__}: {exc}', traceback=traceback.format_exc())
+        result['seconds'] = round(time.perf_counter() - start, 2)
+        results.append(result)
+    return results
+
+
+def _failed_results(dem_path, jobs, error):
+    return [{'dem': dem_path, 'render': job['render'], 'output': job['output'], 'status': 'hata',
+             'seconds': 0.0, 'error': error} for job in jobs]
+
+
+def _print_results(results):
+    for result in results:
+        icon = '✅' if result['status'] == 'tamam' else '❌'
+        print(f"{icon} {result['dem']} / {result['render']} -> {result['output']} "
+              f"{result.get('error', '')}".rstrip())
+
+
+def _run_units(units, workers, context, function=run_dem_jobs):
+    """Birimleri tek havuzda çalıştır: (sonuçlar, havuz çöktüğü için bitmeyen birimler)"""
+    results, unfinished = [], []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {executor.submit(function, dem_path, jobs): (dem_path, jobs) for dem_path, jobs in units}
+        for future in as_completed(futures):
+            dem_path, jobs = futures[future]
+            try:
+                unit_results = future.result()
+            except BrokenProcessPool:
+                # Bir işçi sert biçimde öldü (VTK/OpenGL segfault, OOM): havuzdaki bekleyen
+                # tüm birimler bu hatayı alır, hangisinin suçlu olduğu bilinmez
+                unfinished.append((dem_path, jobs))
+                continue
+            except Exception as exc:
+                unit_results = _failed_results(dem_path, jobs, f'{type(exc).__name__}: {exc}')
+            _print_results(unit_results)
+            results.extend(unit_results)
+    return results, unfinished
+
+
+def run_batch(config, workers=None, function=run_dem_jobs):
+    """Tüm DEM'leri sınırlı süreç havuzunda render et ve sonuç listesini döndür.
+
+    Bir işçi süreci çökerse (BrokenProcessPool) bitmemiş DEM'ler tam işçi
+    sayısıyla yeni bir havuzda yeniden denenir; yalnızca orada da çökenler
+    her biri kendi tek işçili havuzunda ayrıştırılır. Böylece yalnız çöken
+    DEM'in işleri 'hata' olarak raporlanır ve toplu iş yarıda kalmaz.
+    """
+    units = expand_jobs(config)
+    workers = workers or config.get('workers') or os.cpu_count()
+    print(f"🎞️ {len(units)} DEM, {sum(len(jobs) for _, jobs in units)} iş, {workers} süreç")
+
+    # VTK/OpenGL bağlamları fork ile güvenle paylaşılamadığı için 'spawn' kullanılır
+    context = multiprocessing.get_context('spawn')
+    results, unfinished = _run_units(units, workers, context, function)
+    if unfinished:
+        print(f"⚠️ Bir işçi süreci çöktü; {len(unfinished)} DEM yeni bir havuzda yeniden deneniyor")
+        retried, unfinished = _run_units(unfinished, workers, context, function)
+        results.extend(retried)
+    if unfinished:
+        print(f"⚠️ İşçi süreci yine çöktü; {len(unfinished)} DEM ayrı süreçlerde deneniyor")
+    for unit in unfinished:
+        unit_results, crashed = _run_units([unit], 1, context, function)
+        results.extend(unit_results)
+        for dem_path, jobs in crashed:
+            failed = _failed_results(dem_path, jobs, 'BrokenProcessPool: işçi süreci beklenmedik biçimde '
+                                                     'sonlandı (segfault ya da bellek yetersizliği)')
+            _print_results(failed)
+            results.extend(failed)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AgriDagi3D toplu headless render')
+    parser.add_argument('jobs_file', help='DEM ve render işlerini tanımlayan JSON dosyası')
+    parser.add_argument('--workers', type=int, default=None, help='Eşzamanlı süreç sayısı')
+    parser.add_argument('--report', default=None, help='Sonuç raporu JSON yolu')
+    args = parser.parse_args(argv)
+
+    with open(args.jobs_file, encoding='utf-8') as handle:
+        config = json.load(handle)
+    results = run_batch(config, args.workers)
+
+    report_path = args.report or os.path.join(config.get('output_dir', 'renderlar'), 'toplu_render_raporu.json')
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, ensure_ascii=False, indent=2)
+
+    failed = sum(result['status'] != 'tamam' for result in results)
+    print(f"📄 Rapor: {report_path} ({len(results) - failed} başarılı, {failed} hatalı)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
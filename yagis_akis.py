@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GR4J yağış-akış modeli: parametre kümeleri boyunca toplu (vektörel) benzetim ve
+paralel kalibrasyon.
+
+"HydrologicalREADME.md" iş akışı GR4J'yi R'daki airGR ile tek tek, elle
+verilen Param = c(X1..X4) ile çalıştırır. Buradaki motor airGR'ın Fortran
+çekirdeğini (frun_GR4J.f) adım adım izler:
+
+  üretim deposu (X1, mm)   tanh ile yağış/buharlaşma paylaşımı, perkolasyon
+  yeraltı değişimi (X2, mm/gün)   X2 * (R/X3)^3.5
+  öteleme deposu (X3, mm)
+  birim hidrograflar (X4, gün)   UH1/UH2 (NH = 20), akışın %90'ı UH1'den
+
+Zaman döngüsü sıralıdır; parametre kümeleri ise bağımsızdır. numba kuruluysa
+JIT derlenmiş çekirdek parametre kümelerini prange ile çekirdeklere dağıtır,
+her kümenin durumu yerel değişkenlerde kalır; değilse aynı döngü NumPy ile
+tüm kümeler üzerinde vektörel yürür. Kalibrasyon NSE'yi en büyükleyen
+scipy.optimize.differential_evolution ile yapılır: popülasyonun tamamı her
+nesilde tek çağrıda (vectorized=True) değerlendirilir ve akışlar saklanmadan
+hata kareleri biriktirilir. Birden çok havza için aynı parametre kümeleri tek
+geçişte puanlanabilir (ensemble).
+
+airGR varsayılanları: depolar başlangıçta %30 (üretim) ve %50 (öteleme) dolu,
+çalışma döneminden önceki bir yıl ısınma dönemidir. Eksik (NaN ya da negatif)
+yağış/buharlaşma 0 kabul edilir, eksik gözlemler NSE'ye girmez.
+
+Havza dosyası: DatesR/tarih, P, E ve isteğe bağlı Qmm/Qobs sütunlu CSV (airGR
+BasinObs düzeni; ör. R'da write.csv(BasinObs, 'L0123001.csv')).
+airGR karşılaştırması: tests/fixtures/airgr_L0123001_GR4J.R airGR başlangıç örneğinin
+(L0123001) Qsim çıktısını yazar; --reference ile verilir. Bu çıktı henüz depoda
+olmadığından test takımı airGR'a karşı sınamaz. Başka havzalar için R'da:
+  write.csv(data.frame(DatesR = OutputsModel$DatesR, Qsim = OutputsModel$Qsim), 'airgr.csv')
+
+Kullanım:   python yagis_akis.py L0123001.csv --start 1990-01-01 --end 1999-12-31 \\
+                --param 257.238 1.012 88.235 2.208 --reference airgr.csv
+            python yagis_akis.py havzalar/*.csv --calibrate -o kalibrasyon.csv
+Kıyaslama:  python yagis_akis.py --benchmark
+"""
+
+import argparse
+import csv
+import glob
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    from scipy.optimize import differential_evolution
+except ImportError:
+    differential_evolution = None
+
+PARAM_NAMES = ('X1', 'X2', 'X3', 'X4')
+# Kalibrasyon arama sınırları; X4 birim hidrograf uzunluğu NH ile sınırlıdır
+PARAM_BOUNDS = ((10.0, 3000.0), (-10.0, 10.0), (1.0, 1000.0), (0.5, 20.0))
+# Birim hidrograf uzunluğu (gün): UH1 NH, UH2 2*NH ordinat
+NH = 20
+# Başlangıç doluluk oranları (airGR IniResLevels): üretim ve öteleme deposu
+INITIAL_LEVELS = (0.3, 0.5)
+WARMUP_DAYS = 365
+GR4J_BACKENDS = ('numba', 'numpy')
+DATE_FIELDS = ('DatesR', 'date', 'Date', 'tarih')
+QOBS_FIELDS = ('Qmm', 'Qobs', 'Q', 'Qgoz')
+
+
+# --- Havza verisi --------------------------------------------------------------------
+
+def _field(fieldnames, candidates, path, required=True):
+    field = next((name for name in candidates if name in fieldnames), None)
+    if field is None and required:
+        raise ValueError(f"{path}: {'/'.join(candidates)} sütunu bulunamadı")
+    return field
+
+
+def _number(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def read_basin(path):
+    """Havza CSV'si: {'name', 'dates', 'precip', 'evap', 'q_obs'} (gözlem yoksa q_obs NaN)"""
+    with open(path, encoding='utf-8-sig', newline='') as handle:
+        reader = csv.DictReader(handle)
+        fields = reader.fieldnames or []
+        date_field = _field(fields, DATE_FIELDS, path)
+        q_field = _field(fields, QOBS_FIELDS, path, required=False)
+        for name in ('P', 'E'):
+            _field(fields, (name,), path)
+        rows = list(reader)
+    return {'name': os.path.splitext(os.path.basename(path))[0],
+            'dates': np.array([row[date_field][:10] for row in rows], dtype='datetime64[D]'),
+            'precip': np.array([_number(row['P']) for row in rows]),
+            'evap': np.array([_number(row['E']) for row in rows]),
+            'q_obs': np.array([_number(row[q_field]) if q_field else np.nan for row in rows])}
+
+
+def _read_column(path, column):
+    """CSV'den (tarihler, sütun) çifti"""
+    with open(path, encoding='utf-8-sig', newline='') as handle:
+        reader = csv.DictReader(handle)
+        date_field = _field(reader.fieldnames or [], DATE_FIELDS, path)
+        _field(reader.fieldnames or [], (column,), path)
+        rows = list(reader)
+    return (np.array([row[date_field][:10] for row in rows], dtype='datetime64[D]'),
+            np.array([_number(row[column]) for row in rows]))
+
+
+def run_period(dates, start=None, end=None, warmup_days=WARMUP_DAYS):
+    """(ısınma başı, çalışma başı, çalışma sonu + 1) indeksleri; airGR gibi ısınma en fazla bir yıl"""
+    first = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, 'D')))
+    last = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(end, 'D'), side='right'))
+    if first >= last:
+        raise ValueError(f"Çalışma dönemi boş: {start} - {end}")
+    return max(0, first - warmup_days), first, last
+
+
+# --- GR4J çekirdekleri ---------------------------------------------------------------
+
+def _s_curves(x4):
+    """UH1/UH2 S eğrileri (airGR SS1/SS2), x4 (n,) için (n, NH+1) ve (n, 2*NH+1)"""
+    x4 = np.asarray(x4, dtype=np.float64)[:, None]
+    t1 = np.arange(NH + 1) / x4
+    t2 = np.arange(2 * NH + 1) / x4
+    ss1 = np.where(t1 < 1, t1 ** 2.5, 1.0)
+    ss2 = np.where(t2 <= 1, 0.5 * t2 ** 2.5, np.where(t2 < 2, 1 - 0.5 * np.abs(2 - t2) ** 2.5, 1.0))
+    return ss1, ss2
+
+
+def unit_hydrographs(x4):
+    """UH1 ve UH2 ordinatları: (n, NH) ve (n, 2*NH)"""
+    ss1, ss2 = _s_curves(np.atleast_1d(x4))
+    return np.diff(ss1, axis=1), np.diff(ss2, axis=1)
+
+
+def _tanh(ws):
+    """airGR'daki tanh yazımı: (e^2w - 1) / (e^2w + 1); yuvarlama Fortran çekirdeğiyle aynı kalsın"""
+    exp_ws = math.exp(2 * ws)
+    return (exp_ws - 1) / (exp_ws + 1)
+
+
+def _gr4j_reference(precip, evap, params, levels=INITIAL_LEVELS):
+    """frun_GR4J.f'nin satır satır saf Python karşılığı: (akış, su dengesi kapanma hatası).
+
+    Yalnızca toplu çekirdeklerin doğrulaması içindir (gün başına ~10 µs).
+    """
+    x1, x2, x3, x4 = (float(value) for value in params)
+    ord1, ord2 = (ordinates[0].tolist() for ordinates in unit_hydrographs(x4))
+    uh1, uh2 = [0.0] * NH, [0.0] * (2 * NH)
+    n1, n2 = max(1, min(NH - 1, int(x4 + 1))), max(1, min(2 * NH - 1, 2 * int(x4 + 1)))
+    store, routing = levels[0] * x1, levels[1] * x3
+    initial = store + routing
+    q = np.empty(len(precip))
+    inflow = 0.0
+    for t in range(len(precip)):
+        p = precip[t] if precip[t] >= 0 else 0.0
+        e = evap[t] if evap[t] >= 0 else 0.0
+        if p <= e:
+            tws = _tanh(min((e - p) / x1, 13.0))
+            ratio = store / x1
+            er = store * (2 - ratio) * tws / (1 + (1 - ratio) * tws)
+            store -= er
+            inflow += p - (er + p)
+            pr = 0.0
+        else:
+            tws = _tanh(min((p - e) / x1, 13.0))
+            ratio = store / x1
+            ps = x1 * (1 - ratio * ratio) * tws / (1 + ratio * tws)
+            pr = p - e - ps
+            store += ps
+            inflow += p - e
+        store = max(store, 0.0)
+        perc = store * (1 - (1 + (store / x1) ** 4 / 25.62890625) ** -0.25)
+        store -= perc
+        pr += perc
+        for k in range(n1):
+            uh1[k] = uh1[k + 1] + ord1[k] * 0.9 * pr
+        uh1[NH - 1] = ord1[NH - 1] * 0.9 * pr
+        for k in range(n2):
+            uh2[k] = uh2[k + 1] + ord2[k] * 0.1 * pr
+        uh2[2 * NH - 1] = ord2[2 * NH - 1] * 0.1 * pr
+        exchange = x2 * (routing / x3) ** 3.5
+        # Gerçekleşen değişim: depo ya da doğrudan akış eksiye düşemez
+        actual = max(exchange, -routing - uh1[0]) + max(exchange, -uh2[0])
+        routing = max(0.0, routing + uh1[0] + exchange)
+        qr = routing * (1 - (1 + (routing / x3) ** 4) ** -0.25)
+        routing -= qr
+        q[t] = qr + max(0.0, uh2[0] + exchange)
+        inflow += actual - q[t]
+    # UH depolarının ilk elemanları o günün çıkışıdır; kalan elemanlar bekleyen sudur
+    pending = sum(uh1[1:]) + sum(uh2[1:])
+    return q, store + routing + pending - initial - inflow
+
+
+def _gr4j_numpy(precip, evap, params, q_obs, start, q_out, sse, levels):
+    """Toplu çekirdek: zaman döngüsü Python'da, her adım tüm parametre kümeleri üzerinde vektörel"""
+    x1, x2, x3, x4 = params.T
+    ord1, ord2 = unit_hydrographs(x4)
+    # airGR döngüyü UH uzunluğunda keser; ötesindeki ordinatlar ve depolar sıfır olduğundan
+    # tam uzunlukta kaydırma aynı sonucu verir
+    ord1 *= 0.9
+    ord2 *= 0.1
+    uh1, uh2 = np.zeros_like(ord1), np.zeros_like(ord2)
+    store, routing = levels[0] * x1, levels[1] * x3
+    for t in range(len(precip)):
+        p = precip[t] if precip[t] >= 0 else 0.0
+        e = evap[t] if evap[t] >= 0 else 0.0
+        ratio = store / x1
+        if p <= e:
+            exp_ws = np.exp(2 * np.minimum((e - p) / x1, 13.0))
+            tws = (exp_ws - 1) / (exp_ws + 1)
+            store = store - store * (2 - ratio) * tws / (1 + (1 - ratio) * tws)
+            pr = np.zeros_like(store)
+        else:
+            exp_ws = np.exp(2 * np.minimum((p - e) / x1, 13.0))
+            tws = (exp_ws - 1) / (exp_ws + 1)
+            ps = x1 * (1 - ratio * ratio) * tws / (1 + ratio * tws)
+            pr = p - e - ps
+            store = store + ps
+        np.maximum(store, 0.0, out=store)
+        perc = store * (1 - (1 + (store / x1) ** 4 / 25.62890625) ** -0.25)
+        store -= perc
+        pr += perc
+        uh1[:, :-1] = uh1[:, 1:]
+        uh1[:, -1] = 0
+        uh1 += ord1 * pr[:, None]
+        uh2[:, :-1] = uh2[:, 1:]
+        uh2[:, -1] = 0
+        uh2 += ord2 * pr[:, None]
+        exchange = x2 * (routing / x3) ** 3.5
+        routing = np.maximum(routing + uh1[:, 0] + exchange, 0.0)
+        qr = routing * (1 - (1 + (routing / x3) ** 4) ** -0.25)
+        routing -= qr
+        if t >= start:
+            q = qr + np.maximum(uh2[:, 0] + exchange, 0.0)
+            if q_out.shape[0]:
+                q_out[:, t - start] = q
+            if q_obs[t - start] == q_obs[t - start]:
+                sse += (q - q_obs[t - start]) ** 2
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _gr4j_numba(precip, evap, params, q_obs, start, q_out, sse, levels):
+        """_gr4j_reference ile aynı adımlar; parametre kümeleri prange ile paralel"""
+        n_steps = len(precip)
+        store_q = q_out.shape[0] > 0
+        for i in numba.prange(params.shape[0]):
+            x1, x2, x3, x4 = params[i, 0], params[i, 1], params[i, 2], params[i, 3]
+            # S eğrilerinden UH ordinatları (dağıtım katsayıları 0.9 / 0.1 dahil)
+            ord1 = np.empty(NH)
+            ord2 = np.empty(2 * NH)
+            previous = 0.0
+            for k in range(1, NH + 1):
+                ratio = k / x4
+                current = ratio ** 2.5 if ratio < 1 else 1.0
+                ord1[k - 1] = 0.9 * (current - previous)
+                previous = current
+            previous = 0.0
+            for k in range(1, 2 * NH + 1):
+                ratio = k / x4
+                if ratio <= 1:
+                    current = 0.5 * ratio ** 2.5
+                elif ratio < 2:
+                    current = 1 - 0.5 * (2 - ratio) ** 2.5
+                else:
+                    current = 1.0
+                ord2[k - 1] = 0.1 * (current - previous)
+                previous = current
+            uh1 = np.zeros(NH)
+            uh2 = np.zeros(2 * NH)
+            n1 = max(1, min(NH - 1, int(x4 + 1)))
+            n2 = max(1, min(2 * NH - 1, 2 * int(x4 + 1)))
+            store, routing = levels[0] * x1, levels[1] * x3
+            total = 0.0
+            for t in range(n_steps):
+                p = precip[t] if precip[t] >= 0 else 0.0
+                e = evap[t] if evap[t] >= 0 else 0.0
+                ratio = store / x1
+                exp_ws = math.exp(2 * min(abs(p - e) / x1, 13.0))
+                tws = (exp_ws - 1) / (exp_ws + 1)
+                if p <= e:
+                    store -= store * (2 - ratio) * tws / (1 + (1 - ratio) * tws)
+                    pr = 0.0
+                else:
+                    ps = x1 * (1 - ratio * ratio) * tws / (1 + ratio * tws)
+                    pr = p - e - ps
+                    store += ps
+                if store < 0:
+                    store = 0.0
+                ratio = store / x1
+                ratio *= ratio
+                perc = store * (1 - 1 / math.sqrt(math.sqrt(1 + ratio * ratio / 25.62890625)))
+                store -= perc
+                pr += perc
+                for k in range(n1):
+                    uh1[k] = uh1[k + 1] + ord1[k] * pr
+                uh1[NH - 1] = ord1[NH - 1] * pr
+                for k in range(n2):
+                    uh2[k] = uh2[k + 1] + ord2[k] * pr
+                uh2[2 * NH - 1] = ord2[2 * NH - 1] * pr
+                ratio = routing / x3
+                exchange = x2 * ratio * ratio * ratio * math.sqrt(ratio)
+                routing = max(routing + uh1[0] + exchange, 0.0)
+                ratio = routing / x3
+                ratio *= ratio
+                qr = routing * (1 - 1 / math.sqrt(math.sqrt(1 + ratio * ratio)))
+                routing -= qr
+                if t >= start:
+                    q = qr + max(uh2[0] + exchange, 0.0)
+                    if store_q:
+                        q_out[i, t - start] = q
+                    observed = q_obs[t - start]
+                    if observed == observed:
+                        total += (q - observed) ** 2
+            sse[i] = total
+
+
+def _run(precip, evap, params, q_obs, start, keep_flows, backend, levels):
+    """Çekirdeği seç ve çalıştır: (akışlar ya da boş dizi, hata kareleri toplamı)"""
+    if backend not in GR4J_BACKENDS:
+        raise ValueError(f"Bilinmeyen arka uç: {backend} ({', '.join(GR4J_BACKENDS)})")
+    if backend == 'numba' and numba is None:
+        print("⚠️ numba kurulu değil, 'numpy' arka ucu kullanılıyor")
+        backend = 'numpy'
+    precip = np.ascontiguousarray(precip, dtype=np.float64)
+    evap = np.ascontiguousarray(evap, dtype=np.float64)
+    params = np.ascontiguousarray(np.atleast_2d(params), dtype=np.float64)
+    if params.shape[1] != 4:
+        raise ValueError(f"Parametre kümeleri (n, 4) olmalı, {params.shape} verildi")
+    n_run = len(precip) - start
+    q_obs = np.full(n_run, np.nan) if q_obs is None else np.ascontiguousarray(q_obs, dtype=np.float64)
+    q_out = np.empty((len(params), n_run) if keep_flows else (0, 0))
+    sse = np.zeros(len(params))
+    kernel = _gr4j_numba if backend == 'numba' else _gr4j_numpy
+    kernel(precip, evap, params, q_obs, start, q_out, sse, np.asarray(levels, dtype=np.float64))
+    return q_out, sse
+
+
+def gr4j(precip, evap, params, start=0, backend='numba', levels=INITIAL_LEVELS):
+    """GR4J günlük akışları (mm/gün); ilk ``start`` gün ısınma dönemidir ve döndürülmez.
+
+    params tek küme (4,) ise (gün,), (n, 4) ise (n, gün) dizi döner.
+    """
+    flows, _ = _run(precip, evap, params, None, start, True, backend, levels)
+    return flows[0] if np.ndim(params) == 1 else flows
+
+
+def nse(precip, evap, q_obs, params, start=0, backend='numba', levels=INITIAL_LEVELS):
+    """Parametre kümeleri için Nash-Sutcliffe verimi; akışlar saklanmadan hesaplanır.
+
+    q_obs çalışma dönemidir (len(precip) - start gün); NaN gözlemler atlanır.
+    """
+    q_obs = np.asarray(q_obs, dtype=np.float64)
+    observed = q_obs[np.isfinite(q_obs)]
+    if observed.size < 2:
+        raise ValueError("NSE için en az iki gözlem gerekli")
+    _, sse = _run(precip, evap, params, q_obs, start, False, backend, levels)
+    scores = 1 - sse / np.sum((observed - observed.mean()) ** 2)
+    return scores[0] if np.ndim(params) == 1 else scores
+
+
+@contextmanager
+def _numba_threads(n_workers):
+    """numba iş parçacığı sayısını blok süresince ayarla, çıkışta önceki değere döndür"""
+    if numba is None or not n_workers:
+        yield
+        return
+    previous = numba.get_num_threads()
+    numba.set_num_threads(min(n_workers, numba.config.NUMBA_NUM_THREADS))
+    try:
+        yield
+    finally:
+        numba.set_num_threads(previous)
+
+
+# --- Kalibrasyon ve topluluk ---------------------------------------------------------
+
+def calibrate(basin, start=None, end=None, bounds=PARAM_BOUNDS, popsize=64, maxiter=200, seed=0,
+              n_workers=None, backend='numba'):
+    """NSE'yi en büyükleyen X1-X4 (differential evolution, nesil başına tek toplu çağrı)"""
+    if differential_evolution is None:
+        raise RuntimeError("Kalibrasyon için scipy gerekli: pip install scipy")
+    warmup, first, last = run_period(basin['dates'], start, end)
+    precip, evap = basin['precip'][warmup:last], basin['evap'][warmup:last]
+    q_obs = basin['q_obs'][first:last]
+    started = time.perf_counter()
+    evaluations = 0
+
+    def objective(population):
+        nonlocal evaluations
+        # vectorized=True: popülasyon (4, S) biçiminde gelir
+        population = np.atleast_2d(population.T)
+        evaluations += len(population)
+        return 1 - nse(precip, evap, q_obs, population, first - warmup, backend)
+
+    # popsize çarpandır: popülasyon popsize x parametre sayısı kadardır
+    with _numba_threads(n_workers):
+        result = differential_evolution(objective, bounds, popsize=max(1, popsize // len(bounds)), maxiter=maxiter,
+                                        seed=seed, tol=1e-8, vectorized=True, updating='deferred', polish=False)
+    return {'name': basin['name'], **dict(zip(PARAM_NAMES, result.x.tolist())), 'NSE': float(1 - result.fun),
+            'evaluations': evaluations, 'seconds': time.perf_counter() - started}
+
+
+def ensemble_nse(basins, params, start=None, end=None, n_workers=None, backend='numba'):
+    """Aynı parametre kümelerinin her havzadaki NSE'si: (havza, küme) matrisi"""
+    scores = np.empty((len(basins), len(np.atleast_2d(params))))
+    with _numba_threads(n_workers):
+        for row, basin in enumerate(basins):
+            warmup, first, last = run_period(basin['dates'], start, end)
+            scores[row] = nse(basin['precip'][warmup:last], basin['evap'][warmup:last],
+                              basin['q_obs'][first:last], np.atleast_2d(params), first - warmup, backend)
+    return scores
+
+
+def simulate_basin(basin, params, start=None, end=None, backend='numba'):
+    """Tek havza, tek parametre kümesi: (tarihler, benzetim, gözlem) çalışma dönemi için"""
+    warmup, first, last = run_period(basin['dates'], start, end)
+    flows = gr4j(basin['precip'][warmup:last], basin['evap'][warmup:last], np.asarray(params, dtype=float),
+                 first - warmup, backend)
+    return basin['dates'][first:last], flows, basin['q_obs'][first:last]
+
+
+def compare_reference(path, dates, flows):
+    """airGR çıktısıyla (DatesR, Qsim) karşılaştırma: (ortak gün sayısı, en büyük mutlak fark)"""
+    reference = _read_column(path, 'Qsim')
+    common, ours, theirs = np.intersect1d(dates, reference[0], return_indices=True)
+    return len(common), float(np.max(np.abs(flows[ours] - reference[1][theirs]))) if len(common) else float('nan')
+
+
+def write_simulation(path, dates, flows, q_obs):
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['DatesR', 'Qsim', 'Qobs'])
+        for date, flow, observed in zip(dates.astype(str), flows, q_obs):
+            writer.writerow([date, f'{flow:.6f}', '' if np.isnan(observed) else f'{observed:.6f}'])
+
+
+def write_calibration(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=('name',) + PARAM_NAMES + ('NSE', 'evaluations', 'seconds'))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# --- Kıyaslama -----------------------------------------------------------------------
+
+def synthetic_basin(n_years=30, params=(257.238, 1.012, 88.235, 2.208), noise=0.05, seed=0):
+    """Mevsimsel yağış/buharlaşma üreteci ve bilinen parametrelerle üretilmiş gürültülü gözlemler"""
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64('1986-01-01'), np.datetime64(f'{1986 + n_years}-01-01'))
+    day = (dates - dates.astype('datetime64[Y]')).astype(float)
+    season = np.cos(2 * np.pi * (day - 15) / 365.25)
+    wet = rng.random(len(dates)) < 0.35 + 0.15 * season
+    precip = np.where(wet, rng.gamma(0.8, 8.0 + 3.0 * season), 0.0)
+    evap = np.maximum(0.0, 2.5 - 2.2 * season + rng.normal(0, 0.3, len(dates)))
+    flows = gr4j(precip, evap, np.asarray(params, dtype=float))
+    q_obs = flows * rng.lognormal(0.0, noise, len(dates))
+    q_obs[rng.random(len(dates)) < 0.02] = np.nan
+    return {'name': 'sentetik', 'dates': dates, 'precip': precip, 'evap': evap, 'q_obs': q_obs}
+
+
+def _random_params(n, seed=1, bounds=PARAM_BOUNDS):
+    rng = np.random.default_rng(seed)
+    low, high = np.array(bounds).T
+    return low + (high - low) * rng.random((n, len(bounds)))
+
+
+def benchmark(n_sets=10_000, n_years=30):
+    basin = synthetic_basin(n_years)
+    precip, evap, q_obs = basin['precip'], basin['evap'], basin['q_obs']
+    params = _random_params(n_sets)
+    n_days = len(precip)
+    print(f"💧 {n_years} yıl ({n_days:,} gün), {n_sets:,} parametre kümesi, {os.cpu_count()} CPU")
+    print(f"{'Yöntem':<38}{'süre (s)':>10}{'küme/s':>12}")
+
+    started = time.perf_counter()
+    for row in params[:5]:
+        _gr4j_reference(precip, evap, row)
+    scalar = (time.perf_counter() - started) / 5
+    print(f"{'saf Python (airGR döngüsü, tahmini)':<38}{scalar * n_sets:>10.1f}{1 / scalar:>12,.0f}")
+
+    subset = params[:200]
+    started = time.perf_counter()
+    nse(precip, evap, q_obs, subset, backend='numpy')
+    elapsed = (time.perf_counter() - started) * n_sets / len(subset)
+    print(f"{'NumPy, kümeler boyunca vektörel':<38}{elapsed:>10.1f}{n_sets / elapsed:>12,.0f}")
+
+    if numba is not None:
+        started = time.perf_counter()
+        scores = nse(precip, evap, q_obs, params)
+        elapsed = time.perf_counter() - started
+        print(f"{'numba, NSE (akış saklanmadan)':<38}{elapsed:>10.2f}{n_sets / elapsed:>12,.0f}")
+        started = time.perf_counter()
+        gr4j(precip, evap, params[:1000])
+        elapsed = time.perf_counter() - started
+        print(f"{'numba, 1000 küme tam akış serisi':<38}{elapsed:>10.2f}{1000 / elapsed:>12,.0f}")
+        print(f"   en iyi rastgele küme NSE = {scores.max():.4f}")
+
+    # Doğrulama: toplu çekirdekler airGR döngüsünün satır satır karşılığıyla ve su dengesiyle
+    checks = params[:20]
+    differences, balances = [], []
+    flows = {backend: gr4j(precip, evap, checks, backend=backend) for backend in GR4J_BACKENDS}
+    for row, values in enumerate(checks):
+        reference, balance = _gr4j_reference(precip, evap, values)
+        balances.append(abs(balance))
+        differences.append(max(np.max(np.abs(flows[backend][row] - reference)) for backend in GR4J_BACKENDS))
+    print(f"✅ 20 küme: en büyük akış farkı {max(differences):.1e} mm/gün, "
+          f"su dengesi kapanma hatası {max(balances):.1e} mm")
+
+    if differential_evolution is not None:
+        result = calibrate(basin, start='1987-01-01')
+        print(f"🎯 Kalibrasyon: {result['evaluations']:,} değerlendirme, {result['seconds']:.1f} s, "
+              f"NSE = {result['NSE']:.4f}; X = " + ", ".join(f"{result[name]:.3f}" for name in PARAM_NAMES)
+              + " (gerçek 257.238, 1.012, 88.235, 2.208)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='GR4J yağış-akış benzetimi ve paralel kalibrasyon')
+    parser.add_argument('basins', nargs='*', help='Havza CSV dosyaları ya da glob desenleri (DatesR, P, E, Qmm)')
+    parser.add_argument('--start', help='Çalışma dönemi başı (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Çalışma dönemi sonu (YYYY-MM-DD)')
+    parser.add_argument('--param', type=float, nargs=4, metavar=PARAM_NAMES, help='Benzetim parametreleri')
+    parser.add_argument('--calibrate', action='store_true', help='NSE ile kalibre et')
+    parser.add_argument('--reference', help='airGR çıktısı (DatesR, Qsim) ile karşılaştır')
+    parser.add_argument('-o', '--output', help='Benzetim ya da kalibrasyon tablosu (CSV)')
+    parser.add_argument('--backend', choices=GR4J_BACKENDS, default='numba')
+    parser.add_argument('--workers', type=int, default=None, help='numba iş parçacığı sayısı')
+    parser.add_argument('--benchmark', action='store_true', help='Sentetik havzayla kıyaslama')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        with _numba_threads(args.workers):
+            benchmark()
+        return 0
+    paths = sorted({path for pattern in args.basins for path in (glob.glob(pattern) or [pattern])})
+    if not paths or (args.param is None) == (not args.calibrate):
+        parser.error('havza dosyası ile --param ya da --calibrate (ya da --benchmark) gerekli')
+    basins = [read_basin(path) for path in paths]
+
+    if args.calibrate:
+        rows = []
+        for basin in basins:
+            row = calibrate(basin, args.start, args.end, n_workers=args.workers, backend=args.backend)
+            rows.append(row)
+            print(f"🎯 {row['name']}: NSE = {row['NSE']:.4f}, "
+                  + ", ".join(f"{name} = {row[name]:.3f}" for name in PARAM_NAMES)
+                  + f" ({row['evaluations']:,} değerlendirme, {row['seconds']:.1f} s)")
+        if args.output:
+            write_calibration(args.output, rows)
+        return 0
+
+    for basin in basins:
+        with _numba_threads(args.workers):
+            dates, flows, q_obs = simulate_basin(basin, args.param, args.start, args.end, args.backend)
+        valid = np.isfinite(q_obs)
+        score = (1 - np.sum((flows[valid] - q_obs[valid]) ** 2) / np.sum((q_obs[valid] - q_obs[valid].mean()) ** 2)
+                 if valid.sum() > 1 else float('nan'))
+        print(f"💧 {basin['name']}: {len(dates):,} gün, NSE = {score:.4f}")
+        if args.reference:
+            n_common, difference = compare_reference(args.reference, dates, flows)
+            print(f"   airGR karşılaştırması: {n_common:,} ortak gün, en büyük fark {difference:.2e} mm/gün")
+        if args.output:
+            output = args.output if len(basins) == 1 else f"{os.path.splitext(args.output)[0]}_{basin['name']}.csv"
+            write_simulation(output, dates, flows, q_obs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
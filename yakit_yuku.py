@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel Sentinel-2 sahnelerinden yakıt yükü sınıflandırma hattı.
+
+"Fire Load MapREADME.md" betiği Google Earth Engine'de çalışır (S2_SR medyan
+kompoziti, NDVI x NBR, reducer.percentile ve frequencyHistogram). Buradaki hat
+aynı adımları yerel bant GeoTIFF/JP2 dosyaları üzerinde yapar:
+
+  1. geçiş  Sahne yığını karo karo (TILE_SIZE x TILE_SIZE) okunur; her karoda
+            bant başına medyan kompozit, NDVI = (B8-B4)/(B8+B4),
+            NBR = (B8-B12)/(B8+B12) ve yakıt yükü = NDVI x NBR hesaplanır.
+            Karolar süreç havuzundaki işçilerde paralel işlenir; ana süreç
+            yakıt yükü rasterını yazar ve değerleri akan bir yüzdelik
+            çizelgesine (arazi_istatistik.LayerStatistics; sabit çözünürlüklü
+            histogram, hata en fazla bir kutu = FUEL_RESOLUTION) ekler.
+  2. geçiş  p20/p50/p80 eşikleriyle yakıt yükü rasterı satır blokları halinde
+            4 sınıfa ayrılır (Düşük, Orta, Yüksek, Çok Yüksek) ve sınıf başına
+            hektar hesaplanır (coğrafi ızgarada piksel alanı enleme göre).
+
+Bellekte hiçbir zaman tam sahne yığını tutulmaz: bir karoda sahne sayısı x 3
+bant x karo boyu kadar veri bulunur, uçuştaki karo sayısı da işçi sayısının
+iki katıyla sınırlıdır.
+
+Girdi olarak her sahne bir dizindir (ör. .SAFE klasörü ya da dışa aktarılmış
+GeoTIFF'ler); dizin içinde B04, B08, B12 ve varsa SCL dosyaları adlarından
+bulunur. Aynı bant birden çok çözünürlükte varsa en ince olanı (_10m) seçilir.
+İlk sahnenin B08 ızgarası referanstır; farklı çözünürlük ya da projeksiyondaki
+bantlar (ör. 20 m B12, SCL) bu ızgaraya en yakın komşu ile yeniden örneklenir.
+SCL varsa bulut, bulut gölgesi, sirrus ve doymuş pikseller kompozite girmez.
+İşlem referansı 04.00 ve sonrası L2A ürünlerinde yansıtıma -1000 ofset eklenir;
+betikteki COPERNICUS/S2_SR koleksiyonuyla aynı sonuç için varsayılan 0'dır.
+Ofsetle sıfıra ya da altına düşen kompozit yansıtımlar (koyu su, gölge)
+REFLECTANCE_FLOOR'a kırpılır; böylece yakıt yükü [-1, 1] içinde kalır.
+
+Kullanım:   python yakit_yuku.py sahneler/S2*.SAFE -o yakit_yuku --bbox 30.90 36.70 31.50 36.95 \\
+                --start 2023-08-01 --end 2023-08-31
+Kıyaslama:  python yakit_yuku.py --benchmark
+"""
+
+import argparse
+import csv
+import glob
+import os
+import re
+import sys
+import tempfile
+import time
+import warnings
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from arazi_istatistik import LayerStatistics
+from olcum import measure
+
+try:
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.vrt import WarpedVRT
+    from rasterio.windows import Window
+except ImportError:
+    rasterio = None
+
+BANDS = ('B04', 'B08', 'B12')
+BAND_EXTENSIONS = ('.tif', '.tiff', '.jp2')
+# SCL sınıfları: 0 veri yok, 1 doymuş, 3 bulut gölgesi, 8-9 bulut, 10 sirrus
+SCL_INVALID = (0, 1, 3, 8, 9, 10)
+SCL_MASK = np.isin(np.arange(256), SCL_INVALID)
+TILE_SIZE = 512
+# Bu sahne sayısına kadar medyan sıralama ağıyla, üstünde np.sort ile bulunur
+SORT_NETWORK_MAX = 24
+BLOCK_ROWS = 512
+PERCENTILES = (20, 50, 80)
+# Yüzdelik histogramının kutu genişliği; NDVI x NBR [-1, 1] aralığındadır
+FUEL_RESOLUTION = 1e-4
+# Ofset sonrası en küçük yansıtım (DN): sıfır ya da negatif yansıtımda NDVI/NBR paydası
+# sıfıra yaklaşıp ±binlere patlar; pozitif bantlarda |NDVI|, |NBR| <= 1 kalır
+REFLECTANCE_FLOOR = 1.0
+FUEL_CLASSES = ('Düşük (<%20)', 'Orta (%20-50)', 'Yüksek (%50-80)', 'Çok Yüksek (>%80)')
+FUEL_COLORS = {1: (0, 128, 0, 255), 2: (255, 255, 0, 255), 3: (255, 165, 0, 255), 4: (255, 0, 0, 255)}
+# Betikteki Manavgat-Bördübet dikdörtgeni (boylam/enlem)
+BORDUBET_BBOX = (30.90, 36.70, 31.50, 36.95)
+EARTH_RADIUS_M = 6371008.8
+TABLE_COLUMNS = ('class', 'label', 'pixels', 'hectares', 'percent')
+
+Grid = namedtuple('Grid', 'crs transform width height')
+
+
+def _require_rasterio():
+    if rasterio is None:
+        raise RuntimeError("Sentinel-2 bantlarını okumak için rasterio gerekli: pip install rasterio")
+
+
+# --- Sahneler ------------------------------------------------------------------------
+
+def _band_pattern(band):
+    return re.compile(rf'(?:^|[_.]){band}(?:[_.]|$)', re.IGNORECASE)
+
+
+def _resolution_rank(path):
+    """'_10m' / '_20m' / '_60m' son ekine göre sıralama anahtarı (ek yoksa en önce)"""
+    match = re.search(r'_(\d+)m$', os.path.splitext(os.path.basename(path))[0])
+    return int(match.group(1)) if match else 0
+
+
+def _scene_date(path):
+    match = re.search(r'(20\d{2})(\d{2})(\d{2})', os.path.basename(os.path.normpath(path)))
+    return '-'.join(match.groups()) if match else None
+
+
+def find_scenes(paths, start=None, end=None):
+    """Sahne dizinlerinden bant dosyalarını bul; start/end (YYYY-MM-DD) adlardaki tarihe göre süzer"""
+    directories = sorted({path for pattern in paths for path in (glob.glob(pattern) or [pattern])})
+    scenes = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            raise ValueError(f"{directory}: sahne dizini değil")
+        date = _scene_date(directory)
+        if (start or end) and date is None:
+            print(f"⚠️ {directory}: adında tarih yok, tarih süzgecine rağmen kullanılıyor")
+        elif (start and date < start) or (end and date > end):
+            continue
+        files = [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names
+                 if name.lower().endswith(BAND_EXTENSIONS)]
+        scene = {'path': directory, 'date': date}
+        for band in BANDS + ('SCL',):
+            pattern = _band_pattern(band)
+            matches = sorted((path for path in files if pattern.search(os.path.splitext(os.path.basename(path))[0])),
+                             key=_resolution_rank)
+            if matches:
+                scene[band] = matches[0]
+        missing = [band for band in BANDS if band not in scene]
+        if missing:
+            raise ValueError(f"{directory}: eksik bant(lar): {', '.join(missing)}")
+        scenes.append(scene)
+    if not scenes:
+        raise ValueError("Tarih aralığında sahne bulunamadı")
+    return scenes
+
+
+def reference_grid(scene, bbox=None):
+    """Sahnenin B08 ızgarası; bbox (boylam/enlem) verilirse bu kutuya kırpılmış pencere"""
+    _require_rasterio()
+    from rasterio.errors import WindowError
+    from rasterio.warp import transform_bounds
+    from rasterio.windows import from_bounds, transform as window_transform
+
+    with rasterio.open(scene['B08']) as dataset:
+        crs, transform = dataset.crs, dataset.transform
+        window = Window(0, 0, dataset.width, dataset.height)
+        if bbox is not None:
+            bounds = transform_bounds('EPSG:4326', crs, *bbox) if crs is not None else bbox
+            clip = from_bounds(*bounds, transform=transform)
+            # Kutuya değen tüm pikseller: başlangıç aşağı, bitiş yukarı yuvarlanır
+            col_off, row_off = int(np.floor(clip.col_off)), int(np.floor(clip.row_off))
+            clip = Window(col_off, row_off, int(np.ceil(clip.col_off + clip.width)) - col_off,
+                          int(np.ceil(clip.row_off + clip.height)) - row_off)
+            try:
+                window = clip.intersection(window)
+            except WindowError:
+                raise ValueError(f"Kutu {bbox} referans sahneyle ({scene['path']}) kesişmiyor") from None
+    return Grid(crs, window_transform(window, transform), int(window.width), int(window.height))
+
+
+def _open_band(path, grid):
+    """Bandı referans ızgarasında okunacak şekilde aç: (veri kümesi, satır ofseti, sütun ofseti, kat).
+
+    Ofsetler referans pikseli cinsindendir; aynı projeksiyonda ve hizalı, piksel
+    boyu referansın tam katı olan bantlar (ör. 20 m B12, SCL) doğrudan okunup
+    np.repeat ile büyütülür (en yakın komşuyla aynı, WarpedVRT'den ~10 kat hızlı).
+    """
+    dataset = rasterio.open(path)
+    src, ref = dataset.transform, grid.transform
+    factor = round(src.a / ref.a)
+    if (dataset.crs == grid.crs and factor >= 1 and np.isclose(src.a, factor * ref.a)
+            and np.isclose(src.e, factor * ref.e)):
+        row_off, col_off = (ref.f - src.f) / ref.e, (ref.c - src.c) / ref.a
+        if (np.isclose(row_off, round(row_off)) and np.isclose(col_off, round(col_off))
+                and 0 <= round(row_off) and round(row_off) + grid.height <= dataset.height * factor
+                and 0 <= round(col_off) and round(col_off) + grid.width <= dataset.width * factor):
+            return dataset, round(row_off), round(col_off), factor
+    # Farklı projeksiyon, hizasız ya da ızgarayı tam kaplamayan sahne: referansa yeniden örnekle
+    vrt = WarpedVRT(dataset, crs=grid.crs, transform=grid.transform, width=grid.width, height=grid.height,
+                    resampling=Resampling.nearest, nodata=dataset.nodata if dataset.nodata is not None else 0)
+    return vrt, 0, 0, 1
+
+
+# --- Kompozit ve yakıt yükü (işçi süreçleri) -----------------------------------------
+
+_scenes = None
+_offset = 0.0
+_stack_dtype = np.uint16
+
+
+def _init_worker(scenes, grid, offset):
+    """Her işçi bant dosyalarını bir kez açar"""
+    global _scenes, _offset, _stack_dtype
+    _scenes = [{band: _open_band(scene[band], grid) for band in BANDS + ('SCL',) if band in scene}
+               for scene in scenes]
+    _offset = offset
+    # L2A sayısal değerleri (DN) uint16'dır; kayan noktalı dışa aktarımlar float32 yığında tutulur
+    integer = all(np.dtype(scene[band][0].dtypes[0]) in (np.uint8, np.uint16) for scene in _scenes for band in BANDS)
+    _stack_dtype = np.uint16 if integer else np.float32
+
+
+def _close_worker():
+    for scene in _scenes:
+        for dataset, *_ in scene.values():
+            dataset.close()
+
+
+def _read(source, row_off, col_off, n_rows, n_cols):
+    dataset, band_row, band_col, factor = source
+    row_off, col_off = band_row + row_off, band_col + col_off
+    if factor == 1:
+        return dataset.read(1, window=Window(col_off, row_off, n_cols, n_rows))
+    top, left = row_off // factor, col_off // factor
+    block = dataset.read(1, window=Window(left, top, -(-(col_off + n_cols) // factor) - left,
+                                          -(-(row_off + n_rows) // factor) - top))
+    block = np.repeat(np.repeat(block, factor, axis=0), factor, axis=1)
+    return block[row_off - top * factor:row_off - top * factor + n_rows,
+                 col_off - left * factor:col_off - left * factor + n_cols]
+
+
+def _invalid_value(dtype):
+    """Yığında geçersiz pikselin değeri: sıralamada en sona düşecek en büyük değer"""
+    return np.iinfo(dtype).max if np.issubdtype(dtype, np.integer) else np.inf
+
+
+def composite_median(stack):
+    """Sahne ekseni (0) boyunca geçersizleri yok sayan medyan (float32; geçerli değer yoksa NaN).
+
+    Geçersizler en büyük değerle (_invalid_value) işaretlidir ve sıralamada sona
+    gider; orta indeksler piksel başına geçerli değer sayısından bulunur
+    (np.nanmedian ile aynı sonuç). Az sahnede bitişik dilimler üzerinde tek-çift
+    yer değiştirmeli sıralama ağı np.sort(axis=0)'dan hızlıdır; yığın yerinde sıralanır.
+    """
+    n = stack.shape[0]
+    invalid = _invalid_value(stack.dtype)
+    if n <= SORT_NETWORK_MAX:
+        for step in range(n):
+            for i in range(step % 2, n - 1, 2):
+                low = np.minimum(stack[i], stack[i + 1])
+                np.maximum(stack[i], stack[i + 1], out=stack[i + 1])
+                stack[i] = low
+        ordered = stack
+    else:
+        ordered = np.sort(stack, axis=0)
+    count = (ordered != invalid).sum(axis=0)
+    median = np.take_along_axis(ordered, (np.maximum(count - 1, 0) // 2)[None], axis=0)[0].astype(np.float32)
+    median += np.take_along_axis(ordered, (count // 2)[None], axis=0)[0]
+    median *= 0.5
+    median[count == 0] = np.nan
+    return median
+
+
+def _fuel_load(b04, b08, b12):
+    """Yakıt yükü = NDVI x NBR (normalizedDifference(['B8', 'B4']) x normalizedDifference(['B8', 'B12']))"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ((b08 - b04) / (b08 + b04)) * ((b08 - b12) / (b08 + b12))
+
+
+def _fuel_tile(row_off, col_off, n_rows, n_cols):
+    """Bir karonun medyan kompozitinden yakıt yükü (float32, geçersiz -> NaN)"""
+    invalid = _invalid_value(_stack_dtype)
+    stacks = {band: np.empty((len(_scenes), n_rows, n_cols), dtype=_stack_dtype) for band in BANDS}
+    for i, scene in enumerate(_scenes):
+        masked = None
+        if 'SCL' in scene:
+            masked = SCL_MASK[_read(scene['SCL'], row_off, col_off, n_rows, n_cols)]
+        for band in BANDS:
+            layer = stacks[band][i]
+            layer[...] = _read(scene[band], row_off, col_off, n_rows, n_cols)
+            nodata = scene[band][0].nodata
+            nodata = 0 if nodata is None else nodata
+            if _stack_dtype == np.float32:
+                # Kayan noktalı dışa aktarımlarda NaN (nodata=nan dahil) asla == ile eşleşmez
+                layer[np.isnan(layer)] = invalid
+            if not np.isnan(nodata):
+                layer[layer == nodata] = invalid
+            if masked is not None:
+                layer[masked] = invalid
+    composite = [composite_median(stacks.pop(band)) for band in BANDS]
+    for layer in composite:
+        if _offset:
+            # Medyan sabit ötelemeyle yer değiştirir: ofset kompozitten sonra eklenir
+            layer += _offset
+        # NaN (geçerli sahne yok) korunur; np.maximum NaN'ı yayar
+        np.maximum(layer, REFLECTANCE_FLOOR, out=layer)
+    return _fuel_load(*composite)
+
+
+def _tile_results(scenes, grid, offset, tiles, n_workers):
+    """Karo sonuçlarını karo sırasıyla üret; uçuştaki karo sayısı sınırlıdır"""
+    if n_workers == 1:
+        _init_worker(scenes, grid, offset)
+        try:
+            for tile in tiles:
+                yield tile, _fuel_tile(*tile)
+        finally:
+            _close_worker()
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(scenes, grid, offset)) as executor:
+        pending = deque()
+        tile_iter = iter(tiles)
+        while True:
+            while len(pending) < 2 * n_workers and (tile := next(tile_iter, None)) is not None:
+                pending.append((tile, executor.submit(_fuel_tile, *tile)))
+            if not pending:
+                break
+            tile, future = pending.popleft()
+            yield tile, future.result()
+
+
+# --- Sınıflandırma -------------------------------------------------------------------
+
+def row_hectares(grid, r0, r1):
+    """Satır başına piksel alanı (ha); coğrafi ızgarada enleme göre küçülür"""
+    a, e, f = grid.transform.a, grid.transform.e, grid.transform.f
+    if grid.crs is None or not grid.crs.is_geographic:
+        return np.full(r1 - r0, abs(a * e) / 1e4)
+    top = np.radians(f + e * np.arange(r0, r1))
+    return EARTH_RADIUS_M ** 2 * np.radians(abs(a)) * np.abs(np.sin(top) - np.sin(top + np.radians(e))) / 1e4
+
+
+def classify(fuel_path, class_path, thresholds, block_rows=BLOCK_ROWS):
+    """Yakıt yükünü eşiklerle 1-4 sınıfına ayır (0: veri yok); sınıf başına (piksel, hektar)"""
+    with rasterio.open(fuel_path) as source:
+        grid = Grid(source.crs, source.transform, source.width, source.height)
+        profile = dict(source.profile, dtype='uint8', nodata=0, compress='deflate')
+        pixels = np.zeros(len(FUEL_CLASSES) + 1, dtype=np.int64)
+        hectares = np.zeros(len(FUEL_CLASSES) + 1)
+        with rasterio.open(class_path, 'w', **profile) as target:
+            target.write_colormap(1, FUEL_COLORS)
+            for r0 in range(0, grid.height, block_rows):
+                r1 = min(grid.height, r0 + block_rows)
+                window = Window(0, r0, grid.width, r1 - r0)
+                fuel = source.read(1, window=window)
+                # Betikteki where zinciri: < p20 -> 1, [p20, p50) -> 2, [p50, p80) -> 3, >= p80 -> 4
+                classes = (np.digitize(fuel, thresholds) + 1).astype(np.uint8)
+                classes[np.isnan(fuel)] = 0
+                target.write(classes, 1, window=window)
+                # Piksel alanı yalnız satıra bağlı: (satır, sınıf) sayım tablosu x satır alanı
+                keys = classes + (np.arange(r1 - r0) * len(pixels))[:, None]
+                table = np.bincount(keys.ravel(), minlength=(r1 - r0) * len(pixels)).reshape(r1 - r0, -1)
+                pixels += table.sum(axis=0)
+                hectares += row_hectares(grid, r0, r1) @ table
+    total = hectares[1:].sum()
+    return [{'class': index, 'label': label, 'pixels': int(pixels[index]), 'hectares': float(hectares[index]),
+             'percent': float(100 * hectares[index] / total) if total else 0.0}
+            for index, label in enumerate(FUEL_CLASSES, start=1)]
+
+
+def fuel_load_map(scenes, output_dir, bbox=None, offset=0.0, tile_size=TILE_SIZE, n_workers=None,
+                  resolution=FUEL_RESOLUTION):
+    """Sahnelerden yakıt yükü ve sınıf rasterlarını üret, sınıf alanlarını döndür"""
+    _require_rasterio()
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    grid = reference_grid(scenes[0], bbox)
+    tiles = [(row_off, col_off, min(tile_size, grid.height - row_off), min(tile_size, grid.width - col_off))
+             for row_off in range(0, grid.height, tile_size) for col_off in range(0, grid.width, tile_size)]
+    n_workers = max(1, min(n_workers or os.cpu_count(), len(tiles)))
+    print(f"🛰️ {len(scenes)} sahne, {grid.height}x{grid.width} ızgara, {len(tiles)} karo, {n_workers} işçi süreci")
+
+    fuel_path = os.path.join(output_dir, 'yakit_yuku.tif')
+    class_path = os.path.join(output_dir, 'yakit_sinifi.tif')
+    profile = {'driver': 'GTiff', 'width': grid.width, 'height': grid.height, 'count': 1, 'dtype': 'float32',
+               'crs': grid.crs, 'transform': grid.transform, 'nodata': np.nan, 'tiled': True,
+               'blockxsize': 512, 'blockysize': 512, 'compress': 'deflate'}
+    stats = LayerStatistics('fuel_load', resolution=resolution, value_range=(-1.0, 1.0))
+    with rasterio.open(fuel_path, 'w', **profile) as target:
+        for (row_off, col_off, n_rows, n_cols), fuel in _tile_results(scenes, grid, offset, tiles, n_workers):
+            target.write(fuel, 1, window=Window(col_off, row_off, n_cols, n_rows))
+            stats.update(fuel)
+
+    summary = stats.result(PERCENTILES)
+    if not summary['count']:
+        raise ValueError("Geçerli (bulutsuz) piksel yok")
+    thresholds = [summary['percentiles'][f'p{q}'] for q in PERCENTILES]
+    classes = classify(fuel_path, class_path, thresholds)
+    total_ha = float(row_hectares(grid, 0, grid.height).sum() * grid.width)
+    return {'fuel_path': fuel_path, 'class_path': class_path, 'thresholds': dict(zip(PERCENTILES, thresholds)),
+            'classes': classes, 'total_ha': total_ha, 'seconds': time.perf_counter() - started}
+
+
+def write_table(rows, path):
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=TABLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_result(result):
+    print("Eşikler: " + ", ".join(f"p{q} = {value:.4f}" for q, value in result['thresholds'].items()))
+    print(f"{'Sınıf':<22}{'piksel':>14}{'alan (ha)':>14}{'oran':>8}")
+    for row in result['classes']:
+        print(f"{row['label']:<22}{row['pixels']:>14,}{row['hectares']:>14,.1f}{row['percent']:>7.1f}%")
+    valid = sum(row['hectares'] for row in result['classes'])
+    print(f"Sınıflanan alan: {valid:,.1f} ha / toplam alan: {result['total_ha']:,.1f} ha")
+
+
+# --- Kıyaslama -----------------------------------------------------------------------
+
+def _write_band(path, data, transform, crs='EPSG:32636'):
+    profile = {'driver': 'GTiff', 'width': data.shape[1], 'height': data.shape[0], 'count': 1,
+               'dtype': data.dtype.name, 'crs': crs, 'transform': transform, 'nodata': 0,
+               'tiled': True, 'blockxsize': 512, 'blockysize': 512}
+    with rasterio.open(path, 'w', **profile) as dataset:
+        dataset.write(data, 1)
+
+
+def write_synthetic_scenes(directory, n_scenes=6, size=3072, seed=0):
+    """Bördübet yakınında 10 m B04/B08, 20 m B12/SCL ve rastgele bulutlar içeren sahneler"""
+    from rasterio.transform import from_origin
+
+    rng = np.random.default_rng(seed)
+    half = size // 2
+    y, x = np.mgrid[0:half, 0:half].astype(np.float32)
+    vegetation = 0.5 + 0.25 * np.sin(x / 90) * np.cos(y / 140) + 0.15 * np.sin((x + y) / 37)
+    paths = []
+    for index in range(n_scenes):
+        scene_dir = os.path.join(directory, f'S2_MSIL2A_202308{index + 2:02d}T083601_T36SUF')
+        os.makedirs(scene_dir)
+        veg = np.clip(vegetation + rng.normal(0, 0.05, vegetation.shape).astype(np.float32), 0, 1)
+        scl = np.full(veg.shape, 4, dtype=np.uint8)
+        for _ in range(8):
+            cy, cx, radius = rng.integers(0, half, 2).tolist() + [int(rng.integers(20, 120))]
+            scl[(y - cy) ** 2 + (x - cx) ** 2 < radius ** 2] = 9
+        cloud = scl == 9
+        b12 = np.where(cloud, 7000, 2400 - 1200 * veg).astype(np.uint16)
+        fine = {'B04': np.where(cloud, 8000, 1400 - 1000 * veg), 'B08': np.where(cloud, 8500, 2200 + 2400 * veg)}
+        for band, data in fine.items():
+            data = np.repeat(np.repeat(data, 2, axis=0), 2, axis=1)
+            data += rng.normal(0, 40, data.shape)
+            _write_band(os.path.join(scene_dir, f'T36SUF_{band}_10m.tif'), data.astype(np.uint16),
+                        from_origin(600000, 4070000, 10, 10))
+        _write_band(os.path.join(scene_dir, 'T36SUF_B12_20m.tif'), b12, from_origin(600000, 4070000, 20, 20))
+        _write_band(os.path.join(scene_dir, 'T36SUF_SCL_20m.tif'), scl, from_origin(600000, 4070000, 20, 20))
+        paths.append(scene_dir)
+    return paths
+
+
+def _eager_map(scenes):
+    """Tüm sahne yığınını belleğe alıp np.nanmedian / np.nanpercentile: betiğin doğrudan karşılığı"""
+    stacks = {band: [] for band in BANDS}
+    for scene in scenes:
+        with rasterio.open(scene['B08']) as reference:
+            shape = reference.shape
+        with rasterio.open(scene['SCL']) as dataset:
+            invalid = np.isin(dataset.read(1, out_shape=shape, resampling=Resampling.nearest), SCL_INVALID)
+        for band in BANDS:
+            with rasterio.open(scene[band]) as dataset:
+                data = dataset.read(1, out_shape=shape, resampling=Resampling.nearest).astype(np.float32)
+            data[(data == 0) | invalid] = np.nan
+            stacks[band].append(data)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # Her sahnede bulutlu pikseller: All-NaN slice
+        composite = [np.nanmedian(np.stack(stacks.pop(band)), axis=0) for band in BANDS]
+    fuel = _fuel_load(*composite)
+    thresholds = np.nanpercentile(fuel, PERCENTILES)
+    classes = np.digitize(fuel, thresholds) + 1
+    classes[np.isnan(fuel)] = 0
+    return thresholds.tolist(), np.bincount(classes.ravel(), minlength=5)[1:].tolist()
+
+
+def _blocked_map(scenes, output_dir, n_workers):
+    result = fuel_load_map(scenes, output_dir, n_workers=n_workers)
+    return list(result['thresholds'].values()), [row['pixels'] for row in result['classes']]
+
+
+def benchmark(n_scenes=6, size=3072):
+    _require_rasterio()
+    with tempfile.TemporaryDirectory() as directory:
+        write_synthetic_scenes(directory, n_scenes, size)
+        scenes = find_scenes([os.path.join(directory, 'S2_*')])
+        stack_mb = n_scenes * len(BANDS) * size * size * 4 / 1024 ** 2
+        print(f"🛰️ {n_scenes} sahne x {size}x{size} piksel (float32 yığın {stack_mb:,.0f} MB), "
+              f"{os.cpu_count()} CPU")
+        print(f"{'Yöntem':<40}{'süre (s)':>10}{'tepe bellek (MB)':>18}")
+        rows = [('tam yığın + np.nanmedian/nanpercentile', _eager_map, scenes),
+                ('karolu hat (1 işçi)', _blocked_map, scenes, os.path.join(directory, 'cikti1'), 1)]
+        if os.cpu_count() > 1:
+            rows.append((f'karolu hat ({os.cpu_count()} işçi)', _blocked_map, scenes,
+                         os.path.join(directory, 'cikti'), os.cpu_count()))
+        results = []
+        for label, function, *args in rows:
+            elapsed, peak, result = measure(function, *args)
+            results.append(result)
+            print(f"{label:<40}{elapsed:>10.2f}{peak:>18,.0f}")
+
+        (exact, exact_counts), (approx, counts) = results[0], results[1]
+        print("Eşik farkı (yaklaşık - kesin): " + ", ".join(
+            f"p{q} {a - e:+.1e}" for q, a, e in zip(PERCENTILES, approx, exact)))
+        print("Sınıf piksel farkı: " + ", ".join(
+            f"{label.split()[0]} {c - e:+,}" for label, c, e in zip(FUEL_CLASSES, counts, exact_counts))
+            + f" (toplam {sum(exact_counts):,})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Yerel Sentinel-2 sahnelerinden yakıt yükü (NDVI x NBR) sınıfları')
+    parser.add_argument('scenes', nargs='*', help='Sahne dizinleri ya da glob desenleri (ör. "S2*.SAFE")')
+    parser.add_argument('-o', '--output', default='yakit_yuku', help='Çıktı dizini')
+    parser.add_argument('--bbox', type=float, nargs=4, metavar=('BATI', 'GUNEY', 'DOGU', 'KUZEY'),
+                        help=f'Boylam/enlem kutusu (betikteki Bördübet: {" ".join(map(str, BORDUBET_BBOX))})')
+    parser.add_argument('--start', help='İlk tarih (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Son tarih (YYYY-MM-DD)')
+    parser.add_argument('--offset', type=float, default=0.0, help='Yansıtım ofseti (işlem referansı >= 04.00: -1000)')
+    parser.add_argument('--tile-size', type=int, default=TILE_SIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--benchmark', action='store_true', help='Sentetik sahnelerle kıyaslama')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark()
+        return 0
+    if not args.scenes:
+        parser.error('sahne dizinleri ya da --benchmark gerekli')
+    scenes = find_scenes(args.scenes, args.start, args.end)
+    result = fuel_load_map(scenes, args.output, args.bbox, args.offset, args.tile_size, args.workers)
+    table_path = os.path.join(args.output, 'yakit_sinif_alanlari.csv')
+    write_table(result['classes'], table_path)
+    print(f"✅ {result['fuel_path']}, {result['class_path']}, {table_path} ({result['seconds']:.1f} s)\n")
+    print_result(result)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AgriDagi3D arazi katmanlarıyla çok ölçütlü orman yangını tehlike haritası.
+
+"Fire Risk MapREADME.md" betiğindeki skor 500x500'lük bir np.meshgrid üzerinde
+analitik yükseklik ve bitki örtüsünden üretilir; orman_yangini_risk_agi.py ise
+risk seviyelerini elle atar. Buradaki motor gerçek rasterları birleştirir:
+
+  eğim       AgriDagi3D.slope_data (derece)        yangın yamaçta yukarı hızla yayılır
+  bakı       AgriDagi3D.aspect_data                güney-güneybatı yamaçlar daha kuru
+  pürüzlülük 'agri_dagi Roughness.tif' (m)         engebeli arazide müdahale güçleşir
+  yakıt      yakit_yuku.py çıktısı (NDVI x NBR)    yanıcı yakıt yükü
+  bitki      NDVI rasterı                          betikteki (1 - bitki örtüsü) terimi
+
+Her faktör kırılım noktaları arasında doğrusal olarak 0-1 puanına çevrilir
+(FACTOR_BREAKS), puanlar ağırlıklarla toplanır (DEFAULT_WEIGHTS; verilmeyen
+katmanların ağırlığı kalanlara paylaştırılır) ve tehlike skoru risk ağıyla
+aynı sınırlarla (risk_agi_skor.RISK_THRESHOLDS) dört seviyeye ayrılır.
+Verilen katmanlardan biri bile eksikse (nodata) piksel sınıflanmaz.
+
+Katmanlar satır blokları halinde (BLOCK_ROWS) tek geçişte okunur; bellek
+raster boyutuna değil blok boyuna bağlıdır. Izgarası referanstan farklı olan
+katmanlar (farklı çözünürlük, hizalama ya da projeksiyon) okunurken referans
+ızgarasına yeniden örneklenir: sürekli katmanlar bilineer, açısal olan bakı en
+yakın komşu ile. Tehlike skoru float32 (nodata NaN), sınıflar renk tablolu
+uint8 (0: veri yok) GeoTIFF olarak yazılır; sınıf başına hektar tablosu CSV'dir.
+
+Bakı kuralı: AgriDagi3D bakısı yukarı eğim vektörünün doğudan saat yönü
+tersine açısıdır (arctan2(-dz/dsatır, dz/dsütun)); yamacın baktığı pusula
+yönü (270 - bakı) mod 360'tır. Kuzeyden saat yönünde pusula bakısı veren
+rasterlar (ör. gdaldem aspect) için aspect_convention='compass' kullanılır.
+
+Kullanım:   python yangin_tehlikesi.py agri_dagi_DEM.tif --roughness "agri_dagi Roughness.tif" \\
+                --fuel yakit_yuku/yakit_yuku.tif --vegetation ndvi.tif -o yangin_tehlikesi
+            python yangin_tehlikesi.py il_dem_10m.tif --tiled --backend numba --fuel yakit_yuku.tif \\
+                --reference fuel -o yangin_tehlikesi
+Kıyaslama:  python yangin_tehlikesi.py --benchmark
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from olcum import measure
+from risk_agi_skor import RISK_THRESHOLDS, RISK_TIERS
+from risk_agi_tanimlari import RISK_LEVELS
+from yakit_yuku import Grid, row_hectares, write_table
+
+try:
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.vrt import WarpedVRT
+    from rasterio.warp import reproject
+    from rasterio.windows import Window, transform as window_transform
+except ImportError:
+    rasterio = None
+
+FACTORS = ('slope', 'aspect', 'roughness', 'fuel', 'vegetation')
+DEFAULT_WEIGHTS = {'slope': 0.25, 'aspect': 0.15, 'roughness': 0.10, 'fuel': 0.35, 'vegetation': 0.15}
+# Faktör değeri kırılımları -> puanlar (aradaki değerler doğrusal, dışındakiler uç puan)
+FACTOR_BREAKS = {
+    'slope': ((0, 5, 15, 25, 35), (0, 0.25, 0.5, 0.75, 1)),   # derece
+    'roughness': ((0, 10, 25, 50), (0, 0.33, 0.67, 1)),        # m (Ağrı: medyan ~20, p95 ~49)
+    'fuel': ((0, 0.1, 0.3, 0.5), (0, 0.33, 0.67, 1)),          # NDVI x NBR
+    'vegetation': ((0.1, 0.8), (1, 0)),                         # NDVI
+}
+# Kuzey yarımkürede en kuru yamaçlar güneybatıya bakar (pusula, derece)
+ASPECT_PEAK = 225.0
+# Bu eğimin altındaki düzlüklerde bakı anlamsızdır: nötr puan
+FLAT_SLOPE = 2.0
+FLAT_ASPECT_SCORE = 0.5
+ASPECT_CONVENTIONS = ('agridagi', 'compass')
+# Açısal katman ara değerlenemez (359° ile 1° ortalaması 180° olur)
+RESAMPLING = {'aspect': 'nearest'}
+BLOCK_ROWS = 512
+HAZARD_CLASSES = tuple(RISK_LEVELS[tier]['label'] for tier in RISK_TIERS)
+HAZARD_COLORS = {index: tuple(int(RISK_LEVELS[tier]['color'][i:i + 2], 16) for i in (1, 3, 5)) + (255,)
+                 for index, tier in enumerate(RISK_TIERS, start=1)}
+
+
+def _require_rasterio():
+    if rasterio is None:
+        raise RuntimeError("Tehlike rasterlarını okuyup yazmak için rasterio gerekli: pip install rasterio")
+
+
+# --- Faktör puanları -----------------------------------------------------------------
+
+def factor_score(name, values, slope=None, aspect_convention='agridagi'):
+    """Faktör değerlerini 0-1 tehlike puanına çevir (NaN korunur)"""
+    if name != 'aspect':
+        breaks, scores = FACTOR_BREAKS[name]
+        return np.interp(values, breaks, scores).astype(np.float32)
+    if aspect_convention not in ASPECT_CONVENTIONS:
+        raise ValueError(f"Geçersiz aspect_convention: {aspect_convention!r} "
+                         f"(seçenekler: {', '.join(ASPECT_CONVENTIONS)})")
+    compass = (270.0 - values) if aspect_convention == 'agridagi' else values
+    score = (0.5 + 0.5 * np.cos(np.radians(compass - ASPECT_PEAK))).astype(np.float32)
+    if slope is not None:
+        score[slope < FLAT_SLOPE] = FLAT_ASPECT_SCORE
+    return score
+
+
+def normalized_weights(names, weights=None):
+    """Verilen katmanların ağırlıkları, toplamı 1 olacak şekilde"""
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    unknown = set(weights) - set(FACTORS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen faktör(ler): {', '.join(sorted(unknown))} (seçenekler: {', '.join(FACTORS)})")
+    total = sum(weights[name] for name in names)
+    if total <= 0:
+        raise ValueError("Verilen katmanların ağırlık toplamı sıfır")
+    return {name: weights[name] / total for name in names}
+
+
+# --- Katman okuma --------------------------------------------------------------------
+
+def layer_grid(source):
+    """Yol ya da (dizi, transform, crs) kaynağının ızgarası"""
+    if isinstance(source, tuple):
+        array, transform, crs = source
+        return Grid(crs, transform, array.shape[1], array.shape[0])
+    with rasterio.open(source) as dataset:
+        return Grid(dataset.crs, dataset.transform, dataset.width, dataset.height)
+
+
+def _same_grid(a, b):
+    return (a.width, a.height) == (b.width, b.height) and a.crs == b.crs and a.transform.almost_equals(b.transform)
+
+
+class _Layer:
+    """Kaynağı referans ızgarasında satır bloğu olarak float32 okur (nodata -> NaN)"""
+
+    def __init__(self, source, grid, resampling):
+        self.grid = grid
+        self.array = self.dataset = self.vrt = None
+        self.nodata = None
+        if isinstance(source, tuple):
+            self.array, self.transform, self.crs = source
+            self.aligned = _same_grid(layer_grid(source), grid)
+            self.resampling = resampling
+            return
+        self.dataset = rasterio.open(source)
+        self.nodata = self.dataset.nodata
+        if not _same_grid(Grid(self.dataset.crs, self.dataset.transform, self.dataset.width, self.dataset.height),
+                          grid):
+            # GDAL yalnız okunan pencerenin kaynak bölgesini yeniden örnekler
+            self.vrt = WarpedVRT(self.dataset, crs=grid.crs, transform=grid.transform, width=grid.width,
+                                 height=grid.height, resampling=resampling, dtype='float32', nodata=np.nan)
+
+    def read(self, r0, r1):
+        window = Window(0, r0, self.grid.width, r1 - r0)
+        if self.array is not None:
+            if self.aligned:
+                return self.array[r0:r1].astype(np.float32)
+            block = np.full((r1 - r0, self.grid.width), np.nan, dtype=np.float32)
+            reproject(self.array, block, src_transform=self.transform,
+                      src_crs=self.crs, src_nodata=np.nan, dst_transform=window_transform(window, self.grid.transform),
+                      dst_crs=self.grid.crs, dst_nodata=np.nan, resampling=self.resampling)
+            return block
+        if self.vrt is not None:
+            return self.vrt.read(1, window=window)
+        block = self.dataset.read(1, window=window, out_dtype=np.float32)
+        if self.nodata is not None and not np.isnan(self.nodata):
+            block[block == self.nodata] = np.nan
+        return block
+
+    def close(self):
+        for dataset in (self.vrt, self.dataset):
+            if dataset is not None:
+                dataset.close()
+
+
+# --- Tehlike haritası ----------------------------------------------------------------
+
+def hazard_block(blocks, weights, aspect_convention='agridagi'):
+    """Faktör bloklarından ağırlıklı tehlike skoru (float32, herhangi bir faktör NaN ise NaN)"""
+    hazard = np.zeros(next(iter(blocks.values())).shape, dtype=np.float32)
+    for name, values in blocks.items():
+        hazard += weights[name] * factor_score(name, values, blocks.get('slope'), aspect_convention)
+    # Düz alanlarda bakı puanı sabitlense de eksik bakı eksik kalmalı
+    if 'aspect' in blocks:
+        hazard[np.isnan(blocks['aspect'])] = np.nan
+    return hazard
+
+
+def fire_hazard_map(layers, output_dir, weights=None, reference='slope', aspect_convention='agridagi',
+                    thresholds=RISK_THRESHOLDS, block_rows=BLOCK_ROWS):
+    """Katmanlardan tehlike (float32) ve sınıf (uint8) rasterlarını üret, sınıf alanlarını döndür.
+
+    ``layers``: {faktör: GeoTIFF yolu ya da (dizi, transform, crs)}. ``reference``
+    çıktı ızgarasını veren katmanın adı ya da bir yakit_yuku.Grid'dir (ör. 10 m
+    yakıt rasterı ile 30 m DEM türevleri: reference='fuel').
+    """
+    _require_rasterio()
+    started = time.perf_counter()
+    layers = {name: source for name, source in layers.items() if source is not None}
+    unknown = set(layers) - set(FACTORS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen katman(lar): {', '.join(sorted(unknown))} (seçenekler: {', '.join(FACTORS)})")
+    if not layers:
+        raise ValueError("En az bir katman gerekli")
+    weights = normalized_weights(layers, weights)
+    if isinstance(reference, Grid):
+        grid = reference
+    elif reference in layers:
+        grid = layer_grid(layers[reference])
+    else:
+        raise ValueError(f"Referans katman verilmedi: {reference!r} (verilenler: {', '.join(layers)})")
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"🔥 {grid.height}x{grid.width} ızgara, faktörler: " +
+          ", ".join(f"{name} {weight:.2f}" for name, weight in weights.items()))
+
+    hazard_path = os.path.join(output_dir, 'yangin_tehlikesi.tif')
+    class_path = os.path.join(output_dir, 'yangin_tehlike_sinifi.tif')
+    profile = {'driver': 'GTiff', 'width': grid.width, 'height': grid.height, 'count': 1, 'crs': grid.crs,
+               'transform': grid.transform, 'tiled': True, 'blockxsize': 512, 'blockysize': 512,
+               'compress': 'deflate', 'BIGTIFF': 'IF_SAFER'}
+    readers = {name: _Layer(source, grid, Resampling[RESAMPLING.get(name, 'bilinear')])
+               for name, source in layers.items()}
+    pixels = np.zeros(len(HAZARD_CLASSES) + 1, dtype=np.int64)
+    hectares = np.zeros(len(HAZARD_CLASSES) + 1)
+    hazard_sum = 0.0
+    try:
+        with rasterio.open(hazard_path, 'w', dtype='float32', nodata=np.nan, **profile) as hazard_out, \
+                rasterio.open(class_path, 'w', dtype='uint8', nodata=0, **profile) as class_out:
+            class_out.write_colormap(1, HAZARD_COLORS)
+            for r0 in range(0, grid.height, block_rows):
+                r1 = min(grid.height, r0 + block_rows)
+                window = Window(0, r0, grid.width, r1 - r0)
+                hazard = hazard_block({name: reader.read(r0, r1) for name, reader in readers.items()},
+                                      weights, aspect_convention)
+                # risk_agi_skor.risk_tier ile aynı: sınır değeri üst seviyeye girer
+                classes = (np.digitize(hazard, thresholds) + 1).astype(np.uint8)
+                valid = ~np.isnan(hazard)
+                classes[~valid] = 0
+                hazard_out.write(hazard, 1, window=window)
+                class_out.write(classes, 1, window=window)
+                hazard_sum += float(hazard[valid].sum(dtype=np.float64))
+                # Piksel alanı yalnız satıra bağlı: (satır, sınıf) sayım tablosu x satır alanı
+                keys = classes + (np.arange(r1 - r0) * len(pixels))[:, None]
+                table = np.bincount(keys.ravel(), minlength=(r1 - r0) * len(pixels)).reshape(r1 - r0, -1)
+                pixels += table.sum(axis=0)
+                hectares += row_hectares(grid, r0, r1) @ table
+    finally:
+        for reader in readers.values():
+            reader.close()
+
+    total = hectares[1:].sum()
+    classes = [{'class': index, 'label': label, 'pixels': int(pixels[index]), 'hectares': float(hectares[index]),
+                'percent': float(100 * hectares[index] / total) if total else 0.0}
+               for index, label in enumerate(HAZARD_CLASSES, start=1)]
+    n_valid = int(pixels[1:].sum())
+    return {'hazard_path': hazard_path, 'class_path': class_path, 'weights': weights, 'classes': classes,
+            'mean_hazard': hazard_sum / n_valid if n_valid else float('nan'),
+            'total_ha': float(row_hectares(grid, 0, grid.height).sum() * grid.width),
+            'seconds': time.perf_counter() - started}
+
+
+def terrain_layers(terrain):
+    """AgriDagi3D nesnesinin eğim, bakı ve (varsa) pürüzlülük katmanları"""
+    if terrain.tiled:
+        layers = {'slope': terrain.derived_paths['slope'], 'aspect': terrain.derived_paths['aspect']}
+    else:
+        layers = {'slope': (terrain.slope_data, terrain.transform, terrain.crs),
+                  'aspect': (terrain.aspect_data, terrain.transform, terrain.crs)}
+    # Pürüzlülük kendi ızgarasından okunur; DEM'den farklıysa yeniden örneklenir
+    if terrain.roughness_path and os.path.exists(terrain.roughness_path):
+        layers['roughness'] = terrain.roughness_path
+    return layers
+
+
+def print_result(result):
+    print(f"Ortalama tehlike skoru: {result['mean_hazard']:.3f} "
+          f"(sınırlar: {', '.join(f'{value:.2f}' for value in RISK_THRESHOLDS)})")
+    print(f"{'Seviye':<22}{'piksel':>14}{'alan (ha)':>14}{'oran':>8}")
+    for row in result['classes']:
+        print(f"{row['label']:<22}{row['pixels']:>14,}{row['hectares']:>14,.1f}{row['percent']:>7.1f}%")
+    valid = sum(row['hectares'] for row in result['classes'])
+    print(f"Sınıflanan alan: {valid:,.1f} ha / toplam alan: {result['total_ha']:,.1f} ha")
+
+
+# --- Kıyaslama -----------------------------------------------------------------------
+
+def _write_layer(path, function, size, pixel, nodata=None, shift=0.0, block_rows=1024):
+    """function(x, y) -> float32 değerlerini satır blokları halinde yaz (x, y metre)"""
+    from rasterio.transform import from_origin
+
+    n = size * 10 // pixel
+    left, top = 600000.0 + shift, 4450000.0 - shift
+    profile = {'driver': 'GTiff', 'width': n, 'height': n, 'count': 1, 'dtype': 'float32', 'nodata': nodata,
+               'crs': 'EPSG:32635', 'transform': from_origin(left, top, pixel, pixel),
+               'tiled': True, 'blockxsize': 512, 'blockysize': 512, 'BIGTIFF': 'IF_SAFER'}
+    x = left + pixel * (np.arange(n, dtype=np.float32) + 0.5) - 600000.0
+    with rasterio.open(path, 'w', **profile) as dataset:
+        for r0 in range(0, n, block_rows):
+            r1 = min(n, r0 + block_rows)
+            y = 4450000.0 - top + pixel * (np.arange(r0, r1, dtype=np.float32) + 0.5)
+            dataset.write(function(x[None, :], y[:, None]).astype(np.float32), 1, window=Window(0, r0, n, r1 - r0))
+    return path
+
+
+def write_synthetic_layers(directory, size=4096):
+    """size x size 10 m eğim/bakı/yakıt, 20 m NDVI ve 5 m kaymış 30 m pürüzlülük (nodata -9999)"""
+    def slope(x, y):
+        return 20 + 15 * np.sin(x / 900) * np.cos(y / 1300) + 5 * np.sin((x + y) / 210)
+
+    def aspect(x, y):
+        return (np.degrees(np.arctan2(np.sin(y / 700), np.cos(x / 500))) + 360) % 360
+
+    def fuel(x, y):
+        values = 0.25 + 0.2 * np.sin(x / 650) * np.sin(y / 470) + 0.05 * np.cos((x - y) / 130)
+        return np.where(np.sin(x / 3000) * np.sin(y / 2700) > 0.9, np.nan, values)  # bulut boşlukları
+
+    def ndvi(x, y):
+        return 0.45 + 0.3 * np.cos(x / 800) * np.sin(y / 1100)
+
+    def roughness(x, y):
+        values = 20 + 15 * np.sin(x / 1200) * np.cos(y / 900) + 5 * np.abs(np.sin(y / 150))
+        return np.where(np.cos(x / 4100) * np.cos(y / 3900) > 0.95, -9999, values)
+
+    return {'slope': _write_layer(os.path.join(directory, 'egim.tif'), slope, size, 10),
+            'aspect': _write_layer(os.path.join(directory, 'baki.tif'), aspect, size, 10),
+            'fuel': _write_layer(os.path.join(directory, 'yakit.tif'), fuel, size, 10, nodata=np.nan),
+            'vegetation': _write_layer(os.path.join(directory, 'ndvi.tif'), ndvi, size, 20),
+            'roughness': _write_layer(os.path.join(directory, 'puruzluluk.tif'), roughness, size, 30,
+                                      nodata=-9999, shift=5.0)}
+
+
+def _eager_map(layers, output_dir):
+    """Tüm katmanları float64 tam dizi olarak referansa yeniden örnekle, tek seferde hesapla ve yaz"""
+    grid = layer_grid(layers['slope'])
+    weights = normalized_weights(layers)
+    arrays = {}
+    for name, path in layers.items():
+        arrays[name] = np.full((grid.height, grid.width), np.nan)
+        with rasterio.open(path) as dataset:
+            reproject(rasterio.band(dataset, 1), arrays[name], src_nodata=dataset.nodata, dst_transform=grid.transform,
+                      dst_crs=grid.crs, dst_nodata=np.nan, resampling=Resampling[RESAMPLING.get(name, 'bilinear')])
+    hazard = sum(weights[name] * factor_score(name, values, arrays['slope']).astype(float)
+                 for name, values in arrays.items())
+    classes = (np.digitize(hazard, RISK_THRESHOLDS) + 1).astype(np.uint8)
+    classes[np.isnan(hazard)] = 0
+    profile = {'driver': 'GTiff', 'width': grid.width, 'height': grid.height, 'count': 1, 'crs': grid.crs,
+               'transform': grid.transform, 'compress': 'deflate'}
+    with rasterio.open(os.path.join(output_dir, 'tehlike.tif'), 'w', dtype='float64', **profile) as dataset:
+        dataset.write(hazard, 1)
+    with rasterio.open(os.path.join(output_dir, 'sinif.tif'), 'w', dtype='uint8', **profile) as dataset:
+        dataset.write(classes, 1)
+    return np.bincount(classes.ravel(), minlength=5)[1:].tolist()
+
+
+def _blocked_map(layers, output_dir):
+    result = fire_hazard_map(layers, output_dir)
+    return [row['pixels'] for row in result['classes']]
+
+
+def benchmark(sizes=(4096, 8192), eager_max=4096):
+    _require_rasterio()
+    print(f"🔥 Sentetik 10 m katmanlar (20 m NDVI, kaymış 30 m pürüzlülük), {os.cpu_count()} CPU")
+    print(f"{'Izgara':<14}{'Yöntem':<34}{'süre (s)':>10}{'tepe bellek (MB)':>18}{'Mpiksel/s':>11}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            layers = write_synthetic_layers(directory, size)
+            rows = [('blok blok (float32)', _blocked_map, layers, os.path.join(directory, 'blok'))]
+            if size <= eager_max:
+                os.makedirs(os.path.join(directory, 'tam'))
+                rows.insert(0, ('tam dizi (float64 reproject)', _eager_map, layers, os.path.join(directory, 'tam')))
+            counts = []
+            for label, function, *args in rows:
+                elapsed, peak, result = measure(function, *args)
+                counts.append(result)
+                rate = size * size / elapsed
+                print(f"{f'{size}x{size}':<14}{label:<34}{elapsed:>10.2f}{peak:>18,.0f}{rate / 1e6:>11.1f}")
+            if len(counts) == 2:
+                print("  Sınıf piksel farkı (blok - tam): " + ", ".join(
+                    f"{label.split()[0]} {b - e:+,}" for label, b, e in zip(HAZARD_CLASSES, counts[1], counts[0]))
+                    + f" (toplam {sum(counts[0]):,})")
+    # İl ölçeği: 10 m'de 10.000 km² = 100 milyon piksel
+    # Son satır en büyük ızgaradaki blok blok ölçümdür
+    print(f"10.000 km² (1e8 piksel, 10 m) için tahmin: {1e8 / rate / 60:.1f} dk (blok blok)")
+
+
+def _parse_weights(items):
+    weights = {}
+    for item in items or ():
+        name, _, value = item.partition('=')
+        if name not in FACTORS or not value:
+            raise argparse.ArgumentTypeError(f"Geçersiz ağırlık {item!r} (ör. fuel=0.4; faktörler: {', '.join(FACTORS)})")
+        weights[name] = float(value)
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AgriDagi3D arazi katmanlarıyla çok ölçütlü yangın tehlike haritası')
+    parser.add_argument('dem', nargs='?', help='DEM GeoTIFF (eğim ve bakı AgriDagi3D ile türetilir)')
+    parser.add_argument('--roughness', help='Pürüzlülük rasterı (ör. "agri_dagi Roughness.tif")')
+    parser.add_argument('--fuel', help='Yakıt yükü rasterı (yakit_yuku.py çıktısı, NDVI x NBR)')
+    parser.add_argument('--vegetation', help='NDVI rasterı')
+    parser.add_argument('-o', '--output', default='yangin_tehlikesi', help='Çıktı dizini')
+    parser.add_argument('--reference', default='slope', choices=FACTORS, help='Çıktı ızgarasını veren katman')
+    parser.add_argument('--weight', action='append', metavar='FAKTÖR=AĞIRLIK',
+                        help='Varsayılan ağırlığı değiştir (tekrarlanabilir): ' +
+                             ', '.join(f'{name}={value}' for name, value in DEFAULT_WEIGHTS.items()))
+    parser.add_argument('--tiled', action='store_true', help='DEM türevlerini karo modunda diske yaz (büyük DEM)')
+    parser.add_argument('--tile-size', type=int, default=1024)
+    parser.add_argument('--backend', default='fused', help='Türev arka ucu: legacy, fused, numba')
+    parser.add_argument('--block-rows', type=int, default=BLOCK_ROWS)
+    parser.add_argument('--benchmark', action='store_true', help='Sentetik katmanlarla kıyaslama')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark()
+        return 0
+    if not args.dem:
+        parser.error('DEM ya da --benchmark gerekli')
+    try:
+        weights = _parse_weights(args.weight)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+    supplied = {'slope': True, 'aspect': True, 'roughness': args.roughness, 'fuel': args.fuel,
+                'vegetation': args.vegetation}
+    if not supplied[args.reference]:
+        parser.error(f"--reference {args.reference}: bu katman verilmedi (--{args.reference} ile verin)")
+    from agri_dagi_3d_profesional import AgriDagi3D
+
+    terrain = AgriDagi3D(args.dem, roughness_path=args.roughness, tiled=args.tiled, tile_size=args.tile_size,
+                         output_dir=os.path.join(args.output, 'arazi') if args.tiled else None,
+                         derivatives_backend=args.backend)
+    result = terrain.create_fire_hazard_map(args.fuel, args.vegetation, args.output, weights=weights,
+                                            reference=args.reference, block_rows=args.block_rows)
+    table_path = os.path.join(args.output, 'yangin_tehlike_alanlari.csv')
+    write_table(result['classes'], table_path)
+    print(f"✅ Alan tablosu: {table_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())